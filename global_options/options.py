@@ -4,6 +4,10 @@ import os
 import unittest
 
 from runtest import TextTestRunner
+from src.cassette import HTTP_CASSETTE
+from src.compression import HTTP_COMPRESSION
+from src.config_tracker import SKIP_CONFIG_RELOAD
+from src.session_cache import SESSION_CACHE
 from src.custom_logger import *
 from src.drivers.abstract_http_driver import CHROME, API, FIREFOX
 from src.options_providers.options_provider import API_CONNECT, CHROME_CONNECT, CONNECTION, FIREFOX_CONNECT
@@ -73,6 +77,22 @@ system = {
     ),
     'api_connection': API_CONNECT,
 
+    # If True a config is not reloaded by `apply_backup` and `load_config` if NMS runs it and no changes have been
+    # sent to NMS since it has been applied. Enable only if the test cases do not change NMS by other means
+    SKIP_CONFIG_RELOAD: False,
+
+    # If set the HTTP exchanges of the API clients are recorded to or replayed from a JSONL cassette, i.e.
+    # {'path': 'cassettes/{suite}.jsonl', 'mode': 'record'} or {'path': ..., 'mode': 'replay', 'replay_latency': True}.
+    # `{suite}` in the path is replaced by the name of the test suite
+    HTTP_CASSETTE: None,
+
+    # If True the API clients accept gzip, deflate and brotli (if installed) encoded replies
+    HTTP_COMPRESSION: True,
+
+    # If True the NMS session cookies are cached in `.nms_sessions.json` and shared by the clients and the processes
+    # of the run, the clients log in again if NMS rejects the cookies. Keep disabled for the cases checking logins
+    SESSION_CACHE: False,
+
     LOGGING: INFO,
     CONSOLE_LOGGING: DEBUG,
 
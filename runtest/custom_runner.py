@@ -7,6 +7,7 @@ import warnings
 from collections import defaultdict
 from unittest import result
 from unittest.signals import registerResult
+from src import cassette, compression, config_tracker, latency, session_cache
 from src.options_providers.options_provider import OptionsProvider
 
 __unittest = True
@@ -57,7 +58,11 @@ class TextTestResult(result.TestResult):
         # print(self.errors)
         # print(self.queue)
         super(TextTestResult, self).startTest(test)
-        pass
+        latency.start_test(test.id())
+
+    def stopTest(self, test):
+        latency.stop_test()
+        super(TextTestResult, self).stopTest(test)
 
     def addSuccess(self, test):
         super(TextTestResult, self).addSuccess(test)
@@ -132,6 +137,16 @@ class TextTestRunner(object):
         result.failfast = self.failfast
         result.buffer = self.buffer
         result.tb_locals = self.tb_locals
+        config_tracker.set_reload_skip(
+            OptionsProvider.get_system_options('global_options', config_tracker.SKIP_CONFIG_RELOAD)
+        )
+        compression.set_enabled(
+            OptionsProvider.get_system_options('global_options', compression.HTTP_COMPRESSION) is not False
+        )
+        session_cache.set_enabled(OptionsProvider.get_system_options('global_options', session_cache.SESSION_CACHE))
+        session_cache.reset_stats()
+        http_cassette = self._use_cassette()
+        latency.reset()
         with warnings.catch_warnings():
             if self.warnings:
                 # if self.warnings is set, use it to filter all the warnings
@@ -163,6 +178,19 @@ class TextTestRunner(object):
         run = result.testsRun
         self.stream.writeln("Ran %d test%s in %.3fs" %
                              (run, run != 1 and "s" or "", timeTaken))
+        config_stats = config_tracker.get_stats()
+        if config_stats.loads:
+            self.stream.writeln("Config loads %d, skipped uploads %d, skipped reloads %d, saved %.3fs" %
+                                 tuple(config_stats))
+        if session_cache.is_enabled():
+            self.stream.writeln("NMS sessions reused %d, logins %d, requests resent upon 401 %d" %
+                                 tuple(session_cache.get_stats()))
+        for endpoint, histogram in latency.get_suite().items():
+            self.stream.writeln(latency.format_summary(endpoint, histogram))
+        if http_cassette is not None:
+            self.stream.writeln("HTTP cassette %s: recorded %d, played %d, missed %d" %
+                                 (http_cassette.path, *http_cassette.get_stats()))
+            cassette.eject()
         self.stream.writeln()
 
         expectedFails = unexpectedSuccesses = skipped = 0
@@ -198,6 +226,41 @@ class TextTestRunner(object):
         self.logs_output(result)
         return result
 
+    def _use_cassette(self):
+        """
+        Activate the HTTP cassette set by `http_cassette` system option. `{suite}` in the cassette path
+        is replaced by the name of the test suite.
+
+        :returns: the activated `Cassette`, None if the option is not set
+        """
+        options = OptionsProvider.get_system_options('global_options', cassette.HTTP_CASSETTE)
+        if not options:
+            return None
+        suite_name = self.suite_name.split('.')[0] if self.suite_name else 'test_suite'
+        return cassette.use_options({**options, 'path': str(options['path']).format(suite=suite_name)})
+
+    def _write_latency(self, log_file, log_dir):
+        """
+        Write the latency of the endpoint classes of the suite and of each test to the suite log,
+        and the whole report including the histograms to `<suite>_latency.json` next to the log.
+
+        :param log_file: the opened suite log
+        :param str log_dir: the folder of the logs
+        """
+        suite_histograms = latency.get_suite()
+        if not suite_histograms:
+            return
+        log_file.write('Latency:\n')
+        for endpoint, histogram in suite_histograms.items():
+            log_file.write(f'{latency.format_summary(endpoint, histogram)}\n')
+        for test, histograms in latency.get_tests().items():
+            if histograms:
+                log_file.write(f'Latency of {test}:\n')
+                for endpoint, histogram in histograms.items():
+                    log_file.write(f'{latency.format_summary(endpoint, histogram)}\n')
+        log_file.write('\n')
+        latency.write_report(f'{log_dir}{self.suite_name}_latency.json', self.suite_name)
+
     def logs_output(self, _result):
         number_of_run = _result.testsRun
         number_of_failures = len(_result.failures)
@@ -239,7 +302,13 @@ class TextTestRunner(object):
             log_file.write(f'RUN {number_of_run} test(s)\n')
             log_file.write(f'ERROR {number_of_errors} test(s)\n')
             log_file.write(f'FAIL {number_of_failures} test(s)\n')
-            log_file.write(f'SKIP {number_of_skip} test(s)\n\n')
+            log_file.write(f'SKIP {number_of_skip} test(s)\n')
+            config_stats = config_tracker.get_stats()
+            log_file.write(f'CONFIG LOADS {config_stats.loads}, skipped uploads {config_stats.uploads_skipped}, '
+                           f'skipped reloads {config_stats.reloads_skipped}, '
+                           f'saved {config_stats.time_saved} seconds\n\n')
+
+            self._write_latency(log_file, log_dir)
 
             if number_of_errors > 0:
                 log_file.write('Tests errors:\n')
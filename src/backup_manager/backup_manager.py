@@ -1,15 +1,24 @@
 import base64
-import json
+import hashlib
 from http import HTTPStatus
-from json import JSONDecodeError
 from pathlib import Path
-from time import sleep
+from time import sleep, perf_counter
 
 import requests
 
 from src.constants import API_LOGIN_PATH, API_LOAD_CONFIG_COMMAND, API_SAVE_CONFIG_AS_COMMAND
+from src import compression, config_tracker, http_session, json_codec, session_cache
 from src.exceptions import DriverInitException, NmsDownloadException
+from src.json_codec import JSONDecodeError
 from src.options_providers.options_provider import OptionsProvider, API_CONNECT
+from src.transfer import DEFAULT_CHUNK_SIZE, MultipartFileStream, update_digest
+
+# Suffix of a file holding a partially downloaded backup
+_PART_SUFFIX = '.part'
+# Suffix of a file next to the part file holding the size and the date of the backup in NMS
+_PART_INFO_SUFFIX = '.info'
+# Number of attempts to download a backup, each next attempt resumes the download
+_DOWNLOAD_ATTEMPTS = 3
 
 
 class BackupManager:
@@ -18,41 +27,70 @@ class BackupManager:
         if connection_options is None:
             connection_options = OptionsProvider.get_connection('global_options', API_CONNECT)
         self._address = connection_options['address']
-        self._driver = requests
+        self._driver = http_session.create_session()
         self._cookies = None
         self._login(connection_options['username'], connection_options['password'])
 
-    def create_backup(self, backup_name, local=True):
+    def create_backup(self, backup_name, local=True, progress=None):
         """
         Create the backup of the current NMS configuration and optionally download it locally.
+        The backup is streamed to disk by chunks, an interrupted download of the same backup is resumed.
 
         :param str backup_name: the name of the backup to create
         :param bool local: if True (by default) the created backup is downloaded to nms_backups folder
+        :param callable progress: optional function called as `progress(downloaded_bytes, total_bytes)`
         :raises NmsDownloadException: if the backup cannot be downloaded locally
+        :returns str digest: SHA-256 hex digest of the downloaded backup, None if the backup is not downloaded
         """
         if not len(backup_name):
             raise ValueError('file name can not be empty')
         old_backup_data = self._get_backup_data(backup_name)
         self._save_backup(backup_name)
         if self._wait_backup(backup_name, old_backup_data) and local:
-            backup = self._download_backup(backup_name)
-            _nms_backup_size = int(self._get_backup_data(backup_name).get('size'))
-            # TODO: probably not needed, however it is better to know when the backup is not fully downloaded
-            if len(backup) < _nms_backup_size:
-                raise NmsDownloadException(f'Cannot download full backup from NMS: '
-                                           f'downloaded size {len(backup)} bytes, actual size {_nms_backup_size} bytes')
-            self._write_backup(backup_name, backup)
-
-    def apply_backup(self, backup_name, local=True):
+            return self._download_backup(backup_name, self._get_backup_data(backup_name), progress)
+        return None
+
+    def download_backup(self, backup_name, progress=None):
+        """
+        Download a backup existing in NMS to nms_backups folder without saving the current configuration.
+
+        :param str backup_name: the name of the backup to download
+        :param callable progress: optional function called as `progress(downloaded_bytes, total_bytes)`
+        :raises NmsDownloadException: if there is no such backup in NMS or it cannot be downloaded
+        :returns str digest: SHA-256 hex digest of the downloaded backup
+        """
+        backup_data = self._get_file_info(backup_name)
+        if backup_data is None:
+            raise NmsDownloadException(f'There is no backup {backup_name} in NMS')
+        return self._download_backup(backup_name, backup_data, progress)
+
+    def apply_backup(self, backup_name, local=True, progress=None):
         """
-        Apply a backup by its name
+        Apply a backup by its name. The upload is skipped if NMS already holds the same file uploaded before,
+        the reload is skipped if NMS runs the backup and it is not changed since then (see `src.config_tracker`).
 
         :param str backup_name: the name of the backup to apply
         :param bool local: if True (by default) the backup is uploaded from a local machine in the first place
+        :param callable progress: optional function called as `progress(uploaded_bytes, total_bytes)` upon uploading
         """
+        digest = None
+        upload_skipped = False
         if local:
-            self._upload_backup(backup_name)
-        self._send_backup(backup_name)
+            digest = config_tracker.get_digest(self._get_backup_dir(backup_name))
+            if config_tracker.can_skip_upload(self._address, backup_name, digest, self._get_file_info(backup_name)):
+                upload_skipped = True
+            else:
+                st_time = perf_counter()
+                self._upload_backup(backup_name, progress)
+                config_tracker.uploaded(
+                    self._address, backup_name, digest, self._get_file_info(backup_name), perf_counter() - st_time
+                )
+        reload_skipped = config_tracker.can_skip_reload(self._address, backup_name, digest, self._get_load_time())
+        if not reload_skipped:
+            st_time = perf_counter()
+            load_time = self._send_backup(backup_name)
+            config_tracker.applied(self._address, backup_name, digest, load_time, perf_counter() - st_time)
+        config_tracker.loaded(backup_name, upload_skipped, reload_skipped)
 
     def _save_backup(self, backup_name):
         result, error = self._post(
@@ -69,10 +107,25 @@ class BackupManager:
             if 'name' in backup_info and backup_name == backup_info['name']:
                 return backup_info
 
+    def _get_file_info(self, backup_name):
+        """Get the description of the backup file in NMS, None if it cannot be obtained"""
+        try:
+            return self._get_backup_data(backup_name)
+        except ValueError:
+            return None
+
+    def _get_load_time(self):
+        """Get NMS config load time, None if it cannot be obtained"""
+        try:
+            return self._get_start_time()
+        except ValueError:
+            return None
+
     def _post(self, path: str, data: dict):
+        config_tracker.note_request(self._address, path)
         resp = self._driver.post(
             self._address + path,
-            data=json.dumps(data),
+            data=json_codec.dumps(data),
             cookies=self._cookies
         )
         result = None
@@ -83,7 +136,7 @@ class BackupManager:
             error = 'Empty response body'
         else:
             try:
-                result_obj = json.loads(resp.content)
+                result_obj = json_codec.loads(resp.content)
                 if 0 == result_obj['error_code']:
                     result = result_obj['reply']
                 else:
@@ -95,6 +148,15 @@ class BackupManager:
         return result, error
 
     def _login(self, username, password):
+        # The cookies cached by another client or process are reused if the session cache is enabled
+        self._cookies = session_cache.acquire(
+            self._address,
+            username,
+            lambda: self._request_login(username, password),
+            lambda cookies: session_cache.validate_cookies(self._driver, self._address, cookies),
+        )
+
+    def _request_login(self, username, password):
         bytes_str = F"{username}:{password}".encode('ascii')
         bytes_b64 = base64.b64encode(bytes_str)
         token = bytes_b64.decode('ascii')
@@ -104,7 +166,7 @@ class BackupManager:
         resp = self._driver.get(self._address + API_LOGIN_PATH, headers=headers)
         if HTTPStatus.OK != resp.status_code:
             raise DriverInitException(resp.content)
-        self._cookies = resp.cookies
+        return resp.cookies
 
     def _wait_backup(self, backup_name, old_backup_data):
         """Wait for backup to be entirely saved in NMS"""
@@ -136,33 +198,112 @@ class BackupManager:
             sleep(0.2)
         raise ValueError('backup not created')
 
-    def _download_backup(self, backup_name):
+    def _download_backup(self, backup_name, backup_data, progress=None):
+        """
+        Download the backup to nms_backups folder by chunks. The data is written to `<backup_name>.part` file
+        which is renamed once the download is completed. If the download is interrupted, it is resumed from
+        the end of the part file. A part file left by a backup having another size or date in NMS is dropped.
+
+        :param str backup_name: the name of the backup to download
+        :param dict backup_data: the description of the backup in NMS containing its `size` and `date`
+        :param callable progress: optional function called as `progress(downloaded_bytes, total_bytes)`
+        :raises NmsDownloadException: if the backup cannot be downloaded
+        :returns str digest: SHA-256 hex digest of the backup
+        """
+        size = int(backup_data.get('size'))
+        part_path = self._get_backup_dir(backup_name + _PART_SUFFIX)
+        info_path = self._get_backup_dir(backup_name + _PART_SUFFIX + _PART_INFO_SUFFIX)
+        self._check_part(part_path, info_path, {'size': size, 'date': backup_data.get('date')})
+        for attempt in range(_DOWNLOAD_ATTEMPTS):
+            try:
+                digest = self._download_part(backup_name, part_path, size, progress)
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as exc:
+                error = exc
+        else:
+            raise NmsDownloadException(f'Cannot download backup {backup_name} from NMS: {error}')
+
+        downloaded = part_path.stat().st_size
+        if downloaded != size:
+            part_path.unlink()
+            info_path.unlink(missing_ok=True)
+            raise NmsDownloadException(f'Cannot download full backup from NMS: '
+                                       f'downloaded size {downloaded} bytes, actual size {size} bytes')
+        part_path.replace(self._get_backup_dir(backup_name))
+        info_path.unlink(missing_ok=True)
+        return digest
+
+    @staticmethod
+    def _check_part(part_path, info_path, info):
+        """
+        Private method that drops the part file if it is left by another backup and stores the description
+        of the backup being downloaded next to it. Do not call it directly.
+
+        :param Path part_path: path to the part file
+        :param Path info_path: path to the file holding the description of the backup of the part file
+        :param dict info: the size and the date of the backup in NMS
+        """
+        if part_path.exists():
+            try:
+                stored = json_codec.loads(info_path.read_bytes())
+            except (OSError, JSONDecodeError):
+                stored = None
+            if stored != info:
+                part_path.unlink()
+        info_path.write_bytes(json_codec.dumps(info))
+
+    def _download_part(self, backup_name, part_path, size, progress=None):
+        """
+        Request the backup from NMS and append the received data to the part file.
+
+        :param str backup_name: the name of the backup to download
+        :param Path part_path: path to the part file
+        :param int size: the size of the backup reported by NMS
+        :param callable progress: optional function called as `progress(downloaded_bytes, total_bytes)`
+        :returns str digest: SHA-256 hex digest of the whole part file
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if offset > size:
+            part_path.unlink()
+            offset = 0
+        # The range of an encoded reply is the range of the encoded bytes, the resumed part is requested as it is
+        headers = {'Range': f'bytes={offset}-', 'Accept-Encoding': compression.IDENTITY} if offset else None
         resp = self._driver.post(
             self._address + f'api/fs/download/nms=0/path=config&{backup_name}',
-            data=json.dumps({'filename': F"config/{backup_name}"}),
+            data=json_codec.dumps({'filename': F"config/{backup_name}"}),
             cookies=self._cookies,
+            headers=headers,
+            stream=True,
         )
-        if HTTPStatus.OK != resp.status_code:
-            error = F"{resp.status_code} : {resp.reason}"
-        elif 0 == len(resp.content):
-            error = 'Empty response body'
-        else:
-            return resp.content
-        raise ValueError(error)
-
-    # noinspection PyMethodMayBeStatic
-    def _write_backup(self, backup_name: str, backup):
-        # newline='' to handle windows system default line endings
-        with open(self._get_backup_dir(backup_name), mode='w+', newline='') as f:
-            data = backup.decode('utf-8')
-            f.write(data)
-
-    def _upload_backup(self, backup_name):
-        with open(self._get_backup_dir(backup_name), 'rb') as f:
-            files = {'config': f}
+        with resp:
+            if HTTPStatus.PARTIAL_CONTENT == resp.status_code and offset:
+                hasher = update_digest(hashlib.sha256(), part_path)
+                mode = 'ab'
+            elif HTTPStatus.OK == resp.status_code:
+                # The range is not supported, the backup is downloaded from the beginning
+                hasher = hashlib.sha256()
+                mode = 'wb'
+                offset = 0
+            else:
+                raise ValueError(F"{resp.status_code} : {resp.reason}")
+            with open(part_path, mode) as f:
+                for chunk in resp.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    offset += len(chunk)
+                    if progress is not None:
+                        progress(offset, size)
+        if 0 == offset:
+            part_path.unlink()
+            raise ValueError('Empty response body')
+        return hasher.hexdigest()
+
+    def _upload_backup(self, backup_name, progress=None):
+        with MultipartFileStream('config', self._get_backup_dir(backup_name), progress=progress) as stream:
             resp = self._driver.post(
                 self._address + 'api/fs/upload/nms=0',
-                files=files,
+                data=stream,
+                headers={'Content-Type': stream.content_type},
                 cookies=self._cookies
             )
             error = None
@@ -172,7 +313,7 @@ class BackupManager:
                 error = 'Empty response body'
             else:
                 try:
-                    result_obj = json.loads(resp.content)
+                    result_obj = json_codec.loads(resp.content)
                     if 0 != result_obj['error_code']:
                         error = result_obj['error_log']
                 except JSONDecodeError:
@@ -195,7 +336,7 @@ class BackupManager:
             try:
                 new_time = self._get_start_time()
                 if new_time and start_time != new_time:
-                    return
+                    return new_time
             except ValueError:
                 continue
         raise ValueError('Backup apply error')
@@ -215,7 +356,7 @@ class BackupManager:
                 error = 'Empty response body'
             else:
                 try:
-                    result_obj = json.loads(resp.content)
+                    result_obj = json_codec.loads(resp.content)
                     if 0 == result_obj['error_code']:
                         result = result_obj['reply']['load_time']
                     else:
@@ -238,6 +379,16 @@ class BackupManager:
         if error is not None:
             raise Exception(error)
 
+    @staticmethod
+    def get_backup_path(backup_name):
+        """
+        Get the path to a local backup
+
+        :param str backup_name: the name of the backup
+        :returns Path path: the absolute path to the backup in nms_backups folder
+        """
+        return BackupManager._get_backup_dir(backup_name)
+
     @staticmethod
     def _get_backup_dir(backup_name):
         return (Path(__file__).parent.parent / '../nms_backups' / backup_name).resolve()
@@ -0,0 +1,449 @@
+"""
+Record and replay of HTTP traffic of NMS and UHP clients.
+
+A cassette is a JSONL file, each line describes a request and its response: method, URL, body, status, headers,
+content and latency. The cassette is plugged into the HTTP sessions of `nms_api`, `NmsApiDriver`, `BackupManager`,
+`FileManager` and `UhpRequestsDriver` as a transport adapter, therefore the clients are not aware of it.
+
+- In `record` mode the requests are sent as usual, the exchanges are appended to the cassette.
+  The responses are read entirely before they are returned, streaming and chunked request bodies are buffered.
+- In `replay` mode nothing is sent. Each request is matched by its normalized key: method, host, path, sorted
+  query, and the body with JSON keys sorted and multipart boundaries masked. The recorded responses of the same key
+  are returned in the recorded order, the last one is repeated if the key is requested more times.
+  The recorded latency is optionally reproduced.
+
+The cassette must be activated before the clients create their sessions. Once the cassette is ejected, the sessions
+it has been plugged into send the requests directly:
+
+>>> cassette.use('cassettes/smoke.jsonl', cassette.RECORD)
+>>> nms_api.connect('http://10.0.0.1:8000', 'admin', '12345')
+>>> cassette.eject()
+"""
+import base64
+import hashlib
+import io
+import json
+import threading
+import weakref
+from collections import deque, namedtuple
+from datetime import timedelta
+from http.client import HTTPMessage
+from pathlib import Path
+from time import perf_counter, sleep
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+from src import json_codec
+from src.exceptions import CassetteMismatchException, InvalidOptionsException
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Cassette statistics: number of recorded exchanges, replayed responses, and requests missing in the cassette
+CassetteStats = namedtuple('CassetteStats', 'recorded played missed')
+
+# The name of the system option activating a cassette for a test run
+HTTP_CASSETTE = 'http_cassette'
+
+# Response headers not kept in the cassette as the content is stored decoded and entire
+_SKIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive')
+# Request bodies up to the size are stored in the cassette for readability, larger ones are stored as digests
+_MAX_STORED_BODY = 64 * 1024
+
+_lock = threading.Lock()
+_active = None
+# The sessions the cassettes are plugged into
+_sessions = weakref.WeakSet()
+
+
+class Cassette:
+    """
+    JSONL cassette of HTTP exchanges.
+
+    :param path: path to the cassette file, it is truncated in `record` mode
+    :param str mode: `record` or `replay`
+    :param bool replay_latency: if True the recorded latency of each response is reproduced upon replay
+    :param float latency_scale: the multiplier of the reproduced latency
+    :param bool match_host: if False the host is not a part of the request key, i.e. to replay another NMS address
+    :raises InvalidOptionsException: if the mode is unknown
+    :raises FileNotFoundError: if the cassette to replay does not exist
+    """
+
+    def __init__(self, path, mode=RECORD, replay_latency=False, latency_scale=1.0, match_host=True):
+        if mode not in (RECORD, REPLAY):
+            raise InvalidOptionsException(f'Unknown cassette mode {mode}, expected `{RECORD}` or `{REPLAY}`')
+        self.path = Path(path)
+        self.mode = mode
+        self._replay_latency = replay_latency
+        self._latency_scale = latency_scale
+        self._match_host = match_host
+        self._lock = threading.Lock()
+        self._file = None
+        self._closed = False
+        # request key -> deque of the recorded entries
+        self._entries = {}
+        self._recorded = 0
+        self._played = 0
+        self._missed = 0
+        if mode == RECORD:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'wb')
+        else:
+            self._load()
+
+    @property
+    def closed(self) -> bool:
+        """
+        True if the cassette is closed and records or replays nothing
+        """
+        return self._closed
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> CassetteStats:
+        """
+        Get the cassette statistics
+
+        :returns CassetteStats: the statistics namedtuple
+        """
+        with self._lock:
+            return CassetteStats(self._recorded, self._played, self._missed)
+
+    def get_key(self, request: requests.PreparedRequest) -> str:
+        """
+        Get the normalized key of a request. The body of the request must be bytes.
+
+        :param requests.PreparedRequest request: the request
+        :returns str key: `<METHOD> <host><path>?<sorted query> <body digest>`
+        """
+        parts = urlsplit(request.url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        host = parts.netloc if self._match_host else ''
+        body = _normalize_body(request.body or b'', request.headers.get('Content-Type') or '')
+        digest = hashlib.sha256(body).hexdigest()[:16] if body else '-'
+        return f'{request.method} {host}{parts.path or "/"}?{query} {digest}'
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, latency: float):
+        """
+        Append an exchange to the cassette
+
+        :param requests.PreparedRequest request: the sent request, its body must be bytes
+        :param requests.Response response: the received response, its content is read
+        :param float latency: the time in seconds the exchange took. Nothing is recorded if the cassette is closed.
+        """
+        body = request.body or b''
+        content = response.content or b''
+        entry = {
+            'key': self.get_key(request),
+            'method': request.method,
+            'url': request.url,
+            'body': _encode(body) if len(body) <= _MAX_STORED_BODY else None,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': [
+                [name, value] for name, value in _get_raw_headers(response) if name.lower() not in _SKIPPED_HEADERS
+            ],
+            'content': _encode(content),
+            'latency': round(latency, 6),
+        }
+        line = json_codec.dumps(entry) + b'\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            self._recorded += 1
+
+    def play(self, request: requests.PreparedRequest) -> dict:
+        """
+        Find the recorded response to a request
+
+        :param requests.PreparedRequest request: the request, its body must be bytes
+        :returns dict entry: the recorded exchange
+        :raises CassetteMismatchException: if the request is not recorded
+        """
+        key = self.get_key(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self._missed += 1
+                raise CassetteMismatchException(f'Request `{key}` ({request.url}) is not found in {self.path}')
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+            self._played += 1
+        if self._replay_latency and entry.get('latency'):
+            sleep(entry['latency'] * self._latency_scale)
+        return entry
+
+    def _load(self):
+        """
+        Private method that reads the recorded exchanges. Do not call it directly.
+        """
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json_codec.loads(line)
+                key = entry['key']
+                if not self._match_host:
+                    # The host is stripped from the recorded key: `<METHOD> <host><path>?<query> <digest>`
+                    method, address, digest = key.split(' ')
+                    key = f'{method} {address[address.find("/"):]} {digest}'
+                self._entries.setdefault(key, deque()).append(entry)
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    Transport adapter recording the exchanges of the wrapped adapter or replaying them from the cassette.
+
+    :param Cassette cassette: the cassette
+    :param BaseAdapter adapter: the adapter sending the requests in `record` mode, a default one if None
+    """
+
+    def __init__(self, cassette: Cassette, adapter: BaseAdapter = None):
+        super().__init__()
+        self.cassette = cassette
+        self._adapter = adapter if adapter is not None else HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.cassette.closed:
+            return self._adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                      proxies=proxies)
+        _buffer_body(request)
+        if self.cassette.mode == REPLAY:
+            return self._build(request, self.cassette.play(request))
+        st_time = perf_counter()
+        response = self._adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                      proxies=proxies)
+        # Reading the content makes the latency include the whole transfer
+        response.content
+        self.cassette.record(request, response, perf_counter() - st_time)
+        return response
+
+    def close(self):
+        self._adapter.close()
+        super().close()
+
+    def _build(self, request, entry: dict) -> requests.Response:
+        """
+        Private method that builds a response from a recorded exchange. Do not call it directly.
+
+        :param requests.PreparedRequest request: the request
+        :param dict entry: the recorded exchange
+        :returns requests.Response response: the response with the recorded status, headers and content
+        """
+        content = _decode(entry['content'])
+        message = HTTPMessage()
+        for name, value in entry['headers']:
+            message[name] = value
+        message['Content-Length'] = str(len(content))
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=list(message.items()),
+            status=entry['status'],
+            reason=entry['reason'],
+            preload_content=False,
+            decode_content=False,
+            original_response=_RecordedResponse(message),
+        )
+        response = self.build_response(request, raw)
+        response.elapsed = timedelta(seconds=entry.get('latency') or 0)
+        return response
+
+
+class _RecordedResponse:
+    """The stand-in of `http.client.HTTPResponse` used by `requests` to extract the cookies"""
+
+    def __init__(self, message: HTTPMessage):
+        self.msg = message
+
+    def info(self):
+        return self.msg
+
+    def isclosed(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def use(path, mode=RECORD, replay_latency=False, latency_scale=1.0, match_host=True) -> Cassette:
+    """
+    Activate a cassette for the HTTP sessions created from now on. The previous cassette is ejected,
+    the sessions it has been plugged into send the requests directly.
+
+    :param path: path to the cassette file
+    :param str mode: `record` or `replay`
+    :param bool replay_latency: if True the recorded latency is reproduced upon replay
+    :param float latency_scale: the multiplier of the reproduced latency
+    :param bool match_host: if False the host is not a part of the request key
+    :returns Cassette cassette: the activated cassette
+    """
+    global _active
+    cassette = Cassette(path, mode, replay_latency, latency_scale, match_host)
+    with _lock:
+        previous, _active = _active, cassette
+    if previous is not None:
+        previous.close()
+        _unmount(previous)
+    return cassette
+
+
+def use_options(options):
+    """
+    Activate a cassette described by the system option `http_cassette`
+
+    :param dict options: None or the keyword arguments of `use`, i.e. `{'path': 'cassettes/run.jsonl', 'mode': 'replay'}`
+    :returns: the activated cassette, None if the options are empty
+    """
+    if not options:
+        return None
+    return use(**options)
+
+
+def eject():
+    """
+    Deactivate the current cassette. The sessions created while it has been active send the requests directly.
+    """
+    global _active
+    with _lock:
+        cassette, _active = _active, None
+    if cassette is not None:
+        cassette.close()
+        _unmount(cassette)
+
+
+def get_active():
+    """
+    Get the active cassette
+
+    :returns: the active `Cassette`, None if there is no active cassette
+    """
+    return _active
+
+
+def mount(session: requests.Session) -> requests.Session:
+    """
+    Plug the active cassette into a session keeping its adapters for recording. Nothing is done if there is
+    no active cassette.
+
+    :param requests.Session session: the session
+    :returns requests.Session session: the passed session
+    """
+    cassette = _active
+    if cassette is not None:
+        for prefix in ('http://', 'https://'):
+            adapter = session.adapters.get(prefix)
+            if not isinstance(adapter, CassetteAdapter):
+                session.mount(prefix, CassetteAdapter(cassette, adapter))
+        with _lock:
+            _sessions.add(session)
+    return session
+
+
+def _unmount(cassette: Cassette):
+    """
+    Private function that restores the wrapped adapters of the sessions a cassette is plugged into.
+    Do not call it directly.
+
+    :param Cassette cassette: the closed cassette
+    """
+    with _lock:
+        sessions = list(_sessions)
+    for session in sessions:
+        for prefix, adapter in list(session.adapters.items()):
+            if isinstance(adapter, CassetteAdapter) and adapter.cassette is cassette:
+                session.adapters[prefix] = adapter._adapter
+
+
+def create_session() -> requests.Session:
+    """
+    Create a new HTTP session with the active cassette plugged in
+
+    :returns requests.Session session: the session
+    """
+    return mount(requests.Session())
+
+
+def _buffer_body(request: requests.PreparedRequest):
+    """
+    Private function that reads a streamed or chunked request body into bytes. Do not call it directly.
+
+    :param requests.PreparedRequest request: the request, its body is replaced by bytes
+    """
+    body = request.body
+    if body is None or isinstance(body, bytes):
+        return
+    if isinstance(body, str):
+        request.body = body.encode('utf-8')
+    elif hasattr(body, 'read'):
+        request.body = body.read()
+    else:
+        request.body = b''.join(chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in body)
+    request.headers.pop('Transfer-Encoding', None)
+    request.headers['Content-Length'] = str(len(request.body))
+
+
+def _normalize_body(body: bytes, content_type: str) -> bytes:
+    """
+    Private function that makes equal requests have equal bodies. Do not call it directly.
+
+    :param bytes body: the request body
+    :param str content_type: the request content type
+    :returns bytes body: JSON with sorted keys, multipart body with masked boundary, otherwise the body as it is
+    """
+    if 'boundary=' in content_type:
+        boundary = content_type.split('boundary=', 1)[1].split(';')[0].strip('"')
+        return body.replace(boundary.encode('latin-1'), b'BOUNDARY')
+    if body[:1] in (b'{', b'['):
+        try:
+            return json.dumps(json_codec.loads(body), sort_keys=True, ensure_ascii=False).encode('utf-8')
+        except (json_codec.JSONDecodeError, UnicodeDecodeError):
+            pass
+    return body
+
+
+def _get_raw_headers(response: requests.Response):
+    """
+    Private function that returns the response headers keeping the repeated ones, i.e. `Set-Cookie`.
+    Do not call it directly.
+
+    :param requests.Response response: the response
+    :returns: iterable of (name, value) pairs
+    """
+    headers = getattr(response.raw, 'headers', None)
+    if headers is not None and hasattr(headers, 'iteritems'):
+        return headers.iteritems()
+    return response.headers.items()
+
+
+def _encode(data: bytes):
+    """
+    Private function that makes bytes JSON serializable. Do not call it directly.
+
+    :param bytes data: the data
+    :returns: a string if the data is UTF-8 text, otherwise `{'base64': <encoded data>}`
+    """
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(data).decode('ascii')}
+
+
+def _decode(data) -> bytes:
+    """
+    Private function that restores the data encoded by `_encode`. Do not call it directly.
+
+    :param data: a string or `{'base64': <encoded data>}`
+    :returns bytes data: the data
+    """
+    if isinstance(data, dict):
+        return base64.b64decode(data['base64'])
+    return (data or '').encode('utf-8')
@@ -0,0 +1,188 @@
+"""
+Compressed transfer of NMS replies.
+
+The HTTP sessions of the NMS clients (see `src.http_session`) advertise the content encodings the client can decode:
+gzip and deflate, and brotli if `brotli` or `brotlicffi` package is installed. The replies are decoded transparently
+by `urllib3`. Requests resuming a download by `Range` ask for the identity encoding, as the range of an encoded
+reply is the range of the encoded bytes.
+
+The comparison mode requests the same paths with the identity and the compressed encodings and reports the bytes
+received over the wire and the latency per endpoint class:
+
+>>> rows = compression.compare(session, 'http://10.0.0.1:8000/', ['api/list/get/nms=0/list_items=station'],
+...                            cookies=cookies)
+>>> print(compression.format_comparison(rows))
+api/list/get: identity 5123.4 KiB 1830.2 ms, gzip, deflate 402.1 KiB 310.5 ms, 12.7x smaller, 5.9x faster
+"""
+import gzip
+import zlib
+from collections import namedtuple
+from statistics import median
+from time import perf_counter
+
+from urllib3.response import brotli
+
+from src import latency
+
+GZIP = 'gzip'
+DEFLATE = 'deflate'
+BROTLI = 'br'
+IDENTITY = 'identity'
+
+# Measured transfer of a path: bytes received over the wire, decoded bytes, and the median latency in seconds
+TransferStats = namedtuple('TransferStats', 'endpoint encoding wire_bytes content_bytes latency')
+
+# The name of the system option enabling compressed transfer, True by default
+HTTP_COMPRESSION = 'http_compression'
+
+# Replies shorter than the size are not worth compressing
+MIN_COMPRESSED_SIZE = 1024
+
+_enabled = True
+
+
+def get_encodings() -> list:
+    """
+    Get the content encodings the client can decode in the order of preference
+
+    :returns list encodings: `br` (if brotli is installed), `gzip`, `deflate`
+    """
+    encodings = [GZIP, DEFLATE]
+    if brotli is not None:
+        encodings.insert(0, BROTLI)
+    return encodings
+
+
+def set_enabled(enabled: bool):
+    """
+    Enable or disable compressed transfer for the sessions created from now on
+
+    :param bool enabled: if False the sessions ask for the identity encoding
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def get_accept_encoding(enabled: bool = None) -> str:
+    """
+    Get the value of `Accept-Encoding` header
+
+    :param bool enabled: if None the module setting is used
+    :returns str accept_encoding: i.e. `gzip, deflate` or `identity`
+    """
+    if enabled is None:
+        enabled = _enabled
+    return ', '.join(get_encodings()) if enabled else IDENTITY
+
+
+def apply(session):
+    """
+    Set `Accept-Encoding` header of a session according to the module setting
+
+    :param requests.Session session: the session
+    :returns requests.Session session: the passed session
+    """
+    session.headers['Accept-Encoding'] = get_accept_encoding()
+    return session
+
+
+def encode(content: bytes, accept_encoding: str):
+    """
+    Compress a reply by the most preferred encoding accepted by the client
+
+    :param bytes content: the reply
+    :param str accept_encoding: the value of the request `Accept-Encoding` header
+    :returns tuple: (encoding, compressed content), (None, content) if the content is not compressed
+    """
+    if len(content) < MIN_COMPRESSED_SIZE or not accept_encoding:
+        return None, content
+    accepted = {value.split(';')[0].strip().lower() for value in accept_encoding.split(',')}
+    if BROTLI in accepted and brotli is not None:
+        return BROTLI, brotli.compress(content)
+    if GZIP in accepted:
+        return GZIP, gzip.compress(content, compresslevel=6, mtime=0)
+    if DEFLATE in accepted:
+        return DEFLATE, zlib.compress(content, 6)
+    return None, content
+
+
+def get_wire_bytes(response) -> int:
+    """
+    Get the number of the reply bytes received over the wire. The content of the response must be read.
+
+    :param requests.Response response: the response
+    :returns int wire_bytes: the size of the encoded body, the size of the content if it is not known
+    """
+    tell = getattr(response.raw, 'tell', None)
+    wire_bytes = tell() if tell is not None else 0
+    return wire_bytes or len(response.content)
+
+
+def measure(session, method: str, url: str, enabled: bool, repeat: int = 3, **kwargs) -> TransferStats:
+    """
+    Measure the transfer of a reply
+
+    :param requests.Session session: the session sending the requests
+    :param str method: `GET` or `POST`
+    :param str url: the URL
+    :param bool enabled: if True the compressed encodings are accepted, otherwise the identity one
+    :param int repeat: the number of requests, the median latency is reported
+    :param kwargs: the other arguments of `session.request`, i.e. `cookies` or `json`
+    :returns TransferStats stats: the measured transfer of the last request
+    """
+    headers = {**kwargs.pop('headers', {}), 'Accept-Encoding': get_accept_encoding(enabled)}
+    latencies = []
+    for _ in range(repeat):
+        st_time = perf_counter()
+        response = session.request(method, url, headers=headers, **kwargs)
+        content = response.content
+        latencies.append(perf_counter() - st_time)
+    return TransferStats(
+        latency.get_endpoint(url), headers['Accept-Encoding'], get_wire_bytes(response), len(content),
+        median(latencies)
+    )
+
+
+def compare(session, address: str, paths, method: str = 'GET', repeat: int = 3, **kwargs) -> list:
+    """
+    Compare the transfer of the replies with and without compression
+
+    :param requests.Session session: the session sending the requests
+    :param str address: NMS address ending by slash, i.e. `http://10.0.0.1:8000/`
+    :param paths: iterable of the requested paths, i.e. `api/list/get/nms=0/list_items=station`
+    :param str method: `GET` or `POST`
+    :param int repeat: the number of requests of each path in each mode
+    :param kwargs: the other arguments of `session.request`, i.e. `cookies`
+    :returns list rows: (identity TransferStats, compressed TransferStats) tuples
+    """
+    rows = []
+    for path in paths:
+        url = address + path
+        rows.append((
+            measure(session, method, url, False, repeat, **kwargs),
+            measure(session, method, url, True, repeat, **kwargs),
+        ))
+    return rows
+
+
+def format_comparison(rows) -> str:
+    """
+    Get a human readable table of the comparison
+
+    :param rows: (identity TransferStats, compressed TransferStats) tuples returned by `compare`
+    :returns str table: a line per compared path
+    """
+    lines = []
+    for plain, compressed in rows:
+        lines.append(
+            f'{plain.endpoint}: '
+            f'{plain.encoding} {plain.wire_bytes / 1024:.1f} KiB {plain.latency * 1000:.1f} ms, '
+            f'{compressed.encoding} {compressed.wire_bytes / 1024:.1f} KiB {compressed.latency * 1000:.1f} ms, '
+            f'{plain.wire_bytes / max(compressed.wire_bytes, 1):.1f}x smaller, '
+            f'{plain.latency / max(compressed.latency, 1e-9):.1f}x faster'
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,247 @@
+"""
+Adaptive limit of the requests sent to NMS at the same time.
+
+The limiter follows AIMD (additive increase, multiplicative decrease) with a latency gradient. The requests are
+grouped into rounds of `limit` completed requests. After a round in which the limit has been reached the limit grows
+by one, unless the round error rate exceeds `max_error_rate` or the mean latency exceeds `latency_tolerance` times
+the no-load latency; then the limit shrinks in proportion to the latency growth, at most by `backoff`.
+The no-load latency is kept per endpoint class, i.e. `api/list/get`, as the requests of different classes take
+different time. It is the min latency of the endpoint, it moves up only in the rounds the client does not load NMS,
+i.e. the limit is not reached or it is at its min.
+A timeout, a connection error or a 5xx reply shrinks the limit by `backoff` at once. The requests started before
+a decrease do not shrink the limit again, therefore a burst of failures halves the limit once.
+
+The limit settles at the concurrency NMS sustains without queueing the requests:
+
+>>> client.enable_adaptive_concurrency(initial_limit=4, max_limit=64)
+>>> client.update_many({f'station:{row}': {'enable': 'OFF'} for row in range(10000)})
+>>> client.get_concurrency_limiter().get_limit()
+12
+>>> client.get_concurrency_limiter().get_history()[-1]
+LimitChange(time=41.2, limit=12, reason='latency', latency=0.031, error_rate=0.0)
+"""
+import threading
+from collections import deque, namedtuple
+from time import monotonic, perf_counter
+
+from src.exceptions import InvalidOptionsException
+
+# Outcomes of the requests: a reply, an NMS error reply, and a timeout, a connection error or a 5xx reply
+SUCCESS = 'success'
+ERROR = 'error'
+DROP = 'drop'
+
+# Reasons of the limit changes
+INCREASE = 'increase'
+LATENCY = 'latency'
+ERRORS = 'errors'
+
+# Change of the limit: seconds since the limiter creation, the new limit, the reason (`increase`, `latency`, `errors`
+# or `drop`), and the mean latency in seconds and the error rate of the round
+LimitChange = namedtuple('LimitChange', 'time limit reason latency error_rate')
+
+# Limiter statistics: the current limit, requests in flight, completed requests, errors and drops,
+# and requests that waited for a free slot
+LimiterStats = namedtuple('LimiterStats', 'limit in_flight requests errors drops waits')
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_BACKOFF = 0.5
+DEFAULT_LATENCY_TOLERANCE = 1.5
+DEFAULT_MAX_ERROR_RATE = 0.1
+DEFAULT_HISTORY_SIZE = 1000
+# Share of the gap the no-load latency estimate moves up per round towards the round min latency
+_BASELINE_DRIFT = 0.1
+# Endpoint class of the requests released without it
+_DEFAULT_ENDPOINT = ''
+
+# A request holding a slot: the time it is started at and the number of the limit decreases before its start
+_Slot = namedtuple('_Slot', 'start epoch')
+
+
+class AdaptiveLimiter:
+    """
+    Thread-safe adaptive limit of concurrent requests.
+
+    :param int initial_limit: the limit before any request is completed
+    :param int min_limit: the limit never goes below the value
+    :param int max_limit: the limit never goes above the value
+    :param float backoff: the factor the limit is multiplied by upon a drop, from 0 to 1
+    :param float latency_tolerance: the ratio of the round mean latency to the no-load latency above which
+                                    the limit shrinks
+    :param float max_error_rate: the share of the NMS error replies in a round above which the limit shrinks
+    :param int history_size: the number of the limit changes kept
+    :raises InvalidOptionsException: if the passed parameters are invalid
+    """
+
+    def __init__(
+            self,
+            initial_limit=DEFAULT_INITIAL_LIMIT,
+            min_limit=DEFAULT_MIN_LIMIT,
+            max_limit=DEFAULT_MAX_LIMIT,
+            backoff=DEFAULT_BACKOFF,
+            latency_tolerance=DEFAULT_LATENCY_TOLERANCE,
+            max_error_rate=DEFAULT_MAX_ERROR_RATE,
+            history_size=DEFAULT_HISTORY_SIZE,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise InvalidOptionsException('Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        if not 0 < backoff < 1:
+            raise InvalidOptionsException('Backoff must be between 0 and 1')
+        if latency_tolerance <= 1:
+            raise InvalidOptionsException('Latency tolerance must be greater than 1')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._backoff = backoff
+        self._latency_tolerance = latency_tolerance
+        self._max_error_rate = max_error_rate
+        self._condition = threading.Condition()
+        self._created = monotonic()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        # Incremented upon each decrease, the requests started before it do not shrink the limit again
+        self._epoch = 0
+        # The estimates of the latency of a request to not loaded NMS per endpoint class
+        self._baselines = {}
+        self._history = deque(maxlen=history_size)
+        self._requests = 0
+        self._errors = 0
+        self._drops = 0
+        self._waits = 0
+        self._reset_round()
+
+    def acquire(self) -> _Slot:
+        """
+        Wait until the number of requests in flight is below the limit and take a slot
+
+        :returns: the slot to pass to `release`
+        """
+        with self._condition:
+            if self._in_flight >= self.get_limit():
+                self._waits += 1
+                while self._in_flight >= self.get_limit():
+                    self._condition.wait()
+            self._in_flight += 1
+            if self._in_flight >= self.get_limit():
+                self._round_saturated = True
+            return _Slot(perf_counter(), self._epoch)
+
+    def release(self, slot: _Slot, outcome: str = SUCCESS, latency: float = None, endpoint: str = None):
+        """
+        Free a slot and adjust the limit according to the outcome of the request
+
+        :param slot: the slot returned by `acquire`
+        :param str outcome: `SUCCESS`, `ERROR` for NMS error replies, or `DROP` for timeouts, connection errors
+                            and 5xx replies
+        :param float latency: the latency of the request in seconds, the time since `acquire` if None
+        :param str endpoint: the endpoint class of the request (see `src.latency.get_endpoint`), the latency is
+                             compared to the no-load latency of the class
+        """
+        if latency is None:
+            latency = perf_counter() - slot.start
+        with self._condition:
+            self._in_flight -= 1
+            self._requests += 1
+            if outcome == DROP:
+                self._drops += 1
+                # The limit is shrunk once per a burst of drops
+                if slot.epoch == self._epoch:
+                    self._decrease(self._backoff, DROP, latency, 1.0)
+            else:
+                self._on_completed(outcome, latency, _DEFAULT_ENDPOINT if endpoint is None else endpoint)
+            self._condition.notify_all()
+
+    def get_limit(self) -> int:
+        """
+        Get the current limit
+
+        :returns int limit: the number of requests allowed in flight
+        """
+        return int(self._limit)
+
+    def get_history(self) -> list:
+        """
+        Get the recent changes of the limit
+
+        :returns list history: `LimitChange` namedtuples in chronological order
+        """
+        with self._condition:
+            return list(self._history)
+
+    def get_stats(self) -> LimiterStats:
+        """
+        Get the limiter statistics
+
+        :returns LimiterStats: the statistics namedtuple
+        """
+        with self._condition:
+            return LimiterStats(self.get_limit(), self._in_flight, self._requests, self._errors, self._drops,
+                                self._waits)
+
+    def _on_completed(self, outcome: str, latency: float, endpoint: str):
+        """
+        Private method that accounts a completed request, the condition lock must be held. Do not call it directly.
+        """
+        if outcome == ERROR:
+            self._errors += 1
+            self._round_errors += 1
+        else:
+            baseline = self._baselines.get(endpoint)
+            self._baselines[endpoint] = latency if baseline is None else min(baseline, latency)
+            self._round_min[endpoint] = min(self._round_min.get(endpoint, latency), latency)
+        self._round_requests += 1
+        self._round_latency += latency
+        # The latency relative to the no-load latency of the endpoint
+        baseline = self._baselines.get(endpoint)
+        self._round_ratio += latency / baseline if baseline else 1.0
+        if self._round_requests < self.get_limit():
+            return
+        mean_latency = self._round_latency / self._round_requests
+        mean_ratio = self._round_ratio / self._round_requests
+        error_rate = self._round_errors / self._round_requests
+        if error_rate > self._max_error_rate:
+            self._decrease(self._backoff, ERRORS, mean_latency, error_rate)
+        elif mean_ratio > self._latency_tolerance:
+            factor = max(self._backoff, self._latency_tolerance / mean_ratio)
+            self._decrease(factor, LATENCY, mean_latency, error_rate)
+        else:
+            # The no-load latency follows NMS getting slower regardless of the load. The latency of the rounds
+            # loading NMS grows with the limit, they do not move it.
+            if not self._round_saturated or self.get_limit() <= self.min_limit:
+                for endpoint, round_min in self._round_min.items():
+                    if round_min > self._baselines[endpoint]:
+                        self._baselines[endpoint] += (round_min - self._baselines[endpoint]) * _BASELINE_DRIFT
+            if self._round_saturated:
+                self._set_limit(self._limit + 1, INCREASE, mean_latency, error_rate)
+            self._reset_round()
+
+    def _decrease(self, factor: float, reason: str, latency: float, error_rate: float):
+        """
+        Private method that shrinks the limit and starts a new round, the condition lock must be held.
+        Do not call it directly.
+        """
+        self._epoch += 1
+        self._set_limit(self._limit * factor, reason, latency, error_rate)
+        self._reset_round()
+
+    def _set_limit(self, limit: float, reason: str, latency: float, error_rate: float):
+        """
+        Private method that sets the limit within the bounds and records the change. Do not call it directly.
+        """
+        limit = min(max(limit, self.min_limit), self.max_limit)
+        changed = int(limit) != self.get_limit()
+        self._limit = limit
+        if changed:
+            self._history.append(LimitChange(
+                round(monotonic() - self._created, 3), self.get_limit(), reason, round(latency, 6),
+                round(error_rate, 3)
+            ))
+
+    def _reset_round(self):
+        self._round_requests = 0
+        self._round_errors = 0
+        self._round_latency = 0.0
+        self._round_ratio = 0.0
+        self._round_min = {}
+        self._round_saturated = self._in_flight >= self.get_limit()
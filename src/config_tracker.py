@@ -0,0 +1,243 @@
+"""
+Tracker of the configs uploaded to and applied by NMS.
+
+Most test cases load the same config in `set_up_class`. The tracker records the digest of each uploaded config
+along with the size and the date of the file in NMS, and the config applied last along with NMS `load_time`.
+
+- The upload is skipped if NMS holds the file uploaded by the tracked clients and the local file is not changed.
+- The reload is skipped if reload skipping is enabled, the same config is applied last, NMS `load_time`
+  is not changed, and no writes have been issued to NMS since then by `nms_api`, `NmsApiDriver`, `NmsWebDriver`,
+  `BackupManager` and `nms_api_async`. The changes made by other means, i.e. by Selenium directly or another
+  process, cannot be detected, therefore reload skipping is disabled by default.
+
+>>> config_tracker.set_reload_skip(True)
+>>> backup.apply_backup('default_config.txt')  # the config is uploaded and applied
+>>> backup.apply_backup('default_config.txt')  # nothing is sent to NMS
+>>> config_tracker.get_stats()
+ConfigLoadStats(loads=2, uploads_skipped=1, reloads_skipped=1, time_saved=6.2)
+"""
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from src.transfer import file_digest
+
+# Config loads statistics: number of loads, skipped uploads, skipped reloads, and the estimated time saved in seconds
+ConfigLoadStats = namedtuple('ConfigLoadStats', 'loads uploads_skipped reloads_skipped time_saved')
+
+# The name of the system option enabling reload skipping
+SKIP_CONFIG_RELOAD = 'skip_config_reload'
+
+# Requests starting with these paths can change the NMS config
+_WRITE_PATHS = ('api/object/write/', 'api/object/delete/', 'api/form/write/')
+
+_lock = threading.Lock()
+_reload_skip = False
+# NMS address -> {config name -> (digest, size, date)} of the files uploaded by the tracked clients
+_uploaded = {}
+# NMS address -> (config name, digest, load_time) of the config applied last
+_applied = {}
+# NMS addresses written since the last applied config
+_dirty = set()
+# Local config path -> (mtime_ns, size, digest)
+_digests = {}
+# Measured durations in seconds of the last upload and reload of each config
+_upload_time = {}
+_reload_time = {}
+_loads = 0
+_uploads_skipped = 0
+_reloads_skipped = 0
+_time_saved = 0.0
+
+
+def set_reload_skip(enabled: bool):
+    """
+    Enable or disable skipping of the redundant config reloads
+
+    :param bool enabled: if True the reload of the config applied last is skipped if the config is not changed
+    """
+    global _reload_skip
+    _reload_skip = bool(enabled)
+
+
+def is_reload_skip_enabled() -> bool:
+    """
+    Check if skipping of the redundant config reloads is enabled
+
+    :returns bool: True if enabled
+    """
+    return _reload_skip
+
+
+def note_request(address: str, path: str):
+    """
+    Mark the NMS config as changed if the request can change it
+
+    :param str address: NMS address, i.e. `http://10.0.0.1:8000/`
+    :param str path: the path of the request relative to the address or the full URL
+    """
+    if address and path.startswith(address):
+        path = path[len(address):]
+    if path.startswith(_WRITE_PATHS):
+        mark_dirty(address)
+
+
+def mark_dirty(address: str = None):
+    """
+    Mark the NMS config as changed
+
+    :param str address: NMS address, if None the configs of all NMS are marked as changed
+    """
+    with _lock:
+        if address is None:
+            _dirty.update(_applied.keys())
+        else:
+            _dirty.add(_get_key(address))
+
+
+def get_digest(path) -> str:
+    """
+    Get SHA-256 digest of a local config. The digest is cached until the file modification time or size changes.
+
+    :param path: path to the config file
+    :returns str digest: hex digest of the file
+    """
+    path = Path(path)
+    stat = path.stat()
+    with _lock:
+        cached = _digests.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = file_digest(path)
+    with _lock:
+        _digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def can_skip_upload(address: str, config_name: str, digest: str, file_info) -> bool:
+    """
+    Check if NMS holds the same config file as the local one
+
+    :param str address: NMS address
+    :param str config_name: the name of the config
+    :param str digest: the digest of the local config
+    :param dict file_info: the description of the file in NMS containing `size` and `date`, None if there is no file
+    :returns bool: True if the upload can be skipped
+    """
+    if file_info is None:
+        return False
+    with _lock:
+        uploaded = _uploaded.get(_get_key(address), {}).get(config_name)
+    return uploaded is not None and uploaded == (digest, file_info.get('size'), file_info.get('date'))
+
+
+def uploaded(address: str, config_name: str, digest: str, file_info, duration: float):
+    """
+    Record the uploaded config
+
+    :param str address: NMS address
+    :param str config_name: the name of the config
+    :param str digest: the digest of the uploaded config
+    :param dict file_info: the description of the file in NMS containing `size` and `date`, None if it is unknown
+    :param float duration: the time in seconds the upload took
+    """
+    with _lock:
+        files = _uploaded.setdefault(_get_key(address), {})
+        if file_info is None:
+            files.pop(config_name, None)
+        else:
+            files[config_name] = (digest, file_info.get('size'), file_info.get('date'))
+        _upload_time[config_name] = duration
+
+
+def can_skip_reload(address: str, config_name: str, digest: str, load_time) -> bool:
+    """
+    Check if NMS runs the config and the config is not changed since it has been applied
+
+    :param str address: NMS address
+    :param str config_name: the name of the config
+    :param str digest: the digest of the config
+    :param load_time: the current NMS `load_time`
+    :returns bool: True if reload skipping is enabled and the reload can be skipped
+    """
+    if not _reload_skip or load_time is None:
+        return False
+    key = _get_key(address)
+    with _lock:
+        return key not in _dirty and _applied.get(key) == (config_name, digest, load_time)
+
+
+def applied(address: str, config_name: str, digest: str, load_time, duration: float):
+    """
+    Record the applied config
+
+    :param str address: NMS address
+    :param str config_name: the name of the config
+    :param str digest: the digest of the config
+    :param load_time: NMS `load_time` after the config has been applied, None if it is unknown
+    :param float duration: the time in seconds the reload took
+    """
+    key = _get_key(address)
+    with _lock:
+        if load_time is None:
+            _applied.pop(key, None)
+        else:
+            _applied[key] = (config_name, digest, load_time)
+        _dirty.discard(key)
+        _reload_time[config_name] = duration
+
+
+def loaded(config_name: str, upload_skipped: bool, reload_skipped: bool):
+    """
+    Count the config load and the time saved by the skipped steps
+
+    :param str config_name: the name of the config
+    :param bool upload_skipped: True if the upload has been skipped
+    :param bool reload_skipped: True if the reload has been skipped
+    """
+    global _loads, _uploads_skipped, _reloads_skipped, _time_saved
+    with _lock:
+        _loads += 1
+        if upload_skipped:
+            _uploads_skipped += 1
+            _time_saved += _upload_time.get(config_name, 0.0)
+        if reload_skipped:
+            _reloads_skipped += 1
+            _time_saved += _reload_time.get(config_name, 0.0)
+
+
+def get_stats() -> ConfigLoadStats:
+    """
+    Get config loads statistics. The time saved is estimated by the measured durations of the skipped steps.
+
+    :returns ConfigLoadStats: the statistics namedtuple
+    """
+    with _lock:
+        return ConfigLoadStats(_loads, _uploads_skipped, _reloads_skipped, round(_time_saved, 3))
+
+
+def reset():
+    """
+    Forget the uploaded and applied configs and the statistics
+    """
+    global _loads, _uploads_skipped, _reloads_skipped, _time_saved
+    with _lock:
+        _uploaded.clear()
+        _applied.clear()
+        _dirty.clear()
+        _upload_time.clear()
+        _reload_time.clear()
+        _loads = 0
+        _uploads_skipped = 0
+        _reloads_skipped = 0
+        _time_saved = 0.0
+
+
+def _get_key(address: str) -> str:
+    """
+    Private function that normalizes NMS address. Do not call it directly.
+
+    :param str address: NMS address
+    :returns str key: the address without trailing slashes
+    """
+    return (address or '').rstrip('/')
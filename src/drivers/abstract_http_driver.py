@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import Optional
 
 API = 1
@@ -85,6 +86,14 @@ class AbstractHttpDriver(ABC):
         self.logout()
         self.login(user, password)
 
+    @contextmanager
+    def snapshot(self):
+        """
+        Read all the values within the context from a single loaded reply.
+        Drivers that do not re-read values on each `get_value` call do nothing here.
+        """
+        yield self
+
     def get_realtime(self, command):
         pass
 
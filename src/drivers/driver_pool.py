@@ -0,0 +1,270 @@
+"""
+Pool of NMS drivers shared by concurrent test code.
+
+Drivers are leased and returned. The pool keeps the returned drivers per driver type, NMS address and credentials,
+and hands out the most recently returned one first. At most `max_size` drivers of a type exist per NMS address
+and credentials; a lease waits for a returned driver once the limit is reached. A driver idle for longer than
+`check_after` seconds is checked before it is leased: an API driver must have its cookies accepted by NMS,
+a web driver must have its browser responding. The drivers idle for longer than `max_idle` seconds are closed.
+
+>>> with DriversProvider.leased_driver(OptionsProvider.get_connection()) as driver:
+...     driver.set_path('api/object/get/nms=0')
+...     driver.get_value('name')
+'UHP NMS'
+>>> DriversProvider.get_pool_stats()
+PoolStats(leases=1, creations=1, reuses=0, reuse_ratio=0.0, waits=0, wait_time=0.0, discards=0, evictions=0, ...)
+"""
+import threading
+from collections import deque, namedtuple
+from time import monotonic
+
+from src import session_cache
+from src.drivers.abstract_http_driver import API
+from src.exceptions import DriverInitException, DriverPoolTimeoutException
+
+# Pool statistics: number of leases, created drivers, leases of returned drivers and their ratio, leases that waited
+# for a returned driver and the total wait time in seconds, drivers discarded by health checks or by the users,
+# drivers closed as idle, existing drivers, and idle drivers
+PoolStats = namedtuple(
+    'PoolStats', 'leases creations reuses reuse_ratio waits wait_time discards evictions size idle'
+)
+
+# The default max number of drivers per driver type, NMS address and credentials
+DEFAULT_MAX_SIZE = {API: 8}
+DEFAULT_MAX_SIZE_OTHER = 2
+DEFAULT_MAX_IDLE = 300
+DEFAULT_CHECK_AFTER = 30
+
+
+class DriverPool:
+    """
+    Thread-safe pool of drivers.
+
+    :param callable create: function getting the driver options and returning a new driver
+    :param max_size: max number of drivers per driver type, NMS address and credentials: either an int, or a dict
+                     {driver type -> int}, the types absent in the dict are limited by `DEFAULT_MAX_SIZE_OTHER`
+    :param float max_idle: seconds after which an idle driver is closed
+    :param float check_after: seconds of idling after which a driver is checked before it is leased
+    """
+
+    def __init__(self, create, max_size=None, max_idle=DEFAULT_MAX_IDLE, check_after=DEFAULT_CHECK_AFTER):
+        self._create = create
+        self._max_size = DEFAULT_MAX_SIZE if max_size is None else max_size
+        self._max_idle = max_idle
+        self._check_after = check_after
+        self._condition = threading.Condition()
+        # key -> deque of (driver, returned at) in the order of return
+        self._idle = {}
+        # key -> number of existing drivers, leased and idle
+        self._sizes = {}
+        # id of a leased driver -> (key, driver)
+        self._leased = {}
+        self._leases = 0
+        self._creations = 0
+        self._reuses = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._discards = 0
+        self._evictions = 0
+
+    def lease(self, driver_options: dict, timeout: float = None):
+        """
+        Lease a driver, it must be returned by `release`
+
+        :param dict driver_options: the driver options, i.e. `OptionsProvider.get_connection()`
+        :param float timeout: max seconds to wait for a returned driver if the pool is full, None to wait forever
+        :returns AbstractHttpDriver driver: an idle driver passed the health check or a new one
+        :raises DriverPoolTimeoutException: if no driver is returned within the timeout
+        :raises DriverInitException: if a new driver cannot be created
+        """
+        key = _get_key(driver_options)
+        max_size = self._get_max_size(key[0])
+        st_time = monotonic()
+        waited = False
+        while True:
+            with self._condition:
+                evicted = self._evict_idle()
+                idle = self._idle.get(key)
+                if idle:
+                    driver, returned_at = idle.pop()
+                    create = False
+                elif self._sizes.get(key, 0) < max_size:
+                    # The slot is reserved while the driver is created outside of the lock
+                    self._sizes[key] = self._sizes.get(key, 0) + 1
+                    create = True
+                else:
+                    remaining = None if timeout is None else timeout - (monotonic() - st_time)
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolTimeoutException(
+                            f'No {key[0]} driver of {key[1]} is returned to the pool in {timeout} seconds'
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+                    continue
+            for evicted_driver in evicted:
+                _close(evicted_driver)
+            if create:
+                driver = self._create_driver(key, driver_options)
+            elif monotonic() - returned_at > self._check_after and not _is_healthy(driver):
+                self._discard(key, driver)
+                continue
+            with self._condition:
+                self._leased[id(driver)] = (key, driver)
+                self._leases += 1
+                if create:
+                    self._creations += 1
+                else:
+                    self._reuses += 1
+                if waited:
+                    self._waits += 1
+                    self._wait_time += monotonic() - st_time
+            return driver
+
+    def release(self, driver, discard: bool = False):
+        """
+        Return a leased driver to the pool
+
+        :param AbstractHttpDriver driver: the leased driver
+        :param bool discard: if True the driver is closed instead, i.e. if it is broken or logged out
+        :raises ValueError: if the driver is not leased from the pool
+        """
+        with self._condition:
+            entry = self._leased.pop(id(driver), None)
+            if entry is None:
+                raise ValueError(f'Driver {driver} is not leased from the pool')
+            key = entry[0]
+            if not discard:
+                self._idle.setdefault(key, deque()).append((driver, monotonic()))
+                self._condition.notify()
+                return
+        self._discard(key, driver)
+
+    def get_stats(self) -> PoolStats:
+        """
+        Get the pool statistics
+
+        :returns PoolStats: the statistics namedtuple
+        """
+        with self._condition:
+            return PoolStats(
+                self._leases,
+                self._creations,
+                self._reuses,
+                round(self._reuses / self._leases, 3) if self._leases else 0.0,
+                self._waits,
+                round(self._wait_time, 3),
+                self._discards,
+                self._evictions,
+                sum(self._sizes.values()),
+                sum(len(idle) for idle in self._idle.values()),
+            )
+
+    def evict_idle(self):
+        """
+        Close the drivers idle for longer than `max_idle` seconds
+        """
+        with self._condition:
+            evicted = self._evict_idle()
+        for driver in evicted:
+            _close(driver)
+
+    def close(self):
+        """
+        Close all idle drivers. The leased drivers are kept until they are returned.
+        """
+        with self._condition:
+            drivers = [driver for idle in self._idle.values() for driver, _ in idle]
+            for key, idle in self._idle.items():
+                self._sizes[key] -= len(idle)
+            self._idle = {}
+            self._condition.notify_all()
+        for driver in drivers:
+            _close(driver)
+
+    def _get_max_size(self, driver_type) -> int:
+        """
+        Private method that returns the max number of drivers of a type. Do not call it directly.
+        """
+        if isinstance(self._max_size, dict):
+            return self._max_size.get(driver_type, DEFAULT_MAX_SIZE_OTHER)
+        return self._max_size
+
+    def _create_driver(self, key, driver_options):
+        """
+        Private method that creates a driver in the reserved slot. Do not call it directly.
+        """
+        try:
+            driver = self._create(driver_options)
+            if driver is None:
+                raise DriverInitException(f'Unknown driver type {key[0]}')
+            return driver
+        except BaseException:
+            with self._condition:
+                self._sizes[key] -= 1
+                self._condition.notify()
+            raise
+
+    def _discard(self, key, driver):
+        """
+        Private method that closes a driver and frees its slot. Do not call it directly.
+        """
+        _close(driver)
+        with self._condition:
+            self._sizes[key] -= 1
+            self._discards += 1
+            self._condition.notify()
+
+    def _evict_idle(self) -> list:
+        """
+        Private method that removes the drivers idle for too long from the pool, the condition lock must be held.
+        Do not call it directly.
+
+        :returns list drivers: the removed drivers to close once the lock is released
+        """
+        evicted = []
+        deadline = monotonic() - self._max_idle
+        for key, idle in self._idle.items():
+            # The drivers are kept in the order of return, the oldest ones are at the left
+            while idle and idle[0][1] <= deadline:
+                evicted.append(idle.popleft()[0])
+                self._sizes[key] -= 1
+                self._evictions += 1
+        if evicted:
+            self._condition.notify_all()
+        return evicted
+
+
+def _get_key(driver_options: dict) -> tuple:
+    return (
+        driver_options.get('type'),
+        driver_options.get('address'),
+        driver_options.get('username'),
+        driver_options.get('password'),
+    )
+
+
+def _is_healthy(driver) -> bool:
+    """
+    Private function that checks an idle driver. Do not call it directly.
+
+    :param AbstractHttpDriver driver: the driver
+    :returns bool: True if NMS accepts the cookies of an API driver, or the browser of a web driver responds
+    """
+    try:
+        if driver.get_type() == API:
+            cookies = driver.get_cookies()
+            return cookies is not None and driver.driver is not None and \
+                session_cache.validate_cookies(driver.driver, driver.address, cookies)
+        return driver.get_current_url() is not None
+    except Exception:
+        return False
+
+
+def _close(driver):
+    """
+    Private function that closes a driver ignoring the errors of a broken one. Do not call it directly.
+    """
+    try:
+        driver.close()
+    except Exception:
+        pass
@@ -1,4 +1,8 @@
+import threading
+from contextlib import contextmanager
+
 from src.drivers.abstract_http_driver import CHROME, FIREFOX, API
+from src.drivers.driver_pool import DriverPool, DEFAULT_MAX_IDLE, DEFAULT_CHECK_AFTER
 from src.drivers.http.api_driver import ApiDriver
 from src.drivers.http.web_driver import WebDriver
 from src.exceptions import DriverInitException
@@ -6,6 +10,9 @@ from src.exceptions import DriverInitException
 
 class DriversProvider(object):
     _drivers = {}
+    # Guards `_drivers` shared by the threads
+    _lock = threading.RLock()
+    _pool = None
 
     @classmethod
     def get_driver_instance(cls, driver_options, driver_id='default', store_driver=True):
@@ -22,27 +29,131 @@ class DriversProvider(object):
         _address = driver_options.get('address')
         _username = driver_options.get('username')
         _password = driver_options.get('password')
-        for drv_id, driver in DriversProvider._drivers.items():
-            if drv_id == driver_id and \
-                    driver.get_type() == _type and \
-                    driver.address == _address and \
-                    driver._username == _username and \
-                    driver._password == _password and \
-                    driver.get_type() == API and \
-                    driver._cookies is not None:
-                return driver
+        with cls._lock:
+            for drv_id, driver in DriversProvider._drivers.items():
+                if drv_id == driver_id and \
+                        driver.get_type() == _type and \
+                        driver.address == _address and \
+                        driver._username == _username and \
+                        driver._password == _password and \
+                        driver.get_type() == API and \
+                        driver._cookies is not None:
+                    return driver
+            driver = cls._create_driver(driver_options)
+            if driver is not None and store_driver:
+                DriversProvider._drivers[driver_id] = driver
+            return driver
+
+    @classmethod
+    def lease_driver(cls, driver_options, timeout=None):
+        """
+        Lease a driver from the pool shared by the threads, the driver must be returned by `return_driver`.
+        A driver is used by one thread at a time.
+
+        :param dict driver_options: driver options that are used to create a new driver
+        :param float timeout: max seconds to wait for a returned driver if the pool is full, None to wait forever
+        :raises DriverPoolTimeoutException: if no driver is returned within the timeout
+        :raises DriverInitException: if there is any error associated with creation of the driver
+        :returns AbstractHttpDriver driver: an instance of the driver
+        """
+        return cls._get_pool().lease(driver_options, timeout)
+
+    @classmethod
+    def return_driver(cls, driver, discard=False):
+        """
+        Return a leased driver to the pool
+
+        :param AbstractHttpDriver driver: the leased driver
+        :param bool discard: if True the driver is closed instead of being reused
+        """
+        cls._get_pool().release(driver, discard)
+
+    @classmethod
+    @contextmanager
+    def leased_driver(cls, driver_options, timeout=None):
+        """
+        Lease a driver for the block. The driver is returned upon exit, or closed if the block raises
+        a non-assertion exception.
+
+        >>> with DriversProvider.leased_driver(OptionsProvider.get_connection()) as driver:
+        ...     driver.set_path('api/object/get/nms=0')
+
+        :param dict driver_options: driver options that are used to create a new driver
+        :param float timeout: max seconds to wait for a returned driver if the pool is full, None to wait forever
+        """
+        driver = cls.lease_driver(driver_options, timeout)
+        discard = False
+        try:
+            yield driver
+        except AssertionError:
+            raise
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            cls.return_driver(driver, discard)
+
+    @classmethod
+    def get_pool_stats(cls):
+        """
+        Get the statistics of the driver pool
+
+        :returns PoolStats: the statistics namedtuple
+        """
+        return cls._get_pool().get_stats()
+
+    @classmethod
+    def configure_pool(cls, max_size=None, max_idle=DEFAULT_MAX_IDLE, check_after=DEFAULT_CHECK_AFTER):
+        """
+        Replace the driver pool by a new one, the idle drivers of the previous pool are closed
+
+        :param max_size: max number of drivers per driver type, NMS address and credentials: either an int, or a dict
+                         {driver type -> int}
+        :param float max_idle: seconds after which an idle driver is closed
+        :param float check_after: seconds of idling after which a driver is checked before it is leased
+        """
+        with cls._lock:
+            previous = cls._pool
+            cls._pool = DriverPool(cls._create_driver, max_size, max_idle, check_after)
+        if previous is not None:
+            previous.close()
+
+    @classmethod
+    def close_pool(cls):
+        """
+        Close the idle drivers of the pool
+        """
+        with cls._lock:
+            pool = cls._pool
+        if pool is not None:
+            pool.close()
+
+    @classmethod
+    def _get_pool(cls) -> DriverPool:
+        """
+        Private method that returns the pool creating it upon the first use. Do not call it directly.
+        """
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = DriverPool(cls._create_driver)
+            return cls._pool
+
+    @staticmethod
+    def _create_driver(driver_options):
+        """
+        Private method that creates a new driver. Do not call it directly.
+        """
+        _type = driver_options.get('type')
         # If by some reason there are not all the required options to init a new driver
         # TODO: probably check WEB driver related options as well
-        if _type is None or _address is None or _username is None or _password is None:
+        if _type is None or driver_options.get('address') is None or driver_options.get('username') is None \
+                or driver_options.get('password') is None:
             raise DriverInitException('Driver type, NMS address, username, and password must be in options')
 
         driver = None
 
-        if CHROME == driver_options.get("type") or FIREFOX == driver_options.get("type"):
+        if CHROME == _type or FIREFOX == _type:
             driver = WebDriver.create_driver(driver_options)
-        elif API == driver_options.get("type"):
+        elif API == _type:
             driver = ApiDriver.create_driver(driver_options)
-
-        if driver is not None and store_driver:
-            DriversProvider._drivers[driver_id] = driver
         return driver
@@ -1,5 +1,4 @@
-import requests
-
+from src import http_session
 from src.drivers.abstract_http_driver import API
 from src.drivers.http.nms_api_driver import NmsApiDriver
 from src.exceptions import DriverInitException
@@ -24,7 +23,7 @@ class ApiDriver(object):
 
     @classmethod
     def _create_api_driver(cls, driver_type, driver_options):
-        driver = requests
+        driver = http_session.create_session()
         drv = NmsApiDriver(driver_type, driver)
         drv.address = driver_options.get('address')
         return drv
@@ -1,19 +1,25 @@
 import base64
-import json
+import threading
+from contextlib import contextmanager
 from http import HTTPStatus
-from json import JSONDecodeError
 from typing import Optional
 from src.class_logger import class_logger_decorator, debug
 from src.constants import API_LOGIN_PATH
 from src.drivers.abstract_http_driver import AbstractHttpDriver, DRIVER_NAMES
 from src.exceptions import ObjectNotFoundException, DriverInitException, ObjectNotCreatedException, \
     ParameterNotPassedException, NotImplementedException, ObjectNotDeletedException
+from src.tick_clock import TickClock
+from src import config_tracker, json_codec, session_cache
+from src.json_codec import JSONDecodeError
 
 DEFAULT_TIMEOUT = 5
+_NMS_READ_PATH = 'api/object/get/nms=0'
 
 
 @class_logger_decorator
 class NmsApiDriver(AbstractHttpDriver):
+    # Guards the logins upon 401 replies. Shared by the instances to keep them picklable for the spawned processes
+    _relogin_lock = threading.Lock()
 
     def __init__(self, driver_type, driver):
         self._type = driver_type
@@ -26,6 +32,10 @@ class NmsApiDriver(AbstractHttpDriver):
         self._password = None
         self.address = None
         self.driver = driver
+        # Snapshot mode state: nesting depth of `snapshot` contexts and the path the loaded values belong to
+        self._snapshot_depth = 0
+        self._snapshot_path = None
+        self._tick_clock = None
 
     def get_type(self):
         return self._type
@@ -46,15 +56,54 @@ class NmsApiDriver(AbstractHttpDriver):
         if HTTPStatus.OK != resp.status_code or 0 == len(resp.content):
             raise ObjectNotFoundException(F"{resp.status_code}:{full_address}: content | {resp.content}")
         debug(resp.content)
-        self._values = json.loads(resp.content)['reply']
+        self._values = json_codec.loads(resp.content)['reply']
+        if self._snapshot_depth:
+            self._snapshot_path = path
 
     def get_value(self, element_id: str):
+        if self._snapshot_depth and self._snapshot_path is not None and self._snapshot_path == self._path:
+            if not isinstance(self._values, dict):
+                return None
+            return self._values.get(element_id)
         self._values[element_id] = None
         self.load_data()
         if element_id not in self._values:
             return None
         return self._values[element_id]
 
+    @contextmanager
+    def snapshot(self):
+        """
+        Snapshot mode context. The first `get_value` call (or an explicit `load_data` call) loads the reply,
+        the following `get_value` calls read the values from it instead of loading the data again.
+        The snapshot is invalidated by any write request, by setting another path or by calling `refresh`.
+        Outside the context each `get_value` call re-reads the value from NMS.
+
+        >>> with driver.snapshot():
+        ...     driver.set_path(PathsManager.station_status(API, 0))
+        ...     state = {field: driver.get_value(field) for field in ('state', 'station_cn', 'station_tx')}
+        Get three station state fields using a single request
+        """
+        if not self._snapshot_depth:
+            self._snapshot_path = None
+        self._snapshot_depth += 1
+        try:
+            yield self
+        finally:
+            self._snapshot_depth -= 1
+            if not self._snapshot_depth:
+                self._snapshot_path = None
+
+    def refresh(self):
+        """
+        Reload the data of the current path. In snapshot mode the snapshot is replaced by the new reply.
+        """
+        self._snapshot_path = None
+        self.load_data()
+
+    def _invalidate_snapshot(self):
+        self._snapshot_path = None
+
     def set_value(self, element_id: str, element_value: any):
         self._values[element_id] = element_value
 
@@ -86,12 +135,14 @@ class NmsApiDriver(AbstractHttpDriver):
             # raise ObjectNotUpdatedException(error)
 
     def _send_get(self):
+        self._invalidate_snapshot()
         self._errors = {}
         obj_id = None
         result = False
         error = ''
         path = self._get_full_path()
         debug(path)
+        config_tracker.note_request(self.address, path)
         resp = self.driver.get(
             path,
             timeout=DEFAULT_TIMEOUT,
@@ -103,7 +154,7 @@ class NmsApiDriver(AbstractHttpDriver):
             error = 'Empty response body'
         else:
             try:
-                result_obj = json.loads(resp.content)
+                result_obj = json_codec.loads(resp.content)
                 if 0 == result_obj['error_code']:
                     result = True
                     obj_id = result_obj['reply']['%row']
@@ -116,6 +167,7 @@ class NmsApiDriver(AbstractHttpDriver):
         return result, error, obj_id
 
     def _send_post(self):
+        self._invalidate_snapshot()
         self._errors = {}
         obj_id = None
         result = False
@@ -123,10 +175,10 @@ class NmsApiDriver(AbstractHttpDriver):
         path = self._get_full_path()
         debug(path)
         debug(self._values)
+        config_tracker.note_request(self.address, path)
 
         # handling non-ascii characters in the payload
-        data = json.dumps(self._values, ensure_ascii=False)
-        encoded_data = data.encode('utf-8')
+        encoded_data = json_codec.dumps(self._values)
         resp = self.driver.post(
             path,
             encoded_data,
@@ -139,7 +191,7 @@ class NmsApiDriver(AbstractHttpDriver):
             error = 'Empty response body'
         else:
             try:
-                result_obj = json.loads(resp.content)
+                result_obj = json_codec.loads(resp.content)
                 if 0 == result_obj['error_code']:
                     result = True
                     obj_id = result_obj['reply']['%row']
@@ -152,12 +204,19 @@ class NmsApiDriver(AbstractHttpDriver):
         return result, error, obj_id
 
     def close(self):
-        self.driver = None
+        # The session holds the pooled keep-alive connections to NMS
+        if self.driver is not None:
+            self.driver.close()
+            self.driver = None
         self._cookies = None
 
     def set_path(self, path: str):
-        self._values = {}
         self._errors = {}
+        # In snapshot mode the loaded values are kept if the path is not changed
+        if self._snapshot_depth and self._snapshot_path is not None and self._snapshot_path == path:
+            return
+        self._invalidate_snapshot()
+        self._values = {}
         self._path = path
 
     def has_param_error(self, element_id: str):
@@ -177,6 +236,18 @@ class NmsApiDriver(AbstractHttpDriver):
         return self.address + self._path
 
     def login(self, username, password):
+        # The cookies cached by another driver or process are reused if the session cache is enabled
+        self._cookies = session_cache.acquire(
+            self.address, username, lambda: self._login(username, password), self._validate_cookies
+        )
+        self._username = username
+        self._password = password
+        if session_cache.is_enabled():
+            session_cache.install_relogin(self.driver, self._relogin)
+        if self._tick_clock is not None:
+            self._tick_clock.reset()
+
+    def _login(self, username, password):
         bytes_str = F"{username}:{password}".encode('ascii')
         bytes_b64 = base64.b64encode(bytes_str)
         token = bytes_b64.decode('ascii')
@@ -186,15 +257,59 @@ class NmsApiDriver(AbstractHttpDriver):
         resp = self.driver.get(self.address + API_LOGIN_PATH, headers=headers, timeout=DEFAULT_TIMEOUT)
         if HTTPStatus.OK != resp.status_code:
             raise DriverInitException(resp.content)
-        self._cookies = resp.cookies
-        self._username = username
-        self._password = password
+        return resp.cookies
+
+    def _validate_cookies(self, cookies):
+        return session_cache.validate_cookies(self.driver, self.address, cookies, DEFAULT_TIMEOUT)
+
+    def _relogin(self, rejected):
+        """
+        Private method that logs in again after NMS has rejected the cookies by 401. Do not call it directly.
+
+        :param dict rejected: the rejected cookies
+        :returns: the new cookies, None if the driver is logged out
+        """
+        with self._relogin_lock:
+            if self._cookies is None or self._username is None:
+                return None
+            # Another thread has already logged in again
+            if dict(self._cookies) != rejected:
+                return self._cookies
+            session_cache.invalidate(self.address, self._username, self._cookies)
+            username, password = self._username, self._password
+            self._cookies = session_cache.acquire(
+                self.address, username, lambda: self._login(username, password), self._validate_cookies
+            )
+            return self._cookies
 
     def logout(self):
         self._cookies = None
         self._username = None
         self._password = None
 
+    def get_tick_clock(self) -> TickClock:
+        """
+        Get the tick clock of the driver session. The clock is shared by all the NMS entities using the driver.
+
+        :returns TickClock: the tick clock
+        """
+        if self._tick_clock is None:
+            self._tick_clock = TickClock(self._read_tick_number)
+        return self._tick_clock
+
+    def _read_tick_number(self):
+        # The request does not change the current path and the loaded values of the driver
+        resp = self.driver.get(self.address + _NMS_READ_PATH, cookies=self._cookies, timeout=DEFAULT_TIMEOUT)
+        if HTTPStatus.OK != resp.status_code or 0 == len(resp.content):
+            return None
+        try:
+            reply = json_codec.loads(resp.content).get('reply')
+        except JSONDecodeError:
+            return None
+        if not isinstance(reply, dict):
+            return None
+        return reply.get('tick_number')
+
     def _set_errors(self, error):
         for field in self._values.keys():
             if error.find(field) != -1:
@@ -203,12 +318,13 @@ class NmsApiDriver(AbstractHttpDriver):
     def get_realtime(self, command=None, obj_id=0):
         if command is None:
             raise ParameterNotPassedException('Command must be passed as an argument')
+        self._invalidate_snapshot()
         payload = {"command": command, "control": obj_id}
         error = ''
         reply = None
         resp = self.driver.post(
             self._get_full_path(),
-            data=json.dumps(payload),
+            data=json_codec.dumps(payload),
             timeout=DEFAULT_TIMEOUT * 10,  # the timeout must be big enough to handle 'No reply' response
             cookies=self._cookies
         )
@@ -218,7 +334,7 @@ class NmsApiDriver(AbstractHttpDriver):
             error = 'Empty response body'
         else:
             try:
-                result_obj = json.loads(resp.content)
+                result_obj = json_codec.loads(resp.content)
                 if 0 == result_obj['error_code']:
                     reply = result_obj['reply']
                 else:
@@ -251,7 +367,9 @@ class NmsApiDriver(AbstractHttpDriver):
             timeout = DEFAULT_TIMEOUT * 10
         reply = None
         error_code = None
+        self._invalidate_snapshot()
         self._path = path
+        config_tracker.note_request(self.address, path)
         resp = self.driver.get(
             self._get_full_path(),
             timeout=timeout,
@@ -264,7 +382,7 @@ class NmsApiDriver(AbstractHttpDriver):
         else:
             html_status = 'OK'
         try:
-            result_obj = json.loads(resp.content)
+            result_obj = json_codec.loads(resp.content)
             reply = result_obj.get('reply', None)
             error_code = result_obj.get('error_code', None)
             error = result_obj.get('error_log', None)
@@ -297,11 +415,12 @@ class NmsApiDriver(AbstractHttpDriver):
             timeout = DEFAULT_TIMEOUT * 10
         reply = None
         error_code = None
+        self._invalidate_snapshot()
         self._path = path
+        config_tracker.note_request(self.address, path)
 
         # handling non-ascii characters in the payload
-        data = json.dumps(payload, ensure_ascii=False)
-        encoded_data = data.encode('utf-8')
+        encoded_data = json_codec.dumps(payload)
 
         resp = self.driver.post(
             self._get_full_path(),
@@ -316,7 +435,7 @@ class NmsApiDriver(AbstractHttpDriver):
         else:
             html_status = 'OK'
         try:
-            result_obj = json.loads(resp.content)
+            result_obj = json_codec.loads(resp.content)
             reply = result_obj.get('reply', None)
             error_code = result_obj.get('error_code', None)
             error = result_obj.get('error_log', None)
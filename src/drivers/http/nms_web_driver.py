@@ -12,6 +12,7 @@ from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.wait import WebDriverWait
 
 from global_options.options import SCREENSHOT_DIR
+from src import config_tracker
 from src.class_logger import class_logger_decorator
 from src.constants import NOT_FOUND_PAGE, WEB_ERROR_SELECTOR, WEB_LOGIN_PATH, WEB_LOGIN_BUTTON, WEB_APPLY_BUTTON, \
     WEB_FIELD_ERROR_SELECTOR, WEB_LOGOUT_BUTTON, WEB_ADD_DEVICE_BUTTON, WEB_SYNC_ADD_BUTTON
@@ -156,6 +157,7 @@ class NmsWebDriver(AbstractHttpDriver):
         btn = self._get_element_by(By.CSS_SELECTOR, sender_selector)
         if btn:
             btn.click()
+            config_tracker.mark_dirty(self.address)
             self._current_path = None
         else:
             raise ObjectNotFoundException(f'Cannot locate {sender_selector} button')
@@ -3,6 +3,7 @@ from time import time, sleep
 from pysnmp.hlapi import SnmpEngine, CommunityData, UdpTransportTarget, ContextData, ObjectType, \
     OctetString, ObjectIdentity, cmdgen, Integer32, Gauge32
 
+from src import latency
 from src.exceptions import DriverInitException
 
 
@@ -49,15 +50,17 @@ class SnmpExecutor(object):
     def _execute(self, cmd, community_data, transport, payload):
         self._error = None
         self._wait_timeout()
-        error_indication, error_status, error_index, var_binds = next(
-            cmd(
-                SnmpEngine(),
-                community_data,
-                transport,
-                ContextData(),
-                payload
+        # getCmd -> snmp/get, setCmd -> snmp/set
+        with latency.measure(f'snmp/{cmd.__name__[:-3]}'):
+            error_indication, error_status, error_index, var_binds = next(
+                cmd(
+                    SnmpEngine(),
+                    community_data,
+                    transport,
+                    ContextData(),
+                    payload
+                )
             )
-        )
         self._last_request_time = self._get_time()
         if error_indication:
             self._error = error_indication
@@ -2,6 +2,8 @@ from time import time, sleep
 from pysnmp.hlapi import SnmpEngine, UdpTransportTarget, ContextData, ObjectType, \
     OctetString, ObjectIdentity, cmdgen, Integer32, Gauge32, UsmUserData, usmAesCfb128Protocol
 
+from src import latency
+
 
 class SnmpExecutorV3(object):
     def __init__(self, delay=0.100):
@@ -47,15 +49,17 @@ class SnmpExecutorV3(object):
     def _execute(self, cmd, community_data, transport, payload):
         self._error = None
         self._wait_timeout()
-        error_indication, error_status, error_index, var_binds = next(
-            cmd(
-                SnmpEngine(),
-                community_data,
-                transport,
-                ContextData(),
-                payload
+        # getCmd -> snmp/get, setCmd -> snmp/set
+        with latency.measure(f'snmp/{cmd.__name__[:-3]}'):
+            error_indication, error_status, error_index, var_binds = next(
+                cmd(
+                    SnmpEngine(),
+                    community_data,
+                    transport,
+                    ContextData(),
+                    payload
+                )
             )
-        )
         self._last_request_time = self._get_time()
         if error_indication:
             self._error = error_indication
@@ -8,6 +8,7 @@ import requests
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 
+from src import http_session
 from src.drivers.uhp.constants import *
 from src.drivers.uhp.uhp_getter import UhpGetter
 from src.enum_types_constants import RollofModes, SnmpModes, SnmpAuth, TdmaInputModes, \
@@ -118,6 +119,7 @@ class UhpRequestsDriver(UhpGetter):
             timeout = self._timeout
         session = requests.Session()
         session.mount('http://', HTTPAdapter(max_retries=self._max_retries))
+        http_session.mount(session)
         for _ in range(3):
             try:
                 r = session.get(url, timeout=timeout)
@@ -4,11 +4,27 @@ import socket
 import telnetlib
 import time
 
+from src import latency
 from src.class_logger import class_logger_decorator, debug
 from src.drivers.uhp.constants import PRESS_SPACE_TO_CONTINUE
 from src.exceptions import DriverInitException, InvalidOptionsException
 
 
+def _get_endpoint(command: str) -> str:
+    """
+    Private function that returns the latency endpoint class of a telnet command. Do not call it directly.
+
+    :param str command: the command, i.e. `ping 10.0.0.1 5`
+    :returns str endpoint: `telnet/` followed by the words of the command preceding the first argument with digits
+    """
+    words = []
+    for word in command.split():
+        if any(char.isdigit() for char in word):
+            break
+        words.append(word)
+    return f'telnet/{" ".join(words)}'
+
+
 @class_logger_decorator
 class UhpTelnetDriver:
     """
@@ -49,8 +65,9 @@ class UhpTelnetDriver:
         if timeout is None:
             timeout = self._timeout
         try:
-            self._telnet = telnetlib.Telnet(self._router_address, timeout=timeout)
-            result = self._telnet.read_until(b'#', timeout=timeout)
+            with latency.measure('telnet/connect'):
+                self._telnet = telnetlib.Telnet(self._router_address, timeout=timeout)
+                result = self._telnet.read_until(b'#', timeout=timeout)
             if result.find(b'#') == -1:
                 raise DriverInitException(f'UHP {self._router_address}: no hashtag in response')
         except Exception as exc:
@@ -123,8 +140,9 @@ class UhpTelnetDriver:
         """
         debug(f'{self._router_address}: issuing `{command}` command...')
 
-        self._telnet.write(f'{command}\r'.encode('UTF-8'))
-        result_bytes = self._get_all_results()
+        with latency.measure(_get_endpoint(command)):
+            self._telnet.write(f'{command}\r'.encode('UTF-8'))
+            result_bytes = self._get_all_results()
         return result_bytes
 
     def clear_arp(self):
@@ -81,3 +81,13 @@ class InvalidModeException(Exception):
 class NmsDownloadException(Exception):
     """Cannot download from NMS"""
     pass
+
+
+class CassetteMismatchException(Exception):
+    """The request is not recorded in the HTTP cassette"""
+    pass
+
+
+class DriverPoolTimeoutException(DriverInitException):
+    """No driver is returned to the pool in time"""
+    pass
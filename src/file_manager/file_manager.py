@@ -1,12 +1,11 @@
 import base64
-import json
 import os
-import requests
 from http import HTTPStatus
-from json import JSONDecodeError
 from pathlib import Path
 from src.constants import API_LOGIN_PATH
+from src import http_session, json_codec, session_cache
 from src.exceptions import DriverInitException, InvalidOptionsException, NmsErrorResponseException
+from src.json_codec import JSONDecodeError
 from src.options_providers.options_provider import OptionsProvider, API_CONNECT
 
 
@@ -16,7 +15,7 @@ class FileManager:
         if connection_options is None:
             connection_options = OptionsProvider.get_connection('global_options', API_CONNECT)
         self._address = connection_options['address']
-        self._driver = requests
+        self._driver = http_session.create_session()
         self._cookies = None
         self._login(connection_options['username'], connection_options['password'])
 
@@ -79,7 +78,7 @@ class FileManager:
                 error = 'Empty response body'
             else:
                 try:
-                    result_obj = json.loads(resp.content)
+                    result_obj = json_codec.loads(resp.content)
                     if 0 != result_obj['error_code']:
                         error = result_obj['error_log']
                 except JSONDecodeError:
@@ -92,7 +91,7 @@ class FileManager:
     def _post(self, path: str, data: dict):
         resp = self._driver.post(
             self._address + path,
-            data=json.dumps(data),
+            data=json_codec.dumps(data),
             cookies=self._cookies
         )
         result = None
@@ -103,7 +102,7 @@ class FileManager:
             error = 'Empty response body'
         else:
             try:
-                result_obj = json.loads(resp.content)
+                result_obj = json_codec.loads(resp.content)
                 if 0 == result_obj['error_code']:
                     result = result_obj['reply']
                 else:
@@ -115,6 +114,15 @@ class FileManager:
         return result, error
 
     def _login(self, username, password):
+        # The cookies cached by another client or process are reused if the session cache is enabled
+        self._cookies = session_cache.acquire(
+            self._address,
+            username,
+            lambda: self._request_login(username, password),
+            lambda cookies: session_cache.validate_cookies(self._driver, self._address, cookies),
+        )
+
+    def _request_login(self, username, password):
         bytes_str = F"{username}:{password}".encode('ascii')
         bytes_b64 = base64.b64encode(bytes_str)
         token = bytes_b64.decode('ascii')
@@ -124,7 +132,7 @@ class FileManager:
         resp = self._driver.get(self._address + API_LOGIN_PATH, headers=headers)
         if HTTPStatus.OK != resp.status_code:
             raise DriverInitException(resp.content)
-        self._cookies = resp.cookies
+        return resp.cookies
 
     def _delete_file(self, dir_name, file_name):
         result, error = self._post(
@@ -0,0 +1,38 @@
+"""
+HTTP sessions of the NMS and UHP clients.
+
+The sessions have the active HTTP cassette (`src.cassette`) and the latency histograms (`src.latency`) plugged in,
+and accept the compressed encodings enabled by `src.compression`.
+The sessions returned by `create_session` keep no cookies between requests, the same way `requests.get` and
+`requests.post` functions do, therefore the clients passing the cookies explicitly can use them in place
+of the `requests` module.
+"""
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+
+from src import cassette, compression, latency
+
+
+def mount(session: requests.Session) -> requests.Session:
+    """
+    Plug the active cassette and the latency histograms into a session, set its `Accept-Encoding` header
+
+    :param requests.Session session: the session
+    :returns requests.Session session: the passed session
+    """
+    cassette.mount(session)
+    latency.mount(session)
+    compression.apply(session)
+    return session
+
+
+def create_session() -> requests.Session:
+    """
+    Create a new HTTP session which does not keep cookies
+
+    :returns requests.Session session: the session
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return mount(session)
@@ -0,0 +1,84 @@
+"""
+JSON codec used by the NMS API drivers.
+
+`orjson` is used if it is installed, otherwise the standard `json` module. Replies are decoded directly from
+the response bytes, payloads are encoded to UTF-8 bytes with non-ASCII characters kept as they are.
+
+>>> from src import json_codec
+>>> json_codec.loads(resp.content)
+{'error_code': 0, 'error_log': '', 'reply': {'%row': 0}}
+>>> json_codec.dumps({'name': 'stn-1'})
+b'{"name":"stn-1"}'
+"""
+import json
+
+from src.exceptions import InvalidOptionsException
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON = 'orjson'
+STDLIB = 'json'
+
+# `orjson.JSONDecodeError` is a subclass of `json.JSONDecodeError`, catching the latter covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+_backend = ORJSON if orjson is not None else STDLIB
+
+
+def set_backend(backend: str):
+    """
+    Select the JSON backend
+
+    :param str backend: either `json_codec.ORJSON` or `json_codec.STDLIB`
+    :raises InvalidOptionsException: if the backend is unknown or is not installed
+    """
+    global _backend
+    if backend not in (ORJSON, STDLIB):
+        raise InvalidOptionsException(f'Unknown JSON backend {backend}, valid backends: {ORJSON}, {STDLIB}')
+    if backend == ORJSON and orjson is None:
+        raise InvalidOptionsException('orjson is not installed')
+    _backend = backend
+
+
+def get_backend() -> str:
+    """
+    Get the name of the JSON backend in use
+
+    :returns str backend: either `json_codec.ORJSON` or `json_codec.STDLIB`
+    """
+    return _backend
+
+
+def loads(data):
+    """
+    Decode JSON document
+
+    :param data: bytes (i.e. `resp.content`), bytearray, memoryview or str containing a JSON document
+    :returns: the decoded object
+    :raises JSONDecodeError: if the document is not a valid JSON
+    """
+    if _backend == ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    # stdlib detects the encoding of bytes itself
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode the object to JSON document as UTF-8 bytes. Non-ASCII characters are not escaped.
+
+    :param obj: the object to encode
+    :returns bytes data: the encoded document
+    """
+    if _backend == ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # The types unsupported by orjson, i.e. Decimal or integers above 64 bit, are left to stdlib
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
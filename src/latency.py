@@ -0,0 +1,395 @@
+"""
+Latency histograms of the requests to NMS and UHP grouped by endpoint class.
+
+The latency of each HTTP request, SNMP command and telnet command is recorded to a histogram of its endpoint class,
+i.e. `api/list/get`, `api/object/write`, `uhp/ss`, `snmp/get` or `telnet/show arp`. The histograms are
+log-linear (HDR-style): values are kept in microseconds with the relative error below 1%, memory does not depend
+on the number of recorded values, and the histograms of different tests are merged by adding the bucket counts.
+
+Values are recorded to the current test and to the current suite. The test runner sets the current test:
+
+>>> latency.start_test('test_scenarios.api.case.ApiCase.test_create')
+>>> nms_api.get_param('station:0', 'serial')
+>>> latency.stop_test()
+>>> latency.get_suite()['api/object/get'].get_summary()
+{'count': 1, 'mean': 0.0021, 'p50': 0.0021, 'p95': 0.0021, 'p99': 0.0021, 'max': 0.0021}
+"""
+import re
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from src import json_codec
+
+# Each power of two range of values is split into the number of buckets, the relative error is 1 / _SUB_BUCKETS
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+# Values below the limit are kept exactly
+_LINEAR_LIMIT = _SUB_BUCKETS << 1
+# Percentiles reported in the summaries
+PERCENTILES = (50, 95, 99)
+
+_UHP_FORM = re.compile(r'[a-z_]+')
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latency values. Not thread-safe, `LatencyRecorder` guards its histograms.
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        # bucket index -> number of values
+        self.counts = {}
+        self.count = 0
+        # sum and max of the values in microseconds
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds: float):
+        """
+        Add a value to the histogram
+
+        :param float seconds: the latency in seconds
+        """
+        value = max(0, int(seconds * 1_000_000))
+        index = _get_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        Add the values of another histogram to the histogram
+
+        :param LatencyHistogram other: the merged histogram, it is not changed
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> 'LatencyHistogram':
+        histogram = LatencyHistogram()
+        histogram.merge(self)
+        return histogram
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the value below or equal to which the passed percent of the values are
+
+        :param float percent: the percent from 0 to 100
+        :returns float value: the value in seconds, the highest value of its bucket not exceeding the max value,
+                              0 if the histogram is empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_get_highest_value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def get_summary(self) -> dict:
+        """
+        Get the number of values, the mean, the reported percentiles and the max value
+
+        :returns dict summary: i.e. `{'count': 10, 'mean': 0.012, 'p50': 0.01, 'p95': 0.03, 'p99': 0.03, 'max': 0.03}`
+        """
+        summary = {'count': self.count, 'mean': round(self.total / self.count / 1_000_000, 6) if self.count else 0.0}
+        for percent in PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        summary['max'] = self.max / 1_000_000
+        return summary
+
+    def to_dict(self) -> dict:
+        """
+        Get a JSON serializable representation of the histogram
+
+        :returns dict histogram: `{'count': ..., 'total': ..., 'max': ..., 'counts': [[index, count], ...]}`
+        """
+        return {'count': self.count, 'total': self.total, 'max': self.max, 'counts': sorted(self.counts.items())}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LatencyHistogram':
+        """
+        Restore a histogram from the representation returned by `to_dict`
+
+        :param dict data: the representation
+        :returns LatencyHistogram histogram: the histogram
+        """
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data['counts']}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.max = data['max']
+        return histogram
+
+
+class LatencyRecorder:
+    """
+    Thread-safe registry of the latency histograms of the current test and the current suite.
+    Values recorded outside tests, i.e. in `setUpClass`, are added to the suite only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._test = None
+        # endpoint class -> histogram of the current test
+        self._current = {}
+        # test id -> {endpoint class -> histogram}
+        self._tests = {}
+        # endpoint class -> histogram of the whole suite
+        self._suite = {}
+
+    def record(self, endpoint: str, seconds: float):
+        """
+        Add a latency value to the histogram of the endpoint class
+
+        :param str endpoint: the endpoint class, i.e. `api/list/get`
+        :param float seconds: the latency in seconds
+        """
+        with self._lock:
+            histograms = self._current if self._test is not None else self._suite
+            histogram = histograms.get(endpoint)
+            if histogram is None:
+                histogram = histograms[endpoint] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def start_test(self, test_id: str):
+        """
+        Set the test the values are recorded to
+
+        :param str test_id: the id of the test, i.e. `unittest.TestCase.id()`
+        """
+        self.stop_test()
+        with self._lock:
+            self._test = test_id
+
+    def stop_test(self):
+        """
+        Finish the current test, its histograms are merged into the suite ones. Nothing is done if there is no test.
+        """
+        with self._lock:
+            if self._test is None:
+                return
+            test_histograms = self._tests.setdefault(self._test, {})
+            for endpoint, histogram in self._current.items():
+                _merge_into(test_histograms, endpoint, histogram)
+                _merge_into(self._suite, endpoint, histogram)
+            self._current = {}
+            self._test = None
+
+    def get_suite(self) -> dict:
+        """
+        Get the histograms of the suite including the current test
+
+        :returns dict histograms: {endpoint class -> LatencyHistogram copy}
+        """
+        with self._lock:
+            histograms = {endpoint: histogram.copy() for endpoint, histogram in self._suite.items()}
+            for endpoint, histogram in self._current.items():
+                _merge_into(histograms, endpoint, histogram)
+        return dict(sorted(histograms.items()))
+
+    def get_tests(self) -> dict:
+        """
+        Get the histograms of the finished tests
+
+        :returns dict histograms: {test id -> {endpoint class -> LatencyHistogram copy}}
+        """
+        with self._lock:
+            return {
+                test: {endpoint: histogram.copy() for endpoint, histogram in sorted(histograms.items())}
+                for test, histograms in self._tests.items()
+            }
+
+    def reset(self):
+        """
+        Drop all histograms
+        """
+        with self._lock:
+            self._test = None
+            self._current = {}
+            self._tests = {}
+            self._suite = {}
+
+
+_recorder = LatencyRecorder()
+
+
+def record(endpoint: str, seconds: float):
+    """
+    Add a latency value to the histograms of the current test and suite
+
+    :param str endpoint: the endpoint class, i.e. `snmp/get`
+    :param float seconds: the latency in seconds
+    """
+    _recorder.record(endpoint, seconds)
+
+
+@contextmanager
+def measure(endpoint: str):
+    """
+    Record the execution time of the block, including the time of a failed execution
+
+    >>> with latency.measure('telnet/show arp'):
+    ...     telnet.write(b'show arp\\r')
+
+    :param str endpoint: the endpoint class
+    """
+    st_time = perf_counter()
+    try:
+        yield
+    finally:
+        _recorder.record(endpoint, perf_counter() - st_time)
+
+
+def start_test(test_id: str):
+    _recorder.start_test(test_id)
+
+
+def stop_test():
+    _recorder.stop_test()
+
+
+def get_suite() -> dict:
+    return _recorder.get_suite()
+
+
+def get_tests() -> dict:
+    return _recorder.get_tests()
+
+
+def reset():
+    _recorder.reset()
+
+
+def get_endpoint(url: str) -> str:
+    """
+    Get the endpoint class of a URL
+
+    >>> get_endpoint('http://10.0.0.1:8000/api/list/get/network=0/list_items=station')
+    'api/list/get'
+    >>> get_endpoint('http://10.0.2.15/cw3?ta=1')
+    'uhp/cw'
+
+    :param str url: the URL
+    :returns str endpoint: the first three path segments of NMS API requests, `uhp/<form>` for other requests
+    """
+    path = urlsplit(url).path.lstrip('/')
+    if path.startswith('api/'):
+        return '/'.join(path.split('/', 3)[:3])
+    form = _UHP_FORM.match(path)
+    return f'uhp/{form.group() if form else ""}'
+
+
+def mount(session):
+    """
+    Record the latency of the responses received by a session. The latency is the time until the response headers
+    are received, it includes the body transfer unless the request is streamed.
+
+    :param requests.Session session: the session
+    :returns requests.Session session: the passed session
+    """
+    hooks = session.hooks['response']
+    if _on_response not in hooks:
+        hooks.append(_on_response)
+    return session
+
+
+def get_report(suite_name: str) -> dict:
+    """
+    Get the summaries and the histograms of the suite and the finished tests
+
+    :param str suite_name: the name of the suite
+    :returns dict report: JSON serializable report
+    """
+    return {
+        'suite': suite_name,
+        'percentiles': list(PERCENTILES),
+        'endpoints': _get_section(get_suite()),
+        'tests': {test: _get_section(histograms) for test, histograms in get_tests().items()},
+    }
+
+
+def write_report(path, suite_name: str):
+    """
+    Write the report returned by `get_report` to a JSON file
+
+    :param path: path to the file
+    :param str suite_name: the name of the suite
+    """
+    with open(path, 'wb') as f:
+        f.write(json_codec.dumps(get_report(suite_name)))
+
+
+def format_summary(endpoint: str, histogram: LatencyHistogram) -> str:
+    """
+    Get a human readable line describing the latency of an endpoint class
+
+    :param str endpoint: the endpoint class
+    :param LatencyHistogram histogram: the histogram
+    :returns str line: i.e. `api/list/get: 120 calls, p50 12.1ms, p95 30.2ms, p99 41.0ms, max 52.3ms`
+    """
+    summary = histogram.get_summary()
+    percentiles = ', '.join(f'p{percent} {summary[f"p{percent}"] * 1000:.1f}ms' for percent in PERCENTILES)
+    return f'{endpoint}: {summary["count"]} calls, {percentiles}, max {summary["max"] * 1000:.1f}ms'
+
+
+def _on_response(response, *args, **kwargs):
+    """
+    Private function, the response hook of the mounted sessions. Do not call it directly.
+    """
+    _recorder.record(get_endpoint(response.request.url), response.elapsed.total_seconds())
+
+
+def _get_section(histograms: dict) -> dict:
+    """
+    Private function that makes a report section of histograms. Do not call it directly.
+
+    :param dict histograms: {endpoint class -> LatencyHistogram}
+    :returns dict section: {endpoint class -> {'summary': ..., 'histogram': ...}}
+    """
+    return {
+        endpoint: {'summary': histogram.get_summary(), 'histogram': histogram.to_dict()}
+        for endpoint, histogram in histograms.items()
+    }
+
+
+def _merge_into(histograms: dict, endpoint: str, histogram: LatencyHistogram):
+    """
+    Private function that merges a histogram into the one of the same endpoint class. Do not call it directly.
+    """
+    target = histograms.get(endpoint)
+    if target is None:
+        histograms[endpoint] = histogram.copy()
+    else:
+        target.merge(histogram)
+
+
+def _get_index(value: int) -> int:
+    """
+    Private function that returns the bucket index of a value in microseconds. Do not call it directly.
+    """
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift << _SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _get_highest_value(index: int) -> int:
+    """
+    Private function that returns the highest value in microseconds of a bucket. Do not call it directly.
+    """
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = (index >> _SUB_BUCKET_BITS) - 1
+    return ((index - (shift << _SUB_BUCKET_BITS) + 1) << shift) - 1
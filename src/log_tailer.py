@@ -0,0 +1,245 @@
+"""
+Incremental NMS log tailer.
+
+Each poll requests only the records logged since the previous poll. The requested window starts at the time
+of the newest record received so far, the NMS clock is used instead of the client one, therefore no records are lost
+if the clocks differ. The records of that exact time already returned are skipped. Records are filtered by the object
+names and the messages using precompiled matchers, therefore several objects and messages can be watched at once.
+
+>>> tailer = LogTailer(read_logs, names=['stn-1', 'stn-2'], messages=['Station Up', re.compile(r'Station Down')])
+>>> tailer.wait(timeout=60)
+LogMatch(name='stn-1', message='Station Up', record={'na': 'stn-1', 'me': 'Station Up', ...})
+"""
+import re
+from collections import Counter, namedtuple
+from time import time, sleep
+
+from src.exceptions import InvalidOptionsException
+
+# A caught log record: object name, stripped log message and the raw record
+LogMatch = namedtuple('LogMatch', 'name message record')
+# Tailer statistics: number of log requests, records received, new records, matched records
+LogTailerStats = namedtuple('LogTailerStats', 'polls received new matched')
+
+# The record field holding the record time since epoch
+_DEFAULT_TIME_KEY = 'ti'
+
+
+class LogTailer:
+    """
+    Incremental reader of an NMS object log.
+
+    :param callable read_logs: a function getting the payload `{start, end, fault, info, warning}`
+                               and returning the list of log records, it raises an exception upon an error
+    :param names: an object name or an iterable of the names to watch. If None, records of any object match
+    :param messages: a message, a compiled regular expression or an iterable of them. Plain messages are compared
+                     to stripped log messages. If None, any message matches
+    :param bool fault: if True FAULT messages are included, otherwise not. Default is True
+    :param bool info: if True INFO messages are included, otherwise not. Default is True
+    :param bool warning: if True WARNING messages are included, otherwise not. Default is True
+    :param float start: start time since epoch to tail logs from, defaults to the current time
+    :param float end: optional end time since epoch to tail logs till
+    :param str time_key: the record field holding the record time since epoch
+    """
+
+    def __init__(
+            self,
+            read_logs,
+            names=None,
+            messages=None,
+            fault=True,
+            info=True,
+            warning=True,
+            start=None,
+            end=None,
+            time_key=_DEFAULT_TIME_KEY
+    ):
+        self._read_logs = read_logs
+        self._names = self._get_names(names)
+        self._plain_messages, self._patterns = self._get_matchers(messages)
+        self._levels = {'fault': fault, 'info': info, 'warning': warning}
+        self._time_key = time_key
+        self._cursor = round(float(time()), 3) if start is None else start
+        self._end = end
+        # Fingerprints of the returned records stamped with the cursor time
+        self._seen = Counter()
+        self._polls = 0
+        self._received = 0
+        self._new = 0
+        self._matched = 0
+
+    def poll(self) -> list:
+        """
+        Request the records logged since the previous poll. The cursor moves to the time of the newest record,
+        it stays if no record is returned.
+
+        :returns list records: new log records as dictionaries
+        """
+        end = round(float(time()), 3)
+        if self._end is not None:
+            end = min(end, self._end)
+        start = self._cursor
+
+        records = self._read_logs({'start': start, 'end': end, **self._levels}) or []
+        self._polls += 1
+        self._received += len(records)
+        seen = Counter(self._seen)
+        new_records = []
+        newest = None
+        newest_fingerprints = Counter()
+        for rec in records:
+            fingerprint = self._get_fingerprint(rec)
+            at = self._get_time(rec)
+            # Only the records stamped with the window start can be returned by the previous polls
+            if at == start and seen[fingerprint]:
+                seen[fingerprint] -= 1
+            else:
+                new_records.append(rec)
+            if at is None:
+                continue
+            if newest is None or at > newest:
+                newest = at
+                newest_fingerprints = Counter()
+            if at == newest:
+                newest_fingerprints[fingerprint] += 1
+        if newest is not None and newest >= start:
+            self._cursor = newest
+            self._seen = newest_fingerprints
+        self._new += len(new_records)
+        return new_records
+
+    def poll_matches(self) -> list:
+        """
+        Request the records logged since the previous poll and filter them by the names and the messages.
+
+        :returns list matches: list of `LogMatch` namedtuples
+        """
+        matches = []
+        for rec in self.poll():
+            match = self.match(rec)
+            if match is not None:
+                matches.append(match)
+        self._matched += len(matches)
+        return matches
+
+    def wait(self, timeout=60, step_timeout=5):
+        """
+        Wait for a record matching the names and the messages.
+
+        :param float timeout: timeout in seconds to await for the record. Default is 60 seconds
+        :param float step_timeout: step in seconds between log requests. Default is 5 seconds
+        :returns:
+            - match (LogMatch) - the first caught record
+            - None - if there is no such record upon timeout
+        """
+        begin = time()
+        while True:
+            matches = self.poll_matches()
+            if matches:
+                return matches[0]
+            if timeout < time() - begin:
+                return None
+            sleep(step_timeout)
+
+    def match(self, rec: dict):
+        """
+        Check if the record refers to one of the watched objects and contains one of the watched messages.
+
+        :param dict rec: the log record
+        :returns:
+            - match (LogMatch) - the record matches
+            - None - the record does not match
+        """
+        name = rec.get('na')
+        if self._names is not None and name not in self._names:
+            return None
+        message = rec.get('me', '').strip()
+        if self._plain_messages is None:
+            return LogMatch(name, message, rec)
+        if message in self._plain_messages:
+            return LogMatch(name, message, rec)
+        for pattern in self._patterns:
+            if pattern.search(message):
+                return LogMatch(name, message, rec)
+        return None
+
+    def get_cursor(self) -> float:
+        """
+        Get the start time of the next requested window: the time of the newest received record or the initial start.
+
+        :returns float cursor: time since epoch
+        """
+        return self._cursor
+
+    def get_stats(self) -> LogTailerStats:
+        """
+        Get the tailer statistics.
+
+        :returns LogTailerStats: the statistics namedtuple
+        """
+        return LogTailerStats(self._polls, self._received, self._new, self._matched)
+
+    def _get_time(self, rec: dict):
+        """
+        Private method that returns the record time. Do not call it directly.
+
+        :param dict rec: the log record
+        :returns: the time since epoch as float, None if the record has no valid time
+        """
+        try:
+            return float(rec[self._time_key])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _get_fingerprint(rec: dict):
+        """
+        Private method that returns a hashable representation of the record. Do not call it directly.
+
+        :param dict rec: the log record
+        :returns: tuple of the record items or its string representation if some values are not hashable
+        """
+        items = tuple(sorted(rec.items()))
+        try:
+            hash(items)
+        except TypeError:
+            return repr(items)
+        return items
+
+    @staticmethod
+    def _get_names(names):
+        """
+        Private method that converts the names to a set. Do not call it directly.
+
+        :param names: None, a name or an iterable of the names
+        :returns: None or a set of the names
+        """
+        if names is None:
+            return None
+        if isinstance(names, str):
+            return {names}
+        return set(names)
+
+    @staticmethod
+    def _get_matchers(messages):
+        """
+        Private method that splits the messages to a set of plain messages and a list of compiled patterns.
+        Do not call it directly.
+
+        :param messages: None, a message, a compiled pattern or an iterable of them
+        :returns tuple (plain_messages, patterns): None and an empty list if any message matches
+        """
+        if messages is None:
+            return None, []
+        if isinstance(messages, (str, re.Pattern)):
+            messages = [messages]
+        plain_messages = set()
+        patterns = []
+        for message in messages:
+            if isinstance(message, re.Pattern):
+                patterns.append(message)
+            elif isinstance(message, str):
+                plain_messages.add(message.strip())
+            else:
+                raise InvalidOptionsException(f'Log message must be a string or a compiled pattern, got {message}')
+        return plain_messages, patterns
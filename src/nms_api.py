@@ -1,11 +1,15 @@
 # Alternative api driver
-import json
+import threading
 import requests
 import base64
-from json import JSONDecodeError
-from time import sleep, time
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import sleep, time, perf_counter
 from http import HTTPStatus
 
+from src import concurrency_limit, http_session, latency, session_cache
 from src.constants import API_RESTART_COMMAND, API_LOAD_CONFIG_COMMAND, API_RETURN_ALL_COMMAND, \
     API_FORCE_CONFIG_CONTROLLER_COMMAND, API_FORCE_CONFIG_STATION_COMMAND
 from src.exceptions import InvalidOptionsException, DriverInitException, ObjectNotCreatedException, \
@@ -14,6 +18,11 @@ from pathlib import Path
 from collections import namedtuple
 
 from src.nms_entities.has_up_state_object import HasUpState
+from src.tick_clock import TickClock, TickStats
+from src.log_tailer import LogTailer
+from src.transfer import MultipartFileStream
+from src import config_tracker, json_codec
+from src.json_codec import JSONDecodeError
 
 NO_AUTO_ABORT = False
 AUTO_ABORT = True
@@ -23,6 +32,9 @@ _API_OBJECT_READ = 'api/object/get/{}'
 _API_OBJECT_UPDATE = 'api/object/write/{}'
 _API_OBJECT_DELETE = 'api/object/delete/{}'
 _API_LIST_ITEMS = 'api/list/get/{}/list_items={}'
+_API_LIST_SKIP = 'list_skip={}'
+_API_LIST_MAX = 'list_max={}'
+_API_LIST_VARS = 'list_vars={}'
 _API_LOGOUT_PATH = "api/tree/logout/nms=0"
 _API_OBJECT_LOG = 'api/log/get/{}'
 _API_REALTIME = 'api/realtime/get/{}'
@@ -113,1014 +125,2031 @@ _set_realtime_commands = {
     'run profile 1': 'prof 1 run',
 }
 
-# The following variables are global, their values are set to default at each `connect` function call
-_default_timeout = 4
-_auto_abort_on_error = True
-_nms_ip_port = None
-_cookies = None
-_error_code = None
-_error_log = None
-
-
-def connect(url: str, username: str, password: str):
-    """
-    Connect to NMS using the passed URL and the credentials
-
-    >>> connect('http://localhost:8000', 'admin', '12345')
-    Login to NMS located at `localhost:8000` using username `admin` and password `12345`
-
-    :param str url: NMS URL in the following format `http://<ip_address>:<port>`
-    :param str username: NMS username
-    :param str password: NMS password
-    :returns None: this function returns None
-    :raises requests.exceptions.ConnectTimeout: if there is no response from the server
-    :raises DriverInitException: if Http status code is not 200
-    """
-    # Setting global variables to their default values at NMS connection
-    global _cookies
-    global _nms_ip_port
-    global _auto_abort_on_error
-    global _error_code
-    global _error_log
-    global _default_timeout
-    _default_timeout = 3
-    _error_code = None
-    _error_log = None
-    _auto_abort_on_error = True
-    bytes_str = F"{username}:{password}".encode('ascii')
-    bytes_b64 = base64.b64encode(bytes_str)
-    token = bytes_b64.decode('ascii')
-    headers = {
-        'Authorization': F"Basic {token}"
-    }
-    if not url.endswith('/'):
-        url += '/'
-    _nms_ip_port = url
-    resp = requests.get(_nms_ip_port + _API_LOGIN_PATH, headers=headers, timeout=_default_timeout)
-    if HTTPStatus.OK != resp.status_code and _auto_abort_on_error:
-        raise DriverInitException(f'Login unsuccessful: {resp.content}')
-    _cookies = resp.cookies
-
-
-def login(url: str, username: str, password: str):
-    """
-    Alias for `connect` function
-    Login to NMS using the passed URL and the credentials
-
-    >>> login('http://localhost:8000', 'admin', '12345')
-    Login to NMS located at `localhost:8000` using username `admin` and password `12345`
-
-    :param str url: NMS URL in the following format `http://<ip_address>:<port>`
-    :param str username: NMS username
-    :param str password: NMS password
-    :returns None:
-    :raises requests.exceptions.ConnectTimeout: if there is no response from the server
-    :raises DriverInitException: if Http status code is not 200
-    """
-    connect(url, username, password)
-
-
-def logout():
-    """
-    Disconnect from NMS
-
-    :returns None:
-    :raises requests.exceptions.ConnectTimeout: if there is no response from the server
-    :raises DriverInitException: if Http status code is not 200
-    """
-    global _cookies
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    resp = requests.get(_nms_ip_port + _API_LOGOUT_PATH, timeout=_default_timeout)
-    if HTTPStatus.OK != resp.status_code and _auto_abort_on_error:
-        raise NmsErrorResponseException(f'Logout unsuccessful: {resp.content}')
-    _cookies = None
-
-
-def create(parent_table_row: str, new_item: str, params: dict):
-    """
-    Create new NMS object
-
-    >>> create('network:0', 'vno', {'name': 'vno-0'})
-    Create a new item `vno` in network ID 0
-
+# HTTP connection pool settings. Keep-alive connections are reused by all the client's requests
+_DEFAULT_POOL_SIZE = 10
+_DEFAULT_MAX_RETRIES = 0
+_DEFAULT_BACKOFF_FACTOR = 0.1
+
+# Default number of items requested at once by the paged list iterator
+_DEFAULT_PAGE_SIZE = 1000
+
+# Default number of requests sent to NMS at the same time by bulk operations
+_DEFAULT_BULK_CONCURRENCY = 8
+# With the adaptive concurrency a dropped request is sent again up to the number of times,
+# the delay before a retry starts with the value in seconds and doubles with each retry
+_DEFAULT_DROP_RETRIES = 3
+_DROP_RETRY_DELAY = 0.1
+# The requests that can be sent again after they have reached NMS
+_IDEMPOTENT_PATHS = ('api/object/get/', 'api/list/get/', 'api/object/dashboard/')
+BulkResult = namedtuple('BulkResult', 'results errors elapsed rate')
+
+# Result of waiting for states of many objects, `times` are in seconds since the beginning of the awaiting
+WaitResult = namedtuple('WaitResult', 'success times states')
+
+# Opt-in read cache of `get_param` and `get_params`. The entries are keyed by `table:row`,
+# invalidated by writes to the object, by NMS tick change and by TTL
+_DEFAULT_CACHE_TTL = 10
+_DEFAULT_TICK_CHECK_INTERVAL = 0.5
+_NMS_TABLE_ROW = 'nms:0'
+CacheStats = namedtuple('CacheStats', 'hits misses tick_requests saved size')
+
+
+class NmsClient:
+    """
+    Simplified NMS API client. Each client holds its own HTTP session, cookies, settings, read cache and tick clock,
+    therefore, several clients can drive different NMS users or NMS instances at the same time.
+    A client can be shared by threads: the errors of the last request are kept per thread.
+
+    >>> admin = NmsClient()
+    >>> admin.connect('http://localhost:8000', 'admin', '12345')
+    >>> admin.create('nms:0', 'network', {'name': 'net-0'})
+    'network:0'
+
+    The module level functions are bound to the default client, i.e. `nms_api.create` is `NmsClient.create`
+    of the client returned by `get_default_client`.
+    """
+
+    def __init__(self):
+        # The following variables are set to their default values at each `connect` call
+        self._default_timeout = 4
+        self._auto_abort_on_error = True
+        self._nms_ip_port = None
+        self._cookies = None
+        self._username = None
+        self._password = None
+        self._relogin_lock = threading.Lock()
+        # The errors of the last request are stored per thread
+        self._local = threading.local()
+
+        self._pool_size = _DEFAULT_POOL_SIZE
+        self._max_retries = _DEFAULT_MAX_RETRIES
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        self._bulk_concurrency = _DEFAULT_BULK_CONCURRENCY
+        # Opt-in adaptive limit of the requests in flight, see `enable_adaptive_concurrency`
+        self._limiter = None
+        self._drop_retries = _DEFAULT_DROP_RETRIES
+
+        self._cache_enabled = False
+        self._cache_ttl = _DEFAULT_CACHE_TTL
+        self._cache_tick_aware = True
+        self._cache_tick_check_interval = _DEFAULT_TICK_CHECK_INTERVAL
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # Incremented upon each invalidation, a read started before it does not store its reply
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_tick_requests = 0
+        self._last_tick_number = None
+        self._last_tick_checked_at = None
+
+        # Tick clock of the session shared by all the tick awaiting methods
+        self._tick_clock = None
+        self._tick_clock_lock = threading.Lock()
+
+    @property
+    def _error_code(self):
+        return getattr(self._local, 'error_code', None)
+
+    @_error_code.setter
+    def _error_code(self, error_code):
+        self._local.error_code = error_code
+
+    @property
+    def _error_log(self):
+        return getattr(self._local, 'error_log', None)
+
+    @_error_log.setter
+    def _error_log(self, error_log):
+        self._local.error_log = error_log
+
+    def connect(self, url: str, username: str, password: str):
+        """
+        Connect to NMS using the passed URL and the credentials
+
+        >>> connect('http://localhost:8000', 'admin', '12345')
+        Login to NMS located at `localhost:8000` using username `admin` and password `12345`
+
+        :param str url: NMS URL in the following format `http://<ip_address>:<port>`
+        :param str username: NMS username
+        :param str password: NMS password
+        :returns None: this function returns None
+        :raises requests.exceptions.ConnectTimeout: if there is no response from the server
+        :raises DriverInitException: if Http status code is not 200
+        """
+        # Setting the client variables to their default values at NMS connection
+        self._default_timeout = 3
+        self._error_code = None
+        self._error_log = None
+        self._auto_abort_on_error = True
+        if not url.endswith('/'):
+            url += '/'
+        self._nms_ip_port = url
+        self._username = username
+        self._password = password
+        self.clear_cache()
+        self.reset_tick_clock()
+        session = self._get_session()
+        # The cookies cached by another client or process are reused if the session cache is enabled
+        self._cookies = session_cache.acquire(url, username, self._login, self._validate_cookies)
+        if session_cache.is_enabled():
+            session_cache.install_relogin(session, self._relogin)
+
+    def login(self, url: str, username: str, password: str):
+        """
+        Alias for `connect` function
+        Login to NMS using the passed URL and the credentials
+
+        >>> login('http://localhost:8000', 'admin', '12345')
+        Login to NMS located at `localhost:8000` using username `admin` and password `12345`
+
+        :param str url: NMS URL in the following format `http://<ip_address>:<port>`
+        :param str username: NMS username
+        :param str password: NMS password
+        :returns None:
+        :raises requests.exceptions.ConnectTimeout: if there is no response from the server
+        :raises DriverInitException: if Http status code is not 200
+        """
+        self.connect(url, username, password)
+
+    def logout(self):
+        """
+        Disconnect from NMS
+
+        :returns None:
+        :raises requests.exceptions.ConnectTimeout: if there is no response from the server
+        :raises DriverInitException: if Http status code is not 200
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        session = self._get_session()
+        resp = session.get(self._nms_ip_port + _API_LOGOUT_PATH, timeout=self._default_timeout)
+        if HTTPStatus.OK != resp.status_code and self._auto_abort_on_error:
+            raise NmsErrorResponseException(f'Logout unsuccessful: {resp.content}')
+        session.cookies.clear()
+        if self._cookies is not None:
+            session_cache.invalidate(self._nms_ip_port, self._username, self._cookies)
+        self._cookies = None
+
+    def create(self, parent_table_row: str, new_item: str, params: dict):
+        """
+        Create new NMS object
+
+        >>> create('network:0', 'vno', {'name': 'vno-0'})
+        Create a new item `vno` in network ID 0
+
+
+        :param str parent_table_row: describes parent object as `<parent_table>:<row>`
+        :param str new_item: name of a new item to create
+        :param dict params: parameters of the new item that are used to create it
+        :returns str trow: the ID of the created item in the following format `<new_item_table>:<row>`
+        :returns None: if auto_abort_on_error is off but there is an error upon creating an object
+        :raises ObjectNotCreatedException: if auto_abort_on_error is on and there is an error upon creation an object
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        if len(parent_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong parent table row format')
+        if not isinstance(params, dict) and self._auto_abort_on_error:
+            raise InvalidOptionsException('Parameters must be passed as a dictionary')
+        reply = self._post(_API_OBJECT_CREATE.format(parent_table_row.replace(':', '='), new_item), params)
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise ObjectNotCreatedException(f'`{new_item}` is not created in `{parent_table_row}`. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        trow = f'{new_item}:{reply.get("%row")}'
+        return trow
+
+    def update(self, object_table_row: str, params: dict):
+        """
+        Update NMS object
+
+        >>> update('vno:0', {'name': 'vno-5'})
+        Apply new name `vno-5` to vno ID 0
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param dict params: parameters which are applied to the object
+        :returns str object_table_row: if update is succeeded
+        :returns None: if auto_abort_on_error is off but there is an error upon creating an object
+        :raises ObjectNotUpdatedException: if auto_abort_on_error is on and there is an error upon creation an object
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if not isinstance(params, dict) and self._auto_abort_on_error:
+            raise InvalidOptionsException('Parameters must be passed as a dictionary')
+        self._post(_API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')), params)
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise ObjectNotUpdatedException(f'`{object_table_row}` is not updated. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        return object_table_row
+
+    def read(self, object_table_row: str):
+        """
+        Read NMS object
+
+        >>> read('station:0')
+        Get station ID 0 parameters
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns None: if auto_abort_on_error is off but there is an error upon getting object data
+        :returns dict reply: a dictionary containing parameters of the object
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon reading an object
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        reply = self._post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        return reply
 
-    :param str parent_table_row: describes parent object as `<parent_table>:<row>`
-    :param str new_item: name of a new item to create
-    :param dict params: parameters of the new item that are used to create it
-    :returns str trow: the ID of the created item in the following format `<new_item_table>:<row>`
-    :returns None: if auto_abort_on_error is off but there is an error upon creating an object
-    :raises ObjectNotCreatedException: if auto_abort_on_error is on and there is an error upon creation an object
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    if len(parent_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong parent table row format')
-    if not isinstance(params, dict) and _auto_abort_on_error:
-        raise InvalidOptionsException('Parameters must be passed as a dictionary')
-    reply = _post(_API_OBJECT_CREATE.format(parent_table_row.replace(':', '='), new_item), params)
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise ObjectNotCreatedException(f'`{new_item}` is not created in `{parent_table_row}`. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+    def delete(self, object_table_row: str, recursive: bool = False):
+        """
+        Delete NMS object
+
+        >>> delete('network:0')
+        Delete network ID 0
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param bool recursive: True to apply recursive deletion, otherwise False
+        :returns bool: True if deletion is succeeded, otherwise False
+        :raises ObjectNotCreatedException: if auto_abort_on_error is on and there is an error upon creation an object
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if recursive:
+            params = {'recursive': 1}
         else:
-            return None
-    trow = f'{new_item}:{reply.get("%row")}'
-    return trow
-
-
-def update(object_table_row: str, params: dict):
-    """
-    Update NMS object
-
-    >>> update('vno:0', {'name': 'vno-5'})
-    Apply new name `vno-5` to vno ID 0
+            params = {}
+        self._post(_API_OBJECT_DELETE.format(object_table_row.replace(':', '=')), params)
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` is not deleted. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return False
+        return True
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param dict params: parameters which are applied to the object
-    :returns str object_table_row: if update is succeeded
-    :returns None: if auto_abort_on_error is off but there is an error upon creating an object
-    :raises ObjectNotUpdatedException: if auto_abort_on_error is on and there is an error upon creation an object
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if not isinstance(params, dict) and _auto_abort_on_error:
-        raise InvalidOptionsException('Parameters must be passed as a dictionary')
-    _post(_API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')), params)
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise ObjectNotUpdatedException(f'`{object_table_row}` is not updated. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
-        else:
+    def get_param(self, object_table_row: str, param_name: str) -> object:
+        """
+        Get the value of the passed parameter for the passed `table_row`
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str param_name: the name of the parameter to get the value from
+        :returns:
+            - param_value - the value of the parameter
+            - None - if such parameter is not found
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the parameter
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        reply = self._read(object_table_row)
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        try:
+            for key, value in reply.items():
+                if key == param_name:
+                    return value
+        except AttributeError:
             return None
-    return object_table_row
-
-
-def read(object_table_row: str):
-    """
-    Read NMS object
-
-    >>> read('station:0')
-    Get station ID 0 parameters
+        return None
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :returns None: if auto_abort_on_error is off but there is an error upon getting object data
-    :returns dict reply: a dictionary containing parameters of the object
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon reading an object
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    reply = _post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
-        else:
+    def get_uprow(self, object_table_row: str):
+        """
+        Get the uprow of the object
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns:
+            - uprow - the uprow of the object
+            - None - if such parameter is not found
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the uprow
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        reply = self._post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        try:
+            for key, value in reply.items():
+                if key == 'uprow' and isinstance(value, str) and len(value.split()) > 1:
+                    return value.split()[0]
+        except AttributeError:
             return None
-    return reply
-
-
-def delete(object_table_row: str, recursive: bool = False):
-    """
-    Delete NMS object
+        return None
 
-    >>> delete('network:0')
-    Delete network ID 0
+    def auto_abort_on_error(self, abort=True):
+        """
+        Set behavior of the API driver
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param bool recursive: True to apply recursive deletion, otherwise False
-    :returns bool: True if deletion is succeeded, otherwise False
-    :raises ObjectNotCreatedException: if auto_abort_on_error is on and there is an error upon creation an object
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if recursive:
-        params = {'recursive': 1}
-    else:
-        params = {}
-    _post(_API_OBJECT_DELETE.format(object_table_row.replace(':', '=')), params)
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` is not deleted. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+        :param bool abort: if True no exceptions will be thrown upon CRUD operations
+        """
+        if abort:
+            self._auto_abort_on_error = True
         else:
-            return False
-    return True
+            self._auto_abort_on_error = False
 
-
-def get_param(object_table_row: str, param_name: str) -> object:
-    """
-    Get the value of the passed parameter for the passed `table_row`
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str param_name: the name of the parameter to get the value from
-    :returns:
-        - param_value - the value of the parameter
-        - None - if such parameter is not found
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the parameter
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    reply = _post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+    def get_next_error(self):
+        if isinstance(self._error_log, requests.exceptions.ConnectionError):
+            error_log = str(self._error_log)
         else:
+            error_log = self._error_log
+        error_code = self._error_code
+        self._error_log = None
+        self._error_code = None
+        current_errors = namedtuple('errors', 'code log')
+        return current_errors(error_code, error_log)
+
+    def load_config(self, config_name, local=True, progress=None):
+        """
+        Load and apply config to NMS.
+
+        >>> load_config('default_config.txt')
+        Upload and apply config `default_config.txt` to NMS
+
+        The upload is skipped if NMS already holds the same file uploaded before, the reload is skipped
+        if NMS runs the config and it is not changed since then (see `src.config_tracker`).
+
+        :param str config_name: the name of the config file to apply
+        :param bool local: if True (by default) the backup is uploaded from a local machine in the first place
+        :param callable progress: optional function called as `progress(uploaded_bytes, total_bytes)` upon uploading
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        digest = None
+        upload_skipped = False
+        if local:
+            digest = config_tracker.get_digest(self._get_config_path(config_name))
+            file_info = self._get_config_info(config_name)
+            if config_tracker.can_skip_upload(self._nms_ip_port, config_name, digest, file_info):
+                upload_skipped = True
+            else:
+                st_time = perf_counter()
+                self._upload_config(config_name, progress)
+                config_tracker.uploaded(
+                    self._nms_ip_port, config_name, digest, self._get_config_info(config_name), perf_counter() - st_time
+                )
+        reload_skipped = config_tracker.can_skip_reload(self._nms_ip_port, config_name, digest, self._get_load_time())
+        if not reload_skipped:
+            st_time = perf_counter()
+            load_time = self._apply_config(config_name)
+            config_tracker.applied(self._nms_ip_port, config_name, digest, load_time, perf_counter() - st_time)
+        config_tracker.loaded(config_name, upload_skipped, reload_skipped)
+
+    def search_by_name(self, parent_table_row: str, object_type: str, name: str):
+        """
+        Get an object table row by its name.
+
+        :param str parent_table_row: the name of a table to perform search in
+        :param str object_type: the type of the searched object
+        :param str name: the name of an object to find
+        :returns:
+            - `object_table_row` - if the object with the passed name is found
+            - None - if the object with the given name is not found
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        if len(parent_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong parent table row format')
+        parent_table_row = parent_table_row.replace(':', '=')
+        resp = self._post(_API_LIST_ITEMS.format(parent_table_row, object_type), {})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get list of `{name}` in `{parent_table_row}`'
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        try:
+            for obj in resp:
+                for inner_key, inner_value in obj.items():
+                    if inner_key == 'name' and inner_value == name:
+                        object_table_row = f'{object_type}:{obj.get("%row", None)}'
+                        return object_table_row
+        except AttributeError:
             return None
-    try:
-        for key, value in reply.items():
-            if key == param_name:
-                return value
-    except AttributeError:
         return None
-    return None
 
+    def set_timeout(self, timeout=3):
+        """
+        Set requests timeout of the client
+
+        :param int timeout: number of seconds to wait for both connection establishment and response
+        """
+        self._default_timeout = timeout
+
+    def set_pool(self, pool_size: int = _DEFAULT_POOL_SIZE, max_retries: int = _DEFAULT_MAX_RETRIES):
+        """
+        Configure the pool of keep-alive HTTP connections used by the client.
+        The current session is closed, the next request opens a new one with the passed settings.
+
+        >>> set_pool(pool_size=20, max_retries=3)
+        Keep up to 20 connections to NMS open and retry failed connection attempts 3 times
+
+        :param int pool_size: max number of connections kept open to NMS
+        :param int max_retries: number of retries of failed connection attempts. Requests that have reached NMS
+                                are never retried as they are not guaranteed to be idempotent
+        :raises InvalidOptionsException: if pool_size is less than 1 or max_retries is negative
+        """
+        if pool_size < 1:
+            raise InvalidOptionsException('Pool size must be a positive integer')
+        if max_retries < 0:
+            raise InvalidOptionsException('Number of retries cannot be negative')
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self.close_session()
+
+    def _login(self):
+        """
+        ! Private method - Do not call it directly! Log in to NMS using the credentials passed to `connect`.
+
+        :returns RequestsCookieJar cookies: the session cookies
+        :raises DriverInitException: if Http status code is not 200 and auto_abort_on_error is on
+        """
+        token = base64.b64encode(F"{self._username}:{self._password}".encode('ascii')).decode('ascii')
+        session = self._get_session()
+        resp = session.get(
+            self._nms_ip_port + _API_LOGIN_PATH,
+            headers={'Authorization': F"Basic {token}"},
+            timeout=self._default_timeout
+        )
+        if HTTPStatus.OK != resp.status_code and self._auto_abort_on_error:
+            raise DriverInitException(f'Login unsuccessful: {resp.content}')
+        # Cookies are passed explicitly to each request, the session jar must not keep them after logout
+        session.cookies.clear()
+        return resp.cookies
+
+    def _validate_cookies(self, cookies) -> bool:
+        """
+        ! Private method - Do not call it directly! Check if NMS accepts the cached cookies.
+        """
+        return session_cache.validate_cookies(self._get_session(), self._nms_ip_port, cookies, self._default_timeout)
+
+    def _relogin(self, rejected: dict):
+        """
+        ! Private method - Do not call it directly! Log in again after NMS has rejected the cookies by 401.
+
+        :param dict rejected: the rejected cookies
+        :returns: the new cookies, None if the client is logged out
+        """
+        with self._relogin_lock:
+            if self._cookies is None or self._username is None:
+                return None
+            # Another thread has already logged in again
+            if dict(self._cookies) != rejected:
+                return self._cookies
+            session_cache.invalidate(self._nms_ip_port, self._username, self._cookies)
+            self._cookies = session_cache.acquire(self._nms_ip_port, self._username, self._login,
+                                                  self._validate_cookies)
+            return self._cookies
+
+    def close_session(self):
+        """
+        Close the HTTP session and all its pooled connections. The next request opens a new session.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _get_session(self):
+        """
+        ! Private method - Do not call it directly! Get the client HTTP session, create it if needed.
+        The threads of a bulk operation get the session of the batch.
+
+        :returns requests.Session session: the session holding the pool of keep-alive connections to NMS
+        """
+        thread_session = getattr(self._local, 'session', None)
+        if thread_session is not None:
+            return thread_session
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session(self._pool_size, self._max_retries)
+                if session_cache.is_enabled():
+                    session_cache.install_relogin(self._session, self._relogin)
+            return self._session
+
+    def _set_thread_session(self, session):
+        """
+        ! Private method - Do not call it directly! Set the session used by the calling thread instead of
+        the client session, None to use the client session.
+        """
+        self._local.session = session
+
+    @staticmethod
+    def _create_session(pool_size: int, max_retries: int):
+        """
+        ! Private method - Do not call it directly! Create a new HTTP session with a tuned connection pool.
+
+        :param int pool_size: max number of connections kept open to NMS
+        :param int max_retries: number of retries of failed connection attempts
+        :returns requests.Session session: a new session
+        """
+        retries = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=0,
+            backoff_factor=_DEFAULT_BACKOFF_FACTOR,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries, pool_block=False)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+        return http_session.mount(session)
+
+    def enable_cache(self, ttl: float = _DEFAULT_CACHE_TTL, tick_aware: bool = True,
+                     tick_check_interval: float = _DEFAULT_TICK_CHECK_INTERVAL):
+        """
+        Enable read cache of `get_param` and `get_params`. A cached object is downloaded again if it is written
+        via this client, if its entry is older than `ttl` seconds, or if NMS tick number has changed.
+
+        >>> enable_cache(ttl=30)
+        >>> get_param('controller:0', 'tx_frq')  # the object is downloaded
+        >>> get_param('controller:0', 'tx_sr')  # the object is taken from the cache if the tick is the same
+
+        :param float ttl: max age of a cache entry in seconds
+        :param bool tick_aware: if True the entries are invalidated upon NMS tick number change
+        :param float tick_check_interval: the tick number is requested not more often than once per the interval seconds
+        :raises InvalidOptionsException: if ttl or tick_check_interval is negative
+        """
+        if ttl < 0 or tick_check_interval < 0:
+            raise InvalidOptionsException('Cache TTL and tick check interval cannot be negative')
+        self._cache_ttl = ttl
+        self._cache_tick_aware = tick_aware
+        self._cache_tick_check_interval = tick_check_interval
+        self._cache_enabled = True
+        self.clear_cache()
+
+    def disable_cache(self):
+        """
+        Disable read cache of `get_param` and `get_params`. The cached entries are dropped.
+        """
+        self._cache_enabled = False
+        self.clear_cache()
+
+    def clear_cache(self, object_table_row: str = None):
+        """
+        Drop cached entries
+
+        :param str object_table_row: the object to drop as `<object_table>:<row>`. If None, all the entries are dropped
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            if object_table_row is None:
+                self._cache.clear()
+                self._last_tick_number = None
+                self._last_tick_checked_at = None
+            else:
+                self._cache.pop(object_table_row, None)
+
+    def get_cache_stats(self):
+        """
+        Get read cache counters. `saved` is the number of round trips to NMS saved by the cache,
+        i.e. cache hits minus the requests of the tick number.
+
+        :returns CacheStats stats: namedtuple containing hits, misses, tick_requests, saved, and size
+        """
+        with self._cache_lock:
+            return CacheStats(
+                self._cache_hits, self._cache_misses, self._cache_tick_requests,
+                self._cache_hits - self._cache_tick_requests, len(self._cache)
+            )
+
+    def reset_cache_stats(self):
+        """
+        Set read cache counters to zero
+        """
+        with self._cache_lock:
+            self._cache_hits = 0
+            self._cache_misses = 0
+            self._cache_tick_requests = 0
+
+    def _read(self, object_table_row: str):
+        """
+        ! Private method - Do not call it directly! Read NMS object using the read cache if it is enabled.
+        The error variables are set the same way as `_post` sets them.
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns reply: the object parameters
+        """
+        # NMS object holds the tick number, it is always read from NMS
+        if not self._cache_enabled or object_table_row == _NMS_TABLE_ROW:
+            return self._post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
+        reply = self._cache_get(object_table_row)
+        if reply is not None:
+            with self._cache_lock:
+                self._cache_hits += 1
+            self._error_code = 0
+            self._error_log = ''
+            return reply.copy()
+        with self._cache_lock:
+            self._cache_misses += 1
+            generation = self._cache_generation
+        tick_number = self._get_tick_number() if self._cache_tick_aware else None
+        reply = self._post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
+        if self._error_log == '' and not self._error_code and isinstance(reply, dict):
+            with self._cache_lock:
+                # A write completed while the object was read, the reply can hold the values before the write
+                if generation == self._cache_generation:
+                    self._cache[object_table_row] = (reply.copy(), tick_number, time())
+        return reply
 
-def get_uprow(object_table_row: str):
-    """
-    Get the uprow of the object
+    def _cache_get(self, object_table_row: str):
+        """
+        ! Private method - Do not call it directly! Get a valid cache entry.
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :returns:
-        - uprow - the uprow of the object
-        - None - if such parameter is not found
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the uprow
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    reply = _post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
-        else:
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns dict reply: the cached object parameters, None if there is no valid entry
+        """
+        with self._cache_lock:
+            entry = self._cache.get(object_table_row)
+        if entry is None:
             return None
-    try:
-        for key, value in reply.items():
-            if key == 'uprow' and isinstance(value, str) and len(value.split()) > 1:
-                return value.split()[0]
-    except AttributeError:
-        return None
-    return None
-
-
-def auto_abort_on_error(abort=True):
-    """
-    Set behavior of the API driver
-
-    :param bool abort: if True no exceptions will be thrown upon CRUD operations
-    """
-    global _auto_abort_on_error
-    if abort:
-        _auto_abort_on_error = True
-    else:
-        _auto_abort_on_error = False
-
-
-def get_next_error():
-    global _error_code
-    global _error_log
-    if isinstance(_error_log, requests.exceptions.ConnectionError):
-        error_log = str(_error_log)
-    else:
-        error_log = _error_log
-    error_code = _error_code
-    _error_log = None
-    _error_code = None
-    current_errors = namedtuple('errors', 'code log')
-    return current_errors(error_code, error_log)
-
-
-def load_config(config_name, local=True):
-    """
-    Load and apply config to NMS.
-
-    >>> load_config('default_config.txt')
-    Upload and apply config `default_config.txt` to NMS
-
-    :param str config_name: the name of the config file to apply
-    :param bool local: if True (by default) the backup is uploaded from a local machine in the first place
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    if local:
-        _upload_config(config_name)
-    _apply_config(config_name)
-
+        reply, tick_number, stored_at = entry
+        if time() - stored_at > self._cache_ttl:
+            return None
+        if self._cache_tick_aware:
+            current_tick = self._get_tick_number()
+            if current_tick is None or current_tick != tick_number:
+                return None
+        return reply
 
-def search_by_name(parent_table_row: str, object_type: str, name: str):
-    """
-    Get an object table row by its name.
-
-    :param str parent_table_row: the name of a table to perform search in
-    :param str object_type: the type of the searched object
-    :param str name: the name of an object to find
-    :returns:
-        - `object_table_row` - if the object with the passed name is found
-        - None - if the object with the given name is not found
-    """
-    global _error_code
-    global _error_log
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    if len(parent_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong parent table row format')
-    parent_table_row = parent_table_row.replace(':', '=')
-    resp = _post(_API_LIST_ITEMS.format(parent_table_row, object_type), {})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'Cannot get list of `{name}` in `{parent_table_row}`'
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+    def _get_tick_number(self):
+        """
+        ! Private method - Do not call it directly! Get NMS tick number.
+        The value is requested not more often than once per `_cache_tick_check_interval` seconds.
+
+        :returns int tick_number: the current NMS tick number, None if it cannot be obtained
+        """
+        with self._cache_lock:
+            checked_at = self._last_tick_checked_at
+            if checked_at is not None and time() - checked_at < self._cache_tick_check_interval:
+                return self._last_tick_number
+            self._cache_tick_requests += 1
+        # The lock is not held during the request, the threads checking the tick at the same time request it each
+        reply, error_code, error_log = self._request(_API_OBJECT_READ.format(_NMS_TABLE_ROW.replace(':', '=')), {})
+        if error_log != '' or error_code or not isinstance(reply, dict):
+            tick_number = None
         else:
+            tick_number = reply.get('tick_number')
+        with self._cache_lock:
+            self._last_tick_number = tick_number
+            self._last_tick_checked_at = time()
+        return tick_number
+
+    def _invalidate_cache(self, path: str):
+        """
+        ! Private method - Do not call it directly! Drop the cache entries that can be changed by the request.
+        It is called once the request is completed, the reads in flight then do not store the values before it.
+
+        :param str path: relative path of the request
+        """
+        if not self._cache_enabled or not path.startswith(('api/object/write/', 'api/object/delete/')):
+            return
+        parts = path.split('/')
+        if len(parts) < 4 or path.startswith('api/object/delete/') or 'command=' in path:
+            # Deletion can be recursive, commands can change anything including the whole config
+            self.clear_cache()
+            return
+        # Both the object itself and the parent of a new item are invalidated
+        self.clear_cache(parts[3].replace('=', ':'))
+
+    def _upload_config(self, config_name, progress=None):
+        """
+        ! Private method - Do not call it directly! Upload a config `config_name` to NMS.
+        The file is streamed by chunks.
+
+        :param str config_name: name of the config file to upload
+        :param callable progress: optional function called as `progress(uploaded_bytes, total_bytes)`
+        :raises JSONDecodeError: if there is any error upon applying the config or applying is timed out
+        :raises FileNotFoundError: if the config file is not found
+        """
+        # Should not happen if the function is not called directly by the user
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        with MultipartFileStream('config', self._get_config_path(config_name), progress=progress) as stream:
+            resp = self._get_session().post(
+                self._nms_ip_port + 'api/fs/upload/nms=0',
+                data=stream,
+                headers={'Content-Type': stream.content_type},
+                cookies=self._cookies
+            )
+            error = None
+            if HTTPStatus.OK != resp.status_code:
+                error = F"{resp.status_code} : {resp.reason}"
+            elif 0 == len(resp.content):
+                error = 'Empty response body'
+            else:
+                try:
+                    result_obj = json_codec.loads(resp.content)
+                    if 0 != result_obj['error_code']:
+                        error = result_obj['error_log']
+                except JSONDecodeError:
+                    error = 'Invalid json in response'
+                except KeyError:
+                    error = 'Not found error_code in response'
+            if self._auto_abort_on_error and error is not None:
+                raise ValueError(error)
+
+    @staticmethod
+    def _get_config_path(config_name):
+        """
+        ! Private method - Do not call it directly! Get the path to a local config.
+
+        :param str config_name: name of the config file
+        :returns Path path: the absolute path to the config in nms_backups folder
+        """
+        return (Path(__file__).parent / '../nms_backups' / config_name).resolve()
+
+    def _get_config_info(self, config_name):
+        """
+        ! Private method - Do not call it directly! Get the description of the config file stored in NMS.
+
+        :param str config_name: name of the config file
+        :returns dict info: the file description containing `size` and `date`, None if it cannot be obtained
+        """
+        reply, error_code, error_log = self._request('api/fs/content/nms=0/path=/config/', {'dir': 'config'})
+        if error_log != '' or error_code or not isinstance(reply, list):
             return None
-    try:
-        for obj in resp:
-            for inner_key, inner_value in obj.items():
-                if inner_key == 'name' and inner_value == name:
-                    object_table_row = f'{object_type}:{obj.get("%row", None)}'
-                    return object_table_row
-    except AttributeError:
+        for file_info in reply:
+            if file_info.get('name') == config_name:
+                return file_info
         return None
-    return None
-
-
-def set_timeout(timeout=3):
-    """
-    Set requests driver global timeout
-
-    :param int timeout: number of seconds to wait for both connection establishment and response
-    """
-    global _default_timeout
-    _default_timeout = timeout
 
+    def _get_load_time(self):
+        """
+        ! Private method - Do not call it directly! Get `load_time` value of NMS ignoring errors.
 
-def _upload_config(config_name):
-    """
-    ! Private function - Do not call it directly! Upload a config `config_name` to NMS.
-
-    :param str config_name: name of the config file to upload
-    :raises JSONDecodeError: if there is any error upon applying the config or applying is timed out
-    :raises FileNotFoundError: if the config file is not found
-    """
-    # Should not happen if the function is not called directly by the user
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    with open((Path(__file__).parent / '../nms_backups' / config_name).resolve(), 'rb') as f:
-        files = {'config': f}
-        resp = requests.post(
-            _nms_ip_port + 'api/fs/upload/nms=0',
-            files=files,
-            cookies=_cookies
-        )
-        error = None
-        if HTTPStatus.OK != resp.status_code:
-            error = F"{resp.status_code} : {resp.reason}"
-        elif 0 == len(resp.content):
-            error = 'Empty response body'
-        else:
-            try:
-                result_obj = json.loads(resp.content)
-                if 0 != result_obj['error_code']:
-                    error = result_obj['error_log']
-            except JSONDecodeError:
-                error = 'Invalid json in response'
-            except KeyError:
-                error = 'Not found error_code in response'
-        if _auto_abort_on_error and error is not None:
-            raise ValueError(error)
-
-
-def _apply_config(config_name):
-    """
-    ! Private function - Do not call it directly! Apply the loaded config `config_name` to NMS.
-
-    :param str config_name: name of the config file to apply
-    :raises ValueError: if there is any error upon applying the config or applying is timed out
-    """
-    # Should not happen if the function is not called directly by the user
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    # global _error_log
-    # global _error_code
-    start_time = _get_start_time()
-    _post(
-        f'api/object/write/nms=0/command={API_LOAD_CONFIG_COMMAND}',
-        {'load_filename': config_name}
-    )
-    if _error_log != '':
-        raise ValueError(f'Cannot apply config. Reason: {_error_log}')
-    sleep(2)
-    for i in range(1, 50):
-        sleep(0.5)
-        # In some cases there is 403 after config load : Forbidden error, therefore, ignoring it
+        :returns int result: Load time value of NMS, None if it cannot be obtained
+        """
         try:
-            new_time = _get_start_time()
-            if new_time and start_time != new_time:
-                return
+            return self._get_start_time()
         except ValueError:
-            continue
-    if _auto_abort_on_error:
-        raise ValueError('Config load error')
-
-
-def _post(path: str, data: dict):
-    """
-    ! Private function - Do not call it directly! Calls POST request with the passed parameters
+            return None
 
-    :param str path: relative path to execute POST request
-    :param dict data: POST payload
-    :returns tuple (result, error): the response to POST request and any errors
-    :raises JSONDecodeError: if the response contains a non-valid JSON
-    :raises KeyError: if there is no error_log in the response
-    """
-    # Should not happen if the function is not called directly by the user
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    # handling non-ascii characters in the payload
-    data = json.dumps(data, ensure_ascii=False)
-    encoded_data = data.encode('utf-8')
-    reply = None
-    global _error_code
-    global _error_log
-    _error_code = None
-    _error_log = None
-
-    try:
-        resp = requests.post(
-            _nms_ip_port + path,
-            data=encoded_data,
-            cookies=_cookies,
-            timeout=_default_timeout
+    def _apply_config(self, config_name):
+        """
+        ! Private method - Do not call it directly! Apply the loaded config `config_name` to NMS.
+
+        :param str config_name: name of the config file to apply
+        :returns int load_time: NMS load time after the config has been applied, None if applying is timed out
+        :raises ValueError: if there is any error upon applying the config or applying is timed out
+        """
+        # Should not happen if the function is not called directly by the user
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        # global _error_log
+        # global _error_code
+        start_time = self._get_start_time()
+        self._post(
+            f'api/object/write/nms=0/command={API_LOAD_CONFIG_COMMAND}',
+            {'load_filename': config_name}
         )
-
-        if HTTPStatus.OK != resp.status_code:
-            _error_log = F"{resp.status_code} : {resp.reason}"
-        elif 0 == len(resp.content):
-            _error_log = 'Empty response body'
-        else:
-            try:
-                result_obj = json.loads(resp.content)
-                reply = result_obj.get('reply', None)
-                if reply is None:
-                    _error_log = 'Not found reply in response'
-                _error_log = result_obj.get('error_log', None)
-                if _error_log is None:
-                    _error_log = 'Not found error_log in response'
-                _error_code = result_obj.get('error_code', None)
-                if _error_code is None:
-                    _error_log = 'Not found error_code in response'
-            except JSONDecodeError:
-                _error_log = 'Invalid json in response'
-    # If NMS does not respond to the POST request
-    except requests.exceptions.ConnectionError as exc:
-        _error_log = exc
-    return reply
-
-
-def _get_start_time():
-    """
-    ! Private function - Do not call it directly! Get `load_time` value of NMS
-
-    :returns int result: Load time value of NMS
-    :raises JSONDecodeError: if the response contains a non-valid JSON
-    :raises KeyError: if there is no error_log in the response
-    :raises ValueError: if there is any error in the response
-    """
-    result = None
-    try:
-        resp = requests.get(_nms_ip_port + 'api/object/dashboard/nms=0', cookies=_cookies, timeout=_default_timeout)
-        error = None
-        if HTTPStatus.OK != resp.status_code:
-            error = F"{resp.status_code} : {resp.reason}"
-            # Handle Access denied after loading backup
-            if resp.status_code == 401:
-                return None
-        elif 0 == len(resp.content):
-            error = 'Empty response body'
-        else:
+        if self._error_log != '':
+            raise ValueError(f'Cannot apply config. Reason: {self._error_log}')
+        sleep(2)
+        for i in range(1, 50):
+            sleep(0.5)
+            # In some cases there is 403 after config load : Forbidden error, therefore, ignoring it
             try:
-                result_obj = json.loads(resp.content)
-                if 0 == result_obj['error_code']:
-                    result = result_obj['reply']['load_time']
-                else:
-                    error = result_obj['error_log']
-            except JSONDecodeError:
-                error = 'Invalid json in response'
-            except KeyError:
-                error = 'Not found error_code in response'
-        if error is not None and _auto_abort_on_error:
-            raise ValueError(error)
-    except requests.exceptions.ConnectionError:
-        pass
-    return result
-
-
-def wait_state(object_table_row: str, state: str, *, timeout: int = 30, step_timeout: int = 5):
-    """
-    Wait for desired state (Up, Down etc.) The awaiting is blocking
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str state: the desired state to wait for
-    :param int timeout: the amount of time in seconds to wait the UP state
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if the UP state is reached, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in _valid_states_objects:
-        raise InvalidOptionsException('Invalid object for awaiting state')
-    if state not in HasUpState._valid_states:
-        raise InvalidOptionsException('Invalid expected state is passed')
-    begin = int(time())
-    while True:
-        if get_param(object_table_row, 'state') == state:
-            return True
-        t = int(time())
-        if timeout < t - begin:
-            return False
-        sleep(step_timeout)
-
-
-def wait_not_state(object_table_row: str, not_state: str, *, timeout: int = 30, step_timeout: int = 5):
-    """
-    Wait for a state (Up, Down etc.) to be ANY but not the passed one. The awaiting is blocking
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str not_state: the desired state that is not expected
-    :param int timeout: the amount of time in seconds to wait for ANY but not the passed state
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if ANY of the state is reached, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in _valid_states_objects:
-        raise InvalidOptionsException('Invalid object for awaiting state')
-    if not_state not in HasUpState._valid_states:
-        raise InvalidOptionsException('Invalid expected state is passed')
-    begin = int(time())
-    while True:
-        if get_param(object_table_row, 'state') != not_state:
-            return True
-        t = int(time())
-        if timeout < t - begin:
-            return False
-        sleep(step_timeout)
-
-
-def wait_states(object_table_row: str, states: list, *, timeout: int = 30, step_timeout: int = 5):
-    """
-    Wait for ANY of the desired states (Up, Down etc.) The awaiting is blocking
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param list states: a list of desired states
-    :param int timeout: the amount of time in seconds to wait for one of the states
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if ANY of the passed state is reached, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in _valid_states_objects:
-        raise InvalidOptionsException('Invalid object for awaiting state')
-    for state in states:
-        if state not in HasUpState._valid_states:
-            raise InvalidOptionsException(f'Invalid expected state is passed: {state}')
-    begin = int(time())
-    while True:
-        if get_param(object_table_row, 'state') in states:
-            return True
-        t = int(time())
-        if timeout < t - begin:
-            return False
-        sleep(step_timeout)
-
+                new_time = self._get_start_time()
+                if new_time and start_time != new_time:
+                    return new_time
+            except ValueError:
+                continue
+        if self._auto_abort_on_error:
+            raise ValueError('Config load error')
+        return None
 
-def wait_not_states(object_table_row: str, states: list, *, timeout: int = 30, step_timeout: int = 5):
-    """
-    Wait for ANY state that is not passed (Up, Down etc.) The awaiting is blocking
+    def _post(self, path: str, data: dict):
+        """
+        ! Private method - Do not call it directly! Calls POST request with the passed parameters.
+        The errors of the request are stored in `_error_code` and `_error_log` of the calling thread.
+
+        :param str path: relative path to execute POST request
+        :param dict data: POST payload
+        :returns reply: the reply to POST request
+        """
+        # Should not happen if the function is not called directly by the user
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        self._error_code = None
+        self._error_log = None
+        reply, self._error_code, self._error_log = self._request(path, data)
+        return reply
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param list states: a list of states to avoid
-    :param int timeout: the amount of time in seconds to wait
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if ANY state but passed is reached, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in _valid_states_objects:
-        raise InvalidOptionsException('Invalid object for awaiting state')
-    for state in states:
+    def _request(self, path: str, data: dict):
+        """
+        ! Private method - Do not call it directly! Calls POST request with the passed parameters.
+        Unlike `_post` the error variables are not touched, therefore, the method can be called from any thread.
+        With the adaptive concurrency a dropped read, or a request rejected before NMS has processed it
+        (a connection error before the request is sent or 503 reply), is sent again once the limit is shrunk.
+        The rest of the dropped requests are not guaranteed to be idempotent, their errors are returned.
+
+        :param str path: relative path to execute POST request
+        :param dict data: POST payload
+        :returns tuple (reply, error_code, error_log): the reply to POST request and its errors
+        """
+        config_tracker.note_request(self._nms_ip_port, path)
+        # handling non-ascii characters in the payload
+        encoded_data = json_codec.dumps(data)
+        try:
+            limiter = self._limiter
+            if limiter is None:
+                return self._send(path, encoded_data)[:3]
+            endpoint = latency.get_endpoint(path)
+            idempotent = path.startswith(_IDEMPOTENT_PATHS)
+            for attempt in range(self._drop_retries):
+                try:
+                    reply, error_code, error_log, outcome, rejected = self._send(
+                        path, encoded_data, limiter, endpoint
+                    )
+                    if outcome != concurrency_limit.DROP or not (idempotent or rejected):
+                        return reply, error_code, error_log
+                except requests.exceptions.Timeout:
+                    # NMS could have applied the request before the timeout
+                    if not idempotent:
+                        raise
+                sleep(_DROP_RETRY_DELAY * 2 ** attempt)
+            return self._send(path, encoded_data, limiter, endpoint)[:3]
+        finally:
+            # A failed write can still be applied by NMS
+            self._invalidate_cache(path)
+
+    def _send(self, path: str, encoded_data: bytes, limiter=None, endpoint: str = None):
+        """
+        ! Private method - Do not call it directly! Send POST request once holding a slot of the limiter if it is
+        passed.
+
+        :param str path: relative path to execute POST request
+        :param bytes encoded_data: POST payload encoded to JSON
+        :param AdaptiveLimiter limiter: the limiter of the requests in flight, None if it is disabled
+        :param str endpoint: the endpoint class of the request passed to the limiter
+        :returns tuple (reply, error_code, error_log, outcome, rejected): the reply to POST request, its errors,
+                                                                         the outcome for the limiter, and True
+                                                                         if NMS has not processed the request
+        """
+        reply = None
+        error_code = None
+        error_log = None
+
+        slot = limiter.acquire() if limiter is not None else None
+        outcome = concurrency_limit.DROP
+        rejected = False
+        try:
+            resp = self._get_session().post(
+                self._nms_ip_port + path,
+                data=encoded_data,
+                cookies=self._cookies,
+                timeout=self._default_timeout
+            )
+            if resp.status_code < HTTPStatus.INTERNAL_SERVER_ERROR:
+                outcome = concurrency_limit.SUCCESS if HTTPStatus.OK == resp.status_code else concurrency_limit.ERROR
+            rejected = HTTPStatus.SERVICE_UNAVAILABLE == resp.status_code
+
+            if HTTPStatus.OK != resp.status_code:
+                error_log = F"{resp.status_code} : {resp.reason}"
+            elif 0 == len(resp.content):
+                error_log = 'Empty response body'
+            else:
+                try:
+                    result_obj = json_codec.loads(resp.content)
+                    reply = result_obj.get('reply', None)
+                    if reply is None:
+                        error_log = 'Not found reply in response'
+                    error_log = result_obj.get('error_log', None)
+                    if error_log is None:
+                        error_log = 'Not found error_log in response'
+                    error_code = result_obj.get('error_code', None)
+                    if error_code is None:
+                        error_log = 'Not found error_code in response'
+                except JSONDecodeError:
+                    error_log = 'Invalid json in response'
+                if error_code and outcome == concurrency_limit.SUCCESS:
+                    outcome = concurrency_limit.ERROR
+        # If NMS does not respond to the POST request
+        except requests.exceptions.ConnectionError as exc:
+            error_log = exc
+            # The connection is not established, the request has not been sent
+            reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+            rejected = isinstance(exc, requests.exceptions.ConnectTimeout) or isinstance(reason, NewConnectionError)
+        finally:
+            if slot is not None:
+                limiter.release(slot, outcome, endpoint=endpoint)
+        return reply, error_code, error_log, outcome, rejected
+
+    def _get_start_time(self):
+        """
+        ! Private method - Do not call it directly! Get `load_time` value of NMS
+
+        :returns int result: Load time value of NMS
+        :raises JSONDecodeError: if the response contains a non-valid JSON
+        :raises KeyError: if there is no error_log in the response
+        :raises ValueError: if there is any error in the response
+        """
+        result = None
+        try:
+            resp = self._get_session().get(
+                self._nms_ip_port + 'api/object/dashboard/nms=0',
+                cookies=self._cookies,
+                timeout=self._default_timeout
+            )
+            error = None
+            if HTTPStatus.OK != resp.status_code:
+                error = F"{resp.status_code} : {resp.reason}"
+                # Handle Access denied after loading backup
+                if resp.status_code == 401:
+                    return None
+            elif 0 == len(resp.content):
+                error = 'Empty response body'
+            else:
+                try:
+                    result_obj = json_codec.loads(resp.content)
+                    if 0 == result_obj['error_code']:
+                        result = result_obj['reply']['load_time']
+                    else:
+                        error = result_obj['error_log']
+                except JSONDecodeError:
+                    error = 'Invalid json in response'
+                except KeyError:
+                    error = 'Not found error_code in response'
+            if error is not None and self._auto_abort_on_error:
+                raise ValueError(error)
+        except requests.exceptions.ConnectionError:
+            pass
+        return result
+
+    def wait_state(self, object_table_row: str, state: str, *, timeout: int = 30, step_timeout: int = 5):
+        """
+        Wait for desired state (Up, Down etc.) The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str state: the desired state to wait for
+        :param int timeout: the amount of time in seconds to wait the UP state
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if the UP state is reached, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in _valid_states_objects:
+            raise InvalidOptionsException('Invalid object for awaiting state')
         if state not in HasUpState._valid_states:
-            raise InvalidOptionsException(f'Invalid expected state is passed: {state}')
-    begin = int(time())
-    while True:
-        if get_param(object_table_row, 'state') not in states:
-            return True
-        t = int(time())
-        if timeout < t - begin:
-            return False
-        sleep(step_timeout)
-
-
-def wait_up(object_table_row: str, timeout=30, step_timeout=5):
-    """
-    Wait for UP state. The awaiting is blocking
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param int timeout: the amount of time in seconds to wait the UP state
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if the UP state is reached, otherwise False
-    """
-    return wait_state(object_table_row, HasUpState.UP, timeout=timeout, step_timeout=step_timeout)
-
-
-def wait_fault(object_table_row: str, timeout=30, step_timeout=5):
-    """
-    Wait for FAULT state. The awaiting is blocking
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param int timeout: the amount of time in seconds to wait the UP state
-    :param int step_timeout: the amount of time in seconds between queries of the state
-    :returns bool: True if the UP state is reached, otherwise False
-    """
-    return wait_state(object_table_row, HasUpState.FAULT, timeout=timeout, step_timeout=step_timeout)
+            raise InvalidOptionsException('Invalid expected state is passed')
+        begin = int(time())
+        while True:
+            if self.get_param(object_table_row, 'state') == state:
+                return True
+            t = int(time())
+            if timeout < t - begin:
+                return False
+            sleep(step_timeout)
+
+    def wait_not_state(self, object_table_row: str, not_state: str, *, timeout: int = 30, step_timeout: int = 5):
+        """
+        Wait for a state (Up, Down etc.) to be ANY but not the passed one. The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str not_state: the desired state that is not expected
+        :param int timeout: the amount of time in seconds to wait for ANY but not the passed state
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if ANY of the state is reached, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in _valid_states_objects:
+            raise InvalidOptionsException('Invalid object for awaiting state')
+        if not_state not in HasUpState._valid_states:
+            raise InvalidOptionsException('Invalid expected state is passed')
+        begin = int(time())
+        while True:
+            if self.get_param(object_table_row, 'state') != not_state:
+                return True
+            t = int(time())
+            if timeout < t - begin:
+                return False
+            sleep(step_timeout)
+
+    def wait_states(self, object_table_row: str, states: list, *, timeout: int = 30, step_timeout: int = 5):
+        """
+        Wait for ANY of the desired states (Up, Down etc.) The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param list states: a list of desired states
+        :param int timeout: the amount of time in seconds to wait for one of the states
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if ANY of the passed state is reached, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in _valid_states_objects:
+            raise InvalidOptionsException('Invalid object for awaiting state')
+        for state in states:
+            if state not in HasUpState._valid_states:
+                raise InvalidOptionsException(f'Invalid expected state is passed: {state}')
+        begin = int(time())
+        while True:
+            if self.get_param(object_table_row, 'state') in states:
+                return True
+            t = int(time())
+            if timeout < t - begin:
+                return False
+            sleep(step_timeout)
+
+    def wait_not_states(self, object_table_row: str, states: list, *, timeout: int = 30, step_timeout: int = 5):
+        """
+        Wait for ANY state that is not passed (Up, Down etc.) The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param list states: a list of states to avoid
+        :param int timeout: the amount of time in seconds to wait
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if ANY state but passed is reached, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in _valid_states_objects:
+            raise InvalidOptionsException('Invalid object for awaiting state')
+        for state in states:
+            if state not in HasUpState._valid_states:
+                raise InvalidOptionsException(f'Invalid expected state is passed: {state}')
+        begin = int(time())
+        while True:
+            if self.get_param(object_table_row, 'state') not in states:
+                return True
+            t = int(time())
+            if timeout < t - begin:
+                return False
+            sleep(step_timeout)
+
+    def wait_up(self, object_table_row: str, timeout=30, step_timeout=5):
+        """
+        Wait for UP state. The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param int timeout: the amount of time in seconds to wait the UP state
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if the UP state is reached, otherwise False
+        """
+        return self.wait_state(object_table_row, HasUpState.UP, timeout=timeout, step_timeout=step_timeout)
+
+    def wait_fault(self, object_table_row: str, timeout=30, step_timeout=5):
+        """
+        Wait for FAULT state. The awaiting is blocking
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param int timeout: the amount of time in seconds to wait the UP state
+        :param int step_timeout: the amount of time in seconds between queries of the state
+        :returns bool: True if the UP state is reached, otherwise False
+        """
+        return self.wait_state(object_table_row, HasUpState.FAULT, timeout=timeout, step_timeout=step_timeout)
+
+    def wait_all(self, object_table_rows: list, state, *, timeout: int = 30, step_timeout: float = 1,
+                 parent_table_row: str = None) -> WaitResult:
+        """
+        Wait for all the passed objects to reach the desired state(s). The states of the objects sharing
+        the same parent are polled by a single list request per cycle. The awaiting is blocking.
+
+        >>> res = wait_all([f'station:{i}' for i in range(20)], 'Up', timeout=120)
+        >>> res.success, res.times.get('station:0')
+        (True, 14.2)
+
+        :param list object_table_rows: objects described as `<object_table>:<row>`
+        :param state: the desired state or a list of states
+        :param int timeout: the amount of time in seconds to wait for the states
+        :param float step_timeout: the amount of time in seconds between the polling cycles
+        :param str parent_table_row: the parent of the objects as `<object_table>:<row>`. If None, the parents
+                                     are found out by the objects, a request per parent
+        :returns WaitResult: `success` is True if all the objects have reached the state, `times` contains
+                             the time-to-state of each object (None if not reached), `states` are the last polled ones
+        """
+        return self._wait_many(object_table_rows, state, timeout, step_timeout, all, parent_table_row)
+
+    def wait_any(self, object_table_rows: list, state, *, timeout: int = 30, step_timeout: float = 1,
+                 parent_table_row: str = None) -> WaitResult:
+        """
+        Wait for any of the passed objects to reach the desired state(s). The states of the objects sharing
+        the same parent are polled by a single list request per cycle. The awaiting is blocking.
+
+        :param list object_table_rows: objects described as `<object_table>:<row>`
+        :param state: the desired state or a list of states
+        :param int timeout: the amount of time in seconds to wait for the states
+        :param float step_timeout: the amount of time in seconds between the polling cycles
+        :param str parent_table_row: the parent of the objects as `<object_table>:<row>`. If None, the parents
+                                     are found out by the objects, a request per parent
+        :returns WaitResult: `success` is True if any of the objects has reached the state, `times` contains
+                             the time-to-state of each object (None if not reached), `states` are the last polled ones
+        """
+        return self._wait_many(object_table_rows, state, timeout, step_timeout, any, parent_table_row)
+
+    def _wait_many(self, object_table_rows, state, timeout, step_timeout, condition,
+                   parent_table_row=None) -> WaitResult:
+        """
+        ! Private method - Do not call it directly! Poll the states of the objects grouped by parents
+        until the `condition` (either `all` or `any`) over the reached states is met.
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        states = [state] if isinstance(state, str) else list(state)
+        for _state in states:
+            if _state not in HasUpState._valid_states:
+                raise InvalidOptionsException(f'Invalid expected state is passed: {_state}')
+        for object_table_row in object_table_rows:
+            if len(object_table_row.split(':')) != 2:
+                raise InvalidOptionsException('Wrong object table row format')
+            if object_table_row.split(':')[0] not in _valid_states_objects:
+                raise InvalidOptionsException(f'Invalid object for awaiting state: {object_table_row}')
+
+        groups, singles = self._group_by_parents(object_table_rows, parent_table_row)
+
+        times = {object_table_row: None for object_table_row in object_table_rows}
+        last_states = {object_table_row: None for object_table_row in object_table_rows}
+        begin = perf_counter()
+        while True:
+            for (parent, items), members in groups.items():
+                if all(times[m] is not None for m in members):
+                    continue
+                params = self.get_params_many(parent, items, ['state'])
+                if params is None:
+                    continue
+                for m in members:
+                    last_states[m] = params.get(m, {}).get('state')
+            for object_table_row in singles:
+                if times[object_table_row] is None:
+                    last_states[object_table_row] = self.get_param(object_table_row, 'state')
+            elapsed = perf_counter() - begin
+            for object_table_row, _state in last_states.items():
+                if times[object_table_row] is None and _state in states:
+                    times[object_table_row] = elapsed
+            reached = [t is not None for t in times.values()]
+            if condition(reached):
+                return WaitResult(True, times, last_states)
+            if timeout < elapsed:
+                return WaitResult(False, times, last_states)
+            sleep(step_timeout)
+
+    def _group_by_parents(self, object_table_rows, parent_table_row=None):
+        """
+        ! Private method - Do not call it directly! Group the objects by their parents and tables to get the states
+        of a group by a single list request. The uprow is read only for an object not found in the listed parents,
+        therefore, there is a request of the uprow and a list request per parent.
+
+        :param list object_table_rows: objects described as `<object_table>:<row>`
+        :param str parent_table_row: the parent listed first, None to find out the parents by the objects
+        :returns tuple (groups, singles): a dictionary of `(<parent_table_row>, <items>)` and the objects in it,
+                                          and a list of the objects without uprow polled one by one
+        """
+        singles = [r for r in object_table_rows if r.startswith(f'{_NMS}:')]
+        pending = [r for r in object_table_rows if not r.startswith(f'{_NMS}:')]
+        groups = {}
+
+        def _list(parent, items):
+            rows = self.get_params_many(parent, items, [])
+            if not rows:
+                return []
+            members = [r for r in pending if r in rows]
+            if members:
+                groups[(parent, items)] = members
+            return members
+
+        if parent_table_row is not None:
+            for items in dict.fromkeys(r.split(':')[0] for r in pending):
+                members = set(_list(parent_table_row, items))
+                pending = [r for r in pending if r not in members]
+        while pending:
+            object_table_row = pending[0]
+            uprow = self.get_uprow(object_table_row)
+            members = set(_list(uprow, object_table_row.split(':')[0])) if uprow is not None else set()
+            if object_table_row not in members:
+                singles.append(object_table_row)
+                members.add(object_table_row)
+            pending = [r for r in pending if r not in members]
+        return groups, singles
+
+    def restart(self, timeout=10):
+        """
+        Restart NMS. NMS will be instantly restarted
+
+        :param int timeout: timeout in seconds to get NMS restarted
+        :raises NmsErrorResponseException: if NMS does not respond after restart
+        :returns True: if no exceptions are thrown
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        _path = f'{_API_OBJECT_UPDATE.format("nms=0")}/command={API_RESTART_COMMAND}'
+        self._post(_path, data={})
+        if self._error_log not in ('', None) or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'NMS restart command unsuccessful. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
 
+        sleep(timeout)
+        self.reset_tick_clock()
 
-def restart(timeout=10):
-    """
-    Restart NMS. NMS will be instantly restarted
+        self._post('api/object/dashboard/nms=0', {})
+        if self._error_log not in ('', None) or self._error_code:
+            raise NmsErrorResponseException('NMS is restarted but does not respond')
+        return True
 
-    :param int timeout: timeout in seconds to get NMS restarted
-    :raises NmsErrorResponseException: if NMS does not respond after restart
-    :returns True: if no exceptions are thrown
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    _path = f'{_API_OBJECT_UPDATE.format("nms=0")}/command={API_RESTART_COMMAND}'
-    _post(_path, data={})
-    if _error_log not in ('', None) or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'NMS restart command unsuccessful. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
-        else:
+    def find_active_device(self, sr_controller_table_row: str):
+        """
+        Get table:row of active device in desired sr_controller
+
+        :param str sr_controller_table_row: sr_controller table:row to find active device in
+        :returns str device_table_row: active device table:row or None if no active device found
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        if len(sr_controller_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong sr_controller table row format')
+        if sr_controller_table_row.split(':')[0] != 'sr_controller':
+            raise InvalidOptionsException('Wrong table name, should be sr_controller')
+        path = _API_LIST_ITEMS.format(sr_controller_table_row.replace(':', '='), 'sr_teleport')
+        reply = self._post(path, {})
+        if self._error_log not in ('', None) or self._error_code:
             return None
-
-    sleep(timeout)
-
-    _post('api/object/dashboard/nms=0', {})
-    if _error_log not in ('', None) or _error_code:
-        raise NmsErrorResponseException('NMS is restarted but does not respond')
-    return True
-
-
-def find_active_device(sr_controller_table_row: str):
-    """
-    Get table:row of active device in desired sr_controller
-
-    :param str sr_controller_table_row: sr_controller table:row to find active device in
-    :returns str device_table_row: active device table:row or None if no active device found
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Call `connect` function first')
-    if len(sr_controller_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong sr_controller table row format')
-    if sr_controller_table_row.split(':')[0] != 'sr_controller':
-        raise InvalidOptionsException('Wrong table name, should be sr_controller')
-    path = _API_LIST_ITEMS.format(sr_controller_table_row.replace(':', '='), 'sr_teleport')
-    reply = _post(path, {})
-    if _error_log not in ('', None) or _error_code:
-        return None
-    if reply is not None:
-        for sr_tp in reply:
-            path = _API_LIST_ITEMS.format(f'sr_teleport:{sr_tp.get("%row")}'.replace(':', '='), 'device')
-            reply = _post(path, {})
-            if reply is not None:
-                for dev in reply:
-                    if get_param(f'device:{dev.get("%row")}', 'state') == HasUpState.UP:
-                        return f'device:{dev.get("%row")}'
-
-
-def wait_log_message(
-        object_table_row: str,
-        message=None,
-        fault=True,
-        info=True,
-        warning=True,
-        start=None,
-        end=None,
-        timeout=60,
-        step_timeout=5
-):
-    """
-    Wait for log message to appear in logs. If 'start' is not set, current time is used.
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str message: log message that is expected to be logged. If None, any message is awaited. Default is None
-    :param int timeout: timeout in seconds to await for the message. Default is 60 seconds
-    :param int step_timeout: step in seconds between log queries. Default is 5 seconds
-    :param bool fault: if True FAULT messages are included, otherwise not. Default is True
-    :param bool info: if True INFO messages are included, otherwise not. Default is True
-    :param bool warning: if True WARNING messages are included, otherwise not. Default is True
-    :param int start: start time since epoch to obtain logs
-    :param int end: send time since epoch to obtain logs
-    :returns bool: log message if the expected log message is caught, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    path = _API_OBJECT_LOG.format(object_table_row.replace(':', '='))
-    if start is None:
-        start = round(float(time()), 3)
-    if end is None:
-        end = start + timeout
-    payload = {
-        'start': start,
-        'end': end,
-        'fault': fault,
-        'info': info,
-        'warning': warning,
-    }
-    object_name = get_param(object_table_row, 'name')
-    while True:
-        reply = _post(path, payload)
-        if _error_log in ('', None) and _error_code == 0:
-            for rec in reply:
-                if rec['na'] == object_name:
-                    if message is None:
-                        return f'{rec["na"]} {rec["me"]}'
-                    else:
-                        if rec['me'].strip() == message:
-                            return f'{rec["na"]} {rec["me"].strip()}'
-        else:
-            raise NmsErrorResponseException(f'Cannot get logs: error_code={_error_code}, error={_error_log}')
-        t = int(time())
-        if timeout < t - start:
+        if reply is not None:
+            for sr_tp in reply:
+                path = _API_LIST_ITEMS.format(f'sr_teleport:{sr_tp.get("%row")}'.replace(':', '='), 'device')
+                reply = self._post(path, {})
+                if reply is not None:
+                    for dev in reply:
+                        if self.get_param(f'device:{dev.get("%row")}', 'state') == HasUpState.UP:
+                            return f'device:{dev.get("%row")}'
+
+    def wait_log_message(
+            self,
+            object_table_row: str,
+            message=None,
+            fault=True,
+            info=True,
+            warning=True,
+            start=None,
+            end=None,
+            timeout=60,
+            step_timeout=5
+    ):
+        """
+        Wait for log message to appear in logs. If 'start' is not set, current time is used.
+        Each log request gets only the records logged since the previous request.
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param message: log message that is expected to be logged, a compiled regular expression
+                        or a list of them. If None, any message is awaited. Default is None
+        :param int timeout: timeout in seconds to await for the message. Default is 60 seconds
+        :param int step_timeout: step in seconds between log queries. Default is 5 seconds
+        :param bool fault: if True FAULT messages are included, otherwise not. Default is True
+        :param bool info: if True INFO messages are included, otherwise not. Default is True
+        :param bool warning: if True WARNING messages are included, otherwise not. Default is True
+        :param int start: start time since epoch to obtain logs
+        :param int end: send time since epoch to obtain logs
+        :returns bool: log message if the expected log message is caught, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if start is None:
+            start = round(float(time()), 3)
+        if end is None:
+            end = start + timeout
+        object_name = self.get_param(object_table_row, 'name')
+        tailer = self.get_log_tailer(
+            object_table_row,
+            names=object_name,
+            messages=message,
+            fault=fault,
+            info=info,
+            warning=warning,
+            start=start,
+            end=end,
+        )
+        match = tailer.wait(timeout=timeout, step_timeout=step_timeout)
+        if match is None:
             return False
-        sleep(step_timeout)
-
-
-def get_params(object_table_row):
-    """
-    Get all the parameters and their respective values of the NMS object
+        if message is None:
+            return f'{match.name} {match.record["me"]}'
+        return f'{match.name} {match.message}'
+
+    def get_log_tailer(
+            self,
+            object_table_row: str,
+            names=None,
+            messages=None,
+            fault=True,
+            info=True,
+            warning=True,
+            start=None,
+            end=None
+    ) -> LogTailer:
+        """
+        Get an incremental reader of the object logs. Several objects and messages can be watched at once,
+        i.e. the logs of `nms:0` filtered by the names of a few stations.
+
+        >>> tailer = nms_api.get_log_tailer('vno:0', names=['stn-1', 'stn-2'], messages='Station Up')
+        >>> tailer.wait(timeout=60)
+
+        :param str object_table_row: describes the object which logs are requested as `<object_table>:<row>`
+        :param names: a name or a list of names of the objects to watch. If None, any object is watched
+        :param messages: a message, a compiled regular expression or a list of them. If None, any message matches
+        :param bool fault: if True FAULT messages are included, otherwise not. Default is True
+        :param bool info: if True INFO messages are included, otherwise not. Default is True
+        :param bool warning: if True WARNING messages are included, otherwise not. Default is True
+        :param float start: start time since epoch to obtain logs, defaults to the current time
+        :param float end: optional end time since epoch to obtain logs
+        :returns LogTailer: the tailer
+        :raises InvalidOptionsException: if the object table row format is wrong
+        """
+        if len(object_table_row.split(':')) != 2:
+            raise InvalidOptionsException('Wrong object table row format')
+        path = _API_OBJECT_LOG.format(object_table_row.replace(':', '='))
+
+        def read_logs(payload):
+            reply = self._post(path, payload)
+            if self._error_log not in ('', None) or self._error_code != 0:
+                raise NmsErrorResponseException(
+                    f'Cannot get logs: error_code={self._error_code}, error={self._error_log}'
+                )
+            return reply
+
+        return LogTailer(
+            read_logs,
+            names=names,
+            messages=messages,
+            fault=fault,
+            info=info,
+            warning=warning,
+            start=start,
+            end=end,
+        )
 
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :returns dict params: a dictionary of parameters and their values returned by NMS API for the object
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the parameters
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    reply = _post(_API_OBJECT_READ.format(object_table_row.replace(':', '=')), {})
-
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+    def get_params(self, object_table_row):
+        """
+        Get all the parameters and their respective values of the NMS object
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns dict params: a dictionary of parameters and their values returned by NMS API for the object
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the parameters
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        reply = self._read(object_table_row)
+
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            return reply
         else:
+            return {}
+
+    def wait_next_tick(self, timeout: int = 10, step_timeout: float = 0.1) -> bool:
+        """
+        Wait till the next NMS tick is in place to make sure that the config is sent to controllers.
+        The session tick clock sleeps till the tick is expected and polls the tick number only around it.
+
+        :param int timeout: the parameter is used to terminate the waiting cycle if tick number is not updated
+        :param float step_timeout: the parameter indicates how often the tick number value is requested near the tick
+        :return bool: True if the tick number value is incremented, False is returned upon timeout
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        return self.get_tick_clock().wait_next_tick(timeout=timeout, step_timeout=step_timeout)
+
+    def wait_ticks(self, number=1):
+        """
+        Wait for the desired number of NMS ticks using the session tick clock.
+
+        :param int number: number of ticks to wait
+        :return bool: True if the expected number of ticks passed, False upon timeout
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if number not in range(1, 100):
+            raise InvalidOptionsException(f'Number of ticks to wait must be in range 1 - 100')
+        return self.get_tick_clock().wait_ticks(number)
+
+    def get_tick_clock(self) -> TickClock:
+        """
+        Get the tick clock of the session. The clock is shared by all the tick awaiting functions.
+
+        :returns TickClock: the tick clock
+        """
+        with self._tick_clock_lock:
+            if self._tick_clock is None:
+                self._tick_clock = TickClock(self._read_tick_number)
+            return self._tick_clock
+
+    def get_tick_stats(self) -> TickStats:
+        """
+        Get the tick timing statistics of the session: number of observed ticks, learned tick period and its jitter,
+        number of tick number requests and number of awaiting calls.
+
+        :returns TickStats: the statistics namedtuple
+        """
+        return self.get_tick_clock().get_stats()
+
+    def reset_tick_clock(self):
+        """
+        Forget the learned tick period and the tick statistics of the session.
+        """
+        if self._tick_clock is not None:
+            self._tick_clock.reset()
+
+    def _read_tick_number(self):
+        """
+        ! Private method - Do not call it directly! Request the current NMS tick number for the tick clock.
+
+        :returns int tick_number: the current NMS tick number, None if it cannot be obtained
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the tick
+        """
+        reply, error_code, error_log = self._request(_API_OBJECT_READ.format(_NMS_TABLE_ROW.replace(':', '=')), {})
+        if error_log != '' or error_code or not isinstance(reply, dict):
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get NMS tick number. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
             return None
-    if reply is not None or reply != '':
-        return reply
-    else:
-        return {}
-
-
-def wait_next_tick(timeout: int = 10, step_timeout: float = 0.1) -> bool:
-    """
-    Wait till the next NMS tick is in place to make sure that the config is sent to controllers.
-
-    :param int timeout: the parameter is used to terminate the waiting cycle if tick number is not updated
-    :param float step_timeout: the parameter indicates how often the tick number value is requested
-    :return bool: True if the tick number value is incremented, False is returned upon timeout
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    begin = int(time())
-    tick_number_init = get_param('nms:0', 'tick_number')
-    while True:
-        tick_number = get_param('nms:0', 'tick_number')
-        if tick_number > tick_number_init:
-            # sleep(1)  # Still has to wait a second in order to let UHP process the new config
-            return True
-        t = int(time())
-        if timeout < t - begin:
-            return False
-        sleep(step_timeout)
-
-
-def wait_ticks(number=1):
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if number not in range(1, 100):
-        raise InvalidOptionsException(f'Number of ticks to wait must be in range 1 - 100')
-    for _ in range(number):
-        if not wait_next_tick():
-            return False
-    return True
-
-
-def get_sr_license_options(sr_license_table_row: str):
-    """
-    Get sr_license options as a string
-    Sample output:
-        'OUTR INR DVB 16AP'
-
-    :param str sr_license_table_row: sr_license table:row to get options from
-    :returns str: a string representing sr_license options
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(sr_license_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if sr_license_table_row.split(':')[0] != 'sr_license':
-        raise InvalidOptionsException('Wrong table name, should be sr_license')
-    _options = ' '.join(get_param(sr_license_table_row, 'options').split())
-    return _options
-
-
-def get_realtime(object_table_row: str, command: str):
-    """
-    Get output of realtime command of an NMS object
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str command: realtime command
-    :returns str reply: output of the command
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the output
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in (_CONTROLLER, _STATION, _DEVICE):
-        raise InvalidOptionsException(f'Realtime available for {_CONTROLLER}, {_STATION} and {_DEVICE}')
-    if not isinstance(command, str):
-        raise InvalidOptionsException('Command must be passed as a string')
-    if command.lower() in _get_realtime_commands.keys():
-        command = _get_realtime_commands.get(command.lower())
-    else:
-        command = command.lower()
-    reply = _post(_API_REALTIME.format(object_table_row.replace(':', '=')), {'command': command, 'control': 0})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` realtime {command} cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+        return reply.get('tick_number')
+
+    def get_sr_license_options(self, sr_license_table_row: str):
+        """
+        Get sr_license options as a string
+        Sample output:
+            'OUTR INR DVB 16AP'
+
+        :param str sr_license_table_row: sr_license table:row to get options from
+        :returns str: a string representing sr_license options
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(sr_license_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if sr_license_table_row.split(':')[0] != 'sr_license':
+            raise InvalidOptionsException('Wrong table name, should be sr_license')
+        _options = ' '.join(self.get_param(sr_license_table_row, 'options').split())
+        return _options
+
+    def get_realtime(self, object_table_row: str, command: str):
+        """
+        Get output of realtime command of an NMS object
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str command: realtime command
+        :returns str reply: output of the command
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the output
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in (_CONTROLLER, _STATION, _DEVICE):
+            raise InvalidOptionsException(f'Realtime available for {_CONTROLLER}, {_STATION} and {_DEVICE}')
+        if not isinstance(command, str):
+            raise InvalidOptionsException('Command must be passed as a string')
+        if command.lower() in _get_realtime_commands.keys():
+            command = _get_realtime_commands.get(command.lower())
         else:
-            return None
-    if reply is not None or reply != '':
-        return reply
-    else:
-        return ''
-
-
-def set_realtime(object_table_row: str, command: str):
-    """
-    Send realtime command to an NMS object
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str command: realtime command
-    :returns str reply: output of the command
-    :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the output
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in (_CONTROLLER, _STATION, _DEVICE):
-        raise InvalidOptionsException(f'Realtime available for {_CONTROLLER}, {_STATION} and {_DEVICE}')
-    if not isinstance(command, str):
-        raise InvalidOptionsException('Command must be passed as a string')
-    if command.lower() in _set_realtime_commands.keys():
-        command = _set_realtime_commands.get(command.lower())
-    else:
-        command = command.lower()
-    reply = _post(_API_REALTIME.format(object_table_row.replace(':', '=')), {'command': command, 'control': 1})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'`{object_table_row}` realtime {command} cannot be read. '
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+            command = command.lower()
+        reply = self._post(_API_REALTIME.format(object_table_row.replace(':', '=')), {'command': command, 'control': 0})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` realtime {command} cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            return reply
         else:
-            return None
-    if reply is not None or reply != '':
-        return reply
-    else:
-        return ''
-
-
-def list_items(object_table_row: str, items: str):
-    """
-    List all items specific to a particular table, i.e. all NMS networks
-    Sample usage:
-    >>> list_items('nms:0', 'network')  # equals to `/api/list/get/nms=0/list_items=network` request
-
-    :param str object_table_row: describes the object as `<object_table>:<row>`
-    :param str items: items to be listed
-    :returns list items: all objects found in the `table:row` format
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    _path = _API_LIST_ITEMS.format(object_table_row.replace(':', '='), items) + '?list_vars='
-    reply = _post(_path, {})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'Cannot get {_path}'
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+            return ''
+
+    def set_realtime(self, object_table_row: str, command: str):
+        """
+        Send realtime command to an NMS object
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str command: realtime command
+        :returns str reply: output of the command
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the output
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in (_CONTROLLER, _STATION, _DEVICE):
+            raise InvalidOptionsException(f'Realtime available for {_CONTROLLER}, {_STATION} and {_DEVICE}')
+        if not isinstance(command, str):
+            raise InvalidOptionsException('Command must be passed as a string')
+        if command.lower() in _set_realtime_commands.keys():
+            command = _set_realtime_commands.get(command.lower())
         else:
-            return None
-    if reply is not None or reply != '':
-        # Preparing reply as a tuple containing strings of `table:row`
-        return [f'{items}:{i.get("%row")}' for i in reply]
-    return []
-
-
-def return_all(object_table_row: str):
-    """
-    Forced return of all stations to initial RX controllers
-    Sample usage:
-    >>> return_all('bal_controller:0')
-
-    :param str object_table_row: describes bal_controller as `bal_controller:<row>`
-    :raises InvalidOptionsException: if passed object_table_row is invalid
-    :raises NmsErrorResponseException: if response error_code is not None, i.e. in case if bal_controller does not exist
-    :returns bool: True if command is successful, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] != 'bal_controller' and _auto_abort_on_error:
-        raise InvalidOptionsException('Return_all is supported for bal_controller only')
-    _path = _API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')) + f'/command={API_RETURN_ALL_COMMAND}'
-    reply = _post(_path, {})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'Cannot get {_path}'
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+            command = command.lower()
+        reply = self._post(_API_REALTIME.format(object_table_row.replace(':', '=')), {'command': command, 'control': 1})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` realtime {command} cannot be read. '
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            return reply
         else:
+            return ''
+
+    def list_items(self, object_table_row: str, items: str):
+        """
+        List all items specific to a particular table, i.e. all NMS networks
+        Sample usage:
+        >>> list_items('nms:0', 'network')  # equals to `/api/list/get/nms=0/list_items=network` request
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str items: items to be listed
+        :returns list items: all objects found in the `table:row` format
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        _path = _API_LIST_ITEMS.format(object_table_row.replace(':', '='), items) + '?list_vars='
+        reply = self._post(_path, {})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get {_path}'
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            # Preparing reply as a tuple containing strings of `table:row`
+            return [f'{items}:{i.get("%row")}' for i in reply]
+        return []
+
+    def iter_items(self, object_table_row: str, items: str, vars_: list = None, page_size: int = _DEFAULT_PAGE_SIZE):
+        """
+        Lazily iterate over all items of a particular table page by page. The next page is requested in background
+        while the current one is consumed, no more than two pages are kept in memory at once.
+        The paging is based on `list_skip` and `list_max`, therefore, items created or deleted during the iteration
+        can shift the pages.
+
+        >>> for stn in iter_items('vno:0', 'station', vars_=['name', 'serial'], page_size=5000):
+        ...     print(stn['%row'], stn['name'], stn['serial'])
+
+        :param str object_table_row: describes the parent object as `<object_table>:<row>`
+        :param str items: items to be listed
+        :param list vars_: names of the variables to get for each item. If None, all the variables are returned.
+                           If an empty list, only `%row` is returned
+        :param int page_size: number of items requested at once
+        :returns generator: dictionaries of the items variables as they are returned by NMS including `%row`
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting a page
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2:
+            raise InvalidOptionsException('Wrong object table row format')
+        if page_size < 1:
+            raise InvalidOptionsException('Page size must be a positive integer')
+        path = _API_LIST_ITEMS.format(object_table_row.replace(':', '='), items)
+        return self._iter_pages(path, page_size, vars_)
+
+    def _iter_pages(self, path: str, page_size: int, vars_: list = None):
+        """
+        ! Private method - Do not call it directly! Generator of items of the paged list request.
+
+        :param str path: relative path of the list request without paging arguments
+        :param int page_size: number of items requested at once
+        :param list vars_: names of the variables to get for each item
+        """
+        self._error_code = 0
+        self._error_log = ''
+
+        def _get_page(skip):
+            _path = f'{path}/{_API_LIST_SKIP.format(skip)}/{_API_LIST_MAX.format(page_size)}'
+            if vars_ is not None:
+                _path += f'/{_API_LIST_VARS.format(",".join(vars_))}'
+            return _path, *self._request(_path, {})
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            skip = 0
+            future = executor.submit(_get_page, skip)
+            while future is not None:
+                _path, page, self._error_code, self._error_log = future.result()
+                if self._error_log != '' or self._error_code:
+                    if self._auto_abort_on_error:
+                        raise NmsErrorResponseException(f'Cannot get `{_path}`. '
+                                                        f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+                    return
+                if not page:
+                    return
+                skip += len(page)
+                # Prefetching the next page while the current one is consumed
+                future = executor.submit(_get_page, skip) if len(page) >= page_size else None
+                yield from page
+                del page
+        finally:
+            executor.shutdown(wait=False)
+
+    def get_params_many(self, parent_table_row: str, items: str, fields: list, page_size: int = _DEFAULT_PAGE_SIZE):
+        """
+        Get the passed parameters of all the items of a particular table in the parent object.
+        Instead of a request per item the values are fetched by a few paged list requests projected to the `fields`.
+
+        >>> get_params_many('vno:0', 'station', ['name', 'state'])
+        {'station:0': {'name': 'stn1', 'state': 'Up'}, 'station:1': {'name': 'stn2', 'state': 'Off'}}
+
+        :param str parent_table_row: describes the parent object as `<object_table>:<row>`
+        :param str items: the table of the items, i.e. `station`
+        :param list fields: names of the parameters to get
+        :param int page_size: number of items requested at once
+        :returns:
+            - params (dict) - the items as `<object_table>:<row>` and dictionaries of their parameters
+            - None - if auto_abort_on_error is off and there is an error upon getting the parameters
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the parameters
+        """
+        params = {}
+        for item in self.iter_items(parent_table_row, items, vars_=list(fields), page_size=page_size):
+            params[f'{items}:{item.get("%row")}'] = {field: item.get(field) for field in fields}
+        if self._error_log != '' or self._error_code:
             return None
-    if reply is not None or reply != '':
-        return True
-    return False
-
-
-def force_config(object_table_row: str):
-    """
-    Send config forcibly; can cause profile restart
-    Sample usage:
-    >>> force_config('controller:0')
-
-    :param str object_table_row: describes controller or station as `<object_table_row>:<row>`
-    :raises InvalidOptionsException: if passed object_table_row is invalid
-    :raises NmsErrorResponseException: if response error_code is not None, i.e. in case if object does not exist
-    :returns bool: True if command is successful, otherwise False
-    """
-    if _auto_abort_on_error and (not _cookies or not _nms_ip_port):
-        raise DriverInitException('Cookies are not received yet. Call `connect` function first')
-    if len(object_table_row.split(':')) != 2 and _auto_abort_on_error:
-        raise InvalidOptionsException('Wrong object table row format')
-    if object_table_row.split(':')[0] not in ('controller', 'station') and _auto_abort_on_error:
-        raise InvalidOptionsException('Force_config is supported for controller or station only')
-    if object_table_row.split(':')[0] == 'controller':
-        command = API_FORCE_CONFIG_CONTROLLER_COMMAND
-    else:
-        command = API_FORCE_CONFIG_STATION_COMMAND
-    _path = _API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')) + f'/command={command}'
-    reply = _post(_path, {})
-    if _error_log != '' or _error_code:
-        if _auto_abort_on_error:
-            raise NmsErrorResponseException(f'Cannot get {_path}'
-                                            f'Reason: error_code: `{_error_code}` error_log: `{_error_log}`')
+        return params
+
+    def create_many(self, parent_table_row: str, new_item: str, params_list: list, *, concurrency: int = None):
+        """
+        Create many NMS objects of the same type in the same parent. Requests are pipelined using
+        `concurrency` parallel connections. An error of a single item does not abort the batch.
+
+        >>> result = create_many('vno:0', 'station', [{'name': f'stn-{i}', 'serial': i} for i in range(1000)])
+        >>> result.results[0]
+        'station:0'
+
+        :param str parent_table_row: describes parent object as `<parent_table>:<row>`
+        :param str new_item: name of the items to create
+        :param list params_list: a list of dictionaries, each one is used to create an item
+        :param int concurrency: number of requests sent to NMS at the same time, client default is used if None
+        :returns BulkResult result: `results` - a list of created `<new_item_table>:<row>` in the order of `params_list`,
+                                    None for the failed items;
+                                    `errors` - a dictionary of failed items indexes and their exceptions;
+                                    `elapsed` - the batch execution time in seconds;
+                                    `rate` - throughput in objects per second
+        :raises InvalidOptionsException: if the passed parameters are invalid
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        if len(parent_table_row.split(':')) != 2:
+            raise InvalidOptionsException('Wrong parent table row format')
+        if not all(isinstance(params, dict) for params in params_list):
+            raise InvalidOptionsException('Parameters must be passed as a list of dictionaries')
+        path = _API_OBJECT_CREATE.format(parent_table_row.replace(':', '='), new_item)
+
+        def _create_one(params):
+            reply, error_code, error_log = self._request(path, params)
+            if error_log != '' or error_code:
+                raise ObjectNotCreatedException(f'`{new_item}` is not created in `{parent_table_row}`. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return f'{new_item}:{reply.get("%row")}'
+
+        return self._run_bulk(_create_one, params_list, concurrency)
+
+    def update_many(self, updates: dict, *, concurrency: int = None):
+        """
+        Update many NMS objects. Requests are pipelined using `concurrency` parallel connections.
+        An error of a single item does not abort the batch.
+
+        >>> update_many({'station:0': {'enable': 'OFF'}, 'station:1': {'enable': 'OFF'}})
+
+        :param dict updates: a dictionary of `<object_table>:<row>` and the parameters applied to the object
+        :param int concurrency: number of requests sent to NMS at the same time, client default is used if None
+        :returns BulkResult result: `results` - a list of updated `<object_table>:<row>` in the order of `updates`,
+                                    None for the failed items; the rest fields are the same as in `create_many`
+        :raises InvalidOptionsException: if the passed parameters are invalid
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        for object_table_row, params in updates.items():
+            if len(object_table_row.split(':')) != 2:
+                raise InvalidOptionsException(f'Wrong object table row format: {object_table_row}')
+            if not isinstance(params, dict):
+                raise InvalidOptionsException('Parameters must be passed as a dictionary')
+
+        def _update_one(item):
+            object_table_row, params = item
+            _, error_code, error_log = self._request(_API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')), params)
+            if error_log != '' or error_code:
+                raise ObjectNotUpdatedException(f'`{object_table_row}` is not updated. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return object_table_row
+
+        return self._run_bulk(_update_one, list(updates.items()), concurrency)
+
+    def delete_many(self, object_table_rows: list, recursive: bool = False, *, concurrency: int = None):
+        """
+        Delete many NMS objects. Requests are pipelined using `concurrency` parallel connections.
+        An error of a single item does not abort the batch.
+
+        >>> delete_many([f'station:{i}' for i in range(1000)])
+
+        :param list object_table_rows: a list of `<object_table>:<row>` to delete
+        :param bool recursive: True to apply recursive deletion, otherwise False
+        :param int concurrency: number of requests sent to NMS at the same time, client default is used if None
+        :returns BulkResult result: `results` - a list of deleted `<object_table>:<row>` in the order
+                                    of `object_table_rows`, None for the failed items;
+                                    the rest fields are the same as in `create_many`
+        :raises InvalidOptionsException: if the passed parameters are invalid
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Call `connect` function first')
+        for object_table_row in object_table_rows:
+            if len(object_table_row.split(':')) != 2:
+                raise InvalidOptionsException(f'Wrong object table row format: {object_table_row}')
+        params = {'recursive': 1} if recursive else {}
+
+        def _delete_one(object_table_row):
+            _, error_code, error_log = self._request(_API_OBJECT_DELETE.format(object_table_row.replace(':', '=')), params)
+            if error_log != '' or error_code:
+                raise NmsErrorResponseException(f'`{object_table_row}` is not deleted. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return object_table_row
+
+        return self._run_bulk(_delete_one, object_table_rows, concurrency)
+
+    def set_bulk_concurrency(self, concurrency: int = _DEFAULT_BULK_CONCURRENCY):
+        """
+        Set the default number of requests sent to NMS at the same time by bulk operations
+
+        :param int concurrency: a positive number of concurrent requests
+        :raises InvalidOptionsException: if concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise InvalidOptionsException('Bulk concurrency must be a positive integer')
+        self._bulk_concurrency = concurrency
+
+    def enable_adaptive_concurrency(
+            self,
+            initial_limit: int = concurrency_limit.DEFAULT_INITIAL_LIMIT,
+            min_limit: int = concurrency_limit.DEFAULT_MIN_LIMIT,
+            max_limit: int = concurrency_limit.DEFAULT_MAX_LIMIT,
+            drop_retries: int = _DEFAULT_DROP_RETRIES,
+            **kwargs
+    ):
+        """
+        Limit the number of the client requests in flight adaptively. The limit grows while the latency and
+        the error rate of NMS replies stay low and shrinks upon timeouts, connection errors and 5xx replies.
+        The dropped reads and the requests rejected before NMS has processed them are sent again after a delay.
+        Bulk operations called without `concurrency` use as many threads as the limit allows.
+
+        >>> enable_adaptive_concurrency(initial_limit=4, max_limit=32)
+        >>> update_many({f'station:{row}': {'enable': 'OFF'} for row in range(10000)})
+        >>> get_concurrency_limiter().get_limit()
+        12
+
+        :param int initial_limit: the limit before any request is completed
+        :param int min_limit: the min limit
+        :param int max_limit: the max limit, also the number of threads of bulk operations
+        :param int drop_retries: the number of times a dropped read or a rejected request is sent again
+        :param kwargs: the other parameters of `AdaptiveLimiter`, i.e. `backoff` or `latency_tolerance`
+        :raises InvalidOptionsException: if the passed parameters are invalid
+        """
+        if drop_retries < 0:
+            raise InvalidOptionsException('Number of retries cannot be negative')
+        self._limiter = concurrency_limit.AdaptiveLimiter(initial_limit, min_limit, max_limit, **kwargs)
+        self._drop_retries = drop_retries
+
+    def disable_adaptive_concurrency(self):
+        """
+        Stop limiting the requests in flight, bulk operations use the client bulk concurrency again
+        """
+        self._limiter = None
+
+    def get_concurrency_limiter(self):
+        """
+        Get the adaptive limiter of the requests in flight
+
+        :returns AdaptiveLimiter limiter: the limiter exposing the current limit and its history,
+                                          None if the adaptive concurrency is disabled
+        """
+        return self._limiter
+
+    def _run_bulk(self, func, items: list, concurrency: int = None):
+        """
+        ! Private method - Do not call it directly! Call `func` for each item using a pool of threads.
+
+        :param func: a function that takes an item, returns a result or raises an exception
+        :param list items: the items to process
+        :param int concurrency: number of threads, client default or the adaptive limiter max limit is used if None
+        :returns BulkResult result: results in the order of the items, errors, elapsed time and throughput
+        """
+        # The threads beyond the adaptive limit wait for a free slot
+        if concurrency is None and self._limiter is not None:
+            concurrency = self._limiter.max_limit
+        if concurrency is None:
+            concurrency = self._bulk_concurrency
+        if concurrency < 1:
+            raise InvalidOptionsException('Bulk concurrency must be a positive integer')
+        # Making sure that each thread has its own keep-alive connection. The client session may be in use
+        # by other threads, therefore, a larger pool is opened for the batch only
+        bulk_session = None
+        if self._pool_size < concurrency:
+            bulk_session = self._create_session(concurrency, self._max_retries)
+            if session_cache.is_enabled():
+                session_cache.install_relogin(bulk_session, self._relogin)
+        results = [None] * len(items)
+        errors = {}
+        st_time = perf_counter()
+        try:
+            with ThreadPoolExecutor(
+                    max_workers=concurrency, initializer=self._set_thread_session, initargs=(bulk_session, )
+            ) as executor:
+                futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as exc:
+                        errors[index] = exc
+        finally:
+            if bulk_session is not None:
+                bulk_session.close()
+        elapsed = perf_counter() - st_time
+        rate = len(items) / elapsed if elapsed > 0 else 0.0
+        return BulkResult(results, errors, elapsed, rate)
+
+    def return_all(self, object_table_row: str):
+        """
+        Forced return of all stations to initial RX controllers
+        Sample usage:
+        >>> return_all('bal_controller:0')
+
+        :param str object_table_row: describes bal_controller as `bal_controller:<row>`
+        :raises InvalidOptionsException: if passed object_table_row is invalid
+        :raises NmsErrorResponseException: if response error_code is not None, i.e. in case if bal_controller does not exist
+        :returns bool: True if command is successful, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] != 'bal_controller' and self._auto_abort_on_error:
+            raise InvalidOptionsException('Return_all is supported for bal_controller only')
+        _path = _API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')) + f'/command={API_RETURN_ALL_COMMAND}'
+        reply = self._post(_path, {})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get {_path}'
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            return True
+        return False
+
+    def force_config(self, object_table_row: str):
+        """
+        Send config forcibly; can cause profile restart
+        Sample usage:
+        >>> force_config('controller:0')
+
+        :param str object_table_row: describes controller or station as `<object_table_row>:<row>`
+        :raises InvalidOptionsException: if passed object_table_row is invalid
+        :raises NmsErrorResponseException: if response error_code is not None, i.e. in case if object does not exist
+        :returns bool: True if command is successful, otherwise False
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in ('controller', 'station') and self._auto_abort_on_error:
+            raise InvalidOptionsException('Force_config is supported for controller or station only')
+        if object_table_row.split(':')[0] == 'controller':
+            command = API_FORCE_CONFIG_CONTROLLER_COMMAND
         else:
-            return None
-    if reply is not None or reply != '':
-        return True
-    return False
+            command = API_FORCE_CONFIG_STATION_COMMAND
+        _path = _API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')) + f'/command={command}'
+        reply = self._post(_path, {})
+        if self._error_log != '' or self._error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get {_path}'
+                                                f'Reason: error_code: `{self._error_code}` error_log: `{self._error_log}`')
+            else:
+                return None
+        if reply is not None or reply != '':
+            return True
+        return False
+
+
+# The module level functions are the methods of the default client
+_default_client = NmsClient()
+
+
+def get_default_client() -> NmsClient:
+    """
+    Get the client the module level functions are bound to.
+
+    :returns NmsClient: the default client
+    """
+    return _default_client
+
+
+connect = _default_client.connect
+login = _default_client.login
+logout = _default_client.logout
+create = _default_client.create
+update = _default_client.update
+read = _default_client.read
+delete = _default_client.delete
+get_param = _default_client.get_param
+get_uprow = _default_client.get_uprow
+auto_abort_on_error = _default_client.auto_abort_on_error
+get_next_error = _default_client.get_next_error
+load_config = _default_client.load_config
+search_by_name = _default_client.search_by_name
+set_timeout = _default_client.set_timeout
+set_pool = _default_client.set_pool
+close_session = _default_client.close_session
+enable_cache = _default_client.enable_cache
+disable_cache = _default_client.disable_cache
+clear_cache = _default_client.clear_cache
+get_cache_stats = _default_client.get_cache_stats
+reset_cache_stats = _default_client.reset_cache_stats
+wait_state = _default_client.wait_state
+wait_not_state = _default_client.wait_not_state
+wait_states = _default_client.wait_states
+wait_not_states = _default_client.wait_not_states
+wait_up = _default_client.wait_up
+wait_fault = _default_client.wait_fault
+wait_all = _default_client.wait_all
+wait_any = _default_client.wait_any
+restart = _default_client.restart
+find_active_device = _default_client.find_active_device
+wait_log_message = _default_client.wait_log_message
+get_log_tailer = _default_client.get_log_tailer
+get_params = _default_client.get_params
+wait_next_tick = _default_client.wait_next_tick
+wait_ticks = _default_client.wait_ticks
+get_tick_clock = _default_client.get_tick_clock
+get_tick_stats = _default_client.get_tick_stats
+reset_tick_clock = _default_client.reset_tick_clock
+get_sr_license_options = _default_client.get_sr_license_options
+get_realtime = _default_client.get_realtime
+set_realtime = _default_client.set_realtime
+list_items = _default_client.list_items
+iter_items = _default_client.iter_items
+get_params_many = _default_client.get_params_many
+create_many = _default_client.create_many
+update_many = _default_client.update_many
+delete_many = _default_client.delete_many
+set_bulk_concurrency = _default_client.set_bulk_concurrency
+enable_adaptive_concurrency = _default_client.enable_adaptive_concurrency
+disable_adaptive_concurrency = _default_client.disable_adaptive_concurrency
+get_concurrency_limiter = _default_client.get_concurrency_limiter
+return_all = _default_client.return_all
+force_config = _default_client.force_config
 
 
 if __name__ == '__main__':
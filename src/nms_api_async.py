@@ -0,0 +1,466 @@
+# Asyncio version of the alternative api driver
+"""
+Coroutine versions of the basic `src.nms_api` functions. Independent requests can be awaited concurrently,
+the number of requests being processed by NMS at the same time is limited by the client concurrency.
+Each `AsyncNmsClient` holds its own aiohttp session, cookies and settings, like `NmsClient` does.
+
+>>> async def main():
+...     client = AsyncNmsClient()
+...     await client.connect('http://localhost:8000', 'admin', '12345')
+...     stations = await asyncio.gather(*[client.create('vno:0', 'station', {'name': f'stn-{i}'}) for i in range(100)])
+...     await client.close()
+>>> asyncio.run(main())
+Create 100 stations in VNO ID 0 concurrently. The result is a list of `station:<row>` strings
+
+The module level coroutines are bound to the default client, i.e. `nms_api_async.create` is `AsyncNmsClient.create`
+of the client returned by `get_default_client`.
+"""
+import asyncio
+import base64
+from http import HTTPStatus
+
+import aiohttp
+
+from src import config_tracker, json_codec
+from src.exceptions import InvalidOptionsException, DriverInitException, ObjectNotCreatedException, \
+    ObjectNotUpdatedException, NmsErrorResponseException
+from src.json_codec import JSONDecodeError
+from src.nms_api import _API_LOGIN_PATH, _API_LOGOUT_PATH, _API_OBJECT_CREATE, _API_OBJECT_READ, \
+    _API_OBJECT_UPDATE, _API_OBJECT_DELETE, _API_LIST_ITEMS, _API_REALTIME, _CONTROLLER, _STATION, _DEVICE, \
+    _get_realtime_commands
+
+
+_DEFAULT_CONCURRENCY = 10
+
+
+class AsyncNmsClient:
+    """
+    Asyncio NMS API client. The aiohttp session is bound to the event loop it is created in, a new session is opened
+    if the client is used in another loop and the previous one is closed. The session is also closed when
+    `asyncio.run` finishes the loop.
+
+    >>> client = AsyncNmsClient()
+    >>> await client.connect('http://localhost:8000', 'admin', '12345', max_concurrency=20)
+    >>> await client.create('nms:0', 'network', {'name': 'net-0'})
+    'network:0'
+    """
+
+    def __init__(self):
+        # The following variables are set to their default values at each `connect` call
+        self._default_timeout = 4
+        self._auto_abort_on_error = True
+        self._nms_ip_port = None
+        self._cookies = None
+        self._max_concurrency = _DEFAULT_CONCURRENCY
+        # The session, the loop it is bound to, and the condition guarding the number of requests in flight
+        self._session = None
+        self._loop = None
+        self._session_guard = None
+        self._slot_freed = None
+        self._in_flight = 0
+
+    async def connect(self, url: str, username: str, password: str, max_concurrency: int = _DEFAULT_CONCURRENCY):
+        """
+        Connect to NMS using the passed URL and the credentials
+
+        >>> await connect('http://localhost:8000', 'admin', '12345', max_concurrency=20)
+        Login to NMS located at `localhost:8000`, up to 20 requests are sent to NMS at the same time
+
+        :param str url: NMS URL in the following format `http://<ip_address>:<port>`
+        :param str username: NMS username
+        :param str password: NMS password
+        :param int max_concurrency: max number of requests awaiting NMS response at the same time
+        :raises DriverInitException: if Http status code is not 200
+        """
+        self._default_timeout = 3
+        self._auto_abort_on_error = True
+        self.set_concurrency(max_concurrency)
+        token = base64.b64encode(F"{username}:{password}".encode('ascii')).decode('ascii')
+        headers = {
+            'Authorization': F"Basic {token}"
+        }
+        if not url.endswith('/'):
+            url += '/'
+        self._nms_ip_port = url
+        session = await self._get_session()
+        async with session.get(self._nms_ip_port + _API_LOGIN_PATH, headers=headers) as resp:
+            content = await resp.read()
+            if HTTPStatus.OK != resp.status and self._auto_abort_on_error:
+                raise DriverInitException(f'Login unsuccessful: {content}')
+            self._cookies = {key: morsel.value for key, morsel in resp.cookies.items()}
+
+    async def logout(self):
+        """
+        Disconnect from NMS and close the session
+
+        :raises DriverInitException: if `connect` is not called yet
+        :raises NmsErrorResponseException: if Http status code is not 200
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+        session = await self._get_session()
+        async with session.get(self._nms_ip_port + _API_LOGOUT_PATH, cookies=self._cookies) as resp:
+            content = await resp.read()
+            if HTTPStatus.OK != resp.status and self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Logout unsuccessful: {content}')
+        self._cookies = None
+        await self.close()
+
+    async def close(self):
+        """
+        Close the aiohttp session and its connections. The cookies are kept, the next request opens a new session.
+        """
+        session, loop = self._session, self._loop
+        if self._session_guard is not None and loop is asyncio.get_running_loop():
+            self._session_guard.cancel()
+        self._session = None
+        self._loop = None
+        self._session_guard = None
+        self._slot_freed = None
+        self._in_flight = 0
+        if session is not None and not session.closed:
+            await _close_session(session, loop)
+
+    def set_concurrency(self, max_concurrency: int = _DEFAULT_CONCURRENCY):
+        """
+        Set the max number of requests awaiting NMS response at the same time.
+        A lower limit applies as the requests in flight complete, they are not interrupted.
+
+        :param int max_concurrency: a positive number of concurrent requests
+        :raises InvalidOptionsException: if max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise InvalidOptionsException('Max concurrency must be a positive integer')
+        self._max_concurrency = max_concurrency
+
+    def auto_abort_on_error(self, abort=True):
+        """
+        Set behavior of the API driver
+
+        :param bool abort: if True no exceptions will be thrown upon CRUD operations
+        """
+        self._auto_abort_on_error = bool(abort)
+
+    def set_timeout(self, timeout=3):
+        """
+        Set the timeout of each request
+
+        :param int timeout: number of seconds to wait for both connection establishment and response
+        """
+        self._default_timeout = timeout
+
+    async def create(self, parent_table_row: str, new_item: str, params: dict):
+        """
+        Create new NMS object
+
+        >>> await create('network:0', 'vno', {'name': 'vno-0'})
+        Create a new item `vno` in network ID 0
+
+        :param str parent_table_row: describes parent object as `<parent_table>:<row>`
+        :param str new_item: name of a new item to create
+        :param dict params: parameters of the new item that are used to create it
+        :returns str trow: the ID of the created item in the following format `<new_item_table>:<row>`
+        :returns None: if auto_abort_on_error is off but there is an error upon creating an object
+        :raises ObjectNotCreatedException: if auto_abort_on_error is on and there is an error upon creation an object
+        """
+        self._check_connected()
+        if len(parent_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong parent table row format')
+        if not isinstance(params, dict) and self._auto_abort_on_error:
+            raise InvalidOptionsException('Parameters must be passed as a dictionary')
+        reply, error_code, error_log = await self._post(
+            _API_OBJECT_CREATE.format(parent_table_row.replace(':', '='), new_item), params
+        )
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise ObjectNotCreatedException(f'`{new_item}` is not created in `{parent_table_row}`. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return None
+        return f'{new_item}:{reply.get("%row")}'
+
+    async def update(self, object_table_row: str, params: dict):
+        """
+        Update NMS object
+
+        >>> await update('vno:0', {'name': 'vno-5'})
+        Apply new name `vno-5` to vno ID 0
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param dict params: parameters which are applied to the object
+        :returns str object_table_row: if update is succeeded
+        :returns None: if auto_abort_on_error is off but there is an error upon updating an object
+        :raises ObjectNotUpdatedException: if auto_abort_on_error is on and there is an error upon updating an object
+        """
+        self._check_connected()
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if not isinstance(params, dict) and self._auto_abort_on_error:
+            raise InvalidOptionsException('Parameters must be passed as a dictionary')
+        _, error_code, error_log = await self._post(
+            _API_OBJECT_UPDATE.format(object_table_row.replace(':', '=')), params
+        )
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise ObjectNotUpdatedException(f'`{object_table_row}` is not updated. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return None
+        return object_table_row
+
+    async def read(self, object_table_row: str):
+        """
+        Read NMS object
+
+        >>> await read('station:0')
+        Get station ID 0 parameters
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :returns None: if auto_abort_on_error is off but there is an error upon getting object data
+        :returns dict reply: a dictionary containing parameters of the object
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon reading an object
+        """
+        self._check_connected()
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        reply, error_code, error_log = await self._post(
+            _API_OBJECT_READ.format(object_table_row.replace(':', '=')), {}
+        )
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` cannot be read. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return None
+        return reply
+
+    async def delete(self, object_table_row: str, recursive: bool = False):
+        """
+        Delete NMS object
+
+        >>> await delete('network:0')
+        Delete network ID 0
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param bool recursive: True to apply recursive deletion, otherwise False
+        :returns bool: True if deletion is succeeded, otherwise False
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon deleting an object
+        """
+        self._check_connected()
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        params = {'recursive': 1} if recursive else {}
+        _, error_code, error_log = await self._post(
+            _API_OBJECT_DELETE.format(object_table_row.replace(':', '=')), params
+        )
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` is not deleted. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return False
+        return True
+
+    async def get_param(self, object_table_row: str, param_name: str) -> object:
+        """
+        Get the value of the passed parameter for the passed `table_row`
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str param_name: the name of the parameter to get the value from
+        :returns:
+            - param_value - the value of the parameter
+            - None - if such parameter is not found
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting
+                                           the parameter
+        """
+        reply = await self.read(object_table_row)
+        if not isinstance(reply, dict):
+            return None
+        return reply.get(param_name)
+
+    async def list_items(self, object_table_row: str, items: str):
+        """
+        List all items specific to a particular table, i.e. all NMS networks
+
+        >>> await list_items('nms:0', 'network')  # equals to `/api/list/get/nms=0/list_items=network` request
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str items: items to be listed
+        :returns list items: all objects found in the `table:row` format
+        """
+        self._check_connected()
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        _path = _API_LIST_ITEMS.format(object_table_row.replace(':', '='), items) + '?list_vars='
+        reply, error_code, error_log = await self._post(_path, {})
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'Cannot get {_path}'
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return None
+        if reply:
+            return [f'{items}:{i.get("%row")}' for i in reply]
+        return []
+
+    async def get_realtime(self, object_table_row: str, command: str):
+        """
+        Get output of realtime command of an NMS object
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str command: realtime command
+        :returns str reply: output of the command
+        :raises NmsErrorResponseException: if auto_abort_on_error is on and there is an error upon getting the output
+        """
+        self._check_connected()
+        if len(object_table_row.split(':')) != 2 and self._auto_abort_on_error:
+            raise InvalidOptionsException('Wrong object table row format')
+        if object_table_row.split(':')[0] not in (_CONTROLLER, _STATION, _DEVICE):
+            raise InvalidOptionsException(f'Realtime available for {_CONTROLLER}, {_STATION} and {_DEVICE}')
+        if not isinstance(command, str):
+            raise InvalidOptionsException('Command must be passed as a string')
+        command = _get_realtime_commands.get(command.lower(), command.lower())
+        reply, error_code, error_log = await self._post(
+            _API_REALTIME.format(object_table_row.replace(':', '=')), {'command': command, 'control': 0}
+        )
+        if error_log != '' or error_code:
+            if self._auto_abort_on_error:
+                raise NmsErrorResponseException(f'`{object_table_row}` realtime {command} cannot be read. '
+                                                f'Reason: error_code: `{error_code}` error_log: `{error_log}`')
+            return None
+        if reply is None:
+            return ''
+        return reply
+
+    def _check_connected(self):
+        """
+        ! Private method - Do not call it directly! Make sure that `connect` is called.
+
+        :raises DriverInitException: if auto_abort_on_error is on and there are no cookies
+        """
+        if self._auto_abort_on_error and (not self._cookies or not self._nms_ip_port):
+            raise DriverInitException('Cookies are not received yet. Call `connect` function first')
+
+    async def _get_session(self):
+        """
+        ! Private method - Do not call it directly! Get the aiohttp session of the running event loop.
+        If the loop differs from the one used previously, the previous session is closed and a new one is opened.
+
+        :returns aiohttp.ClientSession session: the session of the running loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is loop:
+            return self._session
+        if self._session is not None:
+            await self.close()
+        # The connections are not limited by the connector, the requests in flight are limited by the client
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0, force_close=False))
+        self._loop = loop
+        self._session_guard = loop.create_task(_close_on_loop_exit(self._session))
+        self._slot_freed = asyncio.Condition()
+        self._in_flight = 0
+        return self._session
+
+    async def _post(self, path: str, data: dict):
+        """
+        ! Private method - Do not call it directly! Calls POST request with the passed parameters.
+        Unlike the sync version the errors are returned per request, as many requests can be awaited at once.
+
+        :param str path: relative path to execute POST request
+        :param dict data: POST payload
+        :returns tuple (reply, error_code, error_log): the reply to POST request and the errors
+        """
+        config_tracker.note_request(self._nms_ip_port, path)
+        # handling non-ascii characters in the payload
+        encoded_data = json_codec.dumps(data)
+        reply = None
+        error_code = None
+        session = await self._get_session()
+        slot_freed = self._slot_freed
+        try:
+            async with slot_freed:
+                await slot_freed.wait_for(lambda: self._in_flight < self._max_concurrency)
+                self._in_flight += 1
+            try:
+                async with session.post(
+                        self._nms_ip_port + path,
+                        data=encoded_data,
+                        cookies=self._cookies,
+                        timeout=aiohttp.ClientTimeout(total=self._default_timeout)
+                ) as resp:
+                    content = await resp.read()
+                    status, reason = resp.status, resp.reason
+            finally:
+                async with slot_freed:
+                    self._in_flight -= 1
+                    slot_freed.notify_all()
+            if HTTPStatus.OK != status:
+                error_log = F"{status} : {reason}"
+            elif 0 == len(content):
+                error_log = 'Empty response body'
+            else:
+                try:
+                    result_obj = json_codec.loads(content)
+                    reply = result_obj.get('reply', None)
+                    error_log = result_obj.get('error_log', None)
+                    if error_log is None:
+                        error_log = 'Not found error_log in response'
+                    error_code = result_obj.get('error_code', None)
+                    if error_code is None:
+                        error_log = 'Not found error_code in response'
+                except JSONDecodeError:
+                    error_log = 'Invalid json in response'
+        # If NMS does not respond to the POST request
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+            error_log = str(exc) or exc.__class__.__name__
+        return reply, error_code, error_log
+
+
+async def _close_on_loop_exit(session):
+    """
+    ! Private function - Do not call it directly! The task waits until it is cancelled, i.e. by `asyncio.run`
+    finishing the loop, and closes the session while the loop can still close its connections.
+
+    :param aiohttp.ClientSession session: the session
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await session.close()
+
+
+async def _close_session(session, loop):
+    """
+    ! Private function - Do not call it directly! Close a session that may be bound to another event loop.
+
+    :param aiohttp.ClientSession session: the session
+    :param loop: the loop the session is bound to
+    """
+    if loop is not None and loop is not asyncio.get_running_loop() and loop.is_running():
+        # The loop runs in another thread, the session is closed there
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+    else:
+        await session.close()
+
+
+# The module level coroutines are the methods of the default client
+_default_client = AsyncNmsClient()
+
+
+def get_default_client() -> AsyncNmsClient:
+    """
+    Get the client the module level coroutines are bound to.
+
+    :returns AsyncNmsClient: the default client
+    """
+    return _default_client
+
+
+connect = _default_client.connect
+logout = _default_client.logout
+close = _default_client.close
+set_concurrency = _default_client.set_concurrency
+auto_abort_on_error = _default_client.auto_abort_on_error
+set_timeout = _default_client.set_timeout
+create = _default_client.create
+update = _default_client.update
+read = _default_client.read
+delete = _default_client.delete
+get_param = _default_client.get_param
+list_items = _default_client.list_items
+get_realtime = _default_client.get_realtime
@@ -0,0 +1,212 @@
+"""
+Offline structural diff of NMS config files.
+
+Objects are matched either by table and row, or by table and name. When matched by name, the references
+`<table>:<row>` in the values are compared by the names of the referred objects, therefore the configs whose
+objects got other rows are equal as long as the names and the links are the same. Objects without names
+are always matched by row.
+
+>>> diff = compare_backups(BackupManager(), 'config_before.txt', 'config_after.txt')
+>>> diff.added, diff.removed
+([], [('station', 12)])
+>>> diff.changed
+[FieldChange(table='vno', old_row=0, new_row=0, field='stations', old='station:3', new='station:4')]
+"""
+import re
+from collections import namedtuple
+
+from src.nms_config.model import ConfigModel
+
+# A changed field of the matched objects, `old` is None if the field is added, `new` is None if it is removed
+FieldChange = namedtuple('FieldChange', 'table old_row new_row field old new')
+
+# Fields changed upon each save or load of a config. An entry is either a field name ignored in any table,
+# or `<table>.<field>` ignored in the table only
+DEFAULT_IGNORED_FIELDS = ('created', 'nms.save_filename', 'nms.load_filename')
+
+ROW = 'row'
+NAME = 'name'
+
+_REFERENCE = re.compile(r'([a-z_]+\d*):(\d+)')
+
+
+class ConfigDiff:
+    """
+    The result of the comparison of two configs. The instance is True if the configs differ.
+
+    :param list added: (table, row) of the objects present in the new config only
+    :param list removed: (table, row) of the objects present in the old config only
+    :param list changed: `FieldChange` namedtuples of the matched objects
+    """
+
+    def __init__(self, added: list, removed: list, changed: list):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f'ConfigDiff(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)})'
+
+    def summary(self, limit: int = 20) -> str:
+        """
+        Get a human readable description of the differences
+
+        :param int limit: max number of the listed items of each kind
+        :returns str summary: the description, `No differences` if the configs are equal
+        """
+        if not self:
+            return 'No differences'
+        lines = [f'{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed fields']
+        for title, items in (('Added', self.added), ('Removed', self.removed)):
+            lines.extend(f'{title} {table}:{row}' for table, row in items[:limit])
+        for change in self.changed[:limit]:
+            lines.append(f'Changed {change.table}:{change.old_row} {change.field}: {change.old} -> {change.new}')
+        return '\n'.join(lines)
+
+
+def compare(old: ConfigModel, new: ConfigModel, ignored_fields=DEFAULT_IGNORED_FIELDS, match=ROW) -> ConfigDiff:
+    """
+    Compare two configs
+
+    :param ConfigModel old: the old config
+    :param ConfigModel new: the new config
+    :param ignored_fields: iterable of the ignored fields, i.e. `created` or `nms.save_filename`
+    :param str match: `row` (by default) to match objects by table and row, `name` to match them by table and name
+    :returns ConfigDiff diff: the differences
+    :raises ValueError: if the match mode is unknown
+    """
+    if match not in (ROW, NAME):
+        raise ValueError(f'Unknown match mode {match}, expected `{ROW}` or `{NAME}`')
+    ignored = _get_ignored(ignored_fields)
+    old_keys = _get_keys(old, match)
+    new_keys = _get_keys(new, match)
+    old_resolve = _get_resolver(old, match)
+    new_resolve = _get_resolver(new, match)
+
+    added = [new_keys[key] for key in new_keys.keys() - old_keys.keys()]
+    removed = [old_keys[key] for key in old_keys.keys() - new_keys.keys()]
+    changed = []
+    for key, (table, old_row) in old_keys.items():
+        new_object = new_keys.get(key)
+        if new_object is None:
+            continue
+        new_row = new_object[1]
+        old_fields = old.get_object(table, old_row)
+        new_fields = new.get_object(table, new_row)
+        table_ignored = ignored.get(table, set()) | ignored.get(None, set())
+        for field in old_fields.keys() | new_fields.keys():
+            if field in table_ignored:
+                continue
+            old_value = old_resolve(old_fields.get(field))
+            new_value = new_resolve(new_fields.get(field))
+            if old_value != new_value:
+                changed.append(FieldChange(table, old_row, new_row, field, old_value, new_value))
+    added.sort()
+    removed.sort()
+    changed.sort(key=lambda change: (change.table, change.old_row, change.field))
+    return ConfigDiff(added, removed, changed)
+
+
+def compare_files(old_path, new_path, ignored_fields=DEFAULT_IGNORED_FIELDS, match=ROW) -> ConfigDiff:
+    """
+    Compare two config files
+
+    :param old_path: path to the old config
+    :param new_path: path to the new config
+    :param ignored_fields: iterable of the ignored fields, i.e. `created` or `nms.save_filename`
+    :param str match: `row` (by default) to match objects by table and row, `name` to match them by table and name
+    :returns ConfigDiff diff: the differences
+    """
+    return compare(ConfigModel.load(old_path), ConfigModel.load(new_path), ignored_fields, match)
+
+
+def compare_backups(
+        backup_manager,
+        old_name: str,
+        new_name: str,
+        ignored_fields=DEFAULT_IGNORED_FIELDS,
+        match=ROW,
+        download=True
+) -> ConfigDiff:
+    """
+    Download two backups from NMS and compare them locally
+
+    :param BackupManager backup_manager: the manager used to download the backups
+    :param str old_name: the name of the old backup
+    :param str new_name: the name of the new backup
+    :param ignored_fields: iterable of the ignored fields, i.e. `created` or `nms.save_filename`
+    :param str match: `row` (by default) to match objects by table and row, `name` to match them by table and name
+    :param bool download: if False the backups already downloaded to nms_backups folder are compared
+    :returns ConfigDiff diff: the differences
+    :raises NmsDownloadException: if a backup cannot be downloaded
+    """
+    if download:
+        backup_manager.download_backup(old_name)
+        backup_manager.download_backup(new_name)
+    return compare_files(
+        backup_manager.get_backup_path(old_name), backup_manager.get_backup_path(new_name), ignored_fields, match
+    )
+
+
+def _get_ignored(ignored_fields) -> dict:
+    """
+    Private function that groups the ignored fields by table, None key holds the fields ignored in any table.
+    Do not call it directly.
+
+    :param ignored_fields: iterable of `<field>` or `<table>.<field>` entries
+    :returns dict ignored: {table or None -> set of fields}
+    """
+    ignored = {}
+    for entry in ignored_fields or ():
+        table, _, field = entry.rpartition('.')
+        ignored.setdefault(table or None, set()).add(field)
+    return ignored
+
+
+def _get_keys(config: ConfigModel, match: str) -> dict:
+    """
+    Private function that computes the matching keys of the objects. Do not call it directly.
+
+    :param ConfigModel config: the config
+    :param str match: `row` or `name`
+    :returns dict keys: {key -> (table, row)}, named objects sharing a name are keyed by their occurrence number
+    """
+    keys = {}
+    for table in config.tables():
+        occurrences = {}
+        for row in config.rows(table):
+            name = config.get(table, row, NAME) if match == NAME else None
+            if name is None:
+                keys[(table, ROW, row)] = (table, row)
+            else:
+                number = occurrences[name] = occurrences.get(name, -1) + 1
+                keys[(table, NAME, name, number)] = (table, row)
+    return keys
+
+
+def _get_resolver(config: ConfigModel, match: str):
+    """
+    Private function that returns a function converting the compared values. Do not call it directly.
+
+    :param ConfigModel config: the config
+    :param str match: `row` or `name`
+    :returns callable resolve: in `name` mode it replaces references to named objects by `<table>:<name>`
+    """
+    if match == ROW:
+        return lambda value: value
+
+    def resolve(value):
+        if value is None:
+            return None
+        reference = _REFERENCE.fullmatch(value)
+        if reference is None:
+            return value
+        table, row = reference.group(1), int(reference.group(2))
+        if not config.has(table, row):
+            return value
+        name = config.get(table, row, NAME)
+        return value if name is None else f'{table}:{name}'
+    return resolve
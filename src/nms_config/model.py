@@ -0,0 +1,382 @@
+"""
+Indexed in-memory model of NMS config files.
+
+The objects of a table are stored column-wise: a list of rows and a list of values per field, field names and
+repeated values are interned. The parent-children index is built from `uprow` upon loading, the indexes of other
+fields, i.e. the names, are built per table upon the first query by the field.
+
+>>> config = ConfigModel.load('nms_backups/10000_stations_in_1_network.txt')
+>>> config.get('station', 31, 'serial')
+'32'
+>>> config.children('controller:0', 'station', field='rx_controller')[:3]
+[0, 1, 2]
+>>> config.find('station', enable='ON', rx_controller='controller:4')[:3]
+[8000, 8001, 8002]
+"""
+import sys
+from array import array
+
+from src.exceptions import InvalidOptionsException, ObjectNotFoundException
+from src.nms_config.writer import NMS, ConfigWriter, format_value
+
+_UPROW = 'uprow'
+_NAME = 'name'
+# Values up to the length are interned, i.e. references and enumerations
+_INTERN_LENGTH = 32
+
+
+class _Table:
+    """
+    Column-wise storage of the objects of a table.
+
+    :param str name: the name of the table
+    """
+
+    __slots__ = ('name', 'rows', 'positions', 'columns', 'indexes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = array('q')
+        self.positions = {}
+        self.columns = {}
+        # field -> {value -> [rows]}
+        self.indexes = {}
+
+    def add(self, row: int) -> int:
+        if row in self.positions:
+            raise InvalidOptionsException(f'Duplicate object {self.name}:{row}')
+        position = len(self.rows)
+        self.rows.append(row)
+        self.positions[row] = position
+        for column in self.columns.values():
+            column.append(None)
+        return position
+
+    def remove(self, row: int):
+        position = self.positions.pop(row)
+        del self.rows[position]
+        for column in self.columns.values():
+            del column[position]
+        for i in range(position, len(self.rows)):
+            self.positions[self.rows[i]] = i
+        self.indexes.clear()
+
+    def set(self, position: int, field: str, value: str):
+        column = self.columns.get(field)
+        if column is None:
+            column = self.columns[field] = [None] * len(self.rows)
+        column[position] = value
+
+    def get_index(self, field: str) -> dict:
+        index = self.indexes.get(field)
+        if index is None:
+            index = {}
+            column = self.columns.get(field, ())
+            for position, value in enumerate(column):
+                if value is not None:
+                    index.setdefault(value, []).append(self.rows[position])
+            self.indexes[field] = index
+        return index
+
+
+class ConfigModel:
+    """
+    In-memory model of an NMS config. Values are stored as strings without the trailing spaces,
+    i.e. `enable ON ` is stored as `ON`. References are stored as `<table>:<row>` strings.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        # parent reference -> {table -> [rows]}
+        self._children = {}
+        self._order = []
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a config file
+
+        :param path: path to the config file
+        :returns ConfigModel model: the loaded model
+        :raises InvalidOptionsException: if the file contains a duplicate object or a line outside any object
+        """
+        with open(path, encoding='utf-8', newline='') as f:
+            return cls.parse(f)
+
+    @classmethod
+    def parse(cls, lines):
+        """
+        Parse a config
+
+        :param lines: an iterable of the config lines, i.e. an opened file, or the config as a string
+        :returns ConfigModel model: the parsed model
+        :raises InvalidOptionsException: if the config contains a duplicate object or a line outside any object
+        """
+        if isinstance(lines, str):
+            lines = lines.split('\n')
+        model = cls()
+        interned = {}
+        table = None
+        position = None
+        for line in lines:
+            line = line.rstrip()
+            if not line:
+                continue
+            if line[0] == '.':
+                name, _, row = line[1:].partition(' ')
+                name = sys.intern(name)
+                table = model._tables.get(name)
+                if table is None:
+                    table = model._tables[name] = _Table(name)
+                    model._order.append(name)
+                row = int(row)
+                position = table.add(row)
+                continue
+            if table is None:
+                raise InvalidOptionsException(f'Line `{line}` does not belong to any object')
+            key, _, value = line.partition(' ')
+            key = sys.intern(key)
+            if len(value) <= _INTERN_LENGTH:
+                value = interned.setdefault(value, value)
+            table.set(position, key, value)
+            if key == _UPROW:
+                model._children.setdefault(value, {}).setdefault(table.name, []).append(row)
+        return model
+
+    def tables(self) -> list:
+        """
+        Get the names of the tables in the config order
+
+        :returns list tables: the names of the tables
+        """
+        return list(self._order)
+
+    def rows(self, table: str) -> list:
+        """
+        Get the rows of a table in the config order
+
+        :param str table: the name of the table
+        :returns list rows: the rows, an empty list if there is no such table
+        """
+        storage = self._tables.get(table)
+        return storage.rows.tolist() if storage is not None else []
+
+    def count(self, table: str) -> int:
+        """
+        Get the number of objects in a table
+
+        :param str table: the name of the table
+        :returns int count: the number of objects
+        """
+        storage = self._tables.get(table)
+        return len(storage.rows) if storage is not None else 0
+
+    def has(self, table: str, row: int) -> bool:
+        """
+        Check if the object exists
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns bool: True if the object exists
+        """
+        storage = self._tables.get(table)
+        return storage is not None and row in storage.positions
+
+    def get(self, table: str, row: int, field: str, default=None):
+        """
+        Get a field value of an object
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :param str field: the name of the field
+        :param default: the value returned if the object has no such field
+        :returns: the value of the field
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        storage, position = self._locate(table, row)
+        column = storage.columns.get(field)
+        if column is None or column[position] is None:
+            return default
+        return column[position]
+
+    def get_object(self, table: str, row: int) -> dict:
+        """
+        Get all fields of an object
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns dict fields: the fields of the object in the order they first appear in the table
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        storage, position = self._locate(table, row)
+        return {
+            field: column[position] for field, column in storage.columns.items() if column[position] is not None
+        }
+
+    def iter_objects(self):
+        """
+        Iterate over all objects in the config order
+
+        :returns: generator of (table, row, fields) tuples
+        """
+        for table in self._order:
+            storage = self._tables[table]
+            for row in storage.rows:
+                yield table, row, self.get_object(table, row)
+
+    def get_parent(self, table: str, row: int):
+        """
+        Get the parent of an object
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns str parent: the parent as `<table>:<row>`, None if the object has no parent
+        """
+        return self.get(table, row, _UPROW)
+
+    def children(self, object_table_row: str, table: str, field: str = _UPROW) -> list:
+        """
+        Get the objects of a table referring to the object. By default, the children by `uprow` are returned.
+
+        :param str object_table_row: the object as `<table>:<row>`
+        :param str table: the table of the children
+        :param str field: the name of the referring field, i.e. `rx_controller`
+        :returns list rows: the rows of the children
+        """
+        if field == _UPROW:
+            return list(self._children.get(object_table_row, {}).get(table, ()))
+        return self.find(table, **{field: object_table_row})
+
+    def find_by_name(self, table: str, name: str) -> list:
+        """
+        Get the objects of a table by name
+
+        :param str table: the name of the table
+        :param str name: the name of the objects
+        :returns list rows: the rows of the objects
+        """
+        return self.find(table, **{_NAME: name})
+
+    def find(self, table: str, **conditions) -> list:
+        """
+        Get the objects of a table whose fields are equal to the passed values. The index of a field is built upon
+        the first query by the field.
+
+        >>> config.find('station', enable='ON', rx_controller='controller:0')
+
+        :param str table: the name of the table
+        :param conditions: field=value pairs, the values are compared as strings
+        :returns list rows: the rows of the objects in the config order
+        """
+        storage = self._tables.get(table)
+        if storage is None:
+            return []
+        if not conditions:
+            return storage.rows.tolist()
+        matches = None
+        for field, value in conditions.items():
+            rows = storage.get_index(field).get(str(value), ())
+            matches = set(rows) if matches is None else matches.intersection(rows)
+            if not matches:
+                return []
+        return sorted(matches, key=storage.positions.__getitem__)
+
+    def add_object(self, table: str, row: int, fields: dict):
+        """
+        Add an object to the config
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :param dict fields: the fields of the object, None values are skipped
+        :raises InvalidOptionsException: if the object already exists
+        """
+        storage = self._tables.get(table)
+        if storage is None:
+            storage = self._tables[table] = _Table(sys.intern(table))
+            self._order.append(storage.name)
+        storage.add(row)
+        storage.indexes.clear()
+        for field, value in fields.items():
+            self.set(table, row, field, value)
+
+    def set(self, table: str, row: int, field: str, value):
+        """
+        Set a field value of an object
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :param str field: the name of the field
+        :param value: the new value, booleans are stored as `ON` and `OFF`, None removes the field
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        storage, position = self._locate(table, row)
+        if value is not None:
+            value = format_value(value).rstrip()
+        column = storage.columns.get(field)
+        old_value = column[position] if column is not None else None
+        if old_value == value:
+            return
+        storage.set(position, sys.intern(field), value)
+        storage.indexes.pop(field, None)
+        if field == _UPROW:
+            if old_value is not None:
+                self._children[old_value][table].remove(row)
+            if value is not None:
+                self._children.setdefault(value, {}).setdefault(table, []).append(row)
+
+    def delete_object(self, table: str, row: int):
+        """
+        Delete an object from the config. Its children and the references to it are kept.
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        self.set(table, row, _UPROW, None)
+        self._tables[table].remove(row)
+
+    def get_free_row(self, table: str) -> int:
+        """
+        Get the lowest row not used in a table
+
+        :param str table: the name of the table
+        :returns int row: the free row
+        """
+        storage = self._tables.get(table)
+        if storage is None:
+            return 0
+        row = 0
+        while row in storage.positions:
+            row += 1
+        return row
+
+    def save(self, path) -> int:
+        """
+        Write the config to a file in NMS order: NMS object first, the rest of the tables in alphabetical order,
+        the objects of a table in ascending row order
+
+        :param path: path to the config file
+        :returns int count: the number of written objects
+        """
+        tables = sorted(self._order, key=lambda name: (name != NMS, name))
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = ConfigWriter(f)
+            for table in tables:
+                for row in sorted(self._tables[table].rows):
+                    writer.write_object(table, row, self.get_object(table, row))
+            return writer.count
+
+    def _locate(self, table: str, row: int):
+        """
+        Private method that finds the storage of an object. Do not call it directly.
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns tuple (storage, position): the storage of the table and the position of the object
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        storage = self._tables.get(table)
+        position = storage.positions.get(row) if storage is not None else None
+        if position is None:
+            raise ObjectNotFoundException(f'There is no {table}:{row} in the config')
+        return storage, position
@@ -0,0 +1,262 @@
+"""
+Memory-mapped lazy reader of large NMS config files.
+
+The file is memory-mapped and the offsets of `.<table> <row>` headers are indexed in one pass, the fields
+of an object are parsed only when the object is requested. The index is cached in `<config>.idx` sidecar file
+along with the modification time and the size of the config, therefore reopening an unchanged config
+does not scan it again. A stale or broken cache is rebuilt silently.
+
+>>> with ConfigReader('nms_backups/32768_stations_1_vno.txt') as config:
+...     config.get('station', 31999, 'serial')
+'32000'
+"""
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from src import json_codec
+from src.exceptions import ObjectNotFoundException
+
+INDEX_SUFFIX = '.idx'
+# Incremented upon any change of the index format
+_INDEX_VERSION = 1
+
+
+class ConfigReader:
+    """
+    Lazy reader of an NMS config. Values are returned as strings without the trailing spaces the same way
+    `src.nms_config.model.ConfigModel` does.
+
+    :param path: path to the config file
+    :param bool use_cache: if True (by default) the index is read from and written to the sidecar file
+    """
+
+    def __init__(self, path, use_cache: bool = True):
+        self._path = Path(path)
+        self._file = open(self._path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        # Empty files cannot be mapped
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        # table -> (rows, starts, ends) arrays in the file order
+        self._index = None
+        # Tables whose rows are not in ascending order, the rows of the other tables are looked up by bisection
+        self._unordered = set()
+        # table -> {row -> position in the arrays} of the unordered tables, built upon the first lookup in the table
+        self._positions = {}
+        self.index_cached = False
+        if use_cache:
+            self._index = self._read_index()
+            self.index_cached = self._index is not None
+        if self._index is None:
+            self._index = self._build_index()
+            if use_cache:
+                self._write_index()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def tables(self) -> list:
+        """
+        Get the names of the tables in the config order
+
+        :returns list tables: the names of the tables
+        """
+        return list(self._index)
+
+    def rows(self, table: str) -> list:
+        """
+        Get the rows of a table in the config order
+
+        :param str table: the name of the table
+        :returns list rows: the rows, an empty list if there is no such table
+        """
+        entry = self._index.get(table)
+        return entry[0].tolist() if entry is not None else []
+
+    def count(self, table: str) -> int:
+        """
+        Get the number of objects in a table
+
+        :param str table: the name of the table
+        :returns int count: the number of objects
+        """
+        entry = self._index.get(table)
+        return len(entry[0]) if entry is not None else 0
+
+    def has(self, table: str, row: int) -> bool:
+        """
+        Check if the object exists
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns bool: True if the object exists
+        """
+        return self._get_position(table, row) is not None
+
+    def get(self, table: str, row: int, field: str, default=None):
+        """
+        Get a field value of an object, only the object is parsed
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :param str field: the name of the field
+        :param default: the value returned if the object has no such field
+        :returns: the value of the field
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        return self.get_object(table, row).get(field, default)
+
+    def get_object(self, table: str, row: int) -> dict:
+        """
+        Get all fields of an object
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns dict fields: the fields of the object in the file order
+        :raises ObjectNotFoundException: if there is no such object
+        """
+        position = self._get_position(table, row)
+        if position is None:
+            raise ObjectNotFoundException(f'There is no {table}:{row} in the config')
+        _, starts, ends = self._index[table]
+        return self._parse_object(starts[position], ends[position])
+
+    def iter_objects(self):
+        """
+        Iterate over all objects in the config order
+
+        :returns: generator of (table, row, fields) tuples
+        """
+        for table, (rows, starts, ends) in self._index.items():
+            for row, start, end in zip(rows, starts, ends):
+                yield table, row, self._parse_object(start, end)
+
+    def _parse_object(self, start: int, end: int) -> dict:
+        """
+        Private method that parses the fields of an object. Do not call it directly.
+
+        :param int start: the offset of the object header
+        :param int end: the offset following the last byte of the object
+        :returns dict fields: the fields of the object
+        """
+        fields = {}
+        lines = self._data[start:end].decode('utf-8').split('\n')
+        for line in lines[1:]:
+            line = line.rstrip()
+            if line:
+                key, _, value = line.partition(' ')
+                fields[key] = value
+        return fields
+
+    def _get_position(self, table: str, row: int):
+        """
+        Private method that finds the position of a row in the index arrays. Do not call it directly.
+
+        :param str table: the name of the table
+        :param int row: the row of the object
+        :returns: the position, None if there is no such object
+        """
+        entry = self._index.get(table)
+        if entry is None:
+            return None
+        rows = entry[0]
+        if table in self._unordered:
+            positions = self._positions.get(table)
+            if positions is None:
+                positions = self._positions[table] = {value: i for i, value in enumerate(rows)}
+            return positions.get(row)
+        position = bisect_left(rows, row)
+        return position if position < len(rows) and rows[position] == row else None
+
+    def _build_index(self) -> dict:
+        """
+        Private method that scans the file for the object headers. Do not call it directly.
+
+        :returns dict index: {table -> (rows, starts, ends)}
+        """
+        data = self._data
+        size = len(data)
+        starts = [0] if data[:1] == b'.' else []
+        offset = data.find(b'\n.')
+        while offset != -1:
+            starts.append(offset + 1)
+            offset = data.find(b'\n.', offset + 1)
+        index = {}
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else size
+            line_end = data.find(b'\n', start, end)
+            header = data[start + 1:line_end if line_end != -1 else end].decode('utf-8').split()
+            table, row = header[0], int(header[1])
+            entry = index.get(table)
+            if entry is None:
+                entry = index[table] = (array('q'), array('q'), array('q'))
+            elif row <= entry[0][-1]:
+                self._unordered.add(table)
+            entry[0].append(row)
+            entry[1].append(start)
+            entry[2].append(end)
+        return index
+
+    def _get_index_path(self) -> Path:
+        """Private method that returns the path to the sidecar index file. Do not call it directly."""
+        return self._path.with_name(self._path.name + INDEX_SUFFIX)
+
+    def _read_index(self):
+        """
+        Private method that reads the cached index. Do not call it directly.
+
+        :returns: the index, None if there is no valid cache for the current file
+        """
+        try:
+            with open(self._get_index_path(), 'rb') as f:
+                header = json_codec.loads(f.readline())
+                if header['version'] != _INDEX_VERSION or (header['mtime_ns'], header['size']) != self._stat:
+                    return None
+                index = {}
+                for table, count in header['tables']:
+                    entry = index[table] = (array('q'), array('q'), array('q'))
+                    for values in entry:
+                        values.fromfile(f, count)
+                self._unordered = set(header['unordered'])
+                return index
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_index(self):
+        """
+        Private method that writes the index to the sidecar file: a JSON header line followed by the raw arrays.
+        Failures are ignored, i.e. if the folder is read-only. Do not call it directly.
+        """
+        mtime_ns, size = self._stat
+        header = json_codec.dumps({
+            'version': _INDEX_VERSION,
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'tables': [[table, len(entry[0])] for table, entry in self._index.items()],
+            'unordered': sorted(self._unordered),
+        })
+        index_path = self._get_index_path()
+        temp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}')
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(header + b'\n')
+                for entry in self._index.values():
+                    for values in entry:
+                        values.tofile(f)
+            temp_path.replace(index_path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,402 @@
+"""
+Offline writer of NMS config files.
+
+NMS config (backup) is a text file of objects separated by blank lines. An object starts with `.<table> <row>` header
+followed by `<key> <value>` lines. Objects of a table are written in ascending row order, NMS object goes first,
+the rest of the tables follow in alphabetical order. The objects are linked by the references `<table>:<row>`:
+
+- `uprow` is the parent of the object;
+- a parent refers to the first child of each table, i.e. `stations station:0`, the rest of the children
+  are chained by `next` in the order of their names;
+- a controller refers to the first station it receives by `rx_stations`, the rest of its stations are chained
+  by `rx_next` in ascending row order, i.e. `station:30` is followed by `station:31`.
+
+The files are written by streaming the objects, the topology of any size is written in a few seconds:
+
+>>> TopologyWriter(stations=32768, controllers=1, station_name=lambda row: f'stn-{row + 1}').write(path)
+32776
+>>> BackupManager().apply_backup('32768_stations_1_vno.txt')
+"""
+import ipaddress
+from time import time
+
+from src.enum_types_constants import ControllerModesStr, RouteTypesStr
+from src.exceptions import InvalidOptionsException
+
+NMS = 'nms'
+ACCESS = 'access'
+CONTROLLER = 'controller'
+GROUP = 'group'
+NETWORK = 'network'
+ROUTE = 'route'
+SERVICE = 'service'
+STATION = 'station'
+TELEPORT = 'teleport'
+USER = 'user'
+VNO = 'vno'
+
+CONFIG_VERSION = 20
+# Password hash of the default `admin` user as it is stored in NMS config
+DEFAULT_PASSWORD_HASH = 3664045120
+_ON = 'ON '
+_OFF = 'OFF'
+
+
+def format_value(value) -> str:
+    """
+    Format a parameter value the way NMS stores it in a config
+
+    :param value: the value, booleans are stored as `ON ` and `OFF`
+    :returns str value: the formatted value
+    """
+    if value is True:
+        return _ON
+    if value is False:
+        return _OFF
+    if value == 'ON':
+        return _ON
+    return str(value)
+
+
+def ref(table: str, row: int) -> str:
+    """
+    Get the reference to an object
+
+    :param str table: the table of the object
+    :param int row: the row of the object
+    :returns str reference: the reference as `<table>:<row>`
+    """
+    return f'{table}:{row}'
+
+
+def get_chain(rows, name=None) -> dict:
+    """
+    Get the links of a chain of sibling objects ordered by their names
+
+    :param rows: an iterable of the rows of the siblings
+    :param callable name: optional function returning the name of the row, if None the rows are chained in order
+    :returns dict links: a dictionary {row: next_row}, the first row is stored under None key
+    """
+    rows = list(rows)
+    if name is not None:
+        rows.sort(key=name)
+    links = dict(zip(rows, rows[1:]))
+    if rows:
+        links[None] = rows[0]
+    return links
+
+
+class ConfigWriter:
+    """
+    Streaming writer of NMS config objects. Objects must be passed in the file order.
+
+    >>> with open(path, 'w', newline='') as f:
+    ...     writer = ConfigWriter(f)
+    ...     writer.write_object('nms', 0, {'name': 'UHP NMS'})
+
+    :param file: a text file opened for writing with `newline=''`
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._last = None
+        self._tables = set()
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """The number of the written objects"""
+        return self._count
+
+    def write_object(self, table: str, row: int, fields):
+        """
+        Write an object
+
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :param fields: a dictionary or an iterable of (key, value) pairs, the pairs with None values are skipped
+        :raises InvalidOptionsException: if the object goes out of the file order
+        """
+        if self._last is not None and self._last[0] == table:
+            if row <= self._last[1]:
+                raise InvalidOptionsException(f'Row {table}:{row} must be greater than {table}:{self._last[1]}')
+        elif table in self._tables:
+            raise InvalidOptionsException(f'Objects of table {table} must be written in a row')
+        self._tables.add(table)
+        self._last = (table, row)
+        if isinstance(fields, dict):
+            fields = fields.items()
+        lines = [f'.{table} {row}\n']
+        for key, value in fields:
+            if value is not None:
+                lines.append(f'{key} {format_value(value)}\n')
+        if self._count:
+            lines.insert(0, '\n')
+        self._file.write(''.join(lines))
+        self._count += 1
+
+
+class TopologyWriter:
+    """
+    Generator of a network config: NMS with the default admin user, a network, a teleport, controllers,
+    VNOs and stations with optional routes. Stations are split into contiguous blocks between VNOs and between
+    controllers, i.e. 10000 stations and 5 controllers give 2000 stations per controller.
+
+    :param int stations: number of stations
+    :param int controllers: number of controllers
+    :param int vnos: number of VNOs
+    :param int routes: number of routes per station: 0, 1 (IP address) or 2 (IP address and default static route)
+    :param str controller_mode: the mode of the controllers
+    :param str station_mode: optional mode of the stations, the default NMS mode (Star) is not stored
+    :param callable station_name: function returning the name of a station by its row
+    :param callable controller_name: function returning the name of a controller by its row
+    :param callable vno_name: function returning the name of a VNO by its row
+    :param callable station_params: optional function returning a dictionary of extra station parameters by its row
+    :param callable controller_params: optional function returning a dictionary of extra controller parameters by
+                                       its row
+    :param str network_name: the name of the network
+    :param str teleport_name: the name of the teleport
+    :param str sat_name: the satellite name of the teleport
+    :param int created: the creation time stored in the objects, defaults to the current time
+    """
+
+    def __init__(
+            self,
+            stations: int,
+            controllers: int = 1,
+            vnos: int = 1,
+            routes: int = 0,
+            controller_mode: str = ControllerModesStr.MF_HUB,
+            station_mode: str = None,
+            station_name=None,
+            controller_name=None,
+            vno_name=None,
+            station_params=None,
+            controller_params=None,
+            network_name: str = 'net-0',
+            teleport_name: str = 'tp-0',
+            sat_name: str = 'sat',
+            created: int = None,
+    ):
+        if stations < 0 or controllers < 1 or vnos < 1:
+            raise InvalidOptionsException('At least one controller and one VNO are required')
+        if routes not in (0, 1, 2):
+            raise InvalidOptionsException('Number of routes per station must be 0, 1 or 2')
+        self._stations = stations
+        self._controllers = controllers
+        self._vnos = vnos
+        self._routes = routes
+        self._controller_mode = controller_mode
+        self._station_mode = station_mode
+        self._station_name = station_name if station_name is not None else lambda row: f'stn-{row}'
+        self._controller_name = controller_name if controller_name is not None else lambda row: f'ctrl-{row}'
+        self._vno_name = vno_name if vno_name is not None else lambda row: f'vno-{row}'
+        self._station_params = station_params
+        self._controller_params = controller_params
+        self._network_name = network_name
+        self._teleport_name = teleport_name
+        self._sat_name = sat_name
+        self._created = int(time()) if created is None else created
+
+    def write(self, path) -> int:
+        """
+        Write the config file
+
+        :param path: path to the config file
+        :returns int count: the number of the written objects
+        """
+        with open(path, 'w', newline='') as f:
+            writer = ConfigWriter(f)
+            for table, row, fields in self.iter_objects():
+                writer.write_object(table, row, fields)
+        return writer.count
+
+    def iter_objects(self):
+        """
+        Generate the objects in the file order
+
+        :returns: generator of (table, row, fields) tuples, where fields is a list of (key, value) pairs
+        """
+        yield from self._nms()
+        yield from self._access()
+        yield from self._controller()
+        yield from self._group()
+        yield from self._network()
+        yield from self._route()
+        yield from self._service()
+        yield from self._station()
+        yield from self._teleport()
+        yield from self._user()
+        yield from self._vno()
+
+    def get_station_vno(self, row: int) -> int:
+        """
+        Get the VNO of a station
+
+        :param int row: the row of the station
+        :returns int vno: the row of the VNO
+        """
+        return row * self._vnos // self._stations
+
+    def get_station_controller(self, row: int) -> int:
+        """
+        Get the receiving controller of a station
+
+        :param int row: the row of the station
+        :returns int controller: the row of the controller
+        """
+        return row * self._controllers // self._stations
+
+    def _get_block(self, index: int, number: int) -> range:
+        """
+        Private method that returns the rows of the stations belonging to a VNO or a controller.
+        Do not call it directly.
+
+        :param int index: the row of the VNO or the controller
+        :param int number: number of VNOs or controllers
+        :returns range rows: the rows of the stations
+        """
+        start = -(-index * self._stations // number)
+        end = -(-(index + 1) * self._stations // number)
+        return range(start, end)
+
+    def _nms(self):
+        yield NMS, 0, [
+            ('config_ver', CONFIG_VERSION),
+            ('name', 'UHP NMS'),
+            ('created', self._created),
+            ('http_port', 8000),
+            ('fs_path1', '/'),
+            ('accesses', ref(ACCESS, 0)),
+            ('groups', ref(GROUP, 0)),
+            ('networks', ref(NETWORK, 0)),
+        ]
+
+    def _access(self):
+        yield ACCESS, 0, [('uprow', ref(NMS, 0)), ('group', ref(GROUP, 0)), ('edit', True)]
+
+    def _controller(self):
+        chain = get_chain(range(self._controllers), self._controller_name)
+        for row in range(self._controllers):
+            block = self._get_block(row, self._controllers)
+            rx_stations = block[0] if len(block) else None
+            fields = [
+                ('next', ref(CONTROLLER, chain[row]) if row in chain else None),
+                ('uprow', ref(NETWORK, 0)),
+                ('name', self._controller_name(row)),
+                ('created', self._created),
+                ('rx_stations', ref(STATION, rx_stations) if rx_stations is not None else None),
+                ('mode', self._controller_mode),
+                ('device_ip', str(ipaddress.IPv4Address('127.0.0.1') + row)),
+                ('teleport', ref(TELEPORT, 0)),
+                ('tx_on', True),
+                ('tx_level', 22.0),
+                ('stn_number', len(block) if len(block) else None),
+            ]
+            if self._controller_params is not None:
+                fields.extend(self._controller_params(row).items())
+            yield CONTROLLER, row, fields
+
+    def _group(self):
+        yield GROUP, 0, [('uprow', ref(NMS, 0)), ('name', 'Admins'), ('users', ref(USER, 0))]
+
+    def _network(self):
+        yield NETWORK, 0, [
+            ('uprow', ref(NMS, 0)),
+            ('name', self._network_name),
+            ('vnos', ref(VNO, get_chain(range(self._vnos), self._vno_name)[None])),
+            ('controllers', ref(CONTROLLER, get_chain(range(self._controllers), self._controller_name)[None])),
+            ('teleports', ref(TELEPORT, 0)),
+            ('services', ref(SERVICE, 0) if self._routes else None),
+            ('created', self._created),
+        ]
+
+    def _route(self):
+        # The IP address route of a station has the same row as the station, its static route follows the stations
+        if not self._routes:
+            return
+        for row in range(self._stations):
+            ip_address = ipaddress.IPv4Address('10.0.0.1') + row
+            yield ROUTE, row, [
+                ('next', ref(ROUTE, self._stations + row) if self._routes == 2 else None),
+                ('uprow', ref(STATION, row)),
+                ('type', RouteTypesStr.IP_ADDRESS),
+                ('service', ref(SERVICE, 0)),
+                ('ip', str(ip_address)),
+                ('id', 'Private'),
+            ]
+        if self._routes == 2:
+            for row in range(self._stations):
+                yield ROUTE, self._stations + row, [
+                    ('uprow', ref(STATION, row)),
+                    ('type', RouteTypesStr.STATIC_ROUTE),
+                    ('service', ref(SERVICE, 0)),
+                    ('mask', '/0'),
+                    ('gateway', str(ipaddress.IPv4Address('10.0.0.1') + row)),
+                    ('id', 'Private'),
+                ]
+
+    def _service(self):
+        if self._routes:
+            yield SERVICE, 0, [('uprow', ref(NETWORK, 0)), ('name', 'stn_service')]
+
+    def _station(self):
+        # The chains are built block by block, only the links of the current block are kept in memory
+        next_links = {}
+        rx_links = {}
+        for row in range(self._stations):
+            vno = self.get_station_vno(row)
+            controller = self.get_station_controller(row)
+            if row not in next_links:
+                next_links = get_chain(self._get_block(vno, self._vnos), self._station_name)
+            if row not in rx_links:
+                rx_links = get_chain(self._get_block(controller, self._controllers))
+            fields = [
+                ('next', ref(STATION, next_links[row]) if row in next_links else None),
+                ('uprow', ref(VNO, vno)),
+                ('name', self._station_name(row)),
+                ('routes', ref(ROUTE, row) if self._routes else None),
+                ('enable', True),
+                ('serial', row + 1),
+                ('mode', self._station_mode),
+                ('rx_controller', ref(CONTROLLER, controller)),
+                ('created', self._created),
+                ('rx_ctr_dyn', ref(CONTROLLER, controller)),
+                ('rx_ctr_act', ref(CONTROLLER, controller)),
+                ('rx_next', ref(STATION, rx_links[row]) if row in rx_links else None),
+            ]
+            if self._station_params is not None:
+                params = self._station_params(row)
+                fields = [(key, params.pop(key, value)) for key, value in fields]
+                fields.extend(params.items())
+            yield STATION, row, fields
+
+    def _teleport(self):
+        yield TELEPORT, 0, [
+            ('uprow', ref(NETWORK, 0)),
+            ('name', self._teleport_name),
+            ('sat_name', self._sat_name),
+            ('tx_lo', 0),
+            ('rx1_lo', 0),
+            ('rx2_lo', 0),
+        ]
+
+    def _user(self):
+        yield USER, 0, [
+            ('uprow', ref(GROUP, 0)),
+            ('name', 'admin'),
+            ('enable', True),
+            ('password', DEFAULT_PASSWORD_HASH),
+        ]
+
+    def _vno(self):
+        chain = get_chain(range(self._vnos), self._vno_name)
+        for row in range(self._vnos):
+            first = get_chain(self._get_block(row, self._vnos), self._station_name).get(None)
+            yield VNO, row, [
+                ('next', ref(VNO, chain[row]) if row in chain else None),
+                ('uprow', ref(NETWORK, 0)),
+                ('name', self._vno_name(row)),
+                ('stations', ref(STATION, first) if first is not None else None),
+                ('created', self._created),
+            ]
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 from src.constants import NEW_OBJECT_ID
 from src.drivers.abstract_http_driver import API, AbstractHttpDriver
-from src.exceptions import InvalidIdException
+from src.exceptions import InvalidIdException, NmsErrorResponseException, NotImplementedException
 
 
 class AbstractBasicObject(ABC):
@@ -141,6 +141,46 @@ class AbstractBasicObject(ABC):
                 del params[field]
         return first_params, params
 
+    @classmethod
+    def get_params_many(cls, driver: AbstractHttpDriver, parent_id: int, fields: list, page_size: int = 1000):
+        """
+        Get the passed parameters of all the objects in the parent by a few paged list requests
+        instead of loading the objects one by one.
+
+        >>> Station.get_params_many(driver, 0, ['name', 'state'])
+        {0: {'name': 'stn1', 'state': 'Up'}, 1: {'name': 'stn2', 'state': 'Off'}}
+
+        :param AbstractHttpDriver driver: an instance of `src.drivers.abstract_http_driver.AbstractHttpDriver` class
+        :param int parent_id: ID of the parent object
+        :param list fields: names of the parameters to get
+        :param int page_size: number of objects requested at once
+        :returns dict params: IDs of the objects and dictionaries of their parameters
+        :raises NotImplementedException: if the driver is not API or the object does not support listing
+        :raises NmsErrorResponseException: if there is an error in the response
+        """
+        if API != driver.get_type():
+            raise NotImplementedException('Getting parameters of many objects is available for API driver only')
+        params = {}
+        skip = 0
+        while True:
+            _path = cls._get_list_path(driver.get_type(), parent_id, skip, page_size, list(fields))
+            _res, _err, _code = driver.custom_get(_path)
+            if _err not in (None, '') or _code not in (None, 0) or _res is None:
+                raise NmsErrorResponseException(f'Cannot get {cls.__name__} list: error {_err}, error_code {_code}')
+            for r in _res:
+                params[r.get('%row')] = {field: r.get(field) for field in fields}
+            if len(_res) < page_size:
+                return params
+            skip += len(_res)
+
+    @classmethod
+    def _get_list_path(cls, driver_type, parent_id: int, skip=None, max_=None, vars_=None) -> str:
+        """
+        Private class method that returns the path for listing the objects of the parent.
+        Redefine the method in the child class that supports listing.
+        """
+        raise NotImplementedException(f'{cls.__name__} does not support listing')
+
     @abstractmethod
     def _get_create_path(self) -> str:
         """
@@ -220,8 +260,9 @@ class AbstractBasicObject(ABC):
         if self._get_read_path() != self._driver.get_current_path():
             self.load()
         else:
-            for _param_name in self._params.keys():
-                self.read_param(_param_name)
+            with self._driver.snapshot():
+                for _param_name in self._params.keys():
+                    self.read_param(_param_name)
         return self._params[param_name]
 
     def send_param(self, param_name: str, param_value: any):
@@ -285,10 +326,12 @@ class AbstractBasicObject(ABC):
         """
         if self._is_new():
             raise InvalidIdException
-        self._driver.set_path(self._get_read_path())
-        self._driver.load_data()
-        for param_name in self._params.keys():
-            self.read_param(param_name)
+        # The parameters are read from a single reply instead of reloading the object per parameter
+        with self._driver.snapshot():
+            self._driver.set_path(self._get_read_path())
+            self._driver.load_data()
+            for param_name in self._params.keys():
+                self.read_param(param_name)
 
     def save(self):
         """
@@ -151,14 +151,15 @@ class Device(AbstractBasicObject, HasUpState, LogObject, HasFaults):
 
         :returns dict: a dictionary containing the key-value pairs of the Device state.
         """
-        self._driver.set_path(self._get_status_path())
-        self._driver.load_data()
-        for field in self._state_fields.keys():
-            state = self._driver.get_value(field)
-            if str == type(state):
-                self._state_fields[field] = state.strip()
-            else:
-                self._state_fields[field] = state
+        with self._driver.snapshot():
+            self._driver.set_path(self._get_status_path())
+            self._driver.load_data()
+            for field in self._state_fields.keys():
+                state = self._driver.get_value(field)
+                if str == type(state):
+                    self._state_fields[field] = state.strip()
+                else:
+                    self._state_fields[field] = state
         return self._state_fields.copy()
 
     @classmethod
@@ -183,6 +184,10 @@ class Device(AbstractBasicObject, HasUpState, LogObject, HasFaults):
             _dev_ids.add(r.get('%row'))
         return _dev_ids
 
+    @classmethod
+    def _get_list_path(cls, driver_type, parent_id: int, skip=None, max_=None, vars_=None) -> str:
+        return PathsManager.device_list(driver_type, parent_id, skip, max_, vars_)
+
     def log_add_device_investigator(self):
         self._driver.set_path(self._get_log_path())
         self._driver.load_data()
@@ -1,5 +1,5 @@
 import re
-from time import time, sleep
+from time import sleep
 from src.constants import NEW_OBJECT_ID, API_RESTART_COMMAND, NO_ERROR
 from src.drivers.abstract_http_driver import AbstractHttpDriver, API
 from src.exceptions import NotImplementedException, InvalidIdException, NmsErrorResponseException
@@ -108,29 +108,20 @@ class Nms(AbstractBasicObject, LogObject):
     def wait_next_tick(self, timeout: int = 10, step_timeout: float = 0.1) -> bool:
         """
         Wait till the next NMS tick is in place to make sure that the config is sent to controllers.
+        The tick clock of the driver sleeps till the tick is expected and polls the tick number only around it.
         Currently is supported only via API driver.
 
         :param int timeout: the parameter is used to terminate the waiting cycle if tick number is not updated
-        :param float step_timeout: the parameter indicates how often the tick number value is requested
+        :param float step_timeout: the parameter indicates how often the tick number value is requested near the tick
         :return bool: True if the tick number value is incremented, False is returned upon timeout
         """
         # TODO: implement in WEB driver
         if self._driver.get_type() != API:
             raise NotImplementedException('Method is implemented only in API driver')
-        begin = int(time())
-        self._driver.set_path(self._get_read_path())
-        self._driver.load_data()
-        tick_number_init = self._driver.get_value('tick_number')
-        while True:
-            self._driver.load_data()
-            tick_number = self._driver.get_value('tick_number')
-            if tick_number > tick_number_init:
-                sleep(1)  # Still has to wait a second in order to let UHP process the new config
-                return True
-            t = int(time())
-            if timeout < t - begin:
-                return False
-            sleep(step_timeout)
+        if self._driver.get_tick_clock().wait_next_tick(timeout=timeout, step_timeout=step_timeout):
+            sleep(1)  # Still has to wait a second in order to let UHP process the new config
+            return True
+        return False
 
     def wait_ticks(self, number=1):
         """
@@ -139,10 +130,23 @@ class Nms(AbstractBasicObject, LogObject):
         :param int number: number of ticks to wait
         :return bool: True if the expected number of ticks passed, False if there was no tick increment on any step
         """
-        for _ in range(number):
-            if not self.wait_next_tick():
-                return False
-        return True
+        if self._driver.get_type() != API:
+            raise NotImplementedException('Method is implemented only in API driver')
+        if self._driver.get_tick_clock().wait_ticks(number):
+            sleep(1)  # Still has to wait a second in order to let UHP process the new config
+            return True
+        return False
+
+    def get_tick_stats(self):
+        """
+        Get the tick timing statistics of the driver session. Currently is supported only via API driver.
+
+        :returns TickStats: number of observed ticks, learned tick period and its jitter,
+                            number of tick number requests and number of awaiting calls
+        """
+        if self._driver.get_type() != API:
+            raise NotImplementedException('Method is implemented only in API driver')
+        return self._driver.get_tick_clock().get_stats()
 
     def restart(self, timeout=10):
         """
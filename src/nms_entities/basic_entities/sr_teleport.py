@@ -121,14 +121,15 @@ class SrTeleport(AbstractBasicObject, HasUpState, LogObject):
 
         :returns dict: a dictionary containing the key-value pairs of the SrTeleport state.
         """
-        self._driver.set_path(self._get_status_path())
-        self._driver.load_data()
-        for field in self._state_fields.keys():
-            state = self._driver.get_value(field)
-            if str == type(state):
-                self._state_fields[field] = state.strip()
-            else:
-                self._state_fields[field] = state
+        with self._driver.snapshot():
+            self._driver.set_path(self._get_status_path())
+            self._driver.load_data()
+            for field in self._state_fields.keys():
+                state = self._driver.get_value(field)
+                if str == type(state):
+                    self._state_fields[field] = state.strip()
+                else:
+                    self._state_fields[field] = state
         return self._state_fields.copy()
 
     @classmethod
@@ -153,6 +154,10 @@ class SrTeleport(AbstractBasicObject, HasUpState, LogObject):
             _sr_tp_ids.add(r.get('%row'))
         return _sr_tp_ids
 
+    @classmethod
+    def _get_list_path(cls, driver_type, parent_id: int, skip=None, max_=None, vars_=None) -> str:
+        return PathsManager.sr_teleport_list(driver_type, parent_id, skip, max_, vars_)
+
     def log_add_device_investigator(self):
         self._driver.set_path(self._get_log_path())
         self._driver.load_data()
@@ -99,3 +99,7 @@ class Teleport(AbstractBasicObject):
         for r in _res:
             _tp_ids.add(r.get('%row'))
         return _tp_ids
+
+    @classmethod
+    def _get_list_path(cls, driver_type, parent_id: int, skip=None, max_=None, vars_=None) -> str:
+        return PathsManager.teleport_list(driver_type, parent_id, skip, max_, vars_)
@@ -218,14 +218,15 @@ class Vno(AbstractBasicObject, LogObject):
 
         :returns dict: a dictionary containing the key-value pairs of the controller state.
         """
-        self._driver.set_path(self._get_status_path())
-        self._driver.load_data()
-        for field in self._state_fields.keys():
-            state = self._driver.get_value(field)
-            if str == type(state):
-                self._state_fields[field] = state.strip()
-            else:
-                self._state_fields[field] = state
+        with self._driver.snapshot():
+            self._driver.set_path(self._get_status_path())
+            self._driver.load_data()
+            for field in self._state_fields.keys():
+                state = self._driver.get_value(field)
+                if str == type(state):
+                    self._state_fields[field] = state.strip()
+                else:
+                    self._state_fields[field] = state
 
         return self._state_fields.copy()
 
@@ -252,6 +253,10 @@ class Vno(AbstractBasicObject, LogObject):
             _vno_ids.add(r.get('%row'))
         return _vno_ids
 
+    @classmethod
+    def _get_list_path(cls, driver_type, parent_id: int, skip=None, max_=None, vars_=None) -> str:
+        return PathsManager.vno_list(driver_type, parent_id, None, skip, max_, vars_)
+
     def log_add_device_investigator(self):
         self._driver.set_path(self._get_log_path())
         self._driver.load_data()
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from time import sleep, time
 from typing import Tuple, Union, List
 
+from src.drivers.abstract_http_driver import API
 from src.exceptions import InvalidOptionsException
 
 
@@ -225,6 +226,9 @@ class HasUpState(ABC):
                 }...]],
             }
         """
+        objects = [*(controllers or []), *(stations or [])]
+        if objects and all(API == obj._driver.get_type() for obj in objects):
+            return cls._wait_all_listed(objects, timeout, step_timeout)
         done, pending = asyncio.run(cls._run_wait(controllers, stations, timeout, step_timeout))
         result = {
             'up': [],
@@ -261,6 +265,33 @@ class HasUpState(ABC):
         ]
         return result.get('up'), result.get('fail')
 
+    @classmethod
+    def _wait_all_listed(cls, objects: list, timeout: int, step_timeout: int) -> Tuple[list, list]:
+        """
+        Wait for Up state of all the objects polling the states of the objects sharing the same parent
+        by a single list request per cycle. The result is the same as of `wait_all`.
+        """
+        groups = {}
+        for obj in objects:
+            groups.setdefault((type(obj), obj._parent_id, obj._driver), []).append(obj)
+        up_after = {}
+        begin = time()
+        while True:
+            for (obj_type, parent_id, driver), members in groups.items():
+                if all(obj in up_after for obj in members):
+                    continue
+                states = obj_type.get_params_many(driver, parent_id, ['state'])
+                waiting = int(time() - begin)
+                for obj in members:
+                    if obj not in up_after and states.get(obj.get_id(), {}).get('state') == cls.UP:
+                        up_after[obj] = waiting
+            if len(up_after) == len(objects) or timeout < time() - begin:
+                break
+            sleep(step_timeout)
+        up = [{'up_after': up_after[obj], 'instance': obj} for obj in objects if obj in up_after]
+        fail = [{'up_after': None, 'instance': obj} for obj in objects if obj not in up_after]
+        return up, fail
+
     @classmethod
     async def _run_wait(cls, controllers: list = None, stations: list = None, timeout: int = 30, step_timeout: int = 5):
         controllers_tasks = []
@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 from src.constants import NO_ERROR
 from src.drivers.abstract_http_driver import API
 from src.exceptions import NmsErrorResponseException, NotImplementedException
+from src.log_tailer import LogTailer
 
 
 class LogObject(ABC):
@@ -12,10 +13,11 @@ class LogObject(ABC):
 
     def wait_log_message(self, obj, message=None, fault=True, info=True, warning=True, timeout=60, step_timeout=5):
         """
-        Wait for log message to appear in logs
+        Wait for log message to appear in logs. Each log request gets only the records logged since the previous one.
 
-        :param AbstractBasicObject obj: an object that is expected to be referred in logs
-        :param str message: log message that is expected to be logged. If None, any message is awaited. Default is None
+        :param obj: an object or a list of objects (AbstractBasicObject) that are expected to be referred in logs
+        :param message: log message that is expected to be logged, a compiled regular expression or a list of them.
+                        If None, any message is awaited. Default is None
         :param int timeout: timeout in seconds to await for the message. Default is 60 seconds
         :param int step_timeout: step in seconds between log queries. Default is 5 seconds
         :param bool fault: if True FAULT messages are included, otherwise not. Default is True
@@ -24,36 +26,45 @@ class LogObject(ABC):
 
         :returns bool: log message if the expected log message is caught, otherwise False
         """
+        objects = obj if isinstance(obj, (list, tuple, set)) else [obj]
+        tailer = self.get_log_tailer(
+            names=[o.get_param('name') for o in objects],
+            messages=message,
+            fault=fault,
+            info=info,
+            warning=warning,
+        )
+        match = tailer.wait(timeout=timeout, step_timeout=step_timeout)
+        if match is None:
+            return False
+        return f'{match.name} {match.record["me"]}'
 
+    def get_log_tailer(self, names=None, messages=None, fault=True, info=True, warning=True, start=None):
+        """
+        Get an incremental reader of the object logs. Each `poll` of the tailer returns only the records logged since
+        the previous one, `wait` awaits a record of the watched objects containing one of the watched messages.
+
+        :param names: a name or a list of names of the objects to watch. If None, any object is watched
+        :param messages: a message, a compiled regular expression or a list of them. If None, any message matches
+        :param bool fault: if True FAULT messages are included, otherwise not. Default is True
+        :param bool info: if True INFO messages are included, otherwise not. Default is True
+        :param bool warning: if True WARNING messages are included, otherwise not. Default is True
+        :param float start: start time since epoch to get logs from, defaults to the current time
+
+        :raises NotImplementedException: if the driver in use is not API
+        :returns LogTailer: the tailer
+        """
         if self._driver.get_type() != API:
             raise NotImplementedException('Method currently implemented only in API driver')
-        path = self._get_log_path()
-        start = round(float(time.time()), 3)
-        end = start + timeout
-        payload = {
-            'start': start,
-            'end': end,
-            'fault': fault,
-            'info': info,
-            'warning': warning,
-        }
-        object_name = obj.get_param('name')
-        while True:
-            reply, error, error_code = self._driver.custom_post(path, payload=payload)
-            if error_code == NO_ERROR and error == '':
-                for rec in reply:
-                    if rec['na'] == object_name:
-                        if message is None:
-                            return f'{rec["na"]} {rec["me"]}'
-                        else:
-                            if rec['me'] == message:
-                                return f'{rec["na"]} {rec["me"]}'
-            else:
-                raise NmsErrorResponseException(f'Cannot get logs: error_code={error_code}, error={error}')
-            t = int(time.time())
-            if timeout < t - start:
-                return False
-            time.sleep(step_timeout)
+        return LogTailer(
+            self._read_logs,
+            names=names,
+            messages=messages,
+            fault=fault,
+            info=info,
+            warning=warning,
+            start=start,
+        )
 
     def get_raw_logs(self, start=None, end=None, fault=True, info=True, warning=True):
         """
@@ -71,7 +82,6 @@ class LogObject(ABC):
         """
         if self._driver.get_type() != API:
             raise NotImplementedException('Method currently implemented only in API driver')
-        path = self._get_log_path()
         if end is None:
             # End of logs is the current time
             end = round(float(time.time()), 3)
@@ -85,7 +95,17 @@ class LogObject(ABC):
             'info': info,
             'warning': warning,
         }
-        reply, error, error_code = self._driver.custom_post(path, payload=payload)
+        return self._read_logs(payload)
+
+    def _read_logs(self, payload: dict) -> list:
+        """
+        Private method that requests the object logs. Do not call it directly.
+
+        :param dict payload: the log request `{start, end, fault, info, warning}`
+        :raises NmsErrorResponseException: if there is an error in the response
+        :returns list reply: logs messages as a list of dictionaries
+        """
+        reply, error, error_code = self._driver.custom_post(self._get_log_path(), payload=payload)
         if error_code == NO_ERROR and error == '':
             return reply
         else:
@@ -0,0 +1,835 @@
+"""
+Local stand-in of NMS API built on the config model.
+
+The stand-in loads a config from `nms_backups` and serves the subset of NMS API used by the test system:
+login and logout, object get, write, delete and dashboard, paged lists, config save and load commands, and
+file upload, download, listing and deletion. NMS ticks are simulated by `tick_number` of `nms:0`, the states
+of the objects are derived from `enable` unless they are set explicitly. Each response is delayed by the
+configured latency and written to the socket at once, therefore the client stack can be load-tested
+on a laptop.
+
+The stand-in does not validate the values and does not maintain the links other than `uprow`,
+the fields not present in the config (the default values) are not returned.
+
+>>> with NmsStandIn('10000_stations_in_1_network.txt', latency=0.02) as stand_in:
+...     nms_api.connect(stand_in.url, 'admin', '12345')
+...     nms_api.get_param('station:31', 'serial')
+32
+"""
+import base64
+import email.parser
+import email.policy
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+from collections import Counter, namedtuple
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from random import uniform
+from time import monotonic, sleep, time
+from urllib.parse import parse_qs, unquote
+
+from src import compression, json_codec
+from src.constants import API_LOAD_CONFIG_COMMAND, API_RESTART_COMMAND, API_SAVE_CONFIG_AS_COMMAND, \
+    API_SAVE_CONFIG_COMMAND
+from src.exceptions import InvalidOptionsException
+from src.nms_config.model import ConfigModel
+
+# Stand-in statistics: number of requests, number of error replies, and the requests counted by endpoint
+StandInStats = namedtuple('StandInStats', 'requests errors endpoints max_concurrency')
+
+SESSION_COOKIE = 'nms_session'
+# Error code of the failed requests, NMS uses non-zero codes for errors
+ERROR_CODE = -1
+# Tables of the objects having a state
+STATE_TABLES = ('nms', 'controller', 'station', 'bal_controller', 'sr_controller', 'sr_teleport', 'device', 'scheduler')
+
+_NMS_ROW = 'nms:0'
+_BACKUPS_DIR = Path(__file__).parent.parent / 'nms_backups'
+_OBJECT_PATH = re.compile(r'api/object/(get|write|delete|dashboard)/(\w+)=(\d+)((?:/[^/]*)*)')
+_LIST_PATH = re.compile(r'api/list/get/(\w+)=(\d+)/list_items=(\w+)((?:/[^/]*)*)')
+_FS_PATH = re.compile(r'api/fs/(content|upload|download|delete)/nms=0(?:/path=(.*))?')
+_TREE_PATH = re.compile(r'api/tree/(login|logout)/nms=0')
+_REFERENCE = re.compile(r'([a-z_]+\d*):(\d+)')
+_INTEGER = re.compile(r'-?\d+')
+_FLOAT = re.compile(r'-?\d+\.\d+')
+_RANGE = re.compile(r'bytes=(\d+)-')
+
+
+class _RequestError(Exception):
+    """The request cannot be served, the message is returned as `error_log`"""
+
+
+class NmsStandIn:
+    """
+    Local HTTP server imitating NMS API.
+
+    :param config: the name of a config in `nms_backups`, a path to a config, a `ConfigModel`, or None to start
+                   with NMS object only
+    :param str username: the username accepted upon login
+    :param str password: the password accepted upon login
+    :param latency: the delay in seconds of each response, or a function getting the request path
+                    and returning the delay
+    :param float jitter: max random delay in seconds added to the latency
+    :param float tick_period: NMS tick period in seconds
+    :param bandwidth: the simulated link bandwidth in bytes per second adding the transfer time of each response
+                      to its delay, None for no limit
+    :param bool compress: if True the replies are compressed by the encoding accepted by the client
+    :param int capacity: the number of requests served at the same time, the other requests wait in a queue of
+                         the same length, the requests beyond the queue are replied 503. None for no limit
+    :param files_dir: the directory keeping NMS files in `config`, `software` and other subdirectories,
+                      defaults to a temporary directory removed upon stop
+    """
+
+    def __init__(
+            self,
+            config=None,
+            username='admin',
+            password='12345',
+            latency=0.0,
+            jitter=0.0,
+            tick_period=1.0,
+            files_dir=None,
+            bandwidth=None,
+            compress=False,
+            capacity=None
+    ):
+        if tick_period <= 0:
+            raise InvalidOptionsException('Tick period must be a positive number')
+        self._lock = threading.RLock()
+        self._credentials = (username, password)
+        self._sessions = set()
+        self._latency = latency
+        self._jitter = jitter
+        self._tick_period = tick_period
+        self._bandwidth = bandwidth
+        self._compress = compress
+        self._capacity = capacity
+        self._slots = threading.Semaphore(capacity) if capacity else None
+        self._queued = 0
+        # The number of the requests being served and its maximum
+        self._serving = 0
+        self._max_serving = 0
+        self._started = monotonic()
+        # object table row -> list of (tick number, state)
+        self._states = {}
+        self._load_time = int(time())
+        self._temp_dir = None
+        if files_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='nms_stand_in_')
+            files_dir = self._temp_dir
+        self._files_dir = Path(files_dir)
+        (self._files_dir / 'config').mkdir(parents=True, exist_ok=True)
+        self._model = self._get_model(config)
+        self._server = None
+        self._thread = None
+        self._requests = 0
+        self._errors = 0
+        self._endpoints = Counter()
+
+    @property
+    def url(self) -> str:
+        """The URL of the running stand-in, i.e. `http://127.0.0.1:40123/`"""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def model(self) -> ConfigModel:
+        """The config served by the stand-in"""
+        return self._model
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Start serving in a background thread
+
+        :param str host: the address to listen
+        :param int port: the port to listen, a free port is chosen if it is 0
+        :returns str url: the URL of the stand-in
+        """
+        if self._server is not None:
+            return self.url
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name='nms-stand-in', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """
+        Stop serving and remove the temporary files directory
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def set_latency(self, latency, jitter: float = 0.0):
+        """
+        Change the delay of the responses
+
+        :param latency: the delay in seconds, or a function getting the request path and returning the delay
+        :param float jitter: max random delay in seconds added to the latency
+        """
+        self._latency = latency
+        self._jitter = jitter
+
+    def get_tick_number(self) -> int:
+        """
+        Get the current simulated tick number
+
+        :returns int tick_number: the number of the ticks passed since the stand-in has been created
+        """
+        return int((monotonic() - self._started) / self._tick_period)
+
+    def set_state(self, object_table_row: str, state: str, ticks: int = 0):
+        """
+        Set the state of an object starting from a future tick
+
+        >>> stand_in.set_state('station:3', 'Fault', ticks=2)
+        The station goes to Fault in two ticks
+
+        :param str object_table_row: describes the object as `<object_table>:<row>`
+        :param str state: the state, i.e. `Up` or `Fault`
+        :param int ticks: the number of ticks to pass before the state is set
+        """
+        with self._lock:
+            self._states.setdefault(object_table_row, []).append((self.get_tick_number() + ticks, state))
+
+    def get_stats(self) -> StandInStats:
+        """
+        Get the requests statistics
+
+        :returns StandInStats: the statistics namedtuple, `endpoints` maps `api/<kind>/<action>` to the count,
+                               `max_concurrency` is the max number of the requests served at the same time
+        """
+        with self._lock:
+            return StandInStats(self._requests, self._errors, dict(self._endpoints), self._max_serving)
+
+    def handle(self, method: str, path: str, headers, body: bytes):
+        """
+        Serve a request
+
+        :param str method: `GET` or `POST`
+        :param str path: the request path, i.e. `/api/object/get/nms=0`
+        :param headers: the request headers supporting `get`
+        :param bytes body: the request body
+        :returns tuple (status, headers, body): HTTP status, a dict of the response headers, and the body
+        """
+        path, _, query = path.lstrip('/').partition('?')
+        path = unquote(path)
+        with self._lock:
+            self._requests += 1
+            self._endpoints['/'.join(path.split('/')[:3])] += 1
+        tree = _TREE_PATH.fullmatch(path)
+        if tree is not None:
+            return self._tree(tree.group(1), headers)
+        if not self._is_authorized(headers):
+            return self._error_status(HTTPStatus.UNAUTHORIZED)
+        try:
+            fs = _FS_PATH.fullmatch(path)
+            if fs is not None:
+                return self._fs(fs.group(1), fs.group(2), headers, body)
+            payload = self._get_payload(body)
+            with self._lock:
+                match = _OBJECT_PATH.fullmatch(path)
+                if match is not None:
+                    action, table, row, options = match.groups()
+                    reply = self._object(action, table, int(row), _get_options(options), payload)
+                    return self._reply(reply)
+                match = _LIST_PATH.fullmatch(path)
+                if match is not None:
+                    table, row, items, options = match.groups()
+                    options = _get_options(options)
+                    for key, values in parse_qs(query, keep_blank_values=True).items():
+                        options[key] = values[-1]
+                    return self._reply(self._list(f'{table}:{row}', items, options))
+        except _RequestError as exc:
+            with self._lock:
+                self._errors += 1
+            return self._reply({}, ERROR_CODE, str(exc))
+        return self._error_status(HTTPStatus.NOT_FOUND)
+
+    def get_delay(self, path: str, size: int = 0) -> float:
+        """
+        Get the delay of the response to a request
+
+        :param str path: the request path
+        :param int size: the size of the response body in bytes
+        :returns float delay: the delay in seconds
+        """
+        latency = self._latency(path) if callable(self._latency) else self._latency
+        if self._jitter:
+            latency += uniform(0, self._jitter)
+        if self._bandwidth:
+            latency += size / self._bandwidth
+        return latency
+
+    def acquire_slot(self) -> bool:
+        """
+        Wait for a free serving slot if the capacity is limited
+
+        :returns bool: False if the queue is full and the request must be rejected, otherwise True
+        """
+        if self._slots is not None:
+            with self._lock:
+                if self._queued >= self._capacity:
+                    return False
+                self._queued += 1
+            self._slots.acquire()
+            with self._lock:
+                self._queued -= 1
+        with self._lock:
+            self._serving += 1
+            self._max_serving = max(self._max_serving, self._serving)
+        return True
+
+    def release_slot(self):
+        with self._lock:
+            self._serving -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def reject(self):
+        """
+        Reply to a request exceeding the capacity
+
+        :returns tuple (status, headers, body): 503 response
+        """
+        with self._lock:
+            self._requests += 1
+        return self._error_status(HTTPStatus.SERVICE_UNAVAILABLE)
+
+    def encode(self, status: HTTPStatus, headers: dict, content: bytes, accept_encoding: str) -> bytes:
+        """
+        Compress a reply if the compression is enabled, `Content-Encoding` is added to the headers.
+        Partial content is not compressed.
+
+        :param HTTPStatus status: the status of the response
+        :param dict headers: the headers of the response
+        :param bytes content: the body of the response
+        :param str accept_encoding: the value of the request `Accept-Encoding` header
+        :returns bytes content: the body to send
+        """
+        if not self._compress or HTTPStatus.OK != status:
+            return content
+        encoding, content = compression.encode(content, accept_encoding)
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return content
+
+    def _get_model(self, config) -> ConfigModel:
+        """
+        Private method that loads the served config. Do not call it directly.
+
+        :param config: None, a `ConfigModel`, a config name in `nms_backups` or a path
+        :returns ConfigModel model: the config
+        """
+        if isinstance(config, ConfigModel):
+            return config
+        if config is None:
+            model = ConfigModel()
+            model.add_object('nms', 0, {'name': 'UHP NMS'})
+            return model
+        path = Path(config)
+        if not path.is_file():
+            path = _BACKUPS_DIR / config
+        return ConfigModel.load(path)
+
+    def _is_authorized(self, headers) -> bool:
+        """
+        Private method that checks the session cookie. Do not call it directly.
+
+        :param headers: the request headers
+        :returns bool: True if the request belongs to a logged in session
+        """
+        cookie = SimpleCookie(headers.get('Cookie') or '')
+        session = cookie.get(SESSION_COOKIE)
+        with self._lock:
+            return session is not None and session.value in self._sessions
+
+    def _tree(self, action: str, headers):
+        """
+        Private method that serves login and logout. Do not call it directly.
+
+        :param str action: `login` or `logout`
+        :param headers: the request headers
+        :returns tuple (status, headers, body): the response
+        """
+        if action == 'logout':
+            cookie = SimpleCookie(headers.get('Cookie') or '').get(SESSION_COOKIE)
+            with self._lock:
+                if cookie is not None:
+                    self._sessions.discard(cookie.value)
+            return self._reply({})
+        authorization = headers.get('Authorization') or ''
+        try:
+            scheme, token = authorization.split(' ', 1)
+            credentials = tuple(base64.b64decode(token).decode('utf-8').split(':', 1))
+        except ValueError:
+            return self._error_status(HTTPStatus.UNAUTHORIZED)
+        if scheme != 'Basic' or credentials != self._credentials:
+            return self._error_status(HTTPStatus.UNAUTHORIZED)
+        session = secrets.token_hex(16)
+        with self._lock:
+            self._sessions.add(session)
+        status, response_headers, body = self._reply({})
+        response_headers['Set-Cookie'] = f'{SESSION_COOKIE}={session}; Path=/'
+        return status, response_headers, body
+
+    def _object(self, action: str, table: str, row: int, options: dict, payload: dict):
+        """
+        Private method that serves the object requests. Do not call it directly.
+
+        :param str action: `get`, `write`, `delete` or `dashboard`
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :param dict options: the path options, i.e. `new_item` or `command`
+        :param dict payload: the request payload
+        :returns: the reply
+        :raises _RequestError: if the request cannot be served
+        """
+        if not self._model.has(table, row):
+            raise _RequestError(f'Object {table}:{row} is not found')
+        if action == 'get':
+            return self._read(table, row)
+        if action == 'dashboard':
+            return self._dashboard(table, row)
+        if action == 'delete':
+            return self._delete(table, row, bool(payload.get('recursive')))
+        if 'new_item' in options:
+            return self._create(f'{table}:{row}', options['new_item'], payload)
+        command = options.get('command', payload.pop('command', None))
+        for field, value in payload.items():
+            self._model.set(table, row, field, _from_api(value))
+        if command is not None:
+            try:
+                command = int(command)
+            except ValueError:
+                raise _RequestError(f'Invalid command {command}')
+            self._command(command)
+        return {'%row': row}
+
+    def _read(self, table: str, row: int) -> dict:
+        """
+        Private method that returns the fields of an object as NMS does. Do not call it directly.
+
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :returns dict reply: the fields with the numbers converted, the references followed by the names
+        """
+        reply = {'%row': row}
+        for field, value in self._model.get_object(table, row).items():
+            reply[field] = self._to_api(value)
+        if table in STATE_TABLES:
+            reply['state'] = self._get_state(table, row)
+        if f'{table}:{row}' == _NMS_ROW:
+            reply['tick_number'] = self.get_tick_number()
+            reply['load_time'] = self._load_time
+        return reply
+
+    def _dashboard(self, table: str, row: int) -> dict:
+        """
+        Private method that returns the dashboard of an object. Do not call it directly.
+
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :returns dict reply: the name and the state of the object, NMS dashboard contains the load time and the tick
+        """
+        reply = {'%row': row, 'name': self._model.get(table, row, 'name')}
+        if table in STATE_TABLES:
+            reply['state'] = self._get_state(table, row)
+        if f'{table}:{row}' == _NMS_ROW:
+            reply['tick_number'] = self.get_tick_number()
+            reply['load_time'] = self._load_time
+        return reply
+
+    def _create(self, parent_table_row: str, new_item: str, payload: dict) -> dict:
+        """
+        Private method that creates an object in the first free row. Do not call it directly.
+
+        :param str parent_table_row: the parent as `<table>:<row>`
+        :param str new_item: the table of the new object
+        :param dict payload: the fields of the new object
+        :returns dict reply: the row of the created object
+        """
+        row = self._model.get_free_row(new_item)
+        fields = {field: _from_api(value) for field, value in payload.items()}
+        fields['uprow'] = parent_table_row
+        self._model.add_object(new_item, row, fields)
+        return {'%row': row}
+
+    def _delete(self, table: str, row: int, recursive: bool) -> dict:
+        """
+        Private method that deletes an object along with its children if recursive. Do not call it directly.
+
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :param bool recursive: if False the object having children is not deleted
+        :returns dict reply: the row of the deleted object
+        :raises _RequestError: if the object has children and the deletion is not recursive
+        """
+        children = self._get_children(f'{table}:{row}')
+        if children and not recursive:
+            raise _RequestError(f'Object {table}:{row} has children')
+        for child_table, child_row in children:
+            self._delete(child_table, child_row, True)
+        self._model.delete_object(table, row)
+        self._states.pop(f'{table}:{row}', None)
+        return {'%row': row}
+
+    def _get_children(self, object_table_row: str) -> list:
+        """
+        Private method that lists the children of an object in all tables. Do not call it directly.
+
+        :param str object_table_row: the object as `<table>:<row>`
+        :returns list children: (table, row) tuples
+        """
+        return [
+            (table, row) for table in self._model.tables() for row in self._model.children(object_table_row, table)
+        ]
+
+    def _command(self, command: int):
+        """
+        Private method that executes NMS object command. Unknown commands are accepted and ignored.
+        Do not call it directly.
+
+        :param int command: the command code
+        :raises _RequestError: if the command fails
+        """
+        if command in (API_SAVE_CONFIG_AS_COMMAND, API_SAVE_CONFIG_COMMAND):
+            name = self._model.get('nms', 0, 'save_filename')
+            if not name:
+                raise _RequestError('Save filename is not set')
+            self._model.save(self._get_file_path('config', name))
+        elif command == API_LOAD_CONFIG_COMMAND:
+            name = self._model.get('nms', 0, 'load_filename')
+            path = self._get_file_path('config', name or '')
+            if not name or not path.is_file():
+                raise _RequestError(f'Config {name} is not found')
+            self._model = ConfigModel.load(path)
+            self._model.set('nms', 0, 'load_filename', name)
+            self._states.clear()
+            self._restart()
+        elif command == API_RESTART_COMMAND:
+            self._restart()
+
+    def _restart(self):
+        """
+        Private method that updates the load time, it is never the same as the previous one.
+        Do not call it directly.
+        """
+        self._load_time = max(int(time()), self._load_time + 1)
+
+    def _list(self, parent_table_row: str, items: str, options: dict) -> list:
+        """
+        Private method that lists the children of an object. Do not call it directly.
+
+        :param str parent_table_row: the parent as `<table>:<row>`
+        :param str items: the table of the children
+        :param dict options: `list_skip`, `list_max` and `list_vars` options
+        :returns list reply: dictionaries of the children fields including `%row`
+        """
+        rows = self._model.children(parent_table_row, items)
+        skip = int(options.get('list_skip') or 0)
+        rows = rows[skip:]
+        if options.get('list_max'):
+            rows = rows[:int(options['list_max'])]
+        list_vars = options.get('list_vars')
+        if list_vars is None:
+            return [self._read(items, row) for row in rows]
+        fields = [field for field in list_vars.split(',') if field]
+        reply = []
+        for row in rows:
+            values = self._read(items, row) if fields else {}
+            item = {'%row': row}
+            for field in fields:
+                if field in values:
+                    item[field] = values[field]
+            reply.append(item)
+        return reply
+
+    def _fs(self, action: str, path: str, headers, body: bytes):
+        """
+        Private method that serves the file requests. Do not call it directly.
+
+        :param str action: `content`, `upload`, `download` or `delete`
+        :param str path: `<dir>&<name>` of the file, or `/<dir>/` to list
+        :param headers: the request headers
+        :param bytes body: the request body
+        :returns tuple (status, headers, body): the response
+        :raises _RequestError: if the request cannot be served
+        """
+        if action == 'upload':
+            for directory, name, content in _get_files(headers, body):
+                file_path = self._get_file_path(directory, name)
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_bytes(content)
+            return self._reply({})
+        if action == 'content':
+            payload = self._get_payload(body)
+            directory = self._files_dir / (payload.get('dir') or (path or '').strip('/'))
+            files = sorted(directory.iterdir()) if directory.is_dir() else []
+            return self._reply([
+                {'name': file.name, 'size': file.stat().st_size, 'date': int(file.stat().st_mtime)}
+                for file in files if file.is_file()
+            ])
+        directory, _, name = (path or '').partition('&')
+        file_path = self._get_file_path(directory, name)
+        if not file_path.is_file():
+            raise _RequestError(f'File {directory}/{name} is not found')
+        if action == 'delete':
+            file_path.unlink()
+            return self._reply({})
+        content = file_path.read_bytes()
+        match = _RANGE.fullmatch(headers.get('Range') or '')
+        if match is not None and int(match.group(1)) < len(content):
+            start = int(match.group(1))
+            return HTTPStatus.PARTIAL_CONTENT, {
+                'Content-Type': 'application/octet-stream',
+                'Content-Range': f'bytes {start}-{len(content) - 1}/{len(content)}',
+            }, content[start:]
+        return HTTPStatus.OK, {'Content-Type': 'application/octet-stream'}, content
+
+    def _get_file_path(self, directory: str, name: str) -> Path:
+        """
+        Private method that returns the path to an NMS file. Do not call it directly.
+
+        :param str directory: NMS directory, i.e. `config`
+        :param str name: the name of the file
+        :returns Path path: the path in the files directory
+        :raises _RequestError: if the directory or the name are not plain names
+        """
+        for part in (directory, name):
+            if not part or '/' in part or '\\' in part or part in ('.', '..'):
+                raise _RequestError(f'Invalid file path {directory}&{name}')
+        return self._files_dir / directory / name
+
+    def _get_state(self, table: str, row: int) -> str:
+        """
+        Private method that returns the state of an object at the current tick. Do not call it directly.
+
+        :param str table: the table of the object
+        :param int row: the row of the object
+        :returns str state: the state set explicitly, otherwise `Up` if the object is enabled or `Off`
+        """
+        tick = self.get_tick_number()
+        state = None
+        for start, scheduled in self._states.get(f'{table}:{row}', ()):
+            if start <= tick:
+                state = scheduled
+        if state is not None:
+            return state
+        if table == 'nms' or self._model.get(table, row, 'enable') == 'ON':
+            return 'Up'
+        return 'Off'
+
+    def _to_api(self, value: str):
+        """
+        Private method that converts a config value to NMS API representation. Do not call it directly.
+
+        :param str value: the config value
+        :returns: a number if the value is numeric, a reference followed by the name of the object,
+                  otherwise the value as it is
+        """
+        if _INTEGER.fullmatch(value):
+            return int(value)
+        if _FLOAT.fullmatch(value):
+            return float(value)
+        reference = _REFERENCE.fullmatch(value)
+        if reference is not None:
+            table, row = reference.group(1), int(reference.group(2))
+            if self._model.has(table, row):
+                name = self._model.get(table, row, 'name')
+                if name is not None:
+                    return f'{value} {name}'
+        return value
+
+    @staticmethod
+    def _get_payload(body: bytes) -> dict:
+        """
+        Private method that decodes JSON payload. Do not call it directly.
+
+        :param bytes body: the request body
+        :returns dict payload: the payload, an empty dict if there is no body
+        :raises _RequestError: if the body is not a JSON object
+        """
+        if not body:
+            return {}
+        try:
+            payload = json_codec.loads(body)
+        except json_codec.JSONDecodeError:
+            raise _RequestError('Invalid JSON payload')
+        if not isinstance(payload, dict):
+            raise _RequestError('Payload must be a JSON object')
+        return payload
+
+    @staticmethod
+    def _reply(reply, error_code: int = 0, error_log: str = ''):
+        """
+        Private method that builds NMS API response. Do not call it directly.
+
+        :param reply: the reply
+        :param int error_code: NMS error code
+        :param str error_log: NMS error description
+        :returns tuple (status, headers, body): the response
+        """
+        body = json_codec.dumps({'error_code': error_code, 'error_log': error_log, 'reply': reply})
+        return HTTPStatus.OK, {'Content-Type': 'application/json'}, body
+
+    def _error_status(self, status: HTTPStatus):
+        """
+        Private method that builds an HTTP error response. Do not call it directly.
+
+        :param HTTPStatus status: the status
+        :returns tuple (status, headers, body): the response
+        """
+        with self._lock:
+            self._errors += 1
+        return status, {'Content-Type': 'text/plain'}, status.phrase.encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 handler of the stand-in, connections are kept alive.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._serve()
+
+    def do_POST(self):
+        self._serve()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _serve(self):
+        """
+        Private method that serves the request and writes the whole response by a single write.
+        Do not call it directly.
+        """
+        stand_in = self.server.stand_in
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if stand_in.acquire_slot():
+            try:
+                status, headers, content = stand_in.handle(self.command, self.path, self.headers, body)
+                content = stand_in.encode(status, headers, content, self.headers.get('Accept-Encoding'))
+                delay = stand_in.get_delay(self.path, len(content))
+                if delay > 0:
+                    sleep(delay)
+            finally:
+                stand_in.release_slot()
+        else:
+            status, headers, content = stand_in.reject()
+        lines = [f'{self.protocol_version} {status.value} {status.phrase}', f'Content-Length: {len(content)}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        self.wfile.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + content)
+
+
+def _get_options(options: str) -> dict:
+    """
+    Private function that parses `/key=value` path options. Do not call it directly.
+
+    :param str options: the options part of the path
+    :returns dict options: the options
+    """
+    result = {}
+    for option in options.split('/'):
+        if option:
+            key, _, value = option.partition('=')
+            result[key] = value
+    return result
+
+
+def _from_api(value):
+    """
+    Private function that converts a written value to the config representation. Do not call it directly.
+
+    :param value: the value from the payload
+    :returns: the value as it is stored in a config, None for None
+    """
+    if value is None:
+        return None
+    if value is True:
+        return 'ON'
+    if value is False:
+        return 'OFF'
+    value = str(value)
+    reference = _REFERENCE.match(value)
+    if reference is not None and reference.end() < len(value) and value[reference.end()] == ' ':
+        # `<table>:<row> <name>` as it is returned upon reading
+        return reference.group(0)
+    return value
+
+
+def _get_files(headers, body: bytes):
+    """
+    Private function that extracts the files of `multipart/form-data` body. Do not call it directly.
+
+    :param headers: the request headers
+    :param bytes body: the request body
+    :returns: generator of (form field, file name, content) tuples
+    :raises _RequestError: if the body is not a multipart form
+    """
+    content_type = headers.get('Content-Type') or ''
+    if not content_type.startswith('multipart/form-data'):
+        raise _RequestError('Multipart form is expected')
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode('latin-1') + body
+    )
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        filename = part.get_filename()
+        if name and filename:
+            yield name, filename, part.get_payload(decode=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local stand-in of NMS API')
+    parser.add_argument('config', nargs='?', help='config name in nms_backups or path to a config')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='max random delay in seconds added to latency')
+    parser.add_argument('--tick-period', type=float, default=1.0, help='NMS tick period in seconds')
+    parser.add_argument('--bandwidth', type=float, default=None, help='simulated link bandwidth in bytes per second')
+    parser.add_argument('--compress', action='store_true', help='compress replies by the accepted encoding')
+    parser.add_argument('--capacity', type=int, default=None, help='number of requests served at the same time')
+    args = parser.parse_args()
+    stand_in = NmsStandIn(
+        args.config,
+        latency=args.latency,
+        jitter=args.jitter,
+        tick_period=args.tick_period,
+        bandwidth=args.bandwidth,
+        compress=args.compress,
+        capacity=args.capacity,
+    )
+    print(f'NMS stand-in is serving {args.config or "empty config"} at {stand_in.start(args.host, args.port)}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stand_in.stop()
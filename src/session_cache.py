@@ -0,0 +1,310 @@
+"""
+On-disk cache of NMS session cookies shared by the processes of a test run.
+
+The cookies received upon login are stored in a JSON file keyed by NMS address and username along with their
+expiry time. A client logging in reuses the cached cookies once they are confirmed by a single cheap request,
+otherwise it logs in and stores the new cookies. The file is guarded by an OS file lock held during the login,
+therefore the processes started at once wait for the first login instead of logging in all together.
+The clients using the cache log in again transparently if NMS replies 401 to a request (see `install_relogin`).
+
+The cache is disabled by default. Enabling it sets `NMS_SESSION_CACHE` environment variable to the cache path,
+the child processes inherit it and use the same cache:
+
+>>> session_cache.set_enabled(True)
+>>> nms_api.connect('http://10.0.0.1:8000', 'admin', '12345')  # logs in and stores the cookies
+>>> NmsClient().connect('http://10.0.0.1:8000', 'admin', '12345')  # reuses the cookies
+>>> session_cache.get_stats()
+SessionCacheStats(hits=1, logins=1, resent=0)
+"""
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+from time import time
+
+import requests
+from requests.cookies import RequestsCookieJar, cookiejar_from_dict
+
+from src import json_codec
+from src.constants import API_LOGIN_PATH
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Cache statistics of the current process: reused cookies, logins, and requests resent upon 401 replies
+SessionCacheStats = namedtuple('SessionCacheStats', 'hits logins resent')
+
+# The name of the system option enabling the cache
+SESSION_CACHE = 'session_cache'
+# The environment variable holding the path to the cache of the current run
+ENV_VARIABLE = 'NMS_SESSION_CACHE'
+DEFAULT_PATH = Path(__file__).parent.parent / '.nms_sessions.json'
+# Lifetime in seconds of the cookies having no expiry date
+DEFAULT_VALIDITY = 600
+# The cheap request confirming the cookies
+_VALIDATION_PATH = 'api/object/dashboard/nms=0'
+
+_lock = threading.Lock()
+# `busy` is set while the thread logs in or validates cookies, the 401 replies to these requests are not handled
+_local = threading.local()
+_validity = DEFAULT_VALIDITY
+_hits = 0
+_logins = 0
+_resent = 0
+
+
+def set_enabled(enabled: bool, path=None, validity: float = None):
+    """
+    Enable or disable the cache for the current process and the processes started by it
+
+    :param bool enabled: if True the cookies are cached
+    :param path: path to the cache file, `.nms_sessions.json` in the project folder by default
+    :param float validity: lifetime in seconds of the cookies having no expiry date
+    """
+    global _validity
+    if enabled:
+        os.environ[ENV_VARIABLE] = str(path or DEFAULT_PATH)
+    else:
+        os.environ.pop(ENV_VARIABLE, None)
+    if validity is not None:
+        _validity = validity
+
+
+def is_enabled() -> bool:
+    return bool(os.environ.get(ENV_VARIABLE))
+
+
+def get_stats() -> SessionCacheStats:
+    """
+    Get the cache statistics of the current process
+
+    :returns SessionCacheStats: the statistics namedtuple
+    """
+    with _lock:
+        return SessionCacheStats(_hits, _logins, _resent)
+
+
+def reset_stats():
+    global _hits, _logins, _resent
+    with _lock:
+        _hits = _logins = _resent = 0
+
+
+def acquire(address: str, username: str, login, validate) -> RequestsCookieJar:
+    """
+    Get the session cookies of a user, log in if there are no valid cached cookies
+
+    :param str address: NMS address, i.e. `http://10.0.0.1:8000/`
+    :param str username: the username
+    :param callable login: function logging in and returning the cookies, called if the cookies are not cached
+    :param callable validate: function getting the cached cookies and returning True if NMS accepts them
+    :returns RequestsCookieJar cookies: the session cookies
+    """
+    global _hits
+    _local.busy = True
+    try:
+        if not is_enabled():
+            return _login(login)
+        with _FileLock(_get_path()):
+            entries = _read()
+            entry = entries.get(_get_key(address, username))
+            if entry is not None:
+                cookies = cookiejar_from_dict(entry['cookies'])
+                if validate(cookies):
+                    with _lock:
+                        _hits += 1
+                    return cookies
+            cookies = _login(login)
+            entries[_get_key(address, username)] = {'cookies': dict(cookies), 'expires': _get_expires(cookies)}
+            _write(entries)
+        return cookies
+    finally:
+        _local.busy = False
+
+
+def validate_cookies(session, address: str, cookies, timeout: float = None) -> bool:
+    """
+    Check if NMS accepts the cookies by requesting NMS dashboard
+
+    :param session: `requests.Session` or `requests` module sending the request
+    :param str address: NMS address ending by slash
+    :param cookies: the cookies
+    :param float timeout: the request timeout in seconds
+    :returns bool: True if NMS replies 200
+    """
+    try:
+        return 200 == session.get(address + _VALIDATION_PATH, cookies=cookies, timeout=timeout).status_code
+    except requests.exceptions.RequestException:
+        return False
+
+
+def invalidate(address: str, username: str, cookies=None):
+    """
+    Remove the cached cookies of a user, i.e. after logout
+
+    :param str address: NMS address
+    :param str username: the username
+    :param cookies: if passed, the entry is removed only if it holds the same cookies,
+                    the cookies stored by another process are kept
+    """
+    if not is_enabled():
+        return
+    with _FileLock(_get_path()):
+        entries = _read()
+        entry = entries.get(_get_key(address, username))
+        if entry is None or cookies is not None and entry['cookies'] != dict(cookies):
+            return
+        del entries[_get_key(address, username)]
+        _write(entries)
+
+
+def install_relogin(session, relogin):
+    """
+    Log in again and resend the request if NMS replies 401 to a request sent by the session. The requests with
+    streamed bodies are not resent.
+
+    :param requests.Session session: the session
+    :param callable relogin: function getting the rejected cookies and returning the new ones,
+                             or None if the request must not be resent
+    """
+    hooks = session.hooks['response']
+    if not any(isinstance(getattr(hook, '__self__', None), _Relogin) for hook in hooks):
+        hooks.append(_Relogin(relogin).on_response)
+
+
+class _Relogin:
+    """The response hook resending the requests rejected by 401 with the new cookies"""
+
+    def __init__(self, relogin):
+        self._relogin = relogin
+
+    def on_response(self, response, **kwargs):
+        global _resent
+        request = response.request
+        if response.status_code != 401 or API_LOGIN_PATH in request.url or getattr(_local, 'busy', False):
+            return None
+        if request.body is not None and not isinstance(request.body, (bytes, str)):
+            return None
+        cookies = self._relogin(_get_request_cookies(request))
+        if not cookies:
+            return None
+        with _lock:
+            _resent += 1
+        # The rejected response is consumed to release its connection
+        response.content
+        response.close()
+        retry = request.copy()
+        retry.headers.pop('Cookie', None)
+        retry.prepare_cookies(cookies)
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
+
+class _FileLock:
+    """Exclusive lock of `<path>.lock` file shared by the processes"""
+
+    def __init__(self, path: Path):
+        self._path = path.with_name(path.name + '.lock')
+        self._file = None
+
+    def __enter__(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            # LK_LOCK retries for 10 seconds, the login may take longer
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+
+
+def _login(login):
+    """
+    Private function that logs in and counts the login. Do not call it directly.
+    """
+    global _logins
+    cookies = login()
+    with _lock:
+        _logins += 1
+    return cookies
+
+
+def _get_path() -> Path:
+    return Path(os.environ[ENV_VARIABLE])
+
+
+def _get_key(address: str, username: str) -> str:
+    return f'{address.rstrip("/")} {username}'
+
+
+def _get_expires(cookies) -> float:
+    """
+    Private function that returns the time the cookies expire at. Do not call it directly.
+
+    :param RequestsCookieJar cookies: the cookies
+    :returns float expires: the earliest expiry date of the cookies, or now plus the default validity
+    """
+    expires = [cookie.expires for cookie in cookies if cookie.expires]
+    return min(expires) if expires else time() + _validity
+
+
+def _get_request_cookies(request) -> dict:
+    """
+    Private function that parses `Cookie` header of a prepared request. Do not call it directly.
+    """
+    cookies = {}
+    for pair in (request.headers.get('Cookie') or '').split(';'):
+        name, _, value = pair.strip().partition('=')
+        if name:
+            cookies[name] = value
+    return cookies
+
+
+def _read() -> dict:
+    """
+    Private function that reads the cache, the file lock must be held. Do not call it directly.
+
+    :returns dict entries: {`<address> <username>` -> {'cookies': {name -> value}, 'expires': timestamp}}
+    """
+    try:
+        with open(_get_path(), 'rb') as f:
+            entries = json_codec.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    now = time()
+    return {key: entry for key, entry in entries.items() if entry.get('expires', 0) > now} \
+        if isinstance(entries, dict) else {}
+
+
+def _write(entries: dict):
+    """
+    Private function that writes the cache, the file lock must be held. The file is readable by the owner only.
+    Do not call it directly.
+
+    :param dict entries: the entries returned by `_read`
+    """
+    path = _get_path()
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}')
+    descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'wb') as f:
+        f.write(json_codec.dumps(entries))
+    temp_path.replace(path)
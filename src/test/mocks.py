@@ -0,0 +1,67 @@
+"""
+Mocks of `requests` responses and drivers shared by the test suites.
+"""
+import json
+from unittest import mock
+
+import requests
+
+from src.drivers.abstract_http_driver import API
+from src.drivers.http.nms_api_driver import NmsApiDriver
+
+
+def get_reply(reply, error_code=0, error_log='', status_code=200):
+    """
+    Get a mock of a response carrying NMS API reply
+
+    :param reply: the value of `reply`
+    :param int error_code: the value of `error_code`
+    :param str error_log: the value of `error_log`
+    :param int status_code: HTTP status of the response
+    :returns MagicMock response: the mock of `requests.Response`
+    """
+    response = mock.MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    response.reason = 'OK'
+    response.cookies = None
+    response.content = json.dumps({'error_code': error_code, 'error_log': error_log, 'reply': reply}).encode('utf-8')
+    return response
+
+
+def get_stream(status_code, chunks, fail=False, headers=None):
+    """
+    Get a mock of a streamed response
+
+    :param int status_code: HTTP status of the response
+    :param list chunks: the chunks of the body returned by `iter_content`
+    :param bool fail: if True the connection breaks after the chunks
+    :param dict headers: the response headers
+    :returns MagicMock response: the mock of `requests.Response` usable as a context manager
+    """
+    def iter_content(chunk_size=1):
+        yield from chunks
+        if fail:
+            raise requests.exceptions.ChunkedEncodingError('Connection broken')
+
+    response = mock.MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    response.reason = 'OK'
+    response.headers = headers or {}
+    response.iter_content.side_effect = iter_content
+    response.__enter__.return_value = response
+    return response
+
+
+def get_driver(get):
+    """
+    Get an API driver using a mock of `requests` module. POST requests are replied with a created row.
+
+    :param callable get: the function replying to GET requests, it gets the URL and returns a response
+    :returns tuple (driver, requests): the `NmsApiDriver` and the mock of `requests` module
+    """
+    requests_mock = mock.MagicMock()
+    requests_mock.get.side_effect = lambda url, *args, **kwargs: get(url)
+    requests_mock.post.return_value = get_reply({'%row': 1})
+    driver = NmsApiDriver(API, requests_mock)
+    driver.address = 'http://localhost:8000/'
+    return driver, requests_mock
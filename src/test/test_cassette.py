@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from pathlib import Path
+from time import perf_counter
+
+import requests
+
+from src import cassette, json_codec
+from src.exceptions import CassetteMismatchException
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+_CONFIG = ('.nms 0\nname UHP NMS\nnetworks network:0\n\n'
+           '.network 0\nuprow nms:0\nname net-0\n\n'
+           '.station 0\nuprow network:0\nname stn-0\nserial 10\n')
+
+
+class CassetteSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name, 'cassette.jsonl')
+        self.stand_in = NmsStandIn(ConfigModel.parse(_CONFIG), latency=0.02)
+        self.stand_in.start()
+        self.url = self.stand_in.url
+
+    def tearDown(self):
+        cassette.eject()
+        self.stand_in.stop()
+        self.folder.cleanup()
+
+    def _run(self) -> list:
+        client = NmsClient()
+        client.connect(self.url, 'admin', '12345')
+        try:
+            result = [client.get_param('station:0', 'serial')]
+            client.update('station:0', {'serial': 20, 'name': 'stn-x'})
+            result.append(client.get_param('station:0', 'serial'))
+            result.append(client.create('network:0', 'station', {'name': 'stn-1'}))
+            result.append(list(client.iter_items('network:0', 'station', vars_=['name'])))
+            return result
+        finally:
+            client.close_session()
+
+    def test_record_replay(self):
+        recorder = cassette.use(self.path, cassette.RECORD)
+        recorded = self._run()
+        cassette.eject()
+        self.assertEqual([10, 20, 'station:1', [{'%row': 0, 'name': 'stn-x'}, {'%row': 1, 'name': 'stn-1'}]],
+                         recorded)
+        self.assertGreater(recorder.get_stats().recorded, 0)
+        self.stand_in.stop()
+
+        player = cassette.use(self.path, cassette.REPLAY)
+        self.assertEqual(recorded, self._run())
+        self.assertEqual(recorder.get_stats().recorded, player.get_stats().played)
+
+        # JSON payloads with the same content in another key order match the recorded ones
+        client = NmsClient()
+        client.connect(self.url, 'admin', '12345')
+        client.update('station:0', {'name': 'stn-x', 'serial': 20})
+        client.auto_abort_on_error(False)
+        with self.assertRaises(CassetteMismatchException):
+            client.update('station:0', {'serial': 30})
+        self.assertEqual(1, player.get_stats().missed)
+
+    def test_replay_latency(self):
+        cassette.use(self.path, cassette.RECORD)
+        self._run()
+        cassette.eject()
+        with open(self.path, 'rb') as f:
+            latency = sum(json_codec.loads(line)['latency'] for line in f)
+        self.assertGreater(latency, 0.1)
+
+        cassette.use(self.path, cassette.REPLAY, replay_latency=True)
+        st_time = perf_counter()
+        self._run()
+        self.assertGreaterEqual(perf_counter() - st_time, latency)
+
+        cassette.use(self.path, cassette.REPLAY)
+        st_time = perf_counter()
+        self._run()
+        self.assertLess(perf_counter() - st_time, latency)
+
+    def test_eject(self):
+        # The sessions created while the cassette is active send the requests directly after it is ejected
+        status = requests.get(self.url).status_code
+        recorder = cassette.use(self.path, cassette.RECORD)
+        session = cassette.create_session()
+        client = NmsClient()
+        client.connect(self.url, 'admin', '12345')
+        recorded = recorder.get_stats().recorded
+        cassette.eject()
+        try:
+            self.assertEqual(status, session.get(self.url).status_code)
+            self.assertEqual(10, client.get_param('station:0', 'serial'))
+        finally:
+            client.close_session()
+            session.close()
+        self.assertEqual(recorded, recorder.get_stats().recorded)
+
+        # The sessions do not replay the ejected cassette
+        player = cassette.use(self.path, cassette.REPLAY)
+        session = cassette.create_session()
+        adapter = session.get_adapter(self.url)
+        cassette.use(self.path, cassette.REPLAY)
+        try:
+            self.assertEqual(status, session.get(self.url).status_code)
+            # The adapter kept aside passes the requests to the wrapped one
+            request = session.prepare_request(requests.Request('GET', self.url))
+            self.assertEqual(status, adapter.send(request).status_code)
+        finally:
+            session.close()
+        self.assertEqual((0, 0, 0), tuple(player.get_stats()))
+
+
+if __name__ == '__main__':
+    unittest.main()
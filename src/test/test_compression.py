@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import compression
+from src.backup_manager.backup_manager import BackupManager
+from src.http_session import create_session
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+_STATIONS = 200
+
+
+class CompressionSuite(unittest.TestCase):
+
+    def setUp(self):
+        config = '.nms 0\nname UHP NMS\n\n.network 0\nuprow nms:0\nname net-0\n\n' + ''.join(
+            f'.station {row}\nuprow network:0\nname stn-{row}\nserial {10000 + row}\n\n' for row in range(_STATIONS)
+        )
+        self.stand_in = NmsStandIn(ConfigModel.parse(config), compress=True)
+        self.stand_in.start()
+        self.session = create_session()
+        self.cookies = self.session.get(self.stand_in.url + 'api/tree/login/nms=0', auth=('admin', '12345')).cookies
+
+    def tearDown(self):
+        self.session.close()
+        self.stand_in.stop()
+
+    def test_encode(self):
+        content = b'{"name": "stn"}' * 100
+        for accept_encoding, encoding in (('gzip, deflate', 'gzip'), ('deflate', 'deflate'), ('identity', None)):
+            self.assertEqual(encoding, compression.encode(content, accept_encoding)[0])
+        self.assertEqual((None, b'{}'), compression.encode(b'{}', 'gzip'))
+        self.assertIn('gzip', compression.get_accept_encoding())
+        self.assertEqual('identity', compression.get_accept_encoding(False))
+
+    def test_compare(self):
+        (plain, compressed), = compression.compare(
+            self.session, self.stand_in.url, ['api/list/get/network=0/list_items=station'], repeat=1,
+            cookies=self.cookies
+        )
+        self.assertEqual('api/list/get', plain.endpoint)
+        self.assertEqual(plain.content_bytes, compressed.content_bytes)
+        self.assertEqual(plain.content_bytes, plain.wire_bytes)
+        self.assertLess(compressed.wire_bytes * 3, plain.wire_bytes)
+
+        client = NmsClient()
+        client.connect(self.stand_in.url, 'admin', '12345')
+        self.assertEqual(_STATIONS, len(client.list_items('network:0', 'station')))
+        client.close_session()
+
+    def test_resumed_download(self):
+        self.session.post(self.stand_in.url + 'api/object/write/nms=0/command=16777237',
+                          json={'save_filename': 'compressed.txt'}, cookies=self.cookies)
+        with tempfile.TemporaryDirectory() as folder:
+            backup_path = Path(folder, 'compressed.txt')
+            connection = {'address': self.stand_in.url, 'username': 'admin', 'password': '12345'}
+            with mock.patch.object(BackupManager, '_get_backup_dir', side_effect=lambda name: Path(folder, name)):
+                manager = BackupManager(connection)
+                manager.download_backup('compressed.txt')
+                content = backup_path.read_bytes()
+                # The interrupted download is resumed by the range of the identity encoded file
+                part_path = Path(folder, 'compressed.txt.part')
+                info = manager._get_backup_data('compressed.txt')
+                BackupManager._check_part(part_path, Path(folder, 'compressed.txt.part.info'),
+                                          {'size': int(info['size']), 'date': info['date']})
+                part_path.write_bytes(content[:1000])
+                backup_path.unlink()
+                with mock.patch.object(manager._driver, 'post', wraps=manager._driver.post) as post:
+                    manager.download_backup('compressed.txt')
+                self.assertEqual('bytes=1000-', post.call_args.kwargs['headers']['Range'])
+            self.assertEqual(content, backup_path.read_bytes())
+        self.assertEqual(_STATIONS, ConfigModel.parse(content.decode()).count('station'))
+
+
+if __name__ == '__main__':
+    unittest.main()
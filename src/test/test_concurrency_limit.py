@@ -0,0 +1,191 @@
+import threading
+import unittest
+from http import HTTPStatus
+from unittest import mock
+
+import requests
+
+from src import concurrency_limit
+from src.concurrency_limit import AdaptiveLimiter, DROP, ERROR, SUCCESS
+from src.exceptions import InvalidOptionsException
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+from src.test.mocks import get_reply
+
+_CONFIG = '.nms 0\nname UHP NMS\n.network 0\nname net\n.vno 0\nname vno\nuprow network:0\n'
+
+
+def _run_round(limiter, latency, outcome=SUCCESS, endpoint=None):
+    """Completes a round of requests sent at the current limit"""
+    slots = [limiter.acquire() for _ in range(limiter.get_limit())]
+    for slot in slots:
+        limiter.release(slot, outcome, latency, endpoint)
+
+
+class AdaptiveLimiterSuite(unittest.TestCase):
+
+    def test_increase(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=5)
+        for _ in range(10):
+            _run_round(limiter, 0.01)
+        self.assertEqual(5, limiter.get_limit())
+        self.assertEqual([3, 4, 5], [change.limit for change in limiter.get_history()])
+        self.assertEqual({concurrency_limit.INCREASE}, {change.reason for change in limiter.get_history()})
+
+        # The limit does not grow if it is not reached
+        limiter = AdaptiveLimiter(initial_limit=4)
+        for _ in range(10):
+            limiter.release(limiter.acquire(), SUCCESS, 0.01)
+        self.assertEqual(4, limiter.get_limit())
+
+    def test_drop(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        slots = [limiter.acquire() for _ in range(8)]
+        # A burst of drops of the requests started together halves the limit once
+        for slot in slots:
+            limiter.release(slot, DROP)
+        self.assertEqual(4, limiter.get_limit())
+        self.assertEqual(DROP, limiter.get_history()[-1].reason)
+        limiter.release(limiter.acquire(), DROP)
+        self.assertEqual(2, limiter.get_limit())
+        for _ in range(3):
+            limiter.release(limiter.acquire(), DROP)
+        self.assertEqual(1, limiter.get_limit())
+        self.assertEqual((1, 0, 12, 0, 12), tuple(limiter.get_stats())[:5])
+
+    def test_latency_and_errors(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        _run_round(limiter, 0.01)
+        self.assertEqual(9, limiter.get_limit())
+        # Four times the no-load latency halves the limit, twice the latency shrinks it by the tolerance ratio
+        _run_round(limiter, 0.04)
+        self.assertEqual(4, limiter.get_limit())
+        _run_round(limiter, 0.02)
+        self.assertEqual(3, limiter.get_limit())
+        self.assertEqual(concurrency_limit.LATENCY, limiter.get_history()[-1].reason)
+
+        _run_round(limiter, 0.01, ERROR)
+        self.assertEqual(1, limiter.get_limit())
+        self.assertEqual(concurrency_limit.ERRORS, limiter.get_history()[-1].reason)
+
+    def test_endpoints(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=10)
+        _run_round(limiter, 0.01, endpoint='api/object/get')
+        # The lists take longer than the reads of objects without any load
+        for _ in range(5):
+            _run_round(limiter, 0.1, endpoint='api/list/get')
+        self.assertEqual(8, limiter.get_limit())
+        self.assertEqual({concurrency_limit.INCREASE}, {change.reason for change in limiter.get_history()})
+        _run_round(limiter, 0.2, endpoint='api/list/get')
+        self.assertEqual(concurrency_limit.LATENCY, limiter.get_history()[-1].reason)
+
+    def test_converges(self):
+        capacity = 4
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=32)
+        limits = []
+        for _ in range(100):
+            # NMS serves `capacity` requests at once, the rest wait in its queue
+            _run_round(limiter, 0.01 * max(1.0, limiter.get_limit() / capacity))
+            limits.append(limiter.get_limit())
+        # The latency of the loaded NMS does not become the no-load one, the limit stays close to the capacity
+        self.assertEqual({6, 7}, set(limits[-50:]))
+
+    def test_wait(self):
+        limiter = AdaptiveLimiter(initial_limit=1)
+        slot = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.release(limiter.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        limiter.release(slot)
+        thread.join()
+        self.assertEqual(1, limiter.get_stats().waits)
+
+    def test_invalid_options(self):
+        with self.assertRaises(InvalidOptionsException):
+            AdaptiveLimiter(initial_limit=10, max_limit=5)
+        with self.assertRaises(InvalidOptionsException):
+            AdaptiveLimiter(backoff=1)
+
+    def test_retry_drops(self):
+        client = NmsClient()
+        client._nms_ip_port = 'http://localhost:8000/'
+        client._cookies = {'sess_id': '1'}
+        session = mock.MagicMock()
+        client._get_session = lambda: session
+        client.enable_adaptive_concurrency(initial_limit=4)
+        with mock.patch('src.nms_api.sleep') as sleep:
+            session.post.side_effect = [get_reply({}, status_code=503), get_reply({'%row': 3})]
+            self.assertEqual('station:3', client.create('vno:0', 'station', {'name': 'stn-3'}))
+            self.assertEqual([mock.call(0.1)], sleep.call_args_list)
+
+            # The reads are sent again after a timeout, the writes are not
+            session.post.side_effect = [requests.exceptions.ReadTimeout(), get_reply({'name': 'stn-3'})]
+            self.assertEqual('stn-3', client.get_param('station:3', 'name'))
+            session.post.side_effect = [requests.exceptions.ReadTimeout(), get_reply({})]
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                client.update('station:3', {'enable': 'ON'})
+
+            # The error of the last attempt is returned
+            client.auto_abort_on_error(False)
+            session.post.side_effect = [get_reply({}, status_code=503)] * 4
+            self.assertIsNone(client.create('vno:0', 'station', {'name': 'stn-5'}))
+            self.assertEqual([0.1, 0.1, 0.1, 0.2, 0.4], [call.args[0] for call in sleep.call_args_list])
+        self.assertEqual(9, session.post.call_count)
+        self.assertEqual(7, client.get_concurrency_limiter().get_stats().drops)
+        with self.assertRaises(InvalidOptionsException):
+            client.enable_adaptive_concurrency(drop_retries=-1)
+
+    def test_no_write_retries(self):
+        class _FailingStandIn(NmsStandIn):
+            def handle(self, method, path, headers, body):
+                status, headers, content = super().handle(method, path, headers, body)
+                # NMS fails after the object is created
+                if '/new_item=' in path:
+                    return HTTPStatus.INTERNAL_SERVER_ERROR, {}, b''
+                return status, headers, content
+
+        config = ConfigModel.parse(_CONFIG)
+        with _FailingStandIn(config) as stand_in:
+            client = NmsClient()
+            client.connect(stand_in.url, 'admin', '12345')
+            client.enable_adaptive_concurrency()
+            client.auto_abort_on_error(False)
+            self.assertIsNone(client.create('vno:0', 'station', {'name': 'stn-0'}))
+            self.assertEqual(1, stand_in.get_stats().endpoints.get('api/object/write'))
+
+            client.set_timeout(0.2)
+            stand_in.set_latency(lambda path: 0.5 if '/write/' in path else 0)
+            with self.assertRaises(requests.exceptions.Timeout):
+                client.update('station:0', {'enable': 'ON'})
+            self.assertEqual(2, stand_in.get_stats().endpoints.get('api/object/write'))
+            self.assertEqual(2, client.get_concurrency_limiter().get_stats().drops)
+            client.close_session()
+
+    def test_bulk_operation(self):
+        capacity = 4
+        config = ConfigModel.parse(_CONFIG)
+        with NmsStandIn(config, latency=0.01, capacity=capacity) as stand_in:
+            client = NmsClient()
+            client.connect(stand_in.url, 'admin', '12345')
+            client.enable_adaptive_concurrency(initial_limit=2, max_limit=32)
+            result = client.create_many('vno:0', 'station', [{'name': f'stn-{i}'} for i in range(300)])
+            limiter = client.get_concurrency_limiter()
+            # The requests rejected by the overloaded stand-in are sent again
+            stats = limiter.get_stats()
+            self.assertEqual({}, result.errors)
+            self.assertEqual(300 + stats.drops, stats.requests)
+            self.assertEqual(300, len(client.list_items('vno:0', 'station')))
+            self.assertLessEqual(limiter.get_limit(), 32)
+            client.disable_adaptive_concurrency()
+            self.assertIsNone(client.get_concurrency_limiter())
+            client.close_session()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from src.nms_config.diff import FieldChange, compare
+from src.nms_config.model import ConfigModel
+
+_OLD = ('.nms 0\nname UHP NMS\ncreated 1638946965\nsave_filename a.txt\nvnos vno:0\n\n'
+        '.vno 0\nname vno-0\nuprow nms:0\nstations station:0\n\n'
+        '.station 0\nname stn-1\nuprow vno:0\nnext station:1\nserial 1\n\n'
+        '.station 1\nname stn-2\nuprow vno:0\nserial 2\nenable ON \n')
+
+
+class ConfigDiffSuite(unittest.TestCase):
+
+    def test_compare_by_row(self):
+        new = _OLD.replace('created 1638946965', 'created 1638950000').replace('save_filename a.txt', 'save_filename b')
+        new = new.replace('serial 2\nenable ON \n', 'serial 3\n') + '\n.station 2\nname stn-3\nuprow vno:0\n'
+        diff = compare(ConfigModel.parse(_OLD), ConfigModel.parse(new))
+        self.assertEqual([('station', 2)], diff.added)
+        self.assertEqual([], diff.removed)
+        self.assertEqual([
+            FieldChange('station', 1, 1, 'enable', 'ON', None),
+            FieldChange('station', 1, 1, 'serial', '2', '3'),
+        ], diff.changed)
+        self.assertFalse(compare(ConfigModel.parse(_OLD), ConfigModel.parse(new.replace('serial 3', 'serial 2')),
+                                 ignored_fields=('created', 'nms.save_filename', 'station.enable', 'stations')
+                                 ).changed)
+
+    def test_compare_by_name(self):
+        # The same stations saved in the other rows
+        new = _OLD.replace('station:0', 'station:X').replace('station:1', 'station:0').replace('station:X', 'station:1')
+        new = new.replace('.station 0\nname stn-1', '.station X\nname stn-1').replace(
+            '.station 1\nname stn-2', '.station 0\nname stn-2').replace('.station X', '.station 1')
+        old_config, new_config = ConfigModel.parse(_OLD), ConfigModel.parse(new)
+        self.assertTrue(compare(old_config, new_config))
+        self.assertFalse(compare(old_config, new_config, match='name'))
+        with self.assertRaises(ValueError):
+            compare(old_config, new_config, match='serial')
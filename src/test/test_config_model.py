@@ -0,0 +1,65 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.exceptions import InvalidOptionsException, ObjectNotFoundException
+from src.nms_config.model import ConfigModel
+from src.nms_config.writer import ConfigWriter, TopologyWriter
+
+
+class ConfigModelSuite(unittest.TestCase):
+
+    def test_parse(self):
+        config = ConfigModel.parse('\n.nms 0\nname UHP NMS\n\n.vno 0\nname vno-0\nuprow nms:0\n\n'
+                                   '.station 3\nname stn-3\nenable ON \nuprow vno:0\n\n'
+                                   '.station 12\nname stn-12\nuprow vno:0\nserial 12\n')
+        self.assertEqual(['nms', 'vno', 'station'], config.tables())
+        self.assertEqual([3, 12], config.rows('station'))
+        self.assertEqual('ON', config.get('station', 3, 'enable'))
+        self.assertIsNone(config.get('station', 12, 'enable'))
+        self.assertEqual({'name': 'stn-12', 'uprow': 'vno:0', 'serial': '12'}, config.get_object('station', 12))
+        self.assertEqual([3, 12], config.children('vno:0', 'station'))
+        self.assertEqual([12], config.find_by_name('station', 'stn-12'))
+        self.assertEqual([12], config.find('station', uprow='vno:0', serial=12))
+        self.assertEqual([], config.find('station', enable='OFF'))
+        with self.assertRaises(ObjectNotFoundException):
+            config.get('station', 4, 'name')
+        with self.assertRaises(InvalidOptionsException):
+            ConfigModel.parse('.nms 0\n\n.nms 0\n')
+
+    def test_topology(self):
+        f = io.StringIO()
+        writer = ConfigWriter(f)
+        for table, row, fields in TopologyWriter(stations=25, controllers=3, vnos=2).iter_objects():
+            writer.write_object(table, row, fields)
+        f.seek(0)
+        config = ConfigModel.parse(f)
+        self.assertEqual(writer.count, sum(config.count(table) for table in config.tables()))
+        self.assertEqual(writer.count, len(list(config.iter_objects())))
+        stations = config.children('vno:0', 'station') + config.children('vno:1', 'station')
+        self.assertEqual(list(range(25)), sorted(stations))
+        for ctrl in config.rows('controller'):
+            for row in config.children(f'controller:{ctrl}', 'station', field='rx_controller'):
+                self.assertEqual(f'controller:{ctrl}', config.get('station', row, 'rx_controller'))
+        self.assertEqual(25, sum(len(config.children(f'controller:{ctrl}', 'station', field='rx_controller'))
+                                 for ctrl in config.rows('controller')))
+
+    def test_changes(self):
+        config = ConfigModel.parse('.nms 0\nname UHP NMS\n\n.vno 0\nname vno-0\nuprow nms:0\n\n'
+                                   '.vno 1\nname vno-1\nuprow nms:0\n')
+        self.assertEqual([0], config.find_by_name('vno', 'vno-0'))
+        config.set('vno', 0, 'name', 'vno-5')
+        config.set('vno', 1, 'uprow', None)
+        self.assertEqual([0], config.find_by_name('vno', 'vno-5'))
+        self.assertEqual([0], config.children('nms:0', 'vno'))
+        config.delete_object('vno', 0)
+        self.assertEqual(0, config.get_free_row('vno'))
+        config.add_object('vno', 0, {'name': 'vno-0', 'uprow': 'nms:0', 'enable': True})
+        self.assertEqual([1, 0], config.rows('vno'))
+        self.assertEqual([0], config.children('nms:0', 'vno'))
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'config.txt'
+            self.assertEqual(3, config.save(path))
+            self.assertEqual('.nms 0\nname UHP NMS\n\n.vno 0\nname vno-0\nuprow nms:0\nenable ON \n\n'
+                             '.vno 1\nname vno-1\n', path.read_text())
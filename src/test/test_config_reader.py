@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.exceptions import ObjectNotFoundException
+from src.nms_config.model import ConfigModel
+from src.nms_config.reader import INDEX_SUFFIX, ConfigReader
+from src.nms_config.writer import TopologyWriter
+
+
+class ConfigReaderSuite(unittest.TestCase):
+
+    def test_lookup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'config.txt'
+            TopologyWriter(stations=30, controllers=2, vnos=3, routes=1).write(path)
+            config = ConfigModel.load(path)
+            with ConfigReader(path, use_cache=False) as reader:
+                self.assertEqual(config.tables(), reader.tables())
+                self.assertEqual(config.rows('station'), reader.rows('station'))
+                self.assertEqual(config.get_object('station', 17), reader.get_object('station', 17))
+                self.assertEqual(config.get('station', 17, 'serial'), reader.get('station', 17, 'serial'))
+                self.assertEqual(list(config.iter_objects()), list(reader.iter_objects()))
+                self.assertFalse(reader.has('station', 30))
+                with self.assertRaises(ObjectNotFoundException):
+                    reader.get('station', 30, 'name')
+            self.assertFalse(path.with_name(path.name + INDEX_SUFFIX).exists())
+
+    def test_index_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'config.txt'
+            path.write_text('\n.nms 0\nname UHP NMS\n\n.vno 5\nname vno-5\n\n.vno 2\nname vno-2\nenable ON \n')
+            with ConfigReader(path) as reader:
+                self.assertFalse(reader.index_cached)
+                self.assertEqual([5, 2], reader.rows('vno'))
+            with ConfigReader(path) as reader:
+                self.assertTrue(reader.index_cached)
+                self.assertEqual({'name': 'vno-2', 'enable': 'ON'}, reader.get_object('vno', 2))
+                self.assertEqual('vno-5', reader.get('vno', 5, 'name'))
+
+            path.write_text('.nms 0\nname UHP NMS\n\n.vno 2\nname vno-2\n')
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+            with ConfigReader(path) as reader:
+                self.assertFalse(reader.index_cached)
+                self.assertEqual([2], reader.rows('vno'))
+
+            path.with_name(path.name + INDEX_SUFFIX).write_bytes(b'broken')
+            with ConfigReader(path) as reader:
+                self.assertFalse(reader.index_cached)
+                self.assertEqual('vno-2', reader.get('vno', 2, 'name'))
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import config_tracker
+from src.backup_manager.backup_manager import BackupManager
+from src.test.mocks import get_reply
+
+
+class _Nms:
+    """Stands in for `requests` module, keeps the uploaded files and reloads the config upon the command"""
+
+    def __init__(self):
+        self.files = {}
+        self.load_time = 1
+        self.uploads = 0
+        self.reloads = 0
+
+    def get(self, url, **kwargs):
+        return get_reply({'load_time': self.load_time})
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        if url.endswith('api/fs/upload/nms=0'):
+            body = data.read()
+            name = body.split(b'filename="')[1].split(b'"')[0].decode()
+            self.uploads += 1
+            self.files[name] = {'name': name, 'size': len(body), 'date': self.uploads}
+            return get_reply({})
+        if 'api/fs/content/' in url:
+            return get_reply(list(self.files.values()))
+        if 'command=' in url:
+            self.reloads += 1
+            self.load_time += 1
+        return get_reply({'%row': 0})
+
+
+class ConfigTrackerSuite(unittest.TestCase):
+
+    def setUp(self):
+        config_tracker.reset()
+        config_tracker.set_reload_skip(True)
+        self.dir = tempfile.TemporaryDirectory()
+        self.nms = _Nms()
+        self.manager = BackupManager.__new__(BackupManager)
+        self.manager._address = 'http://localhost:8000/'
+        self.manager._cookies = None
+        self.manager._driver = self.nms
+        (Path(self.dir.name) / 'default_config.txt').write_text('.nms 0\nname nms\n')
+        patches = [
+            mock.patch.object(BackupManager, '_get_backup_dir', staticmethod(lambda name: Path(self.dir.name) / name)),
+            mock.patch('src.backup_manager.backup_manager.sleep', lambda seconds: None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        config_tracker.reset()
+        config_tracker.set_reload_skip(False)
+        self.dir.cleanup()
+
+    def test_repeated_apply_skipped(self):
+        for _ in range(3):
+            self.manager.apply_backup('default_config.txt')
+        self.assertEqual((1, 1), (self.nms.uploads, self.nms.reloads))
+        stats = config_tracker.get_stats()
+        self.assertEqual((3, 2, 2), (stats.loads, stats.uploads_skipped, stats.reloads_skipped))
+
+    def test_write_forces_reload(self):
+        self.manager.apply_backup('default_config.txt')
+        config_tracker.note_request('http://localhost:8000', 'api/object/write/station=0')
+        self.manager.apply_backup('default_config.txt')
+        self.assertEqual((1, 2), (self.nms.uploads, self.nms.reloads))
+
+    def test_changed_file_uploaded(self):
+        self.manager.apply_backup('default_config.txt')
+        (Path(self.dir.name) / 'default_config.txt').write_text('.nms 0\nname other\n')
+        self.manager.apply_backup('default_config.txt')
+        self.assertEqual((2, 2), (self.nms.uploads, self.nms.reloads))
+
+    def test_reload_skip_disabled(self):
+        config_tracker.set_reload_skip(False)
+        self.manager.apply_backup('default_config.txt')
+        self.manager.apply_backup('default_config.txt')
+        self.assertEqual((1, 2), (self.nms.uploads, self.nms.reloads))
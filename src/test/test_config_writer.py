@@ -0,0 +1,66 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.exceptions import InvalidOptionsException
+from src.nms_config.writer import ConfigWriter, TopologyWriter
+
+
+def _parse(text):
+    objects = {}
+    for block in text.strip('\n').split('\n\n'):
+        header, *lines = block.split('\n')
+        table, row = header[1:].split(' ')
+        objects[(table, int(row))] = dict(line.split(' ', 1) for line in lines)
+    return objects
+
+
+def _follow(objects, table, first, link):
+    rows = []
+    while first is not None:
+        row = int(first.split(':')[1])
+        rows.append(row)
+        first = objects[(table, row)].get(link)
+    return rows
+
+
+class ConfigWriterSuite(unittest.TestCase):
+
+    def test_format(self):
+        f = io.StringIO()
+        writer = ConfigWriter(f)
+        writer.write_object('nms', 0, {'name': 'UHP NMS', 'unused': None})
+        writer.write_object('user', 0, [('name', 'admin'), ('enable', True), ('password', 1)])
+        self.assertEqual('.nms 0\nname UHP NMS\n\n.user 0\nname admin\nenable ON \npassword 1\n', f.getvalue())
+        with self.assertRaises(InvalidOptionsException):
+            writer.write_object('user', 0, {})
+        with self.assertRaises(InvalidOptionsException):
+            writer.write_object('nms', 1, {})
+
+    def test_topology_links(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'config.txt'
+            count = TopologyWriter(stations=25, controllers=3, vnos=2, routes=2).write(path)
+            objects = _parse(path.read_text())
+        self.assertEqual(count, len(objects))
+        # nms, access, group, network, service, teleport and user
+        self.assertEqual(25 + 50 + 3 + 2 + 7, count)
+
+        vno_stations = []
+        for vno in range(2):
+            rows = _follow(objects, 'station', objects[('vno', vno)]['stations'], 'next')
+            self.assertEqual(sorted(rows, key=lambda row: f'stn-{row}'), rows)
+            self.assertTrue(all(objects[('station', row)]['uprow'] == f'vno:{vno}' for row in rows))
+            vno_stations.extend(rows)
+        self.assertEqual(list(range(25)), sorted(vno_stations))
+
+        controller_stations = []
+        for ctrl in _follow(objects, 'controller', objects[('network', 0)]['controllers'], 'next'):
+            rows = _follow(objects, 'station', objects[('controller', ctrl)]['rx_stations'], 'rx_next')
+            self.assertEqual(sorted(rows), rows)
+            self.assertTrue(all(objects[('station', row)]['rx_controller'] == f'controller:{ctrl}' for row in rows))
+            controller_stations.extend(rows)
+        self.assertEqual(list(range(25)), sorted(controller_stations))
+
+        self.assertEqual([7, 32], _follow(objects, 'route', objects[('station', 7)]['routes'], 'next'))
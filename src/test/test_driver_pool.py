@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+import requests
+
+from src.drivers.abstract_http_driver import API
+from src.drivers.driver_pool import DriverPool
+from src.drivers.drivers_provider import DriversProvider
+from src.exceptions import DriverPoolTimeoutException
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+
+class DriverPoolSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.stand_in = NmsStandIn(ConfigModel.parse('.nms 0\nname UHP NMS\n'))
+        self.stand_in.start()
+        self.url = self.stand_in.url
+        self.options = {'type': API, 'address': self.url, 'username': 'admin', 'password': '12345', 'auto_login': True}
+
+    def tearDown(self):
+        DriversProvider.configure_pool()
+        self.stand_in.stop()
+
+    def test_reuse(self):
+        DriversProvider.configure_pool(max_size=2)
+        with DriversProvider.leased_driver(self.options) as driver:
+            driver.set_path('api/object/get/nms=0')
+            self.assertEqual('UHP NMS', driver.get_value('name'))
+        with DriversProvider.leased_driver(self.options) as reused:
+            self.assertIs(driver, reused)
+        stats = DriversProvider.get_pool_stats()
+        self.assertEqual((2, 1, 1, 0.5), stats[:4])
+        self.assertEqual((1, 1), (stats.size, stats.idle))
+
+        # A failed block discards the driver
+        with self.assertRaises(KeyError):
+            with DriversProvider.leased_driver(self.options):
+                raise KeyError('broken')
+        stats = DriversProvider.get_pool_stats()
+        self.assertEqual((1, 0, 0), (stats.discards, stats.size, stats.idle))
+        with self.assertRaises(ValueError):
+            DriversProvider.return_driver(driver)
+
+    def test_max_size(self):
+        DriversProvider.configure_pool(max_size=1)
+        driver = DriversProvider.lease_driver(self.options)
+        with self.assertRaises(DriverPoolTimeoutException):
+            DriversProvider.lease_driver(self.options, timeout=0.1)
+
+        # A waiting thread gets the returned driver
+        leased = []
+        thread = threading.Thread(target=lambda: leased.append(DriversProvider.lease_driver(self.options, timeout=5)))
+        thread.start()
+        time.sleep(0.1)
+        DriversProvider.return_driver(driver)
+        thread.join()
+        self.assertIs(driver, leased[0])
+        stats = DriversProvider.get_pool_stats()
+        self.assertEqual((2, 1, 1, 1), (stats.leases, stats.creations, stats.reuses, stats.waits))
+        DriversProvider.return_driver(driver)
+
+    def test_health_check(self):
+        DriversProvider.configure_pool(check_after=0)
+        driver = DriversProvider.lease_driver(self.options)
+        DriversProvider.return_driver(driver)
+        self.assertIs(driver, DriversProvider.lease_driver(self.options))
+        DriversProvider.return_driver(driver)
+
+        # The driver logged out is replaced by a new one
+        requests.get(self.url + 'api/tree/logout/nms=0', cookies=driver.get_cookies())
+        new_driver = DriversProvider.lease_driver(self.options)
+        self.assertIsNot(driver, new_driver)
+        stats = DriversProvider.get_pool_stats()
+        self.assertEqual((2, 1, 1), (stats.creations, stats.discards, stats.size))
+        DriversProvider.return_driver(new_driver)
+
+    def test_idle_eviction(self):
+        closed = []
+
+        class Driver:
+            def close(self):
+                closed.append(self)
+
+        pool = DriverPool(lambda options: Driver(), max_size=3, max_idle=0.05)
+        drivers = [pool.lease(self.options) for _ in range(3)]
+        for driver in drivers:
+            pool.release(driver)
+        time.sleep(0.1)
+        pool.evict_idle()
+        self.assertEqual(3, len(closed))
+        stats = pool.get_stats()
+        self.assertEqual((3, 0, 0), (stats.evictions, stats.size, stats.idle))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from src.nms_entities.basic_entities.station import Station
+from src.test.mocks import get_driver, get_reply
+
+
+class GetParamsManySuite(unittest.TestCase):
+
+    def _get_driver(self, number):
+        """Returns a mock driver replying to the paged lists with `number` stations"""
+        def get(url):
+            options = dict(a.split('=') for a in url.split('/') if a.startswith('list_'))
+            skip, max_ = int(options.get('list_skip', 0)), int(options.get('list_max', number))
+            return get_reply([
+                {'%row': i, 'name': f'stn{i}', 'state': 'Up'} for i in range(skip, min(skip + max_, number))
+            ])
+
+        return get_driver(get)
+
+    @staticmethod
+    def _get_urls(requests):
+        return [call.args[0] for call in requests.get.call_args_list]
+
+    def test_single_page(self):
+        driver, requests = self._get_driver(20)
+        params = Station.get_params_many(driver, 0, ['state'])
+        self.assertEqual(1, requests.get.call_count)
+        self.assertIn('list_vars=state', self._get_urls(requests)[0])
+        self.assertEqual(20, len(params))
+        self.assertEqual({'state': 'Up'}, params.get(19))
+
+    def test_paged(self):
+        driver, requests = self._get_driver(25)
+        params = Station.get_params_many(driver, 0, ['name', 'state'], page_size=10)
+        self.assertEqual(3, requests.get.call_count)
+        self.assertEqual(list(range(25)), sorted(params.keys()))
+        self.assertEqual('stn24', params.get(24).get('name'))
+
+    def test_wait_all_single_request_per_cycle(self):
+        driver, requests = self._get_driver(20)
+        stations = [Station(driver, 0, i) for i in range(20)]
+        up, fail = Station.wait_all(timeout=1, step_timeout=0, stations=stations)
+        self.assertEqual(1, requests.get.call_count)
+        self.assertEqual(20, len(up))
+        self.assertEqual([], fail)
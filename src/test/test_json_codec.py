@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from src import json_codec
+from src.exceptions import InvalidOptionsException
+
+
+class JsonCodecSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = json_codec.get_backend()
+
+    def tearDown(self):
+        json_codec.set_backend(self.backend)
+
+    def _backends(self):
+        backends = [json_codec.STDLIB]
+        if json_codec.orjson is not None:
+            backends.append(json_codec.ORJSON)
+        return backends
+
+    def test_round_trip(self):
+        obj = {'error_code': 0, 'error_log': '', 'reply': {'name': 'станция-1', 'rx_snr': 12.5, 'serial': 1}}
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                json_codec.set_backend(backend)
+                data = json_codec.dumps(obj)
+                self.assertIsInstance(data, bytes)
+                self.assertIn('станция-1'.encode('utf-8'), data)
+                self.assertEqual(obj, json_codec.loads(data))
+                self.assertEqual(obj, json.loads(data))
+
+    def test_decode_error(self):
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                json_codec.set_backend(backend)
+                with self.assertRaises(json_codec.JSONDecodeError):
+                    json_codec.loads(b'<html>Internal error</html>')
+
+    def test_unsupported_types_fallback(self):
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                json_codec.set_backend(backend)
+                self.assertEqual({'big': 2 ** 70}, json_codec.loads(json_codec.dumps({'big': 2 ** 70})))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(InvalidOptionsException):
+            json_codec.set_backend('ujson')
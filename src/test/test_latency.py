@@ -0,0 +1,71 @@
+import unittest
+
+from src import latency
+from src.latency import LatencyHistogram, LatencyRecorder
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+
+class LatencySuite(unittest.TestCase):
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value / 1000)
+        summary = histogram.get_summary()
+        self.assertEqual(1000, summary['count'])
+        self.assertEqual(1.0, summary['max'])
+        for percent in latency.PERCENTILES:
+            self.assertAlmostEqual(percent / 100, summary[f'p{percent}'], delta=percent / 100 * 0.01)
+
+        # Merging the halves gives the same histogram
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 1001):
+            (first if value % 2 else second).record(value / 1000)
+        first.merge(LatencyHistogram.from_dict(second.to_dict()))
+        self.assertEqual(histogram.to_dict(), first.to_dict())
+        self.assertEqual(0.0, LatencyHistogram().percentile(99))
+
+    def test_recorder(self):
+        recorder = LatencyRecorder()
+        recorder.record('snmp/get', 0.5)
+        recorder.start_test('test_1')
+        recorder.record('snmp/get', 0.1)
+        recorder.record('telnet/show arp', 0.2)
+        recorder.start_test('test_2')
+        recorder.record('snmp/get', 0.3)
+        recorder.stop_test()
+        suite = recorder.get_suite()
+        self.assertEqual(['snmp/get', 'telnet/show arp'], list(suite))
+        self.assertEqual(3, suite['snmp/get'].count)
+        self.assertEqual(0.5, suite['snmp/get'].get_summary()['max'])
+        tests = recorder.get_tests()
+        self.assertEqual({'test_1': 2, 'test_2': 1}, {test: len(histograms) for test, histograms in tests.items()})
+        self.assertEqual(0.3, tests['test_2']['snmp/get'].get_summary()['p50'])
+
+    def test_endpoints(self):
+        self.assertEqual('api/list/get', latency.get_endpoint('http://nms:8000/api/list/get/nms=0/list_items=vno'))
+        self.assertEqual('api/tree/login', latency.get_endpoint('http://nms:8000/api/tree/login/nms=0'))
+        self.assertEqual('uhp/cw', latency.get_endpoint('http://10.0.2.15/cw3?ta=1'))
+
+        stand_in = NmsStandIn(ConfigModel.parse('.nms 0\nname UHP NMS\n'))
+        stand_in.start()
+        latency.reset()
+        latency.start_test('test_endpoints')
+        client = NmsClient()
+        try:
+            client.connect(stand_in.url, 'admin', '12345')
+            client.get_param('nms:0', 'name')
+        finally:
+            client.close_session()
+            stand_in.stop()
+        latency.stop_test()
+        report = latency.get_report('latency_suite')
+        self.assertEqual(['api/object/get', 'api/tree/login'], list(report['endpoints']))
+        self.assertEqual(1, report['tests']['test_endpoints']['api/object/get']['summary']['count'])
+        latency.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import re
+import unittest
+from unittest import mock
+
+from src.log_tailer import LogTailer
+
+
+class _Logs:
+    """Stands in for the NMS log request, returns the records which times are within the requested window"""
+
+    def __init__(self):
+        self.records = []
+        self.payloads = []
+
+    def add(self, at, name, message):
+        self.records.append((at, {'ti': at, 'na': name, 'me': message}))
+
+    def read(self, payload):
+        self.payloads.append(payload)
+        return [rec for at, rec in self.records if payload['start'] <= at <= payload['end']]
+
+
+class LogTailerSuite(unittest.TestCase):
+
+    def test_only_new_records(self):
+        logs = _Logs()
+        tailer = LogTailer(logs.read, start=0)
+        logs.add(1, 'stn-1', 'Station Up ')
+        logs.add(1, 'stn-1', 'Station Up ')
+        self.assertEqual(2, len(tailer.poll()))
+        # A record equal to the returned ones is logged within the same second
+        logs.add(1, 'stn-1', 'Station Up ')
+        logs.add(2, 'stn-2', 'Station Up ')
+        new = tailer.poll()
+        self.assertEqual([{'ti': 1, 'na': 'stn-1', 'me': 'Station Up '}, {'ti': 2, 'na': 'stn-2', 'me': 'Station Up '}],
+                         new)
+        self.assertEqual([], tailer.poll())
+        # The next window starts at the newest record instead of the initial start
+        self.assertEqual(2, logs.payloads[-1]['start'])
+        # The last poll receives the record at the window start again and skips it
+        self.assertEqual((3, 7, 4, 0), tuple(tailer.get_stats()))
+
+    def test_skewed_clock(self):
+        # The NMS clock lags 30 seconds behind the client one
+        logs = _Logs()
+        now = [1000.0]
+        with mock.patch('src.log_tailer.time', side_effect=lambda: now[0]):
+            tailer = LogTailer(logs.read, start=970)
+            logs.add(971, 'stn-1', 'Station Up')
+            self.assertEqual(1, len(tailer.poll()))
+            self.assertEqual(971, tailer.get_cursor())
+            now[0] += 5
+            logs.add(971, 'stn-1', 'Station Down')
+            logs.add(974, 'stn-2', 'Station Up')
+            self.assertEqual([('stn-1', 'Station Down'), ('stn-2', 'Station Up')],
+                             [(rec['na'], rec['me']) for rec in tailer.poll()])
+            self.assertEqual(974, tailer.get_cursor())
+            # The cursor stays if nothing is returned
+            now[0] += 5
+            logs.records.clear()
+            self.assertEqual([], tailer.poll())
+            self.assertEqual(974, tailer.get_cursor())
+            logs.add(975, 'stn-1', 'Station Up')
+            self.assertEqual([{'ti': 975, 'na': 'stn-1', 'me': 'Station Up'}], tailer.poll())
+        self.assertEqual([970, 971, 974, 974], [payload['start'] for payload in logs.payloads])
+
+    def test_matchers(self):
+        logs = _Logs()
+        tailer = LogTailer(
+            logs.read,
+            names=['stn-1', 'stn-2'],
+            messages=['Station Up', re.compile(r'^Station Down')],
+            start=0,
+        )
+        logs.add(1, 'stn-3', 'Station Up')
+        logs.add(1, 'stn-1', 'Station Fault')
+        logs.add(1, 'stn-2', 'Station Down: no carrier')
+        logs.add(1, 'stn-1', 'Station Up  ')
+        matches = tailer.poll_matches()
+        self.assertEqual([('stn-2', 'Station Down: no carrier'), ('stn-1', 'Station Up')],
+                         [(m.name, m.message) for m in matches])
+
+    def test_wait_timeout(self):
+        logs = _Logs()
+        tailer = LogTailer(logs.read, names='stn-1')
+        self.assertIsNone(tailer.wait(timeout=0, step_timeout=0))
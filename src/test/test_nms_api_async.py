@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+from src.exceptions import DriverInitException, InvalidOptionsException, ObjectNotCreatedException
+from src.nms_api_async import AsyncNmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+
+class AsyncNmsClientSuite(unittest.TestCase):
+
+    def setUp(self):
+        config = ConfigModel.parse('.nms 0\nname UHP NMS\n.network 0\nname net\n.vno 0\nname vno\nuprow network:0\n')
+        self.stand_in = NmsStandIn(config, latency=0.05)
+        self.stand_in.start()
+        self.url = self.stand_in.url
+        self.client = AsyncNmsClient()
+
+    def tearDown(self):
+        self.stand_in.stop()
+
+    def test_crud(self):
+        async def run():
+            await self.client.connect(self.url, 'admin', '12345')
+            rows = await asyncio.gather(*[
+                self.client.create('vno:0', 'station', {'name': f'stn-{i}'}) for i in range(5)
+            ])
+            self.assertEqual(['station:0', 'station:1', 'station:2', 'station:3', 'station:4'], sorted(rows))
+            self.assertEqual('station:1', await self.client.update('station:1', {'name': 'renamed'}))
+            self.assertEqual('renamed', await self.client.get_param('station:1', 'name'))
+            self.assertTrue(await self.client.delete('station:1'))
+            self.assertEqual(4, len(await self.client.list_items('vno:0', 'station')))
+            with self.assertRaises(ObjectNotCreatedException):
+                await self.client.create('vno:10', 'station', {'name': 'stn'})
+            self.client.auto_abort_on_error(False)
+            self.assertIsNone(await self.client.create('vno:10', 'station', {'name': 'stn'}))
+            await self.client.logout()
+
+        asyncio.run(run())
+
+    def test_not_connected(self):
+        with self.assertRaises(DriverInitException):
+            asyncio.run(self.client.read('nms:0'))
+        with self.assertRaises(InvalidOptionsException):
+            self.client.set_concurrency(0)
+
+    def test_concurrency(self):
+        async def create_many(concurrency):
+            self.client.set_concurrency(concurrency)
+            await asyncio.gather(*[self.client.create('vno:0', 'station', {'name': f'stn-{i}'}) for i in range(8)])
+            return self.stand_in.get_stats().max_concurrency
+
+        async def run():
+            await self.client.connect(self.url, 'admin', '12345', max_concurrency=2)
+            self.assertEqual(2, await create_many(2))
+            self.assertEqual(8, await create_many(8))
+            await self.client.close()
+
+        asyncio.run(run())
+
+    def test_loop_change(self):
+        asyncio.run(self.client.connect(self.url, 'admin', '12345'))
+        session = self.client._session
+        # Another loop gets a new session, the previous one is closed
+        self.assertEqual('UHP NMS', asyncio.run(self.client.get_param('nms:0', 'name')))
+        self.assertTrue(session.closed)
+        self.assertIsNot(session, self.client._session)
+        asyncio.run(self.client.close())
+        self.assertIsNone(self.client._session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from src.exceptions import InvalidOptionsException, NmsErrorResponseException, ObjectNotCreatedException, \
+    ObjectNotUpdatedException
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+
+class NmsApiBulkSuite(unittest.TestCase):
+
+    def setUp(self):
+        config = ConfigModel.parse('.nms 0\nname UHP NMS\n.network 0\nname net\n.vno 0\nname vno\nuprow network:0\n')
+        # The jitter completes the requests out of order
+        self.stand_in = NmsStandIn(config, latency=0.001, jitter=0.01)
+        self.stand_in.start()
+        self.client = NmsClient()
+        self.client.connect(self.stand_in.url, 'admin', '12345')
+
+    def tearDown(self):
+        self.client.close_session()
+        self.stand_in.stop()
+
+    def test_create_update_delete(self):
+        params_list = [{'name': f'stn-{i}', 'serial': i} for i in range(50)]
+        params_list[7] = 'not a dictionary'
+        with self.assertRaises(InvalidOptionsException):
+            self.client.create_many('vno:0', 'station', params_list)
+        params_list[7] = {'name': 'stn-7', 'serial': 7}
+
+        result = self.client.create_many('vno:0', 'station', params_list, concurrency=8)
+        self.assertEqual({}, result.errors)
+        # The results are in the order of the items
+        for row, params in zip(result.results, params_list):
+            self.assertEqual(params['serial'], self.client.get_param(row, 'serial'))
+
+        updates = {row: {'serial': 100 + i} for i, row in enumerate(result.results)}
+        updates['station:500'] = {'serial': 1}
+        update_result = self.client.update_many(updates, concurrency=8)
+        self.assertEqual(list(updates)[:-1], update_result.results[:-1])
+        self.assertIsNone(update_result.results[-1])
+        self.assertEqual([50], list(update_result.errors))
+        self.assertIsInstance(update_result.errors[50], ObjectNotUpdatedException)
+        self.assertEqual(110, self.client.get_param(result.results[10], 'serial'))
+
+        rows = result.results[:10] + ['station:500']
+        delete_result = self.client.delete_many(rows, concurrency=8)
+        self.assertEqual(rows[:10] + [None], delete_result.results)
+        self.assertIsInstance(delete_result.errors[10], NmsErrorResponseException)
+        self.assertEqual(40, len(self.client.list_items('vno:0', 'station')))
+
+    def test_errors(self):
+        result = self.client.create_many('vno:10', 'station', [{'name': f'stn-{i}'} for i in range(5)])
+        self.assertEqual([None] * 5, result.results)
+        self.assertEqual([0, 1, 2, 3, 4], sorted(result.errors))
+        self.assertTrue(all(isinstance(exc, ObjectNotCreatedException) for exc in result.errors.values()))
+
+    def test_client_session_kept(self):
+        session = self.client._get_session()
+        result = self.client.create_many('vno:0', 'station', [{'name': f'stn-{i}'} for i in range(30)],
+                                         concurrency=20)
+        self.assertEqual({}, result.errors)
+        # The batch runs on its own larger pool, the session shared with other threads is not closed
+        self.assertIs(session, self.client._get_session())
+        self.assertEqual(10, self.client._pool_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
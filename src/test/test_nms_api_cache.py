@@ -0,0 +1,97 @@
+import json
+import unittest
+from unittest import mock
+
+from src.nms_api import NmsClient
+from src.test.mocks import get_reply
+
+
+class NmsApiCacheSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.tick_number = 1
+        self.objects = {'station=0': {'name': 'stn-0', 'enable': 'OFF'}}
+        # Called when the object is read, before the reply is sent
+        self.on_read = None
+        self.session = mock.MagicMock()
+        self.session.post.side_effect = self._post
+        self.client = NmsClient()
+        self.client._nms_ip_port = 'http://localhost:8000/'
+        self.client._cookies = {'sess_id': '1'}
+        self.client._get_session = lambda: self.session
+        patcher = mock.patch('src.nms_api.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, url, data=None, **kwargs):
+        """Replies the way NMS does to the object reads and writes"""
+        path = url[len(self.client._nms_ip_port):]
+        table_row = path.split('/')[3]
+        if path.startswith('api/object/get/nms=0'):
+            return get_reply({'tick_number': self.tick_number})
+        if path.startswith('api/object/get/'):
+            reply = dict(self.objects[table_row])
+            if self.on_read is not None:
+                on_read, self.on_read = self.on_read, None
+                on_read()
+            return get_reply(reply)
+        self.objects[table_row].update(json.loads(data))
+        return get_reply({})
+
+    def _get_reads(self):
+        return [c.args[0] for c in self.session.post.call_args_list if '/get/station=0' in c.args[0]]
+
+    def test_hit(self):
+        self.client.enable_cache(ttl=30, tick_aware=False)
+        self.assertEqual('stn-0', self.client.get_param('station:0', 'name'))
+        self.assertEqual('OFF', self.client.get_param('station:0', 'enable'))
+        self.assertEqual(1, len(self._get_reads()))
+        stats = self.client.get_cache_stats()
+        self.assertEqual((1, 1, 0, 1, 1), tuple(stats))
+        self.client.reset_cache_stats()
+        self.assertEqual((0, 0, 0, 0, 1), tuple(self.client.get_cache_stats()))
+
+    def test_write_invalidates(self):
+        self.client.enable_cache(ttl=30, tick_aware=False)
+        self.client.get_param('station:0', 'enable')
+        self.client.update('station:0', {'enable': 'ON'})
+        self.assertEqual('ON', self.client.get_param('station:0', 'enable'))
+        self.assertEqual(2, len(self._get_reads()))
+
+    def test_ttl(self):
+        self.client.enable_cache(ttl=30, tick_aware=False)
+        self.client.get_param('station:0', 'name')
+        self.now += 29
+        self.client.get_param('station:0', 'name')
+        self.assertEqual(1, len(self._get_reads()))
+        self.now += 2
+        self.client.get_param('station:0', 'name')
+        self.assertEqual(2, len(self._get_reads()))
+
+    def test_tick_change(self):
+        self.client.enable_cache(ttl=30, tick_aware=True, tick_check_interval=1)
+        self.client.get_param('station:0', 'name')
+        self.client.get_param('station:0', 'name')
+        self.assertEqual(1, len(self._get_reads()))
+        # The tick number is not requested again within the check interval
+        self.tick_number = 2
+        self.client.get_param('station:0', 'name')
+        self.assertEqual(1, len(self._get_reads()))
+        self.assertEqual(1, self.client.get_cache_stats().tick_requests)
+        self.now += 1
+        self.client.get_param('station:0', 'name')
+        self.assertEqual(2, len(self._get_reads()))
+        self.assertEqual(2, self.client.get_cache_stats().tick_requests)
+
+    def test_write_during_read(self):
+        self.client.enable_cache(ttl=30, tick_aware=False)
+        # Another thread completes a write after the read has got the values before it
+        self.on_read = lambda: self.client.update('station:0', {'enable': 'ON'})
+        self.assertEqual('OFF', self.client.get_param('station:0', 'enable'))
+        self.assertEqual('ON', self.client.get_param('station:0', 'enable'))
+        self.assertEqual(2, len(self._get_reads()))
+
+
+if __name__ == '__main__':
+    unittest.main()
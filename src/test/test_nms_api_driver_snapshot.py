@@ -0,0 +1,68 @@
+import unittest
+
+from src.nms_entities.basic_entities.controller import Controller
+from src.nms_entities.basic_entities.network import Network
+from src.nms_entities.basic_entities.station import Station
+from src.nms_entities.basic_entities.vno import Vno
+from src.test.mocks import get_driver, get_reply
+
+
+class NmsApiDriverSnapshotSuite(unittest.TestCase):
+
+    def _get_driver(self, reply):
+        """Returns a mock driver replying with `self.reply` to GET requests"""
+        self.reply = reply
+        return get_driver(lambda url: get_reply(self.reply))
+
+    def test_get_state_single_request(self):
+        for entity in (Station, Controller, Network, Vno):
+            driver, requests = self._get_driver({'state': 'Up ', 'up_stations': 1})
+            obj = entity(driver, 0, 1)
+            with self.subTest(entity=entity.__name__):
+                state = obj.get_state()
+                self.assertEqual(1, requests.get.call_count)
+                if 'state' in state:
+                    self.assertEqual('Up', state['state'])
+
+    def test_load_single_request(self):
+        driver, requests = self._get_driver({'name': 'net', 'dev_password': 'pass', 'dev_vlan': 1})
+        Network(driver, 0, 1, {'name': None, 'dev_password': None, 'dev_vlan': None})
+        self.assertEqual(1, requests.get.call_count)
+
+    def test_live_reads_outside_snapshot(self):
+        driver, requests = self._get_driver({'state': 'Up'})
+        driver.set_path('api/object/dashboard/station=1')
+        driver.get_value('state')
+        driver.get_value('state')
+        self.assertEqual(2, requests.get.call_count)
+
+    def test_write_invalidates_snapshot(self):
+        driver, requests = self._get_driver({'state': 'Up'})
+        with driver.snapshot():
+            driver.set_path('api/object/dashboard/station=1')
+            driver.get_value('state')
+            driver.get_value('state')
+            self.assertEqual(1, requests.get.call_count)
+            driver.send_value('enable', 'ON')
+            driver.set_path('api/object/dashboard/station=1')
+            driver.get_value('state')
+            self.assertEqual(2, requests.get.call_count)
+
+    def test_refresh_reloads_snapshot(self):
+        driver, requests = self._get_driver({'state': 'Up'})
+        with driver.snapshot():
+            driver.set_path('api/object/dashboard/station=1')
+            driver.get_value('state')
+            self.reply = {'state': 'Down'}
+            self.assertEqual('Up', driver.get_value('state'))
+            driver.refresh()
+            self.assertEqual('Down', driver.get_value('state'))
+            self.assertEqual(2, requests.get.call_count)
+
+    def test_close(self):
+        driver, requests = self._get_driver({})
+        driver.close()
+        requests.close.assert_called_once_with()
+        self.assertIsNone(driver.driver)
+        driver.close()
+        requests.close.assert_called_once_with()
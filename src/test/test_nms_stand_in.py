@@ -0,0 +1,90 @@
+import unittest
+
+import requests
+
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+_CONFIG = ('.nms 0\nname UHP NMS\nnetworks network:0\n\n'
+           '.network 0\nuprow nms:0\nname net-0\n\n'
+           '.station 0\nuprow network:0\nname stn-0\nenable ON \nserial 10\n\n'
+           '.station 1\nuprow network:0\nname stn-1\nserial 11\n')
+
+
+class NmsStandInSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.stand_in = NmsStandIn(ConfigModel.parse(_CONFIG), tick_period=0.05)
+        self.stand_in.start()
+        self.client = NmsClient()
+        self.client.connect(self.stand_in.url, 'admin', '12345')
+
+    def tearDown(self):
+        self.client.close_session()
+        self.stand_in.stop()
+
+    def test_objects(self):
+        self.assertEqual(10, self.client.get_param('station:0', 'serial'))
+        self.assertEqual('network:0', self.client.get_uprow('station:1'))
+        self.assertEqual('Up', self.client.get_param('station:0', 'state'))
+        self.assertEqual('Off', self.client.get_param('station:1', 'state'))
+        self.assertEqual([{'%row': 1, 'name': 'stn-1'}],
+                         list(self.client.iter_items('network:0', 'station', vars_=['name'], page_size=1))[1:])
+
+        row = self.client.create('network:0', 'station', {'name': 'stn-2', 'enable': True})
+        self.assertEqual('station:2', row)
+        self.client.update(row, {'serial': 12})
+        self.assertEqual(12, self.client.get_param(row, 'serial'))
+        self.assertEqual('station:2', self.client.search_by_name('network:0', 'station', 'stn-2'))
+        self.client.auto_abort_on_error(False)
+        self.assertFalse(self.client.delete('network:0'))
+        self.client.auto_abort_on_error(True)
+        self.assertTrue(self.client.delete('network:0', recursive=True))
+        self.assertEqual([], self.client.list_items('nms:0', 'network'))
+
+        self.stand_in.set_state('nms:0', 'Fault', ticks=1)
+        self.assertTrue(self.client.wait_state('nms:0', 'Fault', timeout=2, step_timeout=0.05))
+
+    def test_wait_many(self):
+        rows = ['station:0'] + [
+            self.client.create('network:0', 'station', {'name': f'stn-{i}', 'enable': True}) for i in range(2, 22)
+        ]
+        before = self.stand_in.get_stats().endpoints
+        result = self.client.wait_all(rows, 'Up', timeout=2, step_timeout=0.05)
+        self.assertTrue(result.success)
+        after = self.stand_in.get_stats().endpoints
+        # The uprow of the first station and a list of the parent to group them, then a list of the states
+        self.assertEqual(1, after.get('api/object/get', 0) - before.get('api/object/get', 0))
+        self.assertEqual(2, after.get('api/list/get', 0) - before.get('api/list/get', 0))
+
+        result = self.client.wait_any(rows + ['station:1'], 'Off', timeout=2, step_timeout=0.05,
+                                      parent_table_row='network:0')
+        self.assertTrue(result.success)
+        self.assertEqual('Off', result.states['station:1'])
+        reads = self.stand_in.get_stats().endpoints.get('api/object/get', 0) - before.get('api/object/get', 0)
+        self.assertEqual(1, reads)
+
+    def test_files(self):
+        url = self.stand_in.url
+        self.assertEqual(401, requests.get(url + 'api/object/get/nms=0').status_code)
+        self.assertEqual(401, requests.get(url + 'api/tree/login/nms=0', auth=('admin', 'wrong')).status_code)
+        cookies = requests.get(url + 'api/tree/login/nms=0', auth=('admin', '12345')).cookies
+        reply = requests.post(url + 'api/object/write/nms=0/command=16777237',
+                              data=b'{"save_filename": "saved.txt"}', cookies=cookies).json()
+        self.assertEqual(0, reply['error_code'])
+        files = requests.post(url + 'api/fs/content/nms=0/path=/config/', json={'dir': 'config'},
+                              cookies=cookies).json()['reply']
+        self.assertEqual(['saved.txt'], [file['name'] for file in files])
+        saved = requests.get(url + 'api/fs/download/nms=0/path=config&saved.txt', cookies=cookies).content
+        self.assertEqual(['nms', 'network', 'station'], ConfigModel.parse(saved.decode()).tables())
+        partial = requests.get(url + 'api/fs/download/nms=0/path=config&saved.txt', cookies=cookies,
+                               headers={'Range': 'bytes=10-'})
+        self.assertEqual((206, saved[10:]), (partial.status_code, partial.content))
+        upload = requests.post(url + 'api/fs/upload/nms=0', files={'config': ('new.txt', b'.nms 0\nname X\n')},
+                               cookies=cookies).json()
+        self.assertEqual(0, upload['error_code'])
+        reply = requests.post(url + 'api/object/write/nms=0', json={'command': 16777239, 'load_filename': 'new.txt'},
+                              cookies=cookies).json()
+        self.assertEqual(0, reply['error_code'])
+        self.assertEqual('X', self.client.get_param('nms:0', 'name'))
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from src import session_cache
+from src.drivers.abstract_http_driver import API
+from src.drivers.http.api_driver import ApiDriver
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+_PROJECT_DIR = Path(__file__).parent.parent.parent
+
+
+class SessionCacheSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        session_cache.set_enabled(True, Path(self.folder.name, 'sessions.json'))
+        session_cache.reset_stats()
+        self.stand_in = NmsStandIn(ConfigModel.parse('.nms 0\nname UHP NMS\n'))
+        self.stand_in.start()
+        self.url = self.stand_in.url
+
+    def tearDown(self):
+        self.stand_in.stop()
+        session_cache.set_enabled(False)
+        self.folder.cleanup()
+
+    def test_shared_cookies(self):
+        first, second = NmsClient(), NmsClient()
+        first.connect(self.url, 'admin', '12345')
+        second.connect(self.url, 'admin', '12345')
+        self.assertEqual((1, 1, 0), tuple(session_cache.get_stats()))
+
+        # Another process reuses the cookies as well
+        code = ('from src import session_cache; from src.nms_api import NmsClient; '
+                f'NmsClient().connect("{self.url}", "admin", "12345"); print(tuple(session_cache.get_stats()))')
+        output = subprocess.run([sys.executable, '-c', code], cwd=_PROJECT_DIR, capture_output=True, text=True)
+        self.assertEqual('(1, 0, 0)', output.stdout.strip(), output.stderr)
+
+        # The logout of the second client ends the shared NMS session, the first one logs in again upon 401
+        requests.get(self.url + 'api/tree/logout/nms=0', cookies=second._cookies)
+        second.logout()
+        self.assertEqual('UHP NMS', first.get_param('nms:0', 'name'))
+        self.assertEqual((1, 2, 1), tuple(session_cache.get_stats()))
+        first.close_session()
+        second.close_session()
+
+    def test_api_driver(self):
+        options = {'type': API, 'address': self.url, 'username': 'admin', 'password': '12345', 'auto_login': True}
+        driver = ApiDriver.create_driver(options)
+        cookies = driver.get_cookies()
+        requests.get(self.url + 'api/tree/logout/nms=0', cookies=cookies)
+        driver.set_path('api/object/get/nms=0')
+        self.assertEqual('UHP NMS', driver.get_value('name'))
+        self.assertNotEqual(dict(cookies), dict(driver.get_cookies()))
+
+        # A new driver reuses the cookies obtained by the relogin
+        self.assertEqual(dict(driver.get_cookies()), dict(ApiDriver.create_driver(options).get_cookies()))
+        self.assertEqual((1, 2, 1), tuple(session_cache.get_stats()))
+
+        # Without the cache the rejected cookies are not renewed
+        session_cache.set_enabled(False)
+        driver = ApiDriver.create_driver(options)
+        requests.get(self.url + 'api/tree/logout/nms=0', cookies=driver.get_cookies())
+        with self.assertRaises(Exception):
+            driver.load_data('api/object/get/nms=0')
+
+
+if __name__ == '__main__':
+    unittest.main()
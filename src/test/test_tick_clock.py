@@ -0,0 +1,42 @@
+import unittest
+from time import monotonic
+
+from src.tick_clock import TickClock
+
+
+class _FakeNms:
+    """Emulates NMS tick number incremented every `period` seconds and counts the requests"""
+
+    def __init__(self, period):
+        self.period = period
+        self.begin = monotonic()
+        self.requests = 0
+
+    def read_tick(self):
+        self.requests += 1
+        return int((monotonic() - self.begin) / self.period)
+
+
+class TickClockSuite(unittest.TestCase):
+
+    def test_wait_ticks(self):
+        nms = _FakeNms(0.2)
+        clock = TickClock(nms.read_tick, step_timeout=0.01)
+        begin_tick = nms.read_tick()
+        self.assertTrue(clock.wait_ticks(3, timeout=2))
+        self.assertGreaterEqual(nms.read_tick(), begin_tick + 3)
+
+    def test_learns_period_and_sleeps(self):
+        nms = _FakeNms(0.2)
+        clock = TickClock(nms.read_tick, step_timeout=0.01)
+        clock.wait_ticks(2, timeout=2)
+        self.assertAlmostEqual(0.2, clock.get_stats().period, delta=0.03)
+        requests = clock.get_stats().requests
+        self.assertTrue(clock.wait_ticks(5, timeout=3))
+        # Polling every 10 ms would have taken about 100 requests
+        self.assertLess(clock.get_stats().requests - requests, 30)
+
+    def test_timeout(self):
+        clock = TickClock(lambda: 1, step_timeout=0.01)
+        self.assertFalse(clock.wait_next_tick(timeout=0.1))
+        self.assertIsNone(clock.get_stats().period)
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from email.parser import BytesParser
+from pathlib import Path
+from unittest import mock
+
+from src.backup_manager.backup_manager import BackupManager
+from src.test.mocks import get_stream
+from src.transfer import MultipartFileStream, file_digest
+
+
+class TransferSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / 'config.txt'
+        self.data = os.urandom(200000)
+        self.path.write_bytes(self.data)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _post_range(self, url, headers=None, **kwargs):
+        """Replies to a download request, the first download is interrupted in the middle"""
+        rng = (headers or {}).get('Range')
+        if rng is None:
+            return get_stream(200, [self.data[:len(self.data) // 2]], fail=True)
+        offset = int(rng[len('bytes='):-1])
+        return get_stream(206, [self.data[offset:]])
+
+    def test_multipart_stream(self):
+        sent = []
+        with MultipartFileStream('config', self.path, progress=lambda done, total: sent.append(done)) as stream:
+            length = len(stream)
+            content_type = stream.content_type
+            body = b''
+            for chunk in iter(lambda: stream.read(8192), b''):
+                body += chunk
+        self.assertEqual(length, len(body))
+        self.assertEqual(len(self.data), sent[-1])
+        message = BytesParser().parsebytes(f'Content-Type: {content_type}\r\n\r\n'.encode() + body)
+        part = message.get_payload()[0]
+        self.assertEqual('config.txt', part.get_filename())
+        self.assertEqual(self.data, part.get_payload(decode=True))
+
+    def _get_manager(self):
+        manager = BackupManager.__new__(BackupManager)
+        manager._address = 'http://localhost/'
+        manager._cookies = None
+        manager._driver = mock.MagicMock()
+        manager._driver.post.side_effect = self._post_range
+        return manager
+
+    def _get_ranges(self, manager):
+        return [(call.kwargs.get('headers') or {}).get('Range') for call in manager._driver.post.call_args_list]
+
+    def test_download_resumed(self):
+        manager = self._get_manager()
+        with mock.patch.object(BackupManager, '_get_backup_dir', staticmethod(lambda name: Path(self.dir.name) / name)):
+            digest = manager._download_backup('downloaded.txt', {'size': len(self.data), 'date': 1})
+        self.assertEqual([None, f'bytes={len(self.data) // 2}-'], self._get_ranges(manager))
+        self.assertEqual(hashlib.sha256(self.data).hexdigest(), digest)
+        self.assertEqual(digest, file_digest(Path(self.dir.name) / 'downloaded.txt'))
+        self.assertEqual(['config.txt', 'downloaded.txt'], sorted(os.listdir(self.dir.name)))
+
+    def test_stale_part_dropped(self):
+        part_path = Path(self.dir.name) / 'downloaded.txt.part'
+        with mock.patch.object(BackupManager, '_get_backup_dir', staticmethod(lambda name: Path(self.dir.name) / name)):
+            # The part of an older backup having the same name is not resumed
+            BackupManager._check_part(part_path, Path(f'{part_path}.info'), {'size': len(self.data), 'date': 1})
+            part_path.write_bytes(os.urandom(1000))
+            manager = self._get_manager()
+            manager._download_backup('downloaded.txt', {'size': len(self.data), 'date': 2})
+            self.assertEqual([None, f'bytes={len(self.data) // 2}-'], self._get_ranges(manager))
+
+            # The part without the description is not resumed either
+            part_path.write_bytes(os.urandom(1000))
+            manager = self._get_manager()
+            manager._download_backup('downloaded.txt', {'size': len(self.data), 'date': 2})
+            self.assertEqual([None, f'bytes={len(self.data) // 2}-'], self._get_ranges(manager))
+        self.assertEqual(self.data, (Path(self.dir.name) / 'downloaded.txt').read_bytes())
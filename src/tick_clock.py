@@ -0,0 +1,177 @@
+"""
+NMS tick clock shared by all the tick awaiting calls of a session.
+
+The clock learns the period of NMS ticks from the observed tick number changes. Upon awaiting a tick it sleeps
+till just before the moment the tick is expected and only then polls the tick number with a short step.
+Concurrent waiters of the same clock share the tick number requests.
+"""
+import threading
+from collections import namedtuple
+from time import monotonic, sleep
+
+from src.exceptions import InvalidOptionsException
+
+# Tick timing statistics: number of observed ticks, learned tick period and its jitter in seconds,
+# number of tick number requests, number of awaiting calls
+TickStats = namedtuple('TickStats', 'ticks period jitter requests waits')
+
+_DEFAULT_STEP_TIMEOUT = 0.1
+# Weight of a new sample upon averaging the tick period
+_PERIOD_WEIGHT = 0.25
+
+
+class TickClock:
+    """
+    Tick clock of an NMS session.
+
+    >>> clock = TickClock(lambda: nms_api.get_param('nms:0', 'tick_number'))
+    >>> clock.wait_ticks(3)
+    True
+
+    :param callable read_tick: a function with no arguments returning the current NMS tick number or None
+    :param float step_timeout: the interval in seconds between tick number requests near the expected tick
+    """
+
+    def __init__(self, read_tick, step_timeout: float = _DEFAULT_STEP_TIMEOUT):
+        if step_timeout <= 0:
+            raise InvalidOptionsException('Step timeout must be a positive number')
+        self._read_tick = read_tick
+        self._step_timeout = step_timeout
+        self._lock = threading.RLock()
+        self._tick = None
+        self._read_at = None
+        # The last tick number change observed with step_timeout precision and its estimated time
+        self._edge = None
+        self._period = None
+        self._jitter = 0.0
+        self._ticks = 0
+        self._requests = 0
+        self._waits = 0
+
+    def tick_number(self, max_age: float = None):
+        """
+        Get the current NMS tick number. The value is requested not more often than once per `max_age` seconds,
+        concurrent callers share the request.
+
+        :param float max_age: how old in seconds the returned tick number can be, defaults to half of step_timeout
+        :returns:
+            - tick_number (int) - the current NMS tick number
+            - None - if the tick number cannot be obtained
+        """
+        if max_age is None:
+            max_age = self._step_timeout / 2
+        with self._lock:
+            if self._read_at is not None and monotonic() - self._read_at < max_age:
+                return self._tick
+            prev_tick, prev_read_at = self._tick, self._read_at
+            tick = self._read_tick()
+            now = monotonic()
+            self._requests += 1
+            if tick is None:
+                return None
+            if prev_tick is not None and tick > prev_tick:
+                self._ticks += tick - prev_tick
+                # The change is used to learn the period only if the previous request was made right before it
+                if now - prev_read_at <= 2 * self._step_timeout:
+                    self._learn(tick, (prev_read_at + now) / 2)
+            self._tick, self._read_at = tick, now
+            return tick
+
+    def wait_next_tick(self, timeout: float = 10, step_timeout: float = None) -> bool:
+        """
+        Wait till the next NMS tick.
+
+        :param float timeout: the amount of time in seconds to wait for the tick
+        :param float step_timeout: optional interval in seconds between tick number requests near the expected tick
+        :returns bool: True if the tick number is incremented, False upon timeout or if the tick cannot be obtained
+        """
+        return self.wait_ticks(1, timeout=timeout, step_timeout=step_timeout)
+
+    def wait_ticks(self, number: int = 1, timeout: float = None, step_timeout: float = None) -> bool:
+        """
+        Wait for the desired number of NMS ticks.
+
+        :param int number: number of ticks to wait
+        :param float timeout: the amount of time in seconds to wait for the ticks, defaults to 10 seconds per tick
+        :param float step_timeout: optional interval in seconds between tick number requests near the expected tick
+        :returns bool: True if the expected number of ticks passed, False upon timeout
+        """
+        if number < 1:
+            raise InvalidOptionsException('Number of ticks to wait must be a positive integer')
+        if timeout is None:
+            timeout = 10 * number
+        if step_timeout is None:
+            step_timeout = self._step_timeout
+        with self._lock:
+            self._waits += 1
+        begin = monotonic()
+        tick = self.tick_number()
+        if tick is None:
+            return False
+        target = tick + number
+        while True:
+            now = monotonic()
+            if timeout < now - begin:
+                return False
+            sleep(self._get_delay(target, now, begin + timeout, step_timeout))
+            tick = self.tick_number()
+            if tick is not None and tick >= target:
+                return True
+
+    def get_stats(self) -> TickStats:
+        """
+        Get the tick timing statistics.
+
+        :returns TickStats: the statistics namedtuple
+        """
+        with self._lock:
+            return TickStats(self._ticks, self._period, self._jitter, self._requests, self._waits)
+
+    def reset(self):
+        """
+        Forget the learned tick period and the statistics, i.e. after NMS restart.
+        """
+        with self._lock:
+            self._tick = None
+            self._read_at = None
+            self._edge = None
+            self._period = None
+            self._jitter = 0.0
+            self._ticks = 0
+            self._requests = 0
+            self._waits = 0
+
+    def _learn(self, tick: int, at: float):
+        """
+        Private method that updates the tick period using the precisely observed tick number change.
+        Do not call it directly.
+
+        :param int tick: the new tick number
+        :param float at: the estimated time of the change
+        """
+        if self._edge is not None and tick > self._edge[0]:
+            sample = (at - self._edge[1]) / (tick - self._edge[0])
+            if self._period is None:
+                self._period = sample
+            else:
+                self._jitter += _PERIOD_WEIGHT * (abs(sample - self._period) - self._jitter)
+                self._period += _PERIOD_WEIGHT * (sample - self._period)
+        self._edge = (tick, at)
+
+    def _get_delay(self, target: int, now: float, deadline: float, step_timeout: float) -> float:
+        """
+        Private method that returns the time to sleep before the next tick number request. Do not call it directly.
+
+        :param int target: the awaited tick number
+        :param float now: the current time
+        :param float deadline: the time the awaiting ends
+        :param float step_timeout: the interval between requests near the expected tick
+        :returns float: the time in seconds to sleep
+        """
+        delay = step_timeout
+        with self._lock:
+            if self._period is not None and self._edge is not None:
+                expected = self._edge[1] + self._period * (target - self._edge[0])
+                guard = max(2 * step_timeout, 0.1 * self._period) + 2 * self._jitter
+                delay = max(delay, expected - guard - now)
+        return max(0.0, min(delay, deadline - now))
@@ -0,0 +1,125 @@
+"""
+Streaming file transfers to and from NMS.
+
+Files are read and written by chunks, therefore memory use does not depend on the size of the file.
+
+>>> with MultipartFileStream('config', path, progress=print) as stream:
+...     requests.post(url, data=stream, headers={'Content-Type': stream.content_type})
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Get SHA-256 digest of a file reading it by chunks
+
+    :param path: path to the file
+    :param int chunk_size: number of bytes read at once
+    :returns str digest: hex digest of the file content
+    """
+    return update_digest(hashlib.sha256(), path, chunk_size).hexdigest()
+
+
+def update_digest(hasher, path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Feed a file content to a hash object reading it by chunks
+
+    :param hasher: a hash object of `hashlib`
+    :param path: path to the file
+    :param int chunk_size: number of bytes read at once
+    :returns: the passed hash object
+    """
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher
+
+
+class MultipartFileStream:
+    """
+    File-like `multipart/form-data` body containing a single file. The body is produced by chunks upon reading,
+    its length is known in advance, therefore the request is sent with `Content-Length` rather than chunked.
+
+    :param str field: the name of the form field
+    :param path: path to the file to send
+    :param str filename: the file name sent in the form, defaults to the name of the file
+    :param callable progress: optional function called as `progress(sent_bytes, total_bytes)` while the file is read
+    :param int chunk_size: max number of file bytes read at once
+    """
+
+    def __init__(self, field: str, path, filename: str = None, progress=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        path = Path(path)
+        if filename is None:
+            filename = path.name
+        self._boundary = uuid.uuid4().hex
+        self._head = (
+            f'--{self._boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n\r\n'
+        ).encode('utf-8')
+        self._tail = f'\r\n--{self._boundary}--\r\n'.encode('utf-8')
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._progress = progress
+        self._chunk_size = chunk_size
+        self._sent = 0
+        self._buffer = self._head
+
+    @property
+    def content_type(self) -> str:
+        """The value of `Content-Type` header of the request"""
+        return f'multipart/form-data; boundary={self._boundary}'
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read the next part of the body
+
+        :param int size: max number of bytes to read, the whole rest of the body is read if it is negative
+        :returns bytes data: the part of the body, empty bytes if the body is read
+        """
+        if size is None or size < 0:
+            size = len(self)
+        parts = []
+        while size > 0:
+            if not self._buffer:
+                self._buffer = self._next_chunk()
+                if not self._buffer:
+                    break
+            part, self._buffer = self._buffer[:size], self._buffer[size:]
+            parts.append(part)
+            size -= len(part)
+        return b''.join(parts)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _next_chunk(self) -> bytes:
+        """
+        Private method that reads the next chunk of the file, the closing boundary follows the file.
+        Do not call it directly.
+
+        :returns bytes chunk: the next chunk, empty bytes if the body is read
+        """
+        if self._file.closed:
+            return b''
+        chunk = self._file.read(self._chunk_size)
+        if chunk:
+            self._sent += len(chunk)
+            if self._progress is not None:
+                self._progress(self._sent, self._size)
+            return chunk
+        self._file.close()
+        return self._tail
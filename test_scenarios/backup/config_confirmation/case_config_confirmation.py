@@ -5,8 +5,10 @@ from src.backup_manager.backup_manager import BackupManager
 from src.constants import NO_ERROR
 from src.custom_test_case import CustomTestCase
 from src.drivers.drivers_provider import DriversProvider
-from src.exceptions import NmsDownloadException
 from src.file_manager.file_manager import FileManager
+from src.nms_config.diff import DEFAULT_IGNORED_FIELDS, compare_backups
+from src.nms_config.model import ConfigModel
+from src.nms_config.writer import format_value
 from src.nms_entities.basic_entities.access import Access
 from src.nms_entities.basic_entities.alert import Alert
 from src.nms_entities.basic_entities.bal_controller import BalController
@@ -44,6 +46,34 @@ from utilities.random_objects.random_objects import RandomObjects
 options_path = 'test_scenarios.backup.config_confirmation'
 backup_name = 'default_config.txt'
 
+# Fields NMS does not keep while they are switched off, the same ones are skipped by the checks by API
+_SWITCHED_OFF_FIELDS = (
+    (('set_alert',), lambda values: values.get('alert_mode') != 'Specify'),
+    (('policy',), lambda values: values.get('priority', 'Policy') != 'Policy'),
+    (('dns_timeout',), lambda values: values.get('dns_caching') == 'OFF'),
+    (('rx_voltage',), lambda values: values.get('rx_dc_power') == 'OFF'),
+    (('ctl_key',), lambda values: values.get('ctl_protect') == 'OFF'),
+    (('file_name', 'repeat_sound'), lambda values: values.get('sound') == 'OFF'),
+    (('script_file',), lambda values: values.get('run_script') == 'OFF'),
+    (('max_cir', 'max_slope'), lambda values: values.get('max_enable') == 'OFF'),
+    (('min_cir', 'down_slope', 'up_slope'), lambda values: values.get('min_enable') == 'OFF'),
+    (('night_cir', 'night_start', 'night_end'), lambda values: values.get('night_enable') == 'OFF'),
+    (('wfq1', 'wfq2', 'wfq3', 'wfq4', 'wfq5', 'wfq6'), lambda values: values.get('wfq_enable') == 'OFF'),
+    (('max_tx_down', 'max_rx_down', 'max_tx_fault', 'max_rx_fault', 'ctr_timeout'),
+     lambda values: values.get('check_ctr') == 'OFF'),
+    (('min_stn_up', 'min_ctr_up', 'stn_timeout'), lambda values: values.get('check_stn') == 'OFF'),
+    (('hub_cn_min', 'stn_cn_min', 'own_cn_min', 'cn_timeout'), lambda values: values.get('check_cn') == 'OFF'),
+    (('max_sw_fails',), lambda values: values.get('check_sw_fails') == 'OFF'),
+    (('min_idle', 'idle_timeout'), lambda values: values.get('check_idle') == 'OFF'),
+    (('dem1_power', 'dem1_ref'), lambda values: values.get('dem1_connect') != 'Teleport_RX'),
+    (('dem2_power', 'dem2_ref'), lambda values: values.get('dem2_connect') != 'Teleport_RX'),
+    (('free_fault', 'down_time'), lambda values: values.get('free_down') == 'OFF'),
+    (('stn_vlan',), lambda values: values.get('override_vlan') == 'OFF'),
+)
+# The password is stored as a hash, the modcods are stored not the way they are set
+_UNCHECKED_FIELDS = ('password',)
+_UNCHECKED_PREFIXES = ('modcod', 'tx_modcod')
+
 
 class ConfigConfirmationCase(CustomTestCase):
     """Created config with all tables filled in is in place after saving and loading it"""
@@ -342,35 +372,13 @@ class ConfigConfirmationCase(CustomTestCase):
                     new_sch_ser = SchService.create(self.driver, new_sch.get_id(), params=sch_ser_params)
                     self.sch_services[new_sch_ser.get_id()] = sch_ser_params
         self.info('Creating first backup...')
-        try:
-            self.backup.create_backup(self.options.get('config_name1'))
-        except NmsDownloadException:
-            self.info('Downloading first backup expectedly failed due to the file size')
-            pass
-
-        self.info('Loading first backup from NMS...')
-        result, error, error_code = self.driver.custom_post(
-            'api/object/write/nms=0',
-            payload={'command': "15728662", 'load_filename': self.options.get('config_name1')}
-        )
-        self.assertEqual(NO_ERROR, error_code)
-        self.info('First backup loaded, sleeping for 60 seconds...')
-        time.sleep(60)
-        self.info('Creating second backup...')
-        try:
-            self.backup.create_backup(self.options.get('config_name2'))
-        except NmsDownloadException:
-            self.info('Downloading second backup expectedly failed due to the file size')
-            pass
-        self.info('Loading second backup from NMS...')
-        result, error, error_code = self.driver.custom_post(
-            'api/object/write/nms=0',
-            payload={'command': "15728662", 'load_filename': self.options.get('config_name2')}
-        )
-        self.assertEqual(NO_ERROR, error_code)
-        self.info('Second backup loaded, sleeping 60 seconds...')
-        time.sleep(60)
-        self.info('Checking entries...')
+        self.backup.create_backup(self.options.get('config_name1'))
+        self.check_created_objects()
+        self.load_save_confirm(self.options.get('config_name1'), self.options.get('config_name2'))
+        self.load_save_confirm(self.options.get('config_name2'), self.options.get('config_name3'))
+        if not self.options.get('check_by_api'):
+            return
+        self.info('Checking entries by API...')
         self.check_stations()
         self.check_groups()
         self.check_users()
@@ -402,6 +410,108 @@ class ConfigConfirmationCase(CustomTestCase):
         self.check_sch_services()
         self.check_dashboards()
 
+    def load_save_confirm(self, load_name, save_name):
+        """Load a backup, save the running config as another backup and compare the backups offline"""
+        self.info(f'Loading {load_name} from NMS...')
+        result, error, error_code = self.driver.custom_post(
+            'api/object/write/nms=0',
+            payload={'command': "15728662", 'load_filename': load_name}
+        )
+        self.assertEqual(NO_ERROR, error_code)
+        self.info(f'{load_name} loaded, sleeping for 60 seconds...')
+        time.sleep(60)
+        self.info(f'Creating {save_name}...')
+        self.backup.create_backup(save_name)
+        diff = compare_backups(
+            self.backup,
+            load_name,
+            save_name,
+            ignored_fields=DEFAULT_IGNORED_FIELDS + tuple(self.options.get('ignored_fields', ())),
+            download=False
+        )
+        self.assertFalse(diff, msg=f'{save_name} differs from {load_name}:\n{diff.summary()}')
+
+    def check_created_objects(self):
+        """All created objects are in the first backup and hold the values they are created with"""
+        config = ConfigModel.load(self.backup.get_backup_path(self.options.get('config_name1')))
+        ignored_fields = set(self.options.get('ignored_fields', ()))
+        mismatches = []
+        defaults = 0
+        for table, created in (
+                ('dashboard', self.dashboards),
+                ('group', self.groups),
+                ('user', self.users),
+                ('access', self.accesses),
+                ('server', self.servers),
+                ('alert', self.alerts),
+                ('network', self.networks),
+                ('teleport', self.teleports),
+                ('shaper', self.shapers),
+                ('vno', self.vnos),
+                ('policy', self.policies),
+                ('polrule', self.rules),
+                ('service', self.services),
+                ('qos', self.qos),
+                ('sr_controller', self.sr_controllers),
+                ('sr_license', self.sr_licenses),
+                ('sr_teleport', self.sr_teleports),
+                ('device', self.devices),
+                ('bal_controller', self.bal_controllers),
+                ('camera', self.cameras),
+                ('profile_set', self.profiles),
+                ('controller', self.controllers),
+                ('port_map', self.port_maps),
+                ('rip_router', self.rip_routers),
+                ('route', self.routes),
+                ('sw_upload', self.sw_uploads),
+                ('station', self.stations),
+                ('scheduler', self.scheduler),
+                ('sch_range', self.sch_ranges),
+                ('sch_service', self.sch_services),
+        ):
+            missing = sorted(set(created) - set(config.rows(table)))
+            self.assertEqual([], missing[:20], msg=f'{len(missing)} created {table} objects are not saved')
+            for row, values_dict in created.items():
+                for key, value in values_dict.items():
+                    if key in ignored_fields or f'{table}.{key}' in ignored_fields \
+                            or not self._is_checked(key, values_dict):
+                        continue
+                    stored = config.get(table, row, key)
+                    # NMS does not save the values equal to the defaults
+                    if stored is None:
+                        defaults += 1
+                    elif self._normalize(value) != self._normalize(stored):
+                        mismatches.append(f'{table}:{row} {key} expected {value}, saved {stored.rstrip()}')
+        self.info(f'{defaults} created values are not saved as they are equal to NMS defaults')
+        self.assertEqual(
+            [], mismatches[:20], msg=f'{len(mismatches)} created values differ in the first backup'
+        )
+
+    @staticmethod
+    def _is_checked(key, values_dict):
+        """Private method that tells if the value of a created object is kept by NMS. Do not call it directly."""
+        if key in _UNCHECKED_FIELDS or key.startswith(_UNCHECKED_PREFIXES):
+            return False
+        for fields, switched_off in _SWITCHED_OFF_FIELDS:
+            if key in fields and switched_off(values_dict):
+                return False
+        return True
+
+    @staticmethod
+    def _normalize(value):
+        """
+        Private method that returns a value comparable to the saved one. Do not call it directly.
+        A reference is compared without the name of the object, the numbers are compared as floats,
+        the rest of the values are case insensitive.
+        """
+        value = format_value(value).strip()
+        if ':' in value and value.split()[0].split(':')[-1].isdigit():
+            return value.split()[0]
+        try:
+            return float(value)
+        except ValueError:
+            return value.lower()
+
     def check_stations(self):
         for stn_id, values_dict in self.stations.items():
             reply, error, error_code = self.driver.custom_get(f'api/object/get/station={stn_id}')
@@ -1,6 +1,11 @@
 options = {
-    'config_name1': 'config_confirmation.txt',
-    'config_name2': 'config_confirmation.txt',
+    'config_name1': 'config_confirmation1.txt',
+    'config_name2': 'config_confirmation2.txt',
+    'config_name3': 'config_confirmation3.txt',
+    # The saved backups are compared offline, set to True to read back all created objects by API as well
+    'check_by_api': False,
+    # Fields ignored in addition to `src.nms_config.diff.DEFAULT_IGNORED_FIELDS`, i.e. `station.created`
+    'ignored_fields': (),
     'number_of_access': 1024,  # added
     'number_of_alert': 2048,  # added
     'number_of_bal_controller': 32,  # added
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process, Manager
 
 import requests
@@ -8,6 +9,7 @@ from src.drivers.abstract_http_driver import API
 from src.drivers.drivers_provider import DriversProvider
 from src.enum_types_constants import ControllerModes, StationModes
 from src.exceptions import ObjectNotCreatedException, ObjectNotDeletedException
+from src.nms_api import NmsClient
 from src.nms_entities.basic_entities.controller import Controller
 from src.nms_entities.basic_entities.network import Network
 from src.nms_entities.basic_entities.station import Station
@@ -59,6 +61,7 @@ class ApiSimultaneousAccessCase(CustomTestCase):
             'password': None,
             'auto_login': True,
         }
+        cls.nms_ip_port = nms_ip_port
         cls.drivers = []
         for i in range(1, 9):
             username = f'user_{i}'
@@ -162,3 +165,32 @@ class ApiSimultaneousAccessCase(CustomTestCase):
                 self.fail(f'Process {proc} result: {result}')
             else:
                 self.ok(f'Process {proc} result: {result}')
+
+    def test_simultaneous_clients_create_delete(self):
+        """8 users create and delete VNOs in parallel threads, each user has its own NMS API client"""
+        def create_delete(thread_num):
+            client = NmsClient()
+            client.connect(self.nms_ip_port, f'user_{thread_num + 1}', '12345')
+            client.auto_abort_on_error(False)
+            number_of_iterations = 2000
+            for j in range(number_of_iterations):
+                try:
+                    vno = client.create(f'network:{self.net.get_id()}', 'vno', {
+                        'name': f'vno-{thread_num * number_of_iterations + j}'
+                    })
+                    if vno is None:
+                        return f'no_create_at_iteration_{j}: {client.get_next_error()}'
+                    if not client.delete(vno):
+                        return f'no_delete_at_iteration_{j}: {client.get_next_error()}'
+                except requests.exceptions.ReadTimeout:
+                    return f'no_response_at_iteration_{j}'
+            client.logout()
+            return 'ok'
+
+        with ThreadPoolExecutor(max_workers=len(self.drivers)) as executor:
+            results = list(executor.map(create_delete, range(len(self.drivers))))
+        for thread_num, result in enumerate(results):
+            if result != 'ok':
+                self.fail(f'Thread {thread_num} result: {result}')
+            else:
+                self.ok(f'Thread {thread_num} result: {result}')
@@ -126,17 +126,18 @@ class StationsStatesCase(CustomTestCase):
             })
         if not nms_api.wait_up(mf_hub, timeout=60):
             test_api.error('MF hub is not UP')
-        for i in range(cls.real_stations):
-            if not nms_api.wait_up(f'station:{i}'):
-                test_api.error(f'Station {i+1} is not UP')
+        res = nms_api.wait_all([f'station:{i}' for i in range(cls.real_stations)], 'Up', timeout=30)
+        for stn, up_after in res.times.items():
+            if up_after is None:
+                test_api.error(f'{stn} is not UP')
         nms_api.wait_ticks(3)
 
     def test_states(self):
         """Check expected stations' states (Up, Down, Off, Idle)"""
-        stations = nms_api.list_items('vno:0', 'station')
+        stations = nms_api.get_params_many('vno:0', 'station', ['state'])
         states = {}
-        for stn in stations:
-            state = nms_api.get_param(stn, 'state')
+        for stn_params in stations.values():
+            state = stn_params.get('state')
             if state not in states.keys():
                 states[state] = 1
             else:
@@ -0,0 +1,51 @@
+import time
+
+from src.nms_api import NmsClient
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+__author__ = 'dkudryashov'
+
+number_of_stations = 1000
+latency = 0.01
+# The number of requests the stand-in serves at the same time, the same number is queued, the rest are replied 503
+capacity = 4
+fixed_concurrency = (4, 8, 32)
+
+_CONFIG = '.nms 0\nname UHP NMS\n.network 0\nname net\n.vno 0\nname vno\nuprow network:0\n'
+
+
+def create_stations(url, stations, concurrency=None, adaptive=False):
+    """Creates the stations by a new client, returns the bulk result and the client"""
+    client = NmsClient()
+    client.connect(url, 'admin', '12345')
+    if adaptive:
+        client.enable_adaptive_concurrency(initial_limit=2, max_limit=64)
+    result = client.create_many('vno:0', 'station', [{'name': f'stn-{i}'} for i in range(stations)],
+                                concurrency=concurrency)
+    client.close_session()
+    return result, client
+
+
+def run_benchmark(stations=number_of_stations, delay=latency, served_at_once=capacity):
+    """Compare bulk creation at fixed concurrency and at the adaptive limit against a stand-in of limited capacity"""
+    results = {}
+    for concurrency in (*fixed_concurrency, None):
+        with NmsStandIn(ConfigModel.parse(_CONFIG), latency=delay, capacity=served_at_once) as stand_in:
+            st_time = time.perf_counter()
+            result, client = create_stations(stand_in.url, stations, concurrency, adaptive=concurrency is None)
+            elapsed = time.perf_counter() - st_time
+        name = 'adaptive' if concurrency is None else f'fixed {concurrency}'
+        results[name] = result
+        print(f'{name}: {stations} stations in {elapsed:.2f} s, {result.rate:.1f} per second, '
+              f'{len(result.errors)} failed')
+        if concurrency is None:
+            limiter = client.get_concurrency_limiter()
+            limits = [change.limit for change in limiter.get_history()]
+            print(f'adaptive limit: final {limiter.get_limit()}, min {min(limits)}, max {max(limits)}, '
+                  f'{len(limits)} changes, {limiter.get_stats()}')
+    return results
+
+
+if __name__ == '__main__':
+    run_benchmark()
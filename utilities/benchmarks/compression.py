@@ -0,0 +1,38 @@
+from src import compression
+from src.backup_manager.backup_manager import BackupManager
+from src.constants import API_SAVE_CONFIG_AS_COMMAND
+from src.http_session import create_session
+from src.nms_config.model import ConfigModel
+from src.nms_stand_in import NmsStandIn
+
+__author__ = 'dkudryashov'
+
+config_name = '10000_stations_in_1_network.txt'
+# Slow management link: 2 Mbit/s and 50 ms round trip
+link_bandwidth = 250_000
+latency = 0.05
+number_of_requests = 1
+
+
+def run_benchmark(config=config_name, bandwidth=link_bandwidth, delay=latency, repeat=number_of_requests):
+    """Compare the wire bytes and the latency of large NMS replies with and without compression"""
+    model = ConfigModel.load(BackupManager.get_backup_path(config))
+    with NmsStandIn(model, latency=delay, bandwidth=bandwidth, compress=True) as stand_in:
+        session = create_session()
+        cookies = session.get(stand_in.url + 'api/tree/login/nms=0', auth=('admin', '12345')).cookies
+        session.post(stand_in.url + f'api/object/write/nms=0/command={API_SAVE_CONFIG_AS_COMMAND}',
+                     json={'save_filename': config}, cookies=cookies)
+        rows = compression.compare(session, stand_in.url, [
+            'api/list/get/vno=0/list_items=station/list_vars=name,serial,enable,mode',
+            'api/list/get/vno=0/list_items=station',
+        ], repeat=repeat, cookies=cookies)
+        rows.extend(compression.compare(
+            session, stand_in.url, [f'api/fs/download/nms=0/path=config&{config}'], 'POST', repeat, cookies=cookies
+        ))
+        session.close()
+    print(compression.format_comparison(rows))
+    return rows
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,32 @@
+import time
+
+from src.nms_config.model import ConfigModel
+
+__author__ = 'dkudryashov'
+
+config_path = 'nms_backups/10000_stations_in_1_network.txt'
+repeat_number = 5
+
+
+def run_benchmark(path=config_path, number=repeat_number):
+    """Measure loading of a large NMS config and the first and repeated queries by a field"""
+    load_time = None
+    config = None
+    for _ in range(number):
+        start = time.perf_counter()
+        config = ConfigModel.load(path)
+        elapsed = time.perf_counter() - start
+        load_time = elapsed if load_time is None else min(load_time, elapsed)
+    objects = sum(config.count(table) for table in config.tables())
+    print(f'{path}: {objects} objects loaded in {load_time * 1000:.1f} ms')
+
+    controller = f'controller:{config.rows("controller")[0]}'
+    for query in ('first', 'repeated'):
+        start = time.perf_counter()
+        rows = config.find('station', rx_controller=controller, enable='ON')
+        print(f'{query} query: {len(rows)} stations of {controller} in {(time.perf_counter() - start) * 1000:.3f} ms')
+    return load_time
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,41 @@
+import tempfile
+import time
+from pathlib import Path
+
+from src.nms_config.model import ConfigModel
+from src.nms_config.reader import ConfigReader
+from src.nms_config.writer import TopologyWriter
+
+__author__ = 'dkudryashov'
+
+number_of_stations = 100000
+station_row = 31999
+
+
+def timed(function):
+    """Returns the result of the function call and the time in seconds the call took"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(stations=number_of_stations, row=station_row):
+    """Compare a single field lookup in a large generated config by the full parse and by the lazy reader"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'config.txt'
+        count = TopologyWriter(stations=stations, controllers=8, vnos=4, routes=1).write(path)
+        print(f'{count} objects, {path.stat().st_size} bytes')
+
+        config, load_time = timed(lambda: ConfigModel.load(path))
+        print(f'full parse: {load_time * 1000:.1f} ms, serial {config.get("station", row, "serial")}')
+
+        for attempt in ('index scan', 'cached index'):
+            reader, open_time = timed(lambda: ConfigReader(path))
+            serial, get_time = timed(lambda: reader.get('station', row, 'serial'))
+            reader.close()
+            print(f'lazy reader, {attempt}: open {open_time * 1000:.1f} ms, lookup {get_time * 1000:.3f} ms, '
+                  f'serial {serial}')
+
+
+if __name__ == '__main__':
+    run_benchmark()
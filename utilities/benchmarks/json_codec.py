@@ -0,0 +1,59 @@
+import timeit
+
+from src import json_codec
+
+__author__ = 'dkudryashov'
+
+number_of_stations = 10000
+repeat_number = 20
+
+
+def get_list_reply(number=number_of_stations):
+    """Build an NMS list reply with `number` stations projected to the dashboard fields"""
+    items = {
+        str(row): {
+            'name': f'stn-{row}',
+            'serial': 100000 + row,
+            'state': 'Up',
+            'rx_snr': 12.5,
+            'mac': f'00:11:22:33:{row // 256 % 256:02x}:{row % 256:02x}',
+            'enable': 'ON',
+        }
+        for row in range(number)
+    }
+    return json_codec.dumps({'error_code': 0, 'error_log': '', 'reply': items})
+
+
+def codec_timings(content, number=repeat_number):
+    """Returns average loads and dumps times in seconds of the current backend"""
+    decoded = json_codec.loads(content)
+    loads_time = timeit.timeit(lambda: json_codec.loads(content), number=number) / number
+    dumps_time = timeit.timeit(lambda: json_codec.dumps(decoded), number=number) / number
+    return loads_time, dumps_time
+
+
+def run_benchmark(stations=number_of_stations, number=repeat_number):
+    """Compare decoding and encoding of a large list reply by stdlib json and orjson"""
+    content = get_list_reply(stations)
+    current = json_codec.get_backend()
+    results = {}
+    try:
+        for backend in (json_codec.STDLIB, json_codec.ORJSON):
+            if backend == json_codec.ORJSON and json_codec.orjson is None:
+                print('orjson is not installed')
+                continue
+            json_codec.set_backend(backend)
+            results[backend] = codec_timings(content, number)
+            loads_time, dumps_time = results[backend]
+            print(f'{backend}: {len(content)} bytes reply, '
+                  f'loads {loads_time * 1000:.2f} ms, dumps {dumps_time * 1000:.2f} ms')
+    finally:
+        json_codec.set_backend(current)
+    if len(results) == 2:
+        std, fast = results[json_codec.STDLIB], results[json_codec.ORJSON]
+        print(f'orjson speedup: loads x{std[0] / fast[0]:.2f}, dumps x{std[1] / fast[1]:.2f}')
+    return results
+
+
+if __name__ == '__main__':
+    run_benchmark()
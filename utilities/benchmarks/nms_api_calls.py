@@ -0,0 +1,46 @@
+import time
+
+import requests
+
+from src import nms_api, test_api
+
+__author__ = 'dkudryashov'
+
+number_of_calls = 2000
+dashboard_path = 'api/object/dashboard/nms=0'
+
+
+def bare_requests_calls(nms_ip, cookies, number):
+    """Dashboard calls via bare `requests.get`, each call opens a new TCP connection"""
+    st_time = time.perf_counter()
+    for _ in range(number):
+        requests.get(nms_ip + dashboard_path, cookies=cookies, timeout=5)
+    return number / (time.perf_counter() - st_time)
+
+
+def session_calls(nms_ip, cookies, number):
+    """The same dashboard calls via the pooled keep-alive session of `nms_api` client"""
+    session = nms_api.get_default_client()._get_session()
+    st_time = time.perf_counter()
+    for _ in range(number):
+        session.get(nms_ip + dashboard_path, cookies=cookies, timeout=5)
+    return number / (time.perf_counter() - st_time)
+
+
+def run_benchmark(number=number_of_calls):
+    """Compare calls per second of bare requests and of the `nms_api` pooled session"""
+    nms_options = test_api.get_nms()
+    nms_ip = nms_options.get('nms_ip')
+    if not nms_ip.endswith('/'):
+        nms_ip += '/'
+    nms_api.connect(nms_ip, nms_options.get('username'), nms_options.get('password'))
+    cookies = nms_api.get_default_client()._cookies
+    before = bare_requests_calls(nms_ip, cookies, number)
+    after = session_calls(nms_ip, cookies, number)
+    print(f'{number} dashboard calls: bare requests {before:.1f} calls/sec, '
+          f'pooled session {after:.1f} calls/sec, speedup x{after / before:.2f}')
+    return before, after
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+from src import test_api
+from src.nms_api import NmsClient
+
+__author__ = 'dkudryashov'
+
+number_of_workers = 8
+calls_per_worker = 500
+
+
+def worker_calls(args):
+    """Connect an own `NmsClient` and read NMS object `number` times. Returns the number of successful calls"""
+    nms_ip, username, password, number = args
+    client = NmsClient()
+    client.connect(nms_ip, username, password)
+    client.auto_abort_on_error(False)
+    done = 0
+    for _ in range(number):
+        if client.get_param('nms:0', 'tick_number') is not None:
+            done += 1
+    client.close_session()
+    return done
+
+
+def threads_calls(args, workers):
+    """Run the workers in threads of the current process, returns calls per second"""
+    st_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        done = sum(executor.map(worker_calls, [args] * workers))
+    return done / (time.perf_counter() - st_time)
+
+
+def processes_calls(args, workers):
+    """Run the workers in separate processes, returns calls per second including processes start up"""
+    st_time = time.perf_counter()
+    with Pool(processes=workers) as pool:
+        done = sum(pool.map(worker_calls, [args] * workers))
+    return done / (time.perf_counter() - st_time)
+
+
+def run_benchmark(workers=number_of_workers, number=calls_per_worker):
+    """Compare calls per second of `NmsClient` instances driven by threads and by processes"""
+    nms_options = test_api.get_nms()
+    args = (nms_options.get('nms_ip'), nms_options.get('username'), nms_options.get('password'), number)
+    in_threads = threads_calls(args, workers)
+    in_processes = processes_calls(args, workers)
+    print(f'{workers} workers x {number} calls: threads {in_threads:.1f} calls/sec, '
+          f'processes {in_processes:.1f} calls/sec, threads/processes x{in_threads / in_processes:.2f}')
+    return in_threads, in_processes
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,42 @@
+import time
+
+from src.nms_api import NmsClient
+from src.nms_stand_in import NmsStandIn
+
+__author__ = 'dkudryashov'
+
+config_name = '10000_stations_in_1_network.txt'
+number_of_stations = 500
+latency = 0.005
+
+
+def timed(function):
+    """Returns the result of the function call and the time in seconds the call took"""
+    st_time = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - st_time
+
+
+def run_benchmark(config=config_name, stations=number_of_stations, delay=latency):
+    """Compare per-object reads, list projections and bulk writes of `NmsClient` against the local NMS stand-in"""
+    with NmsStandIn(config, latency=delay) as stand_in:
+        client = NmsClient()
+        client.connect(stand_in.url, 'admin', '12345')
+        rows = [f'station:{row}' for row in range(stations)]
+
+        _, single_time = timed(lambda: [client.get_param(row, 'serial') for row in rows])
+        print(f'{stations} get_param calls at {delay * 1000:.0f} ms latency: {single_time:.2f} s')
+
+        params, many_time = timed(lambda: client.get_params_many('vno:0', 'station', ['serial'], page_size=1000))
+        print(f'get_params_many of {len(params)} stations: {many_time:.2f} s')
+
+        _, update_time = timed(lambda: client.update_many({row: {'serial': 1} for row in rows}))
+        print(f'update_many of {stations} stations: {update_time:.2f} s')
+
+        print(stand_in.get_stats())
+        client.close_session()
+    return single_time, many_time, update_time
+
+
+if __name__ == '__main__':
+    run_benchmark()
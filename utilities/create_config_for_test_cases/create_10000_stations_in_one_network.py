@@ -4,17 +4,20 @@ import time
 
 from src.backup_manager.backup_manager import BackupManager
 from src.drivers.drivers_provider import DriversProvider
-from src.enum_types_constants import ControllerModes, CheckboxStr, StationModes, LatitudeModes, LongitudeModes
+from src.enum_types_constants import ControllerModes, CheckboxStr, StationModes, LatitudeModes, LongitudeModes, \
+    LatitudeModesStr, LongitudeModesStr
 from src.exceptions import ObjectNotCreatedException
 from src.nms_entities.basic_entities.controller import Controller
 from src.nms_entities.basic_entities.network import Network
 from src.nms_entities.basic_entities.station import Station
 from src.nms_entities.basic_entities.teleport import Teleport
 from src.nms_entities.basic_entities.vno import Vno
+from src.nms_config.writer import TopologyWriter
 from src.options_providers.options_provider import OptionsProvider, API_CONNECT
 
 options_path = 'utilities.create_config_for_test_cases'
 backup_name = 'default_config.txt'
+config_name = '10000_stations_in_1_network.txt'
 __author__ = 'dkudryashov'
 
 
@@ -79,7 +82,29 @@ def create_config(driver=None):
     stations = Station.station_list(api, 0, vars_=['name'])
     if number_of_stations != len(stations):
         raise ObjectNotCreatedException(f'Expected {number_of_stations} stations created, got {len(stations)}')
-    backup.create_backup('10000_stations_in_1_network.txt')
+    backup.create_backup(config_name)
+
+
+def generate_config(apply=False):
+    """Write the config of 10000 stations in 1 network offline without NMS, optionally apply it"""
+    st_time = time.perf_counter()
+    number = TopologyWriter(
+        stations=10000,
+        controllers=5,
+        station_params=lambda row: {
+            'fixed_location': True,
+            'lat_deg': random.randint(0, 89),
+            'lat_min': random.randint(0, 59),
+            'lat_south': random.choice([*LatitudeModesStr()]),
+            'lon_deg': random.randint(0, 179),
+            'lon_min': random.randint(0, 59),
+            'lon_west': random.choice([*LongitudeModesStr()]),
+            'time_zone': random.randint(-12, 12),
+        },
+    ).write(BackupManager.get_backup_path(config_name))
+    print(f'{number} objects are written in {time.perf_counter() - st_time} seconds')
+    if apply:
+        BackupManager().apply_backup(config_name)
 
 
 if __name__ == '__main__':
@@ -1,19 +1,22 @@
 import random
 import time
 
+from src import nms_api
 from src.backup_manager.backup_manager import BackupManager
 from src.drivers.drivers_provider import DriversProvider
-from src.enum_types_constants import ControllerModes, StationModes, LatitudeModes, LongitudeModes
+from src.enum_types_constants import ControllerModes, StationModes, LatitudeModes, LongitudeModes, \
+    ControllerModesStr, StationModesStr, LatitudeModesStr, LongitudeModesStr
 from src.exceptions import ObjectNotCreatedException
 from src.nms_entities.basic_entities.controller import Controller
 from src.nms_entities.basic_entities.network import Network
-from src.nms_entities.basic_entities.station import Station
 from src.nms_entities.basic_entities.teleport import Teleport
 from src.nms_entities.basic_entities.vno import Vno
+from src.nms_config.writer import TopologyWriter
 from src.options_providers.options_provider import OptionsProvider, API_CONNECT
 
 options_path = 'utilities.create_config_for_test_cases'
 backup_name = 'default_config.txt'
+config_name = '32768_stations_1_vno.txt'
 __author__ = 'dkudryashov'
 
 
@@ -44,29 +47,68 @@ def create_config(driver=None):
         0,
         params={'name': 'ctrl1', 'mode': ControllerModes.HUBLESS_MASTER, 'teleport': f'teleport:0'}
     )
+    connection_options = OptionsProvider.get_connection('global_options', API_CONNECT)
+    nms_api.connect(
+        connection_options.get('address'), connection_options.get('username'), connection_options.get('password')
+    )
+    # The number of concurrent requests settles at the rate NMS sustains
+    nms_api.enable_adaptive_concurrency()
+    st_time = time.perf_counter()
+    result = nms_api.create_many('vno:0', 'station', [{
+        'name': f'stn-{i}',
+        'mode': StationModes.HUBLESS,
+        'enable': 'ON',
+        'rx_controller': 'controller:0',
+        'serial': i,
+        'fixed_location': True,
+        'lat_deg': random.randint(0, 89),
+        'lat_min': random.randint(0, 59),
+        'lat_south': random.choice([*LatitudeModes()]),
+        'lon_deg': random.randint(0, 179),
+        'lon_min': random.randint(0, 59),
+        'lon_west': random.choice([*LongitudeModes()]),
+        'time_zone': random.randint(-12, 12),
+    } for i in range(1, 32769)])
+    print(f'32768 stations creation time is {time.perf_counter() - st_time} seconds, '
+          f'{result.rate:.1f} stations per second, '
+          f'concurrency limit {nms_api.get_concurrency_limiter().get_limit()}')
+    nms_api.disable_adaptive_concurrency()
+    if result.errors:
+        raise ObjectNotCreatedException(f'{len(result.errors)} stations are not created, '
+                                        f'first error: {next(iter(result.errors.values()))}')
+    stations = sum(1 for _ in nms_api.iter_items('vno:0', 'station', vars_=[], page_size=10000))
+    if 32768 != stations:
+        raise ObjectNotCreatedException(f'Expected 32768 stations created, got {stations}')
+    backup.create_backup(config_name)
+
+
+def generate_config(apply=False):
+    """Write the config of 32768 stations in 1 VNO offline without NMS, optionally apply it"""
     st_time = time.perf_counter()
-    for i in range(1, 32769):
-        Station.create(api, 0, params={
-            'name': f'stn-{i}',
-            'mode': StationModes.HUBLESS,
-            'enable': 'ON',
-            'rx_controller': 'controller:0',
-            'serial': i,
+    number = TopologyWriter(
+        stations=32768,
+        controller_mode=ControllerModesStr.HUBLESS_MASTER,
+        station_mode=StationModesStr.HUBLESS,
+        station_name=lambda row: f'stn-{row + 1}',
+        controller_name=lambda row: f'ctrl{row + 1}',
+        vno_name=lambda row: f'vno{row + 1}',
+        network_name='net1',
+        teleport_name='tp1',
+        sat_name='sat1',
+        station_params=lambda row: {
             'fixed_location': True,
             'lat_deg': random.randint(0, 89),
             'lat_min': random.randint(0, 59),
-            'lat_south': random.choice([*LatitudeModes()]),
+            'lat_south': random.choice([*LatitudeModesStr()]),
             'lon_deg': random.randint(0, 179),
             'lon_min': random.randint(0, 59),
-            'lon_west': random.choice([*LongitudeModes()]),
+            'lon_west': random.choice([*LongitudeModesStr()]),
             'time_zone': random.randint(-12, 12),
-        })
-    print(f'32768 stations creation time is {time.perf_counter() - st_time} seconds')
-    stations1 = Station.station_list(api, 0, vars_=['name'], max_=15000)
-    stations2 = Station.station_list(api, 0, vars_=['name'], skip=15000)
-    if 32768 != len(stations1) + len(stations2):
-        raise ObjectNotCreatedException(f'Expected 32768 stations created, got {len(stations1) + len(stations2)}')
-    backup.create_backup('32768_stations_1_vno.txt')
+        },
+    ).write(BackupManager.get_backup_path(config_name))
+    print(f'{number} objects are written in {time.perf_counter() - st_time} seconds')
+    if apply:
+        BackupManager().apply_backup(config_name)
 
 
 if __name__ == '__main__':